@@ -48,7 +48,7 @@ class AkusolarScraper(BaseScraper):
         response = self.make_request(self.base_url, verify=False)
         
         if response:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             all_links = soup.find_all('a', href=True)
             
             for link in all_links:
@@ -103,7 +103,7 @@ class AkusolarScraper(BaseScraper):
             response = self.make_request(category_url, verify=False)  # Disable SSL verification
             
             if response:
-                soup = self.parse_html(response.text)
+                soup = self.parse_response(response)
                 
                 # Find all links that look like product pages
                 all_links = soup.find_all('a', href=True)
@@ -145,7 +145,7 @@ class AkusolarScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name (try multiple selectors)
             product_name = self._extract_text(soup, [
@@ -82,7 +82,7 @@ class AlphaScraper(BaseScraper):
         response = self.make_request(sitemap_url, verify=False)  # Disable SSL verification
         
         if response:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             locs = soup.find_all('loc')
             
             for loc in locs:
@@ -126,7 +126,7 @@ class AlphaScraper(BaseScraper):
             response = self.make_request(category_url, verify=False)  # Disable SSL verification
             
             if response:
-                soup = self.parse_html(response.text)
+                soup = self.parse_response(response)
                 
                 # Find all links
                 all_links = soup.find_all('a', href=True)
@@ -168,7 +168,7 @@ class AlphaScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name (try multiple selectors)
             product_name = self._extract_text(soup, [
@@ -0,0 +1,257 @@
+"""
+asyncio execution engine for BaseScraper.run (SCRAPER_ENGINE=async).
+
+Downloads product pages with aiohttp so hundreds of requests can be in flight
+on one thread (still paced by the per-host rate limiter), then hands each
+response to a worker pool where the scraper's unchanged scrape_product()
+parses it. The adapter is BaseScraper's prefetch slot: the first
+make_request() for the URL inside scrape_product() returns the
+already-downloaded response instead of going to the network again.
+
+Scrapers split into fetch_product() / extract_product() have their
+successful pages parsed on the extract process pool instead when
+SCRAPER_PARSE_PROCESSES is set.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from base_scraper import _extract_in_worker
+from circuit_breaker import CircuitOpenError
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+DEFAULT_ASYNC_CONCURRENCY = 200
+
+# Statuses worth retrying; everything else is handed to the scraper as-is.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncCrawlEngine:
+    """
+    Drives one scraper run on an asyncio event loop.
+
+    Args:
+        scraper: BaseScraper instance to run
+        concurrency: Maximum requests in flight (SCRAPER_ASYNC_CONCURRENCY)
+        parse_workers: Threads running scrape_product() on downloaded pages
+    """
+
+    def __init__(self, scraper, concurrency: Optional[int] = None, parse_workers: int = 4):
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.concurrency = max(
+            int(concurrency or os.getenv("SCRAPER_ASYNC_CONCURRENCY", DEFAULT_ASYNC_CONCURRENCY)),
+            1,
+        )
+        self.parse_workers = max(parse_workers, 1)
+
+    def run(self, product_urls: Iterable[str], tally) -> None:
+        """Scrape all URLs, recording every result in the run tally."""
+        if aiohttp is None:
+            self.logger.warning("aiohttp is not installed; using the thread engine instead")
+            self.scraper._run_threaded(list(product_urls), self.parse_workers, tally)
+            return
+
+        self.logger.info(
+            f"Async engine: {self.concurrency} requests in flight, "
+            f"{self.parse_workers} parse workers"
+        )
+        asyncio.run(self._crawl(product_urls, tally))
+
+    def _default_headers(self) -> Dict[str, str]:
+        headers = dict(getattr(self.scraper, "request_headers", {}) or {})
+        headers.setdefault("User-Agent", self.scraper._get_random_user_agent())
+        return headers
+
+    async def _crawl(self, product_urls: Iterable[str], tally) -> None:
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.scraper.request_timeout)
+
+        extract_pool = self.scraper.create_extract_pool()
+
+        with ThreadPoolExecutor(max_workers=self.parse_workers) as parse_pool, \
+                (extract_pool or nullcontext()):
+            async with aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers=self._default_headers(),
+                cookies=self.scraper.session.cookies.get_dict(),
+            ) as session:
+
+                async def worker():
+                    while True:
+                        url = await queue.get()
+                        try:
+                            if url is None:
+                                return
+                            response = await self._fetch(session, url)
+                            if extract_pool is not None and response is not None and response.ok:
+                                product_data = await loop.run_in_executor(
+                                    extract_pool, _extract_in_worker, url, response
+                                )
+                            else:
+                                product_data = await loop.run_in_executor(
+                                    parse_pool,
+                                    self.scraper._scrape_with_retry,
+                                    url,
+                                    response,
+                                )
+                            tally.record(url, product_data)
+                        except Exception as e:
+                            tally.record_error(url, e)
+                        finally:
+                            queue.task_done()
+
+                workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+
+                # Producer: the bounded queue keeps memory flat for huge URL lists.
+                url_iter = iter(product_urls)
+                # A UrlStream may block while discovery runs; wait for it off the loop.
+                next_batch = getattr(product_urls, "next_batch", None)
+                while True:
+                    if next_batch is not None:
+                        batch = await loop.run_in_executor(None, next_batch, self.concurrency)
+                    else:
+                        batch = list(islice(url_iter, self.concurrency))
+                    if not batch:
+                        break
+                    if self.scraper.stop_requested:
+                        tally.unvisited.extend(batch)
+                        tally.unvisited.extend(await loop.run_in_executor(None, list, url_iter))
+                        break
+                    for url in batch:
+                        await queue.put(url)
+                for _ in workers:
+                    await queue.put(None)
+
+                await asyncio.gather(*workers)
+
+    async def _fetch(self, session, url: str) -> Optional[requests.Response]:
+        """Download one page, going through the scraper's cassette when one is set."""
+        cassette = self.scraper.cassette
+        if cassette is not None and cassette.replaying:
+            response, latency = cassette.replay("GET", url)
+            if latency:
+                await asyncio.sleep(latency)
+            response.prefetch_url = url
+            return response
+
+        started = time.monotonic()
+        response = await self._fetch_live(session, url)
+        if cassette is not None and response is not None:
+            cassette.record("GET", url, response, time.monotonic() - started)
+        return response
+
+    async def _fetch_live(self, session, url: str) -> Optional[requests.Response]:
+        """
+        Download one page with budgeted retries. Returns None when every attempt
+        failed on the network level, so scrape_product() falls back to its own client.
+        """
+        http_cache = self.scraper.http_cache
+        headers = http_cache.conditional_headers(url) if http_cache is not None else {}
+        limiter = self.scraper._get_rate_limiter(url)
+        breaker = self.scraper._get_circuit_breaker(url)
+
+        for attempt in range(self.scraper.max_retries):
+            response = None
+            try:
+                if breaker is not None:
+                    await self._wait_for_breaker(breaker)
+                if limiter is not None:
+                    await asyncio.sleep(limiter.reserve())
+                self.scraper.retry_budget.record_request()
+                started = time.monotonic()
+                async with session.get(url, headers=headers, allow_redirects=True) as resp:
+                    body = await resp.read()
+                    response = self._to_requests_response(url, resp, body)
+                if limiter is not None:
+                    self.scraper._record_rate_outcome(
+                        limiter, response.status_code, time.monotonic() - started
+                    )
+                if breaker is not None:
+                    breaker.record_status(response.status_code)
+
+                if response.status_code in RETRY_STATUSES and attempt < self.scraper.max_retries - 1:
+                    self.logger.warning(
+                        f"HTTP error {response.status_code} for {url} "
+                        f"(attempt {attempt + 1}/{self.scraper.max_retries})"
+                    )
+                else:
+                    return self._apply_cache(url, response)
+            except CircuitOpenError:
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if breaker is not None:
+                    breaker.record_exception()
+                if limiter is not None:
+                    if isinstance(e, asyncio.TimeoutError):
+                        limiter.record_throttle()
+                    else:
+                        limiter.record_error()
+                self.logger.warning(
+                    f"Request failed for {url}: {e!r} "
+                    f"(attempt {attempt + 1}/{self.scraper.max_retries})"
+                )
+
+            if attempt == self.scraper.max_retries - 1:
+                break
+            delay = self.scraper._retry_delay_for(attempt, response)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        # A final throttled response goes to make_request(), which decides
+        # about further retries against the same budget.
+        return response
+
+    @staticmethod
+    async def _wait_for_breaker(breaker) -> None:
+        """Non-blocking counterpart of CircuitBreaker.wait()."""
+        while True:
+            delay = breaker.admit()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _apply_cache(self, url: str, response: requests.Response) -> Optional[requests.Response]:
+        http_cache = self.scraper.http_cache
+        if http_cache is None:
+            return response
+        if response.status_code == 304:
+            cached = http_cache.response_from_cache(url, response)
+            if cached is not None:
+                cached.prefetch_url = url
+            return cached
+        http_cache.record_miss()
+        http_cache.store(url, response)
+        return response
+
+    @staticmethod
+    def _to_requests_response(url: str, resp: Any, body: bytes) -> requests.Response:
+        """Wrap an aiohttp response so scrapers can treat it like requests'."""
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.url = str(resp.url)
+        response.encoding = resp.charset
+        response._content = body
+        response._content_consumed = True
+        response.request = requests.Request("GET", url).prepare()
+        response.prefetch_url = url
+        return response
@@ -4,24 +4,176 @@ All individual scrapers should inherit from this class.
 """
 import csv
 import os
+import re
 import time
 import random
 import logging
+import multiprocessing
+import threading
 import requests
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Iterable, Iterator, List, Dict, Optional, Any, Set, Tuple, Union
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup   
 from logging.handlers import RotatingFileHandler
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from requests.adapters import HTTPAdapter
 
 from config import (
     DATA_DIR, LOGS_DIR, CSV_COLUMNS, REQUEST_TIMEOUT,
     MAX_RETRIES, RETRY_DELAY, MIN_DELAY, MAX_DELAY,
     USER_AGENTS, LOG_FORMAT, LOG_DATE_FORMAT,
-    MAX_LOG_SIZE, LOG_BACKUP_COUNT, LOG_LEVEL
+    MAX_LOG_SIZE, LOG_BACKUP_COUNT, LOG_LEVEL, SCRAPER_CONFIGS
 )
+from bulk_source import BulkSource, BulkSourceUnavailable
+from cassette import get_cassette, request_body
+from circuit_breaker import (
+    CircuitBreaker, CircuitOpenError,
+    clear_unvisited_urls, load_unvisited_urls, save_unvisited_urls,
+)
+from frontier import UrlFrontier, frontier_path
+from global_scheduler import GlobalScheduler, SchedulerLane
+from http_cache import HttpCache
+from json_ld import extract_product as extract_json_ld_product
+from memory_governor import get_memory_governor
+from parser_backends import build_document, resolve_backend
+from product_state import (
+    DEFAULT_FULL_REFRESH_DAYS,
+    DEFAULT_LISTING_REFRESH_DAYS,
+    DEFAULT_VOLATILE_DAYS,
+    ProductStateStore,
+    page_refresh_due,
+)
+from rate_limiter import AdaptiveRateLimiter, get_host_limiter, host_of
+from retry_policy import RetryBudget, backoff_delay, parse_retry_after
+from sharding import cached_discovery, parse_shard, select_shard, shard_of, shard_part_path
+from url_stream import UrlStream
+
+
+# Responses telling us to slow down (rate limiter backs off sharply).
+THROTTLE_STATUSES = {429, 503}
+
+# Charset sniffing for parse_response(): Content-Type header, then <meta charset>
+# / <meta http-equiv> within the first bytes of the document (as browsers do).
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([A-Za-z0-9_.:-]+)", re.I)
+META_SNIFF_BYTES = 4096
+
+# Attribute types that stay in the parent process when a scraper is pickled
+# for the extract process pool (sessions include cloudscraper instances).
+_PROCESS_LOCAL_TYPES = (
+    requests.Session, logging.Logger, threading.local,
+    type(threading.Lock()), type(threading.RLock()),
+)
+
+# Scraper copy used by extract worker processes (set by _init_extract_worker).
+_extract_scraper: Optional["BaseScraper"] = None
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean toggle such as SCRAPER_HTTP_CACHE=1 from the environment."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def net_price(price_gross: str) -> str:
+    """Net price for a German gross price string such as "1.234,56" (19% VAT)."""
+    if not price_gross:
+        return ""
+    try:
+        gross = float(price_gross.replace(".", "").replace(",", ".") if "," in price_gross else price_gross)
+    except ValueError:
+        return ""
+    return f"{gross / 1.19:.2f}".replace(".", ",")
+
+
+class DeadlineReached(Exception):
+    """A URL was not started because the run's deadline had passed."""
+
+
+class FetchFailed(Exception):
+    """Every attempt to download a URL failed on an error worth retrying later."""
+
+
+class RunTally:
+    """
+    Counters and CSV buffer for one run() call, shared by all execution engines.
+    """
+
+    def __init__(self, scraper: "BaseScraper", total: Optional[int], buffer_size: int):
+        self.scraper = scraper
+        self.total = total
+        self.buffer_size = buffer_size
+        self.success_count = 0
+        self.no_data_count = 0
+        self.processed_count = 0
+        self.output_buffer: List[Dict[str, Any]] = []
+        # Smaller CSV buffer when RSS nears PIPELINE_MEMORY_LIMIT_MB.
+        self.memory = get_memory_governor()
+        # URLs skipped because a circuit breaker tripped (saved for a later run).
+        self.unvisited: List[str] = []
+        # (url, error) results for the frontier, committed after their rows are written.
+        # Pages without data are done; only record_error() outcomes are retried.
+        self.outcomes: List[Tuple[str, Optional[str]]] = []
+
+    def record(self, url: str, product_data: Optional[Dict[str, Any]]) -> None:
+        """Count one finished URL and buffer its row."""
+        self.processed_count += 1
+        if self.processed_count % 100 == 0:
+            # total is None while URLs are still being discovered.
+            done = f"{self.processed_count}/{self.total}" if self.total is not None else self.processed_count
+            self.scraper.logger.info(f"Progress: {done} products processed")
+
+        if product_data:
+            if self.scraper.product_state is not None:
+                self.scraper.remember_product(url, product_data)
+            self.output_buffer.append(product_data)
+            self.success_count += 1
+        else:
+            self.no_data_count += 1
+            if self.no_data_count <= 20 or self.no_data_count % 500 == 0:
+                self.scraper.logger.warning(f"No data extracted from {url}")
+
+        if self.scraper.frontier is not None:
+            self.outcomes.append((url, None))
+        buffer_size = self.memory.scale(self.buffer_size)
+        if len(self.output_buffer) >= buffer_size or len(self.outcomes) >= buffer_size:
+            self.flush()
+
+    def record_error(self, url: str, error: Exception) -> None:
+        if isinstance(error, (CircuitOpenError, DeadlineReached)):
+            self.unvisited.append(url)
+            return
+        self.processed_count += 1
+        self.scraper.logger.error(f"Error processing {url}: {error}")
+        if self.scraper.frontier is not None:
+            self.outcomes.append((url, f"{type(error).__name__}: {error}"))
+
+    def flush(self) -> None:
+        if self.output_buffer:
+            self.scraper.save_products(self.output_buffer)
+            self.output_buffer = []
+        # Only now are the rows on disk: a resumed run must not skip them.
+        if self.outcomes:
+            self.scraper.frontier.complete(self.outcomes)
+            self.outcomes = []
+
+
+def _init_extract_worker(scraper: "BaseScraper") -> None:
+    """Process pool initializer: keep one unpickled scraper per worker."""
+    global _extract_scraper
+    _extract_scraper = scraper
+
+
+def _extract_in_worker(url: str, response: requests.Response) -> Optional[Dict[str, Any]]:
+    """Run the scraper's extract_product() inside an extract worker process."""
+    try:
+        return _extract_scraper.extract_product(url, response)
+    except Exception as e:
+        _extract_scraper.logger.error(f"Error extracting {url}: {e}")
+        return None
 
 
 class BaseScraper(ABC):
@@ -39,9 +191,19 @@ class BaseScraper(ABC):
     To create a new scraper:
     1. Inherit from this class
     2. Implement get_product_urls() method
-    3. Implement scrape_product() method
+    3. Implement extract_product() (or override scrape_product() as a whole)
     4. Optionally override other methods for custom behavior
     """
+
+    # Whether the async engine may download pages with its own HTTP client.
+    # Scrapers that depend on cloudscraper cookies/TLS fingerprints set this to False.
+    async_fetch_supported = True
+
+    # Listing extraction: CSV columns a category tile must fill for its row to
+    # be written without the product page, and the columns a tile must fill
+    # on its own when no product page of the URL has been stored yet.
+    listing_fresh_columns = ("Preis_Brutto",)
+    listing_required_columns = ("Name", "Preis_Brutto", "Hersteller", "EAN")
     
     def __init__(self, scraper_name: str):
         """
@@ -62,6 +224,23 @@ class BaseScraper(ABC):
         if self.scrape_max_delay < self.scrape_min_delay:
             self.scrape_min_delay, self.scrape_max_delay = self.scrape_max_delay, self.scrape_min_delay
 
+        # Per-host adaptive rate limiting replaces the fixed random sleep per product.
+        # SCRAPER_ADAPTIVE_RATE=0 restores the SCRAPER_MIN_DELAY..SCRAPER_MAX_DELAY sleep.
+        self.adaptive_rate = env_flag("SCRAPER_ADAPTIVE_RATE", True)
+        self.delay_override = SCRAPER_CONFIGS.get(scraper_name, {}).get("delay_override")
+        self._rate_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+        # Retries back off exponentially (honouring Retry-After) and share one
+        # per-run budget (SCRAPER_RETRY_BUDGET, fraction of requests sent).
+        self.retry_backoff_max = float(os.getenv("SCRAPER_RETRY_BACKOFF_MAX", 60))
+        self.retry_after_max = float(os.getenv("SCRAPER_RETRY_AFTER_MAX", 120))
+        self.retry_budget = RetryBudget.from_env()
+
+        # Per-host circuit breaker for 403/429 storms (SCRAPER_CIRCUIT_BREAKER=0 disables).
+        self.circuit_breaker_enabled = env_flag("SCRAPER_CIRCUIT_BREAKER", True)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
         pool_connections = max(int(os.getenv("SCRAPER_HTTP_POOL_CONNECTIONS", "100")), 10)
         pool_maxsize = max(int(os.getenv("SCRAPER_HTTP_POOL_MAXSIZE", "100")), 10)
         adapter = HTTPAdapter(
@@ -72,15 +251,120 @@ class BaseScraper(ABC):
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
-        self.output_file = DATA_DIR / f"{scraper_name}.csv"
+        # Responses handed over by the async engine, consumed by _send_request.
+        self._prefetch_local = threading.local()
+        # Per-thread flag set when make_request() gives up (see _fetch_failed).
+        self._request_local = threading.local()
+
+        # Opt-in conditional-GET cache (ETag / Last-Modified) shared by all request paths.
+        self.http_cache = HttpCache(scraper_name) if env_flag("SCRAPER_HTTP_CACHE") else None
+        # HTML parser backend: html.parser (default), lxml or selectolax (SCRAPER_PARSER).
+        self.parser_backend = resolve_backend()
+        # Encoding seen on earlier pages of each host, used when a page declares none.
+        self._host_encodings: Dict[str, str] = {}
+        # Record/replay of all HTTP traffic for offline benchmarks (SCRAPER_CASSETTE=path).
+        self.cassette = get_cassette(scraper_name)
+        # Worker processes for extract_product(); 0 keeps parsing on the fetch threads.
+        self.parse_processes = max(int(os.getenv("SCRAPER_PARSE_PROCESSES", "0")), 0)
+
+        # Incremental runs (SCRAPER_INCREMENTAL=1) only scrape URLs whose sitemap
+        # lastmod changed and carry the other rows over from the product state;
+        # every SCRAPER_FULL_REFRESH_DAYS everything is scraped again.
+        self.incremental = env_flag("SCRAPER_INCREMENTAL")
+        self.full_refresh_days = float(
+            os.getenv("SCRAPER_FULL_REFRESH_DAYS", DEFAULT_FULL_REFRESH_DAYS)
+        )
+        # Sitemap lastmod per product URL, filled by get_product_urls().
+        self.url_lastmods: Dict[str, str] = {}
+        self.product_state: Optional[ProductStateStore] = None
+
+        # Listing extraction (SCRAPER_LISTING_EXTRACT=1): category tiles give the
+        # current price, the product state the remaining fields; product pages
+        # are fetched only for missing fields and every SCRAPER_LISTING_REFRESH_DAYS.
+        self.listing_extract = env_flag("SCRAPER_LISTING_EXTRACT")
+        self.listing_refresh_days = float(
+            os.getenv("SCRAPER_LISTING_REFRESH_DAYS", DEFAULT_LISTING_REFRESH_DAYS)
+        )
+        # Partial product records per URL, filled by record_listing().
+        self.listing_records: Dict[str, Dict[str, Any]] = {}
+
+        # Bulk sources (SCRAPER_BULK_SOURCE=1): scrapers with a JSON catalogue
+        # endpoint (bulk_source()) write its records instead of scraping the
+        # product pages; HTML scraping covers whatever the endpoint did not.
+        # Fields the endpoint lacks come from stored pages, which are
+        # re-fetched every SCRAPER_LISTING_REFRESH_DAYS like listing rows.
+        self.use_bulk_source = env_flag("SCRAPER_BULK_SOURCE")
+
+        # Resumable runs (SCRAPER_FRONTIER=1): URL states live in a SQLite
+        # frontier, so a killed run continues where it stopped.
+        self.use_frontier = env_flag("SCRAPER_FRONTIER")
+        self.frontier: Optional[UrlFrontier] = None
+        # Scrape product URLs while discovery is still running (SCRAPER_STREAM_DISCOVERY=0
+        # waits for the complete list).
+        self.stream_discovery = env_flag("SCRAPER_STREAM_DISCOVERY", True)
+        # GlobalScheduler shared with other scrapers (PIPELINE_SCHEDULER=global);
+        # when set, the thread and pipeline engines run their downloads on a
+        # lane of its pool instead of a pool of their own.
+        self.scheduler: Optional[GlobalScheduler] = None
+        # Wall-clock deadline of the current run (run(deadline=...) or
+        # SCRAPER_TIME_BUDGET_MINUTES): URLs are ranked by value, and once it
+        # passes no new URL starts; the rest are saved for the next run.
+        self.deadline: Optional[float] = None
+        self.volatile_days = float(os.getenv("SCRAPER_VOLATILE_DAYS", DEFAULT_VOLATILE_DAYS))
+
+        # Sharded runs (SCRAPER_SHARD=i/N) scrape a hash slice of the URLs into a
+        # part file; frontier and unvisited list are kept per shard.
+        self.shard = parse_shard(os.getenv("SCRAPER_SHARD"))
+        if self.shard is None:
+            self.run_name = scraper_name
+            self.output_file = DATA_DIR / f"{scraper_name}.csv"
+        else:
+            self.run_name = f"{scraper_name}.shard-{self.shard[0]}-of-{self.shard[1]}"
+            self.output_file = shard_part_path(scraper_name, *self.shard)
+            self.output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Setup logging
+        # Setup logging (the directory is kept so extract workers log to the same place)
+        self.logs_dir = LOGS_DIR
         self.logger = self._setup_logging()
         
-        # Initialize CSV file with headers
-        self._initialize_csv()
+        # Initialize CSV file with headers, unless a resumable run appends to it
+        self._csv_kept = self.use_frontier and self.output_file.exists() and self._frontier_resumable()
+        if not self._csv_kept:
+            self._initialize_csv()
         
         self.logger.info(f"Initialized {scraper_name} scraper")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        State sent to extract worker processes. Sessions, locks, loggers and
+        the per-run network helpers stay behind; extract_product() only needs
+        the configuration and the parsing helpers.
+        """
+        state = {
+            key: (None if isinstance(value, _PROCESS_LOCAL_TYPES) else value)
+            for key, value in self.__dict__.items()
+        }
+        state.update(
+            cassette=None,
+            http_cache=None,
+            retry_budget=None,
+            product_state=None,
+            frontier=None,
+            scheduler=None,
+            url_lastmods={},
+            listing_records={},
+            _rate_limiters={},
+            _breakers={},
+        )
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.logger = self._setup_logging()
+        self._prefetch_local = threading.local()
+        self._request_local = threading.local()
+        self._breakers_lock = threading.Lock()
+        self.retry_budget = RetryBudget.from_env()
     
     def _setup_logging(self) -> logging.Logger:
         """
@@ -97,7 +381,7 @@ class BaseScraper(ABC):
             return logger
         
         # File handler with rotation
-        log_file = LOGS_DIR / f"{self.scraper_name}.log"
+        log_file = Path(self.logs_dir) / f"{self.scraper_name}.log"
         file_handler = RotatingFileHandler(
             log_file,
             maxBytes=MAX_LOG_SIZE,
@@ -129,6 +413,41 @@ class BaseScraper(ABC):
             self.logger.error(f"Failed to initialize CSV: {e}")
             raise
     
+    def reset_for_next_run(self) -> None:
+        """
+        Prepare an instance kept between runs (scheduler_daemon.py) for another run().
+
+        Starts a new CSV, unless a frontier run is resumed, and drops the
+        per-run discovery records. Sessions, cookies and rate limiters stay warm.
+        """
+        self.url_lastmods = {}
+        self.listing_records = {}
+        self._csv_kept = self.use_frontier and self.output_file.exists() and self._frontier_resumable()
+        if not self._csv_kept:
+            self._initialize_csv()
+
+    def warm_up(self) -> int:
+        """
+        Discover the product URLs into the discovery cache ahead of a scheduled run.
+
+        Only useful with SCRAPER_DISCOVERY_CACHE=1 (the scheduler daemon sets
+        it): the run then starts scraping straight away.
+
+        Returns:
+            Number of product URLs discovered
+        """
+        return len(self._discover_product_urls())
+
+    def _frontier_resumable(self) -> bool:
+        """Whether an earlier run left URLs in the frontier to resume."""
+        if not frontier_path(self.run_name).exists():
+            return False
+        frontier = UrlFrontier.from_env(self.run_name)
+        try:
+            return frontier.resumable()
+        finally:
+            frontier.close()
+
     def _get_random_user_agent(self) -> str:
         """Get a random user agent from the pool."""
         return random.choice(USER_AGENTS)
@@ -164,7 +483,8 @@ class BaseScraper(ABC):
         
         for attempt in range(self.max_retries):
             try:
-                response = self.session.request(
+                response = self._send_request(
+                    self.session,
                     method,
                     url,
                     headers=headers,
@@ -186,36 +506,349 @@ class BaseScraper(ABC):
                 # Don't retry on 404 or 403
                 if e.response.status_code in [404, 403]:
                     return None
+                failed_response = e.response
                     
             except requests.exceptions.Timeout:
                 self.logger.warning(
                     f"Timeout for {url} (attempt {attempt + 1}/{self.max_retries})"
                 )
+                failed_response = None
+
+            except CircuitOpenError as e:
+                self.logger.debug(f"Skipping {url}: {e}")
+                return None
                 
             except requests.exceptions.RequestException as e:
                 self.logger.warning(
                     f"Request failed for {url}: {e} "
                     f"(attempt {attempt + 1}/{self.max_retries})"
                 )
+                failed_response = None
             
             # Wait before retrying
             if attempt < self.max_retries - 1:
-                time.sleep(self.retry_delay)
+                if not self._backoff_before_retry(attempt, failed_response):
+                    break
         
-        self.logger.error(f"Failed to fetch {url} after {self.max_retries} attempts")
+        self.logger.error(f"Failed to fetch {url} after {attempt + 1} attempts")
+        self._fetch_failed(url)
         return None
+
+    def _fetch_failed(self, url: str, error: Optional[Exception] = None) -> None:
+        """
+        Note that a request gave up on an error worth retrying in a later
+        attempt (timeouts, connection errors, 5xx, blocks), so the URL is
+        reported as failed rather than as a page without data. A 404 or 410
+        is a page without data.
+
+        make_request() overrides call this where they give up.
+        """
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code in (404, 410):
+            return
+        self._request_local.failed = True
+
+    def _retry_delay_for(
+        self,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        base_delay: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Spend one retry from the run's budget and compute the backoff.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            response: Failed response, used for its Retry-After header
+            base_delay: First-retry delay (defaults to SCRAPER_RETRY_DELAY)
+
+        Returns:
+            Seconds to wait, or None when the retry budget is used up
+        """
+        if self.stop_requested:
+            return None
+        if not self.retry_budget.try_spend():
+            if self.retry_budget.denied == 1:
+                self.logger.warning(
+                    f"Retry budget exhausted ({self.retry_budget.retries} retries); "
+                    f"failing fast for the rest of the run"
+                )
+            return None
+
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                retry_after = min(retry_after, self.retry_after_max)
+
+        delay = backoff_delay(
+            attempt,
+            self.retry_delay if base_delay is None else base_delay,
+            max_delay=self.retry_backoff_max,
+            retry_after=retry_after,
+        )
+        self.retry_budget.record_backoff(delay)
+        return delay
+
+    def _backoff_before_retry(
+        self,
+        attempt: int,
+        response: Optional[requests.Response] = None,
+        base_delay: Optional[float] = None,
+    ) -> bool:
+        """
+        Sleep before the next attempt.
+
+        Returns:
+            False if the retry budget is used up and the caller should give up
+        """
+        delay = self._retry_delay_for(attempt, response, base_delay)
+        if delay is None:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _send_request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send one HTTP request through the given session.
+
+        Every request path (the requests session here and the cloudscraper
+        overrides in subclasses) goes through this method, so cassette
+        record/replay, conditional-GET caching, the circuit breaker and
+        per-host rate limiting apply to all of them.
+
+        Args:
+            session: requests.Session or cloudscraper instance to send with
+            method: HTTP method
+            url: URL to request
+            **kwargs: Additional arguments for session.request
+
+        Returns:
+            Response object (a 304 is returned as the cached 200 response)
+        """
+        prefetched = getattr(self._prefetch_local, "response", None)
+        if prefetched is not None and method.upper() == "GET" and prefetched.prefetch_url == url:
+            self._prefetch_local.response = None
+            return prefetched
+
+        body = request_body(**kwargs) if self.cassette is not None else b""
+        if self.cassette is not None and self.cassette.replaying:
+            response, latency = self.cassette.replay(method, url, body)
+            if latency:
+                time.sleep(latency)
+            return response
+
+        started = time.monotonic()
+        response = self._send_live_request(session, method, url, **kwargs)
+        if self.cassette is not None:
+            self.cassette.record(method, url, response, time.monotonic() - started, body)
+        return response
+
+    def _send_live_request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> requests.Response:
+        """Network path of _send_request: HTTP cache, breaker and rate limiter."""
+        self.retry_budget.record_request()
+        use_cache = (
+            self.http_cache is not None
+            and method.upper() == "GET"
+            and not kwargs.get("stream")
+        )
+        if use_cache:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(self.http_cache.conditional_headers(url))
+            kwargs["headers"] = headers
+
+        response = self._guarded_request(session, method, url, **kwargs)
+
+        if use_cache:
+            if response.status_code == 304:
+                cached = self.http_cache.response_from_cache(url, response)
+                if cached is not None:
+                    self.logger.debug(f"Not modified, served from cache: {url}")
+                    return cached
+                # Cache entry vanished between the two reads; fetch unconditionally.
+                for name in ("If-None-Match", "If-Modified-Since"):
+                    kwargs["headers"].pop(name, None)
+                response = self._guarded_request(session, method, url, **kwargs)
+            self.http_cache.record_miss()
+            self.http_cache.store(url, response)
+
+        return response
     
+    def _get_circuit_breaker(self, url: str) -> Optional[CircuitBreaker]:
+        """Return this run's breaker for the URL's host (None when disabled)."""
+        if not self.circuit_breaker_enabled:
+            return None
+        host = host_of(url)
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker.from_env(host)
+                self._breakers[host] = breaker
+            return breaker
+
+    @property
+    def circuit_tripped(self) -> bool:
+        """True once any host stayed blocked past the breaker deadline."""
+        return any(breaker.tripped for breaker in list(self._breakers.values()))
+
+    @property
+    def out_of_time(self) -> bool:
+        """True once the run's deadline has passed."""
+        return self.deadline is not None and time.time() >= self.deadline
+
+    @property
+    def stop_requested(self) -> bool:
+        """True when no new URL should start: a host is blocked for good or the deadline passed."""
+        return self.circuit_tripped or self.out_of_time
+
+    def _guarded_request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> requests.Response:
+        """Send one request through the host's circuit breaker and rate limiter."""
+        breaker = self._get_circuit_breaker(url)
+        if breaker is None:
+            return self._rate_limited_request(session, method, url, **kwargs)
+
+        breaker.wait()
+        try:
+            response = self._rate_limited_request(session, method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record_exception()
+            raise
+        breaker.record_status(response.status_code)
+        return response
+
+    def _get_rate_limiter(self, url: str) -> Optional[AdaptiveRateLimiter]:
+        """Return the shared limiter for the URL's host (None when disabled)."""
+        if not self.adaptive_rate:
+            return None
+        limiter = get_host_limiter(url, delay_override=self.delay_override)
+        self._rate_limiters[limiter.host] = limiter
+        return limiter
+
+    def _rate_limited_request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Wait for the host's token bucket, send the request and feed the
+        outcome back into the limiter (AIMD).
+        """
+        limiter = self._get_rate_limiter(url)
+        if limiter is None:
+            return session.request(method, url, **kwargs)
+
+        limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            limiter.record_throttle()
+            raise
+        except requests.exceptions.RequestException:
+            limiter.record_error()
+            raise
+
+        self._record_rate_outcome(limiter, response.status_code, time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _record_rate_outcome(limiter: AdaptiveRateLimiter, status_code: int, latency: float) -> None:
+        """Classify one response for the limiter's AIMD adjustment."""
+        if status_code in THROTTLE_STATUSES:
+            limiter.record_throttle()
+        elif status_code >= 500:
+            limiter.record_error()
+        else:
+            limiter.record_success(latency)
+
     def parse_html(self, html: str) -> BeautifulSoup:
         """
-        Parse HTML content with BeautifulSoup.
+        Parse HTML content with the configured parser backend.
         
         Args:
             html: HTML string to parse
         
         Returns:
-            BeautifulSoup object
+            BeautifulSoup object (or its selectolax adapter)
+        """
+        return build_document(html, self.parser_backend)
+
+    def parse_response(self, response: requests.Response, parser: Optional[str] = None) -> BeautifulSoup:
+        """
+        Parse a response from its raw bytes instead of response.text.
+
+        The encoding comes from the Content-Type header, then <meta charset>,
+        then the encoding earlier pages of the same host used. This skips
+        requests' charset detection over the whole body. The encoding is also
+        set on the response, so later response.text calls are cheap.
+
+        Args:
+            response: Response to parse
+            parser: Parser override such as "xml"; defaults to SCRAPER_PARSER
+
+        Returns:
+            BeautifulSoup object (or its selectolax adapter)
+        """
+        encoding, declared = self._response_encoding(response)
+        soup = build_document(response.content, parser or self.parser_backend, from_encoding=encoding)
+
+        used = getattr(soup, "original_encoding", None) or encoding
+        if used:
+            response.encoding = used
+            host = host_of(response.url or "")
+            if host and (declared or host not in self._host_encodings):
+                self._host_encodings[host] = used
+        return soup
+
+    def extract_json_ld(self, response: requests.Response, **kwargs) -> Dict[str, str]:
+        """
+        Canonical Product fields from the page's JSON-LD, without building a DOM.
+
+        Args:
+            response: Product page response
+            **kwargs: Key order overrides for json_ld.product_fields()
+
+        Returns:
+            Dict with json_ld.PRODUCT_FIELDS ("" where JSON-LD has no value)
+        """
+        encoding, _ = self._response_encoding(response)
+        return extract_json_ld_product(response.content, encoding, **kwargs)
+
+    def _response_encoding(self, response: requests.Response):
+        """
+        Returns:
+            (encoding or None, True if the page declared it itself)
         """
-        return BeautifulSoup(html, 'html.parser')
+        match = _HEADER_CHARSET_RE.search(response.headers.get("Content-Type", ""))
+        if match:
+            return match.group(1).lower(), True
+
+        match = _META_CHARSET_RE.search(response.content[:META_SNIFF_BYTES])
+        if match:
+            return match.group(1).decode("ascii").lower(), True
+
+        host = host_of(response.url or "")
+        return self._host_encodings.get(host), False
     
     def _map_product_row(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -245,6 +878,225 @@ class BaseScraper(ABC):
         # Keep strict column order and include any future columns as empty by default.
         return {col: row.get(col, "") for col in CSV_COLUMNS}
 
+    def record_lastmod(self, url: str, lastmod: str) -> None:
+        """
+        Remember the sitemap lastmod of a product URL (used by incremental runs).
+
+        Args:
+            url: Product URL exactly as returned by get_product_urls()
+            lastmod: <lastmod> from the sitemap; empty values are ignored
+        """
+        if lastmod:
+            self.url_lastmods[url] = lastmod
+
+    def record_listing(self, url: str, fields: Dict[str, Any]) -> None:
+        """
+        Remember what a category tile shows of a product (listing extraction).
+
+        Args:
+            url: Product URL exactly as returned by get_product_urls()
+            fields: Product fields with the keys extract_product() uses
+        """
+        self.listing_records[url] = fields
+
+    def remember_product(self, url: str, product_data: Dict[str, Any]) -> None:
+        """Store a successful extraction in the product state."""
+        try:
+            self.product_state.save(url, self.url_lastmods.get(url, ""), product_data)
+        except Exception as e:
+            self.logger.warning(f"Could not update product state for {url}: {e}")
+
+    def _rank_by_value(self, product_urls: List[str]) -> List[str]:
+        """
+        Order the URLs of a run with a deadline so the valuable ones are scraped first:
+        never-seen products, then recent price changes, then the least recently scraped.
+        """
+        ranked, counts = self.product_state.rank(product_urls, self.volatile_days)
+        remaining = max(self.deadline - time.time(), 0)
+        self.logger.info(
+            f"Deadline in {remaining / 60:.1f} min: scraping {counts['new']} new, "
+            f"{counts['volatile']} price-volatile (last {self.volatile_days:g} days), "
+            f"then {counts['rest']} other products, least recently scraped first"
+        )
+        return ranked
+
+    def _carry_forward_unchanged(self, product_urls: List[str], buffer_size: int) -> Tuple[List[str], int]:
+        """
+        Write the stored rows of products whose lastmod is unchanged to the CSV.
+
+        Args:
+            product_urls: URLs this run would scrape
+            buffer_size: Rows written per CSV append
+
+        Returns:
+            (URLs that still need scraping, number of rows carried forward)
+        """
+        to_scrape, unchanged = self.product_state.split(product_urls, self.url_lastmods)
+        carried = 0
+        batch: List[Dict[str, Any]] = []
+        for product_data in self.product_state.iter_products(unchanged):
+            batch.append(product_data)
+            if len(batch) >= buffer_size:
+                self.save_products(batch)
+                carried += len(batch)
+                batch = []
+        self.save_products(batch)
+        carried += len(batch)
+        self.logger.info(
+            f"Incremental run: {len(to_scrape)} new or changed URLs, "
+            f"{carried} unchanged products carried forward"
+        )
+        return to_scrape, carried
+
+    def bulk_source(self) -> Optional[BulkSource]:
+        """
+        JSON catalogue source of the shop (see bulk_source.py), or None to
+        scrape product pages only. Override in scrapers whose shop system has one.
+        """
+        return None
+
+    def _write_bulk_products(
+        self, max_products: Optional[int], buffer_size: int
+    ) -> Tuple[int, Set[str], bool]:
+        """
+        Write the records of the bulk source to the CSV.
+
+        Args:
+            max_products: Stop after this many products (None for all)
+            buffer_size: Rows written per CSV append
+
+        Returns:
+            (rows written, their product URLs, whether the source covered the
+            whole run so that no product pages need scraping)
+        """
+        source = self.bulk_source()
+        if source is None:
+            self.logger.info(f"{self.scraper_name} has no bulk source; scraping product pages")
+            return 0, set(), False
+
+        if source.missing_fields and self.product_state is None:
+            # Fields the source cannot supply come from stored product pages;
+            # the pages scraped this run are stored for the next one.
+            self.product_state = ProductStateStore(self.scraper_name)
+        written: Set[str] = set()
+        deferred: Set[str] = set()
+        batch: List[Dict[str, Any]] = []
+        complete = False
+        try:
+            for product_data in source.iter_products():
+                url = product_data["product_url"]
+                if url in written or url in deferred:
+                    continue
+                if self.shard is not None and shard_of(url, self.shard[1]) != self.shard[0]:
+                    continue
+                if source.missing_fields:
+                    product_data = self._complete_bulk_record(product_data, source.missing_fields)
+                    if product_data is None:
+                        deferred.add(url)
+                        continue
+                written.add(url)
+                batch.append(product_data)
+                if len(batch) >= buffer_size:
+                    self.save_products(batch)
+                    batch = []
+                if max_products and len(written) >= max_products:
+                    break
+            complete = bool(written) and not deferred
+        except BulkSourceUnavailable as e:
+            self.logger.warning(f"{e}; scraping product pages instead")
+        self.save_products(batch)
+        self.logger.info(source.summary())
+        if deferred:
+            self.logger.info(
+                f"{len(deferred)} products have no stored {'/'.join(source.missing_fields)} "
+                f"(or are due for a refresh); scraping their product pages"
+            )
+        return len(written), written, complete
+
+    def _complete_bulk_record(
+        self, product_data: Dict[str, Any], fields: Tuple[str, ...]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fill the fields a bulk source cannot supply from the stored product page.
+
+        Args:
+            product_data: Record from the bulk source
+            fields: The source's missing_fields
+
+        Returns:
+            The completed record, or None when the product page has to be
+            scraped (never stored, or due for a refresh like listing rows)
+        """
+        url = product_data["product_url"]
+        stored = self.product_state.stored(url)
+        if stored is None:
+            return None
+        stored_data, scraped_at = stored
+        if page_refresh_due(url, scraped_at, self.listing_refresh_days):
+            return None
+        completed = dict(product_data)
+        for field in fields:
+            if not completed.get(field):
+                completed[field] = stored_data.get(field, "")
+        return completed
+
+    def _listing_row(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        CSV row for a URL built from its category tile and the stored product
+        page, or None when the product page has to be fetched.
+        """
+        fields = self.listing_records.get(url)
+        if not fields:
+            return None
+        tile = self._map_product_row(fields)
+        if not all(tile[col] for col in self.listing_fresh_columns):
+            return None
+
+        stored = self.product_state.stored(url)
+        if stored is None:
+            return tile if all(tile[col] for col in self.listing_required_columns) else None
+        product_data, scraped_at = stored
+        if page_refresh_due(url, scraped_at, self.listing_refresh_days):
+            return None
+
+        row = self._map_product_row(product_data)
+        row.update((col, value) for col, value in tile.items() if value)
+        if tile["Preis_Brutto"] and not tile["Preis_Netto"]:
+            row["Preis_Netto"] = net_price(tile["Preis_Brutto"])
+        return row
+
+    def _fill_from_listings(self, product_urls: List[str], buffer_size: int) -> Tuple[List[str], int]:
+        """
+        Write the rows category tiles complete to the CSV (listing extraction).
+
+        Args:
+            product_urls: URLs this run would scrape
+            buffer_size: Rows written per CSV append
+
+        Returns:
+            (URLs whose product page still has to be fetched, rows written)
+        """
+        to_scrape = []
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for url in product_urls:
+            row = self._listing_row(url)
+            if row is None:
+                to_scrape.append(url)
+                continue
+            batch.append(row)
+            if len(batch) >= buffer_size:
+                self.save_products(batch)
+                written += len(batch)
+                batch = []
+        self.save_products(batch)
+        written += len(batch)
+        self.logger.info(
+            f"Listing extraction: {written} rows from category tiles, "
+            f"{len(to_scrape)} product pages to fetch"
+        )
+        return to_scrape, written
+
     def save_product(self, product_data: Dict[str, Any]) -> None:
         """
         Save one product row.
@@ -283,12 +1135,101 @@ class BaseScraper(ABC):
         """
         pass
     
-    @abstractmethod
+    def iter_product_urls(self) -> Iterator[str]:
+        """
+        Yield product URLs as they are discovered.
+
+        The default adapts get_product_urls(); scrapers whose discovery takes
+        long (category crawls, many sitemaps) override this with a generator
+        and implement get_product_urls() as list(self.iter_product_urls()).
+        Duplicates and max_products are handled by run().
+        """
+        yield from self.get_product_urls()
+
+    def _needs_url_list(self) -> bool:
+        """Frontier, incremental runs, listing extraction, sharding and deadlines work on the complete URL list."""
+        return (
+            self.use_frontier
+            or self.incremental
+            or self.listing_extract
+            or self.deadline is not None
+            or self.shard is not None
+            or env_flag("SCRAPER_DISCOVERY_CACHE")
+        )
+
+    def _discover_product_urls(self) -> List[str]:
+        """
+        get_product_urls() through the discovery cache and the shard filter.
+
+        Sharded runs (and SCRAPER_DISCOVERY_CACHE=1) share one cached URL
+        list, so the shop is crawled once for all shards. Lastmods and
+        category tile fields (listing extraction) are cached with the URLs:
+        runs that read the cache, or a daemon run after a prewarm, have
+        them without crawling.
+        """
+        if self.shard is None and not env_flag("SCRAPER_DISCOVERY_CACHE"):
+            return self.get_product_urls()
+
+        def discover() -> List[tuple]:
+            entries = []
+            for url in self.get_product_urls():
+                entry = (url, self.url_lastmods.get(url, ""))
+                if url in self.listing_records:
+                    entry += (self.listing_records[url],)
+                entries.append(entry)
+            return entries
+
+        entries = cached_discovery(self.scraper_name, discover, logger=self.logger)
+        for url, lastmod, *listing in entries:
+            self.record_lastmod(url, lastmod)
+            if listing and listing[0]:
+                self.record_listing(url, listing[0])
+        product_urls = [entry[0] for entry in entries]
+        if self.shard is not None:
+            index, count = self.shard
+            product_urls = select_shard(product_urls, index, count)
+            self.logger.info(f"Shard {index}/{count}: {len(product_urls)} of {len(entries)} product URLs")
+        return product_urls
+
+    def fetch_product(self, url: str) -> Optional[requests.Response]:
+        """
+        Download a product page (the I/O half of scrape_product()).
+
+        Args:
+            url: Product page URL
+
+        Returns:
+            Response object if successful, None otherwise
+        """
+        return self.make_request(url)
+
+    def extract_product(self, url: str, response: requests.Response) -> Optional[Dict[str, Any]]:
+        """
+        Extract product data from a downloaded page (the CPU half of scrape_product()).
+
+        Must not make HTTP requests: with SCRAPER_PARSE_PROCESSES it runs in a
+        worker process without sessions.
+
+        Args:
+            url: Product page URL
+            response: Response returned by fetch_product()
+
+        Returns:
+            Product data dictionary (see scrape_product()), or None
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement extract_product()")
+
+    @property
+    def extract_supported(self) -> bool:
+        """Whether the scraper is split into fetch_product() / extract_product()."""
+        return type(self).extract_product is not BaseScraper.extract_product
+
     def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Scrape a single product page.
         
-        This method MUST be implemented by each scraper.
+        Scrapers either implement extract_product() (and, if needed,
+        fetch_product()) or override this method as a whole.
         
         Args:
             url: Product page URL
@@ -308,136 +1249,488 @@ class BaseScraper(ABC):
             
             Return None if scraping fails.
         """
-        pass
+        response = self.fetch_product(url)
+        if not response:
+            return None
+        return self.extract_product(url, response)
     
-    def run(self, max_products: Optional[int] = None, concurrent_workers: int = 10) -> int:
+    def run(
+        self,
+        max_products: Optional[int] = None,
+        concurrent_workers: int = 10,
+        engine: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> int:
         """
         Main execution method - runs the complete scraping process.
         
         Args:
             max_products: Maximum number of products to scrape (None for all)
             concurrent_workers: Number of concurrent threads for scraping (default: 10)
+            engine: "thread" (default) or "async"; falls back to SCRAPER_ENGINE
+            deadline: Unix time by which scraping stops; URLs not started by
+                then are saved for the next run (default: start plus
+                SCRAPER_TIME_BUDGET_MINUTES, or no deadline)
         
         Returns:
-            Number of products successfully scraped
+            Number of products written to the CSV (scraped, plus carried
+            forward from the product state or written by the bulk source)
         """
         self.logger.info(f"Starting {self.scraper_name} scraper")
         start_time = time.time()
+        engine = (engine or os.getenv("SCRAPER_ENGINE") or "thread").strip().lower()
+        memory = get_memory_governor()
+        discovery_stage = f"{self.run_name}: discovery"
+        scraping_stage = f"{self.run_name}: scraping"
+        memory.begin(discovery_stage)
+        if deadline is None and os.getenv("SCRAPER_TIME_BUDGET_MINUTES"):
+            deadline = start_time + float(os.getenv("SCRAPER_TIME_BUDGET_MINUTES")) * 60
+        self.deadline = deadline
+        self.retry_budget = RetryBudget.from_env()
+        self._breakers = {}
+        url_stream = None
         
         try:
-            # Get product URLs
-            self.logger.info("Fetching product URLs...")
-            product_urls = self.get_product_urls()
-            
-            # Limit products if specified
-            if max_products and max_products < len(product_urls):
-                product_urls = product_urls[:max_products]
-                self.logger.info(f"Limited to first {max_products} products")
-            
-            self.logger.info(f"Found {len(product_urls)} products to scrape")
-            
-            if not product_urls:
-                self.logger.warning("No product URLs found")
-                return 0
-            
-            # Scrape products concurrently with bounded in-flight futures.
-            # This avoids creating one Future per URL (large memory spike).
-            success_count = 0
-            no_data_count = 0
-            processed_count = 0
-            total_products = len(product_urls)
-            max_in_flight = max(concurrent_workers * 4, concurrent_workers)
             csv_buffer_size = max(int(os.getenv("SCRAPER_CSV_BUFFER_SIZE", "250")), 1)
-            output_buffer: List[Dict[str, Any]] = []
+            carried_leftover: List[str] = []
+            carried_forward = 0
+            full_refresh = False
+            bulk_written = 0
+            bulk_urls: Set[str] = set()
+            bulk_complete = False
 
-            with ThreadPoolExecutor(max_workers=concurrent_workers) as executor:
-                url_iter = iter(product_urls)
-                future_to_url = {}
+            if self.use_frontier:
+                self.frontier = UrlFrontier.from_env(self.run_name)
+            resume = self.frontier is not None and self.frontier.resumable()
 
-                # Prime queue
-                for _ in range(max_in_flight):
-                    try:
-                        url = next(url_iter)
-                    except StopIteration:
-                        break
-                    future_to_url[executor.submit(self._scrape_with_retry, url)] = url
+            if self.use_bulk_source and not resume:
+                bulk_written, bulk_urls, bulk_complete = self._write_bulk_products(
+                    max_products, csv_buffer_size
+                )
+                if max_products and not bulk_complete:
+                    max_products -= bulk_written
 
-                while future_to_url:
-                    # Process all currently completed futures in one shot, then refill queue.
-                    done, _ = wait(
-                        set(future_to_url.keys()),
-                        return_when=FIRST_COMPLETED,
-                    )
+            if resume:
+                recovered = self.frontier.recover()
+                self.logger.info(
+                    f"Resuming the previous run: {self.frontier.remaining()} URLs left "
+                    f"({recovered} were in flight), appending to {self.output_file}"
+                )
+            elif bulk_complete:
+                product_urls = []
+                if self.frontier is not None:
+                    self.frontier.start(product_urls)
+            elif self.stream_discovery and not self._needs_url_list():
+                # URLs an earlier run could not visit (circuit breaker) go first.
+                carried_urls = load_unvisited_urls(self.run_name)
+                if carried_urls:
+                    self.logger.info(f"Retrying {len(carried_urls)} URLs left unvisited by the last run")
+                carried_leftover = carried_urls[max_products:] if max_products else []
+                self.logger.info("Scraping product URLs as they are discovered...")
+                source = self.iter_product_urls()
+                if bulk_urls:
+                    source = (url for url in source if url not in bulk_urls)
+                url_stream = UrlStream(
+                    source,
+                    first=carried_urls,
+                    limit=max_products,
+                    logger=self.logger,
+                )
+                product_urls = url_stream
+            else:
+                if self._csv_kept:
+                    self._initialize_csv()
+                    self._csv_kept = False
 
-                    for future in done:
-                        url = future_to_url.pop(future)
-                        processed_count += 1
+                # Get product URLs
+                self.logger.info("Fetching product URLs...")
+                product_urls = self._discover_product_urls()
+                
+                # URLs an earlier run could not visit (circuit breaker) go first.
+                carried_urls = load_unvisited_urls(self.run_name)
+                if carried_urls:
+                    self.logger.info(f"Retrying {len(carried_urls)} URLs left unvisited by the last run")
+                product_urls = list(dict.fromkeys(carried_urls + product_urls))
+                if bulk_urls:
+                    product_urls = [url for url in product_urls if url not in bulk_urls]
 
-                        if processed_count % 100 == 0:
-                            self.logger.info(
-                                f"Progress: {processed_count}/{total_products} products processed"
-                            )
+                # Limit products if specified
+                if max_products and max_products < len(product_urls):
+                    product_urls = product_urls[:max_products]
+                    self.logger.info(f"Limited to first {max_products} products")
+                # Carried URLs that did not fit within max_products stay saved.
+                carried_leftover = carried_urls[len(product_urls):]
+                
+                self.logger.info(f"Found {len(product_urls)} products to scrape")
+                
+                if not product_urls:
+                    self.logger.warning("No product URLs found")
+                    return bulk_written
 
-                        try:
-                            product_data = future.result()
-
-                            if product_data:
-                                output_buffer.append(product_data)
-                                if len(output_buffer) >= csv_buffer_size:
-                                    self.save_products(output_buffer)
-                                    output_buffer = []
-                                success_count += 1
-                            else:
-                                no_data_count += 1
-                                if no_data_count <= 20 or no_data_count % 500 == 0:
-                                    self.logger.warning(f"No data extracted from {url}")
+                if (
+                    self.incremental or self.listing_extract or self.deadline is not None
+                ) and self.product_state is None:
+                    self.product_state = ProductStateStore(self.scraper_name)
+                if self.incremental:
+                    full_refresh = self.product_state.full_refresh_due(self.full_refresh_days, now=start_time)
+                    if full_refresh:
+                        self.logger.info("Incremental run: full refresh due, scraping all URLs")
+                    else:
+                        product_urls, carried_forward = self._carry_forward_unchanged(
+                            product_urls, csv_buffer_size
+                        )
+                if self.listing_extract and not full_refresh:
+                    product_urls, listed = self._fill_from_listings(product_urls, csv_buffer_size)
+                    carried_forward += listed
+                if self.deadline is not None:
+                    product_urls = self._rank_by_value(product_urls)
 
-                        except Exception as e:
-                            self.logger.error(f"Error processing {url}: {e}")
+                if self.frontier is not None:
+                    self.frontier.start(product_urls)
 
-                        try:
-                            next_url = next(url_iter)
-                            future_to_url[executor.submit(self._scrape_with_retry, next_url)] = next_url
-                        except StopIteration:
-                            pass
+            if self.frontier is not None:
+                total = self.frontier.remaining()
+            else:
+                total = None if url_stream is not None else len(product_urls)
+            tally = RunTally(self, total=total, buffer_size=csv_buffer_size)
+            # Streaming runs discover while scraping; the scraping stage covers both.
+            memory.end(discovery_stage)
+            memory.begin(scraping_stage)
+
+            if engine == "async" and not self.async_fetch_supported:
+                self.logger.info(
+                    f"{self.scraper_name} needs its own HTTP client; using the thread engine"
+                )
+                engine = "thread"
+
+            if self.parse_processes and not self.extract_supported:
+                self.logger.info(
+                    f"{self.scraper_name} has no extract_product(); parsing on the fetch threads"
+                )
+
+            if self.frontier is not None:
+                engine = self._run_frontier(engine, concurrent_workers, tally)
+            elif product_urls:
+                engine = self._run_engine(engine, product_urls, concurrent_workers, tally)
+            else:
+                engine = "none"
 
-            if output_buffer:
-                self.save_products(output_buffer)
+            tally.flush()
+            if url_stream is not None:
+                tally.total = url_stream.count
+                if not url_stream.count and not bulk_written:
+                    self.logger.warning("No product URLs found")
+            self._save_unvisited(tally.unvisited + carried_leftover)
+            if full_refresh and not tally.unvisited:
+                # The run's start, not its end: the next weekly run starts
+                # seven days after this one did, not after this one finished.
+                self.product_state.mark_full_refresh(now=start_time)
             
             # Summary
             elapsed_time = time.time() - start_time
             self.logger.info(
-                f"Scraping completed: {success_count}/{total_products} products "
-                f"in {elapsed_time:.2f} seconds ({success_count/elapsed_time:.1f} products/sec)"
+                f"Scraping completed: {tally.success_count}/{tally.total} products "
+                f"in {elapsed_time:.2f} seconds "
+                f"({tally.success_count/elapsed_time:.1f} products/sec, {engine} engine)"
             )
+            if bulk_written:
+                self.logger.info(f"Wrote {bulk_written} products from the bulk source")
+            if carried_forward:
+                self.logger.info(
+                    f"Carried forward {carried_forward} unchanged or listing-extracted products"
+                )
+            if self.frontier is not None:
+                self.logger.info(self.frontier.summary())
+            self.logger.info(self.retry_budget.summary())
+            if self.http_cache is not None:
+                self.logger.info(self.http_cache.summary())
+            for limiter in self._rate_limiters.values():
+                self.logger.info(limiter.summary())
+            if self.cassette is not None:
+                self.cassette.flush()
+                self.logger.info(self.cassette.summary())
+            for breaker in self._breakers.values():
+                if breaker.times_opened:
+                    self.logger.info(breaker.summary())
             
-            return success_count
+            return tally.success_count + carried_forward + bulk_written
             
         except Exception as e:
             self.logger.error(f"Scraper failed: {e}", exc_info=True)
             return 0
         
         finally:
+            memory.end(discovery_stage)
+            memory.end(scraping_stage)
+            if url_stream is not None:
+                url_stream.close()
             self.session.close()
+            if self.product_state is not None:
+                self.product_state.close()
+                self.product_state = None
+            if self.frontier is not None:
+                self.frontier.close()
+                self.frontier = None
+
+    def _run_engine(
+        self, engine: str, product_urls: Iterable[str], concurrent_workers: int, tally: "RunTally"
+    ) -> str:
+        """Scrape the URLs with the selected engine; returns the engine used."""
+        if engine == "async":
+            from async_engine import AsyncCrawlEngine
+
+            AsyncCrawlEngine(self, parse_workers=concurrent_workers).run(product_urls, tally)
+        elif self.parse_processes and self.extract_supported:
+            engine = "pipeline"
+            self._run_pipelined(product_urls, concurrent_workers, tally)
+        else:
+            engine = "thread"
+            self._run_threaded(product_urls, concurrent_workers, tally)
+        return engine
+
+    def _run_frontier(self, engine: str, concurrent_workers: int, tally: "RunTally") -> str:
+        """
+        Scrape the URLs claimed from the frontier. Failed URLs are retried
+        once their backoff has passed, until they run out of attempts.
+        """
+        while True:
+            engine = self._run_engine(engine, self.frontier.iter_claims(), concurrent_workers, tally)
+            tally.flush()
+            # Unvisited URLs (circuit breaker, deadline) stay pending for the next run.
+            self.frontier.release(tally.unvisited)
+            if self.stop_requested:
+                break
+            wait = self.frontier.seconds_until_retry()
+            if wait is None or (self.deadline is not None and time.time() + wait >= self.deadline):
+                break
+            self.logger.info(f"Retrying failed URLs in {wait:.0f} seconds")
+            time.sleep(wait)
+
+        if self.frontier.finish():
+            self.logger.info("All frontier URLs finished; the next run starts a new crawl")
+        return engine
+
+    def _save_unvisited(self, urls: List[str]) -> None:
+        """Persist URLs this run could not visit; clear the list when there are none."""
+        if urls:
+            path = save_unvisited_urls(self.run_name, urls)
+            reason = "host blocked past the circuit breaker deadline"
+            if not self.circuit_tripped and self.deadline is not None:
+                reason = "run deadline reached"
+            self.logger.warning(
+                f"Run ended early ({reason}); "
+                f"{len(urls)} unvisited URLs saved to {path}"
+            )
+        else:
+            clear_unvisited_urls(self.run_name)
+
+    def _fetch_pool(self, concurrent_workers: int) -> Union[ThreadPoolExecutor, SchedulerLane]:
+        """Executor for the download threads: a lane of the shared scheduler, or a pool of our own."""
+        if self.scheduler is not None:
+            return self.scheduler.lane(self.run_name, limit=concurrent_workers)
+        return ThreadPoolExecutor(max_workers=concurrent_workers)
+
+    def _run_threaded(self, product_urls: Iterable[str], concurrent_workers: int, tally: "RunTally") -> None:
+        """
+        Scrape products on a thread pool with bounded in-flight futures.
+        This avoids creating one Future per URL (large memory spike); the
+        bound shrinks while RSS nears PIPELINE_MEMORY_LIMIT_MB.
+        """
+        max_in_flight = max(concurrent_workers * 4, concurrent_workers)
+        memory = get_memory_governor()
+
+        with self._fetch_pool(concurrent_workers) as executor:
+            url_iter = iter(product_urls)
+            future_to_url = {}
+
+            def refill() -> None:
+                # Under memory pressure no queue: fewer pages in flight than workers.
+                limit = max_in_flight if memory.level() >= 1 else memory.scale(concurrent_workers)
+                while len(future_to_url) < limit:
+                    # Stop feeding the pool once a host is blocked for good or time is up.
+                    if self.stop_requested:
+                        return
+                    url = next(url_iter, None)
+                    if url is None:
+                        return
+                    future_to_url[executor.submit(self._scrape_with_retry, url)] = url
+
+            refill()
+            while future_to_url:
+                # Process all currently completed futures in one shot, then refill queue.
+                done, _ = wait(
+                    set(future_to_url.keys()),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    url = future_to_url.pop(future)
+                    try:
+                        tally.record(url, future.result())
+                    except Exception as e:
+                        tally.record_error(url, e)
+
+                refill()
+
+        if self.stop_requested:
+            tally.unvisited.extend(url_iter)
+
+    def create_extract_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Process pool running extract_product(), or None when it is not used.
+
+        Workers are spawned, not forked: the scraper reaches them only through
+        __getstate__(), as on Windows, and a fork cannot copy held locks or
+        the fetch threads' sessions into them.
+        """
+        if not self.parse_processes or not self.extract_supported:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self.parse_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_extract_worker,
+            initargs=(self,),
+        )
+
+    def _run_pipelined(self, product_urls: Iterable[str], concurrent_workers: int, tally: "RunTally") -> None:
+        """
+        Download pages on a thread pool and extract them on a process pool.
+
+        Both stages keep a bounded number of items in flight: no new download
+        starts while the extract stage is full, so downloaded pages never pile
+        up in memory faster than the worker processes can parse them.
+        """
+        max_fetching = max(concurrent_workers * 2, 1)
+        max_extracting = self.parse_processes * 4
+        memory = get_memory_governor()
+        self.logger.info(
+            f"Pipeline: {concurrent_workers} fetch threads, "
+            f"{self.parse_processes} extract processes"
+        )
+
+        url_iter = iter(product_urls)
+        fetching = {}
+        extracting = {}
+
+        with self._fetch_pool(concurrent_workers) as fetch_pool, \
+                self.create_extract_pool() as extract_pool:
+
+            def refill() -> None:
+                # Both bounds shrink while RSS nears PIPELINE_MEMORY_LIMIT_MB.
+                fetch_limit = memory.scale(max_fetching)
+                total_limit = fetch_limit + memory.scale(max_extracting)
+                while len(fetching) < fetch_limit and len(fetching) + len(extracting) < total_limit:
+                    # Stop feeding the pool once a host is blocked for good or time is up.
+                    if self.stop_requested:
+                        return
+                    url = next(url_iter, None)
+                    if url is None:
+                        return
+                    fetching[fetch_pool.submit(self._fetch_with_retry, url)] = url
+
+            refill()
+            while fetching or extracting:
+                done, _ = wait(
+                    set(fetching) | set(extracting),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for future in done:
+                    if future in fetching:
+                        url = fetching.pop(future)
+                        try:
+                            response = future.result()
+                        except Exception as e:
+                            tally.record_error(url, e)
+                            continue
+                        if response is None:
+                            tally.record(url, None)
+                            continue
+                        extracting[extract_pool.submit(_extract_in_worker, url, response)] = url
+                    else:
+                        url = extracting.pop(future)
+                        try:
+                            tally.record(url, future.result())
+                        except Exception as e:
+                            tally.record_error(url, e)
+
+                refill()
+
+        if self.stop_requested:
+            tally.unvisited.extend(url_iter)
+
+    def _fetch_with_retry(self, url: str) -> Optional[requests.Response]:
+        """
+        fetch_product() for the pipeline's fetch threads.
+
+        Raises:
+            CircuitOpenError: no response because the host's circuit breaker tripped
+            DeadlineReached: not started because the run's deadline had passed
+        """
+        if self.out_of_time:
+            raise DeadlineReached(f"{url} not visited, deadline reached")
+        response = None
+        self._request_local.failed = False
+        try:
+            if not self.adaptive_rate and self.scrape_max_delay > 0:
+                time.sleep(random.uniform(self.scrape_min_delay, self.scrape_max_delay))
+            response = self.fetch_product(url)
+        except Exception as e:
+            self.logger.error(f"Error fetching {url}: {e}")
+            self._fetch_failed(url, e)
+
+        if not response and self.circuit_tripped:
+            raise CircuitOpenError(f"{url} not visited, circuit open")
+        if not response and self._request_local.failed:
+            raise FetchFailed(f"{url} could not be downloaded")
+        return response or None
     
-    def _scrape_with_retry(self, url: str) -> Optional[Dict[str, Any]]:
+    def _scrape_with_retry(self, url: str, prefetched: Optional[requests.Response] = None) -> Optional[Dict[str, Any]]:
         """
         Scrape a single product with minimal delay (for concurrent execution).
         
         Args:
             url: Product URL to scrape
+            prefetched: Response already downloaded by the async engine; the
+                scraper's first request for this URL is answered with it
         
         Returns:
-            Product data dictionary or None
+            Product data dictionary, or None when the page has no product
+
+        Raises:
+            CircuitOpenError: no data because the host's circuit breaker tripped
+            DeadlineReached: not started because the run's deadline had passed
+            FetchFailed: no data because the page could not be downloaded
+            Exception: whatever scrape_product() raised
         """
+        # Queued before the deadline, but not downloaded yet: leave it for the next run.
+        if prefetched is None and self.out_of_time:
+            raise DeadlineReached(f"{url} not visited, deadline reached")
+        product_data = None
+        error = None
+        self._request_local.failed = False
         try:
-            # Small random delay to avoid hammering the server.
-            if self.scrape_max_delay > 0:
+            if prefetched is not None:
+                self._prefetch_local.response = prefetched
+            # Small random delay to avoid hammering the server
+            # (only when the per-host rate limiter is switched off).
+            elif not self.adaptive_rate and self.scrape_max_delay > 0:
                 time.sleep(random.uniform(self.scrape_min_delay, self.scrape_max_delay))
-            return self.scrape_product(url)
+            product_data = self.scrape_product(url)
         except Exception as e:
-            self.logger.error(f"Error scraping {url}: {e}")
-            return None
+            error = e
+        finally:
+            self._prefetch_local.response = None
+
+        # scrape_product() usually swallows request errors; report the URL as
+        # unvisited rather than "no data" so it is retried by a later run.
+        if product_data is None and self.circuit_tripped:
+            raise CircuitOpenError(f"{url} not visited, circuit open")
+        if error is not None:
+            raise error
+        if product_data is None and self._request_local.failed:
+            raise FetchFailed(f"{url} could not be downloaded")
+        return product_data
     
     def get_output_file(self) -> Path:
         """Get path to output CSV file."""
@@ -0,0 +1,88 @@
+"""
+Bulk product sources (SCRAPER_BULK_SOURCE=1).
+
+Some shop systems answer catalogue queries with JSON: a page of hundreds of
+products, prices included, per request. A scraper that implements
+bulk_source() returns such a source, and run() writes its records to the CSV
+before any HTML is scraped. Records use the keys extract_product() returns,
+so _map_product_row() handles them like scraped products.
+
+When the endpoint is not reachable (no access key, 401/403/404, no JSON) the
+source raises BulkSourceUnavailable. run() then scrapes the HTML product
+pages as usual, skipping the products the source already wrote.
+
+A source lists the fields its endpoint cannot supply in missing_fields.
+run() fills them from the stored product page (product state). Products
+without a stored page, or whose page is due for a refresh, are not written
+from the source; their product pages are scraped instead.
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_BULK_PAGE_SIZE = 100
+
+
+class BulkSourceUnavailable(Exception):
+    """The bulk endpoint cannot be used; scrape the product pages instead."""
+
+
+def format_price(value: Any) -> str:
+    """Price as the scrapers write it, in German format ("1.234,56")."""
+    if value is None or value == "":
+        return ""
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return ""
+    return f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+class BulkSource(ABC):
+    """
+    Pages through a shop's JSON catalogue endpoint.
+
+    Args:
+        scraper: BaseScraper whose make_request() sends the requests
+        page_size: Products per request (SCRAPER_BULK_PAGE_SIZE)
+    """
+
+    name = "bulk"
+    # Record fields the endpoint cannot supply (filled from stored product pages).
+    missing_fields: Tuple[str, ...] = ()
+
+    def __init__(self, scraper, page_size: Optional[int] = None):
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.page_size = max(
+            int(page_size or os.getenv("SCRAPER_BULK_PAGE_SIZE", DEFAULT_BULK_PAGE_SIZE)), 1
+        )
+        self.requests = 0
+        self.products = 0
+
+    @abstractmethod
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield product records page by page.
+
+        Raises:
+            BulkSourceUnavailable: the endpoint failed (possibly after some pages)
+        """
+
+    def _request_json(self, url: str, method: str = "GET", **kwargs) -> Any:
+        """make_request() returning the decoded JSON body; failures raise BulkSourceUnavailable."""
+        headers = {"Accept": "application/json", **kwargs.pop("headers", {})}
+        # Some scrapers override make_request() for GET only (cloudscraper).
+        if method != "GET":
+            kwargs["method"] = method
+        response = self.scraper.make_request(url, headers=headers, **kwargs)
+        self.requests += 1
+        if response is None:
+            raise BulkSourceUnavailable(f"{self.name}: no response from {url}")
+        try:
+            return response.json()
+        except ValueError:
+            raise BulkSourceUnavailable(f"{self.name}: {url} did not return JSON") from None
+
+    def summary(self) -> str:
+        return f"{self.name}: {self.products} products in {self.requests} requests"
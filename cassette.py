@@ -0,0 +1,224 @@
+"""
+Record/replay cassette for scraper HTTP traffic.
+
+Record mode writes every request/response that goes through
+BaseScraper._send_request (so the cloudscraper overrides too) to a gzip
+compressed JSON-lines file. Replay mode answers the same requests from that
+file without touching the network, optionally adding latency, so parser and
+engine changes can be benchmarked deterministically offline.
+
+Environment:
+    SCRAPER_CASSETTE             Cassette path; "{scraper}" is replaced by the scraper name
+    SCRAPER_CASSETTE_MODE        "record" or "replay" (default: replay if the file exists)
+    SCRAPER_CASSETTE_LATENCY_MS  Latency injected per replayed response, or "recorded"
+                                 to replay the originally measured response times
+"""
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Hop-by-hop / transport headers that do not describe the stored body.
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+class Cassette:
+    """
+    One cassette file, shared by every scraper instance that uses the same path.
+
+    Args:
+        path: Cassette file (.jsonl.gz)
+        mode: RECORD or REPLAY
+        latency: Seconds added per replayed response, or "recorded"
+    """
+
+    def __init__(self, path: str, mode: str, latency="0"):
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._writer = None
+        self._entries: Dict[Tuple[str, str, str], List[dict]] = {}
+        self._served: Dict[Tuple[str, str, str], int] = {}
+
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+        if mode == REPLAY:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = gzip.open(self.path, "wt", encoding="utf-8")
+            atexit.register(self.close)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = (entry["method"], entry["url"], entry.get("body_sha1", ""))
+                self._entries.setdefault(key, []).append(entry)
+
+    def record(
+        self, method: str, url: str, response: requests.Response, elapsed: float, body: bytes = b""
+    ) -> None:
+        """Append one exchange to the cassette (body: the request body, see request_body())."""
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "body_sha1": _body_digest(body),
+            "status": response.status_code,
+            "final_url": response.url or url,
+            "headers": {
+                k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS
+            },
+            "body": base64.b64encode(response.content or b"").decode("ascii"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            if self._writer is None:
+                return
+            self._writer.write(line + "\n")
+            self.recorded += 1
+
+    def replay(self, method: str, url: str, body: bytes = b"") -> Tuple[requests.Response, float]:
+        """
+        Look up a recorded exchange.
+
+        Requests with a body (Store API / GraphQL POSTs all go to one URL)
+        are matched on the body too, so every page gets its own answer.
+
+        Args:
+            method: HTTP method
+            url: Requested URL
+            body: Request body, see request_body()
+
+        Returns:
+            (response, seconds of latency to inject). Unknown requests get a
+            404 so scrapers treat them like a missing page.
+        """
+        key = (method.upper(), url, _body_digest(body))
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                entry = None
+            else:
+                # Repeated requests get the recorded answers in order; the last one repeats.
+                index = self._served.get(key, 0)
+                self._served[key] = index + 1
+                entry = entries[min(index, len(entries) - 1)]
+                self.replayed += 1
+
+        if entry is None:
+            return _build_response(method.upper(), url, 404, {}, b"", url), 0.0
+        response = _build_response(
+            entry["method"],
+            url,
+            entry["status"],
+            entry["headers"],
+            base64.b64decode(entry["body"]),
+            entry.get("final_url", url),
+        )
+        return response, self._latency_for(entry)
+
+    def _latency_for(self, entry: dict) -> float:
+        if str(self.latency).strip().lower() == "recorded":
+            return float(entry.get("elapsed", 0.0))
+        try:
+            return max(float(self.latency), 0.0) / 1000.0
+        except ValueError:
+            return 0.0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def summary(self) -> str:
+        if self.replaying:
+            return f"Cassette {self.path}: {self.replayed} replayed, {self.misses} not recorded"
+        return f"Cassette {self.path}: {self.recorded} exchanges recorded"
+
+
+def request_body(**kwargs) -> bytes:
+    """Body session.request() would send for these arguments (b"" without data/json)."""
+    if kwargs.get("data") is None and kwargs.get("json") is None:
+        return b""
+    body = requests.Request(
+        "POST", "http://cassette.invalid/", data=kwargs.get("data"), json=kwargs.get("json")
+    ).prepare().body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return body or b""
+
+
+def _body_digest(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest() if body else ""
+
+
+def _build_response(
+    method: str, url: str, status: int, headers: dict, body: bytes, final_url: str
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = final_url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = body
+    response._content_consumed = True
+    response.request = requests.Request(method, url).prepare()
+    response.from_cassette = True
+    return response
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(scraper_name: str) -> Optional[Cassette]:
+    """
+    Return the cassette configured via SCRAPER_CASSETTE for this scraper, or None.
+    Scrapers sharing a cassette path share one Cassette object (and one writer).
+    """
+    template = os.getenv("SCRAPER_CASSETTE", "").strip()
+    if not template:
+        return None
+    path = template.replace("{scraper}", scraper_name)
+
+    mode = os.getenv("SCRAPER_CASSETTE_MODE", "").strip().lower()
+    if mode not in (RECORD, REPLAY):
+        mode = REPLAY if os.path.exists(path) else RECORD
+    latency = os.getenv("SCRAPER_CASSETTE_LATENCY_MS", "0")
+
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None or cassette.mode != mode:
+            cassette = Cassette(path, mode, latency=latency)
+            _cassettes[path] = cassette
+        return cassette
@@ -0,0 +1,294 @@
+"""
+Concurrent, paginated crawl of category listing pages (Magento, Shopware, xt:Commerce).
+
+CategoryCrawler downloads listing pages through the scraper's own
+make_request() (so the per-host rate limiter, circuit breaker and cassette
+apply), follows pagination (rel="next", ?p=, ?page=) and optionally
+sub-category links. Up to SCRAPER_CATEGORY_WORKERS pages are in flight at
+once, across categories; the pages of one category are fetched in order. A
+category stops as soon as one of its pages yields no new product URLs.
+
+With SCRAPER_LISTING_EXTRACT=1, the product tiles of each listing page (name,
+price, image) are handed to scraper.record_listing(), so run() can write
+rows without fetching the product pages (read_tiles() covers Magento and
+Shopware listings).
+
+Usage:
+    crawler = CategoryCrawler(scraper, product_links=scraper._listing_product_links)
+    for url in crawler.iter_products(scraper.category_urls):
+        ...
+"""
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+DEFAULT_CATEGORY_WORKERS = 4
+DEFAULT_MAX_PAGES = 200
+# Query parameters carrying the page number on the supported shop systems.
+PAGE_PARAMS = ("p", "page")
+
+# Selectors of product tiles on listing pages, for read_tiles().
+MAGENTO_TILES = {
+    "tile": "li.product-item, div.product-item",
+    "link": "a.product-item-link, a.product-item-photo",
+    "name": ".product-item-link",
+    "price": '[data-price-type="finalPrice"] .price, .price',
+    "image": "img.product-image-photo",
+}
+# Shopware 6 (.product-box) and Shopware 5 (.product--box).
+SHOPWARE_TILES = {
+    "tile": ".product-box, .product--box",
+    "link": "a.product-name, a.product--title, a.product-image-link, a.product--image",
+    "name": ".product-name, .product--title",
+    "price": ".product-price, .price--default",
+    "image": "img.product-image, .image--media img",
+}
+
+
+def _page_number(url: str) -> Optional[int]:
+    for key, value in parse_qsl(urlsplit(url).query):
+        if key in PAGE_PARAMS and value.isdigit():
+            return int(value)
+    return None
+
+
+def next_page_url(soup, url: str, page: int) -> Optional[str]:
+    """
+    URL of the listing page after `page`, or None on the last page.
+
+    Uses <link rel="next"> / <a rel="next"> when present, otherwise the
+    pagination link whose ?p= or ?page= equals page + 1.
+    """
+    for element in soup.select('link[rel="next"], a[rel="next"]'):
+        href = (element.get("href") or "").strip()
+        if href:
+            return urljoin(url, href)
+
+    for anchor in soup.select("a[href]"):
+        href = anchor.get("href") or ""
+        if ("p=" in href or "page=" in href) and _page_number(href) == page + 1:
+            return urljoin(url, href)
+    return None
+
+
+def absolute_links(soup, url: str, keep: Callable[[str], bool]) -> List[str]:
+    """Absolute hrefs of all links on the page that `keep` accepts, in page order."""
+    links = []
+    for anchor in soup.select("a[href]"):
+        href = (anchor.get("href") or "").strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:")):
+            continue
+        link = urljoin(url, href).split("#", 1)[0]
+        if keep(link):
+            links.append(link)
+    return links
+
+
+def read_tiles(
+    soup,
+    page_url: str,
+    tile: str,
+    link: str,
+    name: str,
+    price: str,
+    image: str,
+    clean_price: Callable[[str], str] = str.strip,
+    normalize_url: Optional[Callable[[str], str]] = None,
+) -> List[Dict[str, str]]:
+    """
+    Partial product records from the product tiles of a listing page.
+
+    Args:
+        soup: Parsed listing page
+        page_url: URL of the page, for relative links
+        tile, link, name, price, image: CSS selectors (see MAGENTO_TILES)
+        clean_price: The scraper's price cleaner, so tile prices are formatted
+            like the ones from product pages
+        normalize_url: Maps the tile link to the scraper's product URL;
+            an empty result drops the tile
+
+    Returns:
+        Dicts with product_url and whichever of name, title, price_gross and
+        product_image the tile shows
+    """
+    records = []
+    for item in soup.select(tile):
+        anchor = item.select_one(link) or item.select_one("a[href]")
+        href = (anchor.get("href") or "").strip() if anchor else ""
+        if not href:
+            continue
+        url = urljoin(page_url, href)
+        if normalize_url is not None:
+            url = normalize_url(url)
+            if not url:
+                continue
+
+        record = {"product_url": url}
+        element = item.select_one(name)
+        if element:
+            text = element.get_text(" ", strip=True) or (element.get("title") or "").strip()
+            if text:
+                record["name"] = record["title"] = text
+        element = item.select_one(price)
+        if element:
+            value = clean_price(element.get_text(" ", strip=True))
+            if value:
+                record["price_gross"] = value
+        element = item.select_one(image)
+        if element:
+            src = element.get("data-src") or element.get("src")
+            if src and not src.startswith("data:"):
+                record["product_image"] = urljoin(page_url, src)
+        records.append(record)
+    return records
+
+
+class CategoryCrawler:
+    """
+    Walks category listings and yields each product URL once.
+
+    Args:
+        scraper: BaseScraper whose make_request() downloads the pages
+        product_links: Returns the product URLs on a parsed listing page,
+            called as product_links(soup, page_url); defaults to the URLs
+            of the tiles
+        tiles: Returns partial product records of the page's tiles, called
+            as tiles(soup, page_url) (e.g. a read_tiles() partial); recorded
+            with scraper.record_listing() in listing-extraction runs
+        follow_category: Marks links on listing pages that are further
+            categories to crawl (None crawls only the given categories)
+        workers: Listing pages downloaded in parallel (SCRAPER_CATEGORY_WORKERS)
+        max_pages: Upper bound on pages per category
+        max_categories: Upper bound on categories, including followed ones
+        request_kwargs: Extra arguments for make_request()
+    """
+
+    def __init__(
+        self,
+        scraper,
+        product_links: Optional[Callable[[object, str], Iterable[str]]] = None,
+        tiles: Optional[Callable[[object, str], Iterable[Dict[str, str]]]] = None,
+        follow_category: Optional[Callable[[str], bool]] = None,
+        workers: Optional[int] = None,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        max_categories: Optional[int] = None,
+        request_kwargs: Optional[dict] = None,
+    ):
+        self.scraper = scraper
+        self.logger = scraper.logger
+        if product_links is None and tiles is None:
+            raise ValueError("CategoryCrawler needs product_links or tiles")
+        self.product_links = product_links
+        self.tiles = tiles
+        self.follow_category = follow_category
+        self.workers = max(
+            int(workers or os.getenv("SCRAPER_CATEGORY_WORKERS", DEFAULT_CATEGORY_WORKERS)), 1
+        )
+        self.max_pages = max(max_pages, 1)
+        self.max_categories = max_categories
+        self.request_kwargs = dict(request_kwargs or {})
+        self.pages = 0
+        self.categories = 0
+
+    def fetch_page(self, url: str, page: int) -> Tuple[List[str], Optional[str], List[str]]:
+        """
+        Download and parse one listing page.
+
+        Returns:
+            (product URLs, next page URL or None, linked category URLs)
+        """
+        response = self.scraper.make_request(url, **self.request_kwargs)
+        if not response:
+            return [], None, []
+        soup = self.scraper.parse_response(response)
+        records = list(self.tiles(soup, url)) if self.tiles is not None else []
+        if self.product_links is not None:
+            products = list(dict.fromkeys(self.product_links(soup, url)))
+        else:
+            products = list(dict.fromkeys(record["product_url"] for record in records))
+        if self.scraper.listing_extract:
+            for record in records:
+                self.scraper.record_listing(record["product_url"], record)
+        next_url = next_page_url(soup, url, page)
+        categories = []
+        if self.follow_category is not None:
+            # Pagination links of other categories are reached through their first page.
+            categories = [
+                link for link in dict.fromkeys(absolute_links(soup, url, self.follow_category))
+                if (_page_number(link) or 1) == 1
+            ]
+        return products, next_url, categories
+
+    def iter_products(self, category_urls: Iterable[str]) -> Iterator[str]:
+        """
+        Crawl the categories (and followed sub-categories) with their pagination.
+
+        Yields:
+            Product URLs as listing pages come in; each URL once
+        """
+        queue = deque()
+        known_categories = set()
+        visited_pages = set()
+        seen = set()
+        pending = {}
+        self.pages = self.categories = 0
+
+        def add_category(url: str) -> None:
+            if url in known_categories:
+                return
+            if self.max_categories is not None and len(known_categories) >= self.max_categories:
+                return
+            known_categories.add(url)
+            queue.append((url, 1))
+
+        for url in category_urls:
+            add_category(url)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while queue or pending:
+                    while queue and len(pending) < self.workers:
+                        url, page = queue.popleft()
+                        if url in visited_pages:
+                            continue
+                        visited_pages.add(url)
+                        pending[pool.submit(self.fetch_page, url, page)] = (url, page)
+                    if not pending:
+                        continue
+
+                    done, _ = wait(set(pending), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, page = pending.pop(future)
+                        try:
+                            products, next_url, categories = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Error crawling category page {url}: {e}")
+                            continue
+                        self.pages += 1
+                        if page == 1:
+                            self.categories += 1
+
+                        new = 0
+                        for product_url in products:
+                            if product_url not in seen:
+                                seen.add(product_url)
+                                new += 1
+                                yield product_url
+                        self.logger.debug(f"{url}: {len(products)} products, {new} new")
+
+                        # Next pages go first so open categories finish early.
+                        if new and next_url and page < self.max_pages:
+                            queue.appendleft((next_url, page + 1))
+                        for category_url in categories:
+                            add_category(category_url)
+            finally:
+                # The caller may stop early (max_products); drop pages not yet started.
+                for future in pending:
+                    future.cancel()
+
+        self.logger.info(
+            f"Categories: {self.categories} crawled, {self.pages} listing pages, "
+            f"{len(seen)} product URLs"
+        )
@@ -0,0 +1,197 @@
+"""
+Per-host circuit breaker for 403/429 storms.
+
+After SCRAPER_BREAKER_THRESHOLD consecutive blocked responses the circuit
+opens: requests to the host wait instead of going out. After a cooldown one
+half-open probe is let through; a clean answer closes the circuit, another
+block re-opens it with a longer cooldown. If the host is still blocked after
+SCRAPER_BREAKER_DEADLINE seconds the breaker trips for good, requests fail
+with CircuitOpenError and run() stops early, saving the URLs it did not visit.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import requests
+
+from config import DATA_DIR
+
+
+# Answers meaning "you are blocked", as opposed to ordinary failures.
+BLOCKED_STATUSES = {403, 429}
+
+DEFAULT_THRESHOLD = 10
+DEFAULT_COOLDOWN = 60.0     # seconds before the first half-open probe
+DEFAULT_MAX_COOLDOWN = 300.0
+DEFAULT_DEADLINE = 900.0    # seconds blocked before the run gives up on the host
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request to a host whose breaker has tripped."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-block counter with open / half-open / closed states.
+
+    Args:
+        host: Host name this breaker protects (for log output)
+        threshold: Consecutive blocked responses that open the circuit
+        cooldown: Seconds to wait before the first half-open probe
+        deadline: Seconds the host may stay blocked before the breaker trips
+    """
+
+    def __init__(
+        self,
+        host: str,
+        threshold: int = DEFAULT_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        deadline: float = DEFAULT_DEADLINE,
+        max_cooldown: float = DEFAULT_MAX_COOLDOWN,
+    ):
+        self.host = host
+        self.threshold = max(threshold, 1)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(max_cooldown, cooldown)
+        self.deadline = deadline
+
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.tripped = False
+        self.consecutive_blocked = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._blocked_since: Optional[float] = None
+        self._probe_in_flight = False
+
+        self.times_opened = 0
+        self.probes = 0
+
+    @classmethod
+    def from_env(cls, host: str) -> "CircuitBreaker":
+        return cls(
+            host,
+            threshold=int(os.getenv("SCRAPER_BREAKER_THRESHOLD", DEFAULT_THRESHOLD)),
+            cooldown=float(os.getenv("SCRAPER_BREAKER_COOLDOWN", DEFAULT_COOLDOWN)),
+            deadline=float(os.getenv("SCRAPER_BREAKER_DEADLINE", DEFAULT_DEADLINE)),
+        )
+
+    def admit(self) -> float:
+        """
+        Ask whether a request may be sent now.
+
+        Returns:
+            0.0 if the caller may send (possibly as the half-open probe),
+            otherwise seconds to wait before asking again
+
+        Raises:
+            CircuitOpenError: the host stayed blocked past the deadline
+        """
+        with self._lock:
+            if self.tripped:
+                raise CircuitOpenError(f"Circuit for {self.host} is open (blocked past deadline)")
+            if self.state == CLOSED:
+                return 0.0
+
+            now = time.monotonic()
+            if self._blocked_since is not None and now - self._blocked_since > self.deadline:
+                self.tripped = True
+                raise CircuitOpenError(f"Circuit for {self.host} is open (blocked past deadline)")
+
+            if self.state == OPEN and now >= self._open_until and not self._probe_in_flight:
+                self.state = HALF_OPEN
+                self._probe_in_flight = True
+                self.probes += 1
+                return 0.0
+
+            if self.state == OPEN:
+                wait = self._open_until - now
+            else:
+                wait = 1.0  # probe in flight; its outcome decides
+            return max(min(wait, 5.0), 0.05)
+
+    def wait(self) -> None:
+        """Block until admit() lets the caller through."""
+        while True:
+            delay = self.admit()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _open(self, now: float) -> None:
+        if self._blocked_since is None:
+            self._blocked_since = now
+        self.state = OPEN
+        self._open_until = now + self._cooldown
+        self._probe_in_flight = False
+        self.times_opened += 1
+
+    def record_status(self, status_code: int) -> None:
+        """Feed one response status into the breaker."""
+        with self._lock:
+            now = time.monotonic()
+            if status_code in BLOCKED_STATUSES:
+                self.consecutive_blocked += 1
+                if self.state == HALF_OPEN:
+                    self._cooldown = min(self._cooldown * 2, self.max_cooldown)
+                    self._open(now)
+                elif self.state == CLOSED and self.consecutive_blocked >= self.threshold:
+                    self._open(now)
+                return
+
+            self.consecutive_blocked = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self._probe_in_flight = False
+                self._blocked_since = None
+                self._cooldown = self.base_cooldown
+
+    def record_exception(self) -> None:
+        """A failed probe (timeout, connection error) keeps the circuit open."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open(time.monotonic())
+
+    def summary(self) -> str:
+        text = f"Circuit breaker {self.host}: {self.state}"
+        if self.tripped:
+            text += " (tripped, run ended early)"
+        return text + f", opened {self.times_opened}x, {self.probes} probes"
+
+
+def unvisited_path(scraper_name: str) -> Path:
+    return Path(DATA_DIR) / "unvisited" / f"{scraper_name}.txt"
+
+
+def save_unvisited_urls(scraper_name: str, urls: Iterable[str]) -> Path:
+    """Write URLs a run could not visit, one per line (replacing older ones)."""
+    path = unvisited_path(scraper_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for url in urls:
+            f.write(url + "\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_unvisited_urls(scraper_name: str) -> List[str]:
+    """Read URLs left over by an earlier run (empty list if there are none)."""
+    path = unvisited_path(scraper_name)
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def clear_unvisited_urls(scraper_name: str) -> None:
+    try:
+        unvisited_path(scraper_name).unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,33 @@
+"""
+Shared pytest fixtures for the offline checks (test_*.py with a stub server).
+
+tmp_data_dirs points DATA_DIR and LOGS_DIR at a temporary directory, so the
+stub scrapers' CSVs, logs, state files and unvisited lists do not end up in
+(or truncate) the real data/ and logs/ directories. fixture_cassette replays
+the saved product pages to the production scrapers.
+
+The helpers behind them live in tests/support.py, next to the stub server;
+the __main__ benchmarks use tmp_run_dirs() from there instead.
+"""
+import pytest
+
+from tests.support import close_log_handlers, redirect_data_dirs, use_fixture_cassette
+
+
+@pytest.fixture
+def tmp_data_dirs(tmp_path, monkeypatch):
+    """
+    Redirect DATA_DIR and LOGS_DIR to tmp_path for one test.
+
+    Returns:
+        (data_dir, logs_dir)
+    """
+    yield redirect_data_dirs(monkeypatch, tmp_path)
+    # The next test's scraper opens a log file in its own directory.
+    close_log_handlers(tmp_path)
+
+
+@pytest.fixture
+def fixture_cassette(tmp_path, monkeypatch):
+    """Serve the saved product pages (tests.support.FIXTURES) from a replay cassette."""
+    use_fixture_cassette(monkeypatch, tmp_path)
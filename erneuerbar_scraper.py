@@ -43,7 +43,7 @@ class ErneuerbarScraper(BaseScraper):
         response = self.make_request(sitemap_url)
         
         if response:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             locs = soup.find_all('loc')
             
             for loc in locs:
@@ -79,7 +79,7 @@ class ErneuerbarScraper(BaseScraper):
             response = self.make_request(category_url)
             
             if response:
-                soup = self.parse_html(response.text)
+                soup = self.parse_response(response)
                 
                 # Find all links
                 all_links = soup.find_all('a', href=True)
@@ -121,7 +121,7 @@ class ErneuerbarScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name (try multiple selectors)
             product_name = self._extract_text(soup, [
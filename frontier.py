@@ -0,0 +1,236 @@
+"""
+Disk-backed URL frontier for resumable runs (SCRAPER_FRONTIER=1).
+
+Every URL of a run is a row in DATA_DIR/frontier/<scraper>.sqlite with its
+state (pending, in-flight, done, failed), number of attempts and last error.
+URLs are claimed in discovery order and marked done or failed only after
+their CSV rows have been written, so a run that is killed can be resumed by
+the next one: in-flight URLs go back to pending, the existing CSV is kept and
+appended to. Failed URLs are retried after an exponential backoff until
+SCRAPER_FRONTIER_MAX_ATTEMPTS is reached.
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from config import DATA_DIR
+
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 30.0      # seconds before the first retry, doubled per attempt
+CLAIM_BATCH = 64
+
+PENDING = "pending"
+IN_FLIGHT = "in-flight"
+DONE = "done"
+FAILED = "failed"
+
+# meta.status values
+RUNNING = "running"
+COMPLETE = "complete"
+
+
+def frontier_path(scraper_name: str) -> Path:
+    return Path(DATA_DIR) / "frontier" / f"{scraper_name}.sqlite"
+
+
+class UrlFrontier:
+    """
+    SQLite table of the URLs of one run. Safe to share between threads.
+
+    Args:
+        scraper_name: Scraper the frontier belongs to
+        max_attempts: Attempts per URL before it stays failed
+        backoff: Seconds before the first retry of a failed URL
+        path: Database file (default: DATA_DIR/frontier/<scraper_name>.sqlite)
+    """
+
+    def __init__(
+        self,
+        scraper_name: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        path: Optional[Path] = None,
+    ):
+        self.path = Path(path or frontier_path(scraper_name))
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff = max(backoff, 0.0)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS urls ("
+                " url TEXT PRIMARY KEY,"
+                " seq INTEGER NOT NULL,"
+                " state TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " last_error TEXT NOT NULL DEFAULT '',"
+                " next_attempt_at REAL NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state, seq)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    @classmethod
+    def from_env(cls, scraper_name: str) -> "UrlFrontier":
+        return cls(
+            scraper_name,
+            max_attempts=int(os.getenv("SCRAPER_FRONTIER_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)),
+            backoff=float(os.getenv("SCRAPER_FRONTIER_BACKOFF", DEFAULT_BACKOFF)),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Run lifecycle ----------------------------------------------------------
+
+    def _status(self) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'status'").fetchone()
+        return row[0] if row else None
+
+    def _set_status(self, status: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('status', ?)", (status,)
+        )
+
+    def resumable(self) -> bool:
+        """True when the last run stopped with URLs left to scrape."""
+        with self._lock:
+            return self._status() == RUNNING and self._open_count() > 0
+
+    def start(self, urls: Iterable[str]) -> int:
+        """
+        Replace the frontier with a new run over the given URLs (all pending).
+
+        Returns:
+            Number of URLs queued (duplicates are dropped)
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM urls")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, seq, state) VALUES (?, ?, ?)",
+                ((url, seq, PENDING) for seq, url in enumerate(urls)),
+            )
+            self._set_status(RUNNING)
+            return self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def recover(self) -> int:
+        """Put URLs left in flight by a killed run back to pending; returns their number."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE urls SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT)
+            ).rowcount
+
+    def finish(self) -> bool:
+        """Mark the run complete if no URL is left to scrape; returns whether it was."""
+        with self._lock, self._conn:
+            if self._open_count() > 0:
+                return False
+            self._set_status(COMPLETE)
+            return True
+
+    # Claiming and results ---------------------------------------------------
+
+    def _open_count(self) -> int:
+        """Pending and in-flight URLs plus failed URLs with attempts left."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM urls WHERE state IN (?, ?) OR (state = ? AND attempts < ?)",
+            (PENDING, IN_FLIGHT, FAILED, self.max_attempts),
+        ).fetchone()[0]
+
+    def remaining(self) -> int:
+        with self._lock:
+            return self._open_count()
+
+    def _claim_batch(self, limit: int) -> List[str]:
+        with self._lock, self._conn:
+            urls = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT url FROM urls"
+                    " WHERE state = ? OR (state = ? AND attempts < ? AND next_attempt_at <= ?)"
+                    " ORDER BY seq LIMIT ?",
+                    (PENDING, FAILED, self.max_attempts, time.time(), limit),
+                )
+            ]
+            self._conn.executemany(
+                "UPDATE urls SET state = ? WHERE url = ?", ((IN_FLIGHT, url) for url in urls)
+            )
+        return urls
+
+    def iter_claims(self, batch_size: int = CLAIM_BATCH) -> Iterator[str]:
+        """
+        Yield claimable URLs in discovery order, marking them in flight.
+
+        Claims happen in batches as the consumer advances, so a crash leaves
+        at most one batch beyond the URLs being scraped in flight.
+        """
+        while True:
+            batch = self._claim_batch(batch_size)
+            if not batch:
+                return
+            yield from batch
+
+    def release(self, urls: Iterable[str]) -> None:
+        """Return claimed but unvisited URLs to pending (no attempt counted)."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE urls SET state = ? WHERE url = ? AND state = ?",
+                ((PENDING, url, IN_FLIGHT) for url in urls),
+            )
+
+    def complete(self, outcomes: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Record finished URLs in one transaction.
+
+        Args:
+            outcomes: (url, error) pairs; error is None for success, otherwise
+                the reason stored as last_error
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            for url, error in outcomes:
+                if error is None:
+                    self._conn.execute(
+                        "UPDATE urls SET state = ?, attempts = attempts + 1, last_error = ''"
+                        " WHERE url = ?",
+                        (DONE, url),
+                    )
+                    continue
+                row = self._conn.execute(
+                    "SELECT attempts FROM urls WHERE url = ?", (url,)
+                ).fetchone()
+                attempts = (row[0] if row else 0) + 1
+                self._conn.execute(
+                    "UPDATE urls SET state = ?, attempts = ?, last_error = ?, next_attempt_at = ?"
+                    " WHERE url = ?",
+                    (FAILED, attempts, error[:500], now + self.backoff * 2 ** (attempts - 1), url),
+                )
+
+    def seconds_until_retry(self) -> Optional[float]:
+        """Wait until the next failed URL may be retried, or None if none will be."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM urls WHERE state = ? AND attempts < ?",
+                (FAILED, self.max_attempts),
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state"))
+
+    def summary(self) -> str:
+        counts = self.counts()
+        return "Frontier: " + ", ".join(
+            f"{counts.get(state, 0)} {state}" for state in (DONE, FAILED, PENDING, IN_FLIGHT)
+        )
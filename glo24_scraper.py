@@ -3,11 +3,11 @@ Glo24 Scraper with Cloudscraper (bypasses Cloudflare protection)
 Website: https://glo24.de
 Platform: Unknown (Cloudflare protected)
 """
+import os
 import sys
 import re
 import time
 from typing import List, Dict, Optional, Any
-from bs4 import BeautifulSoup
 import cloudscraper
 from base_scraper import BaseScraper
 from google_sheets_helper import push_data
@@ -22,6 +22,9 @@ class Glo24Scraper(BaseScraper):
     Scraper for Glo24.de using cloudscraper to bypass Cloudflare protection.
     """
     
+    # Cloudflare cookies are bound to the cloudscraper session.
+    async_fetch_supported = False
+    
     def __init__(self):
         super().__init__(SCRAPER_NAME)
         
@@ -55,11 +58,12 @@ class Glo24Scraper(BaseScraper):
     def make_request(self, url: str, **kwargs):
         """Override to use cloudscraper instead of requests."""
         try:
-            response = self.scraper.get(url, timeout=30, **kwargs)
+            response = self._send_request(self.scraper, "GET", url, timeout=30, **kwargs)
             response.raise_for_status()
             return response
         except Exception as e:
             self.logger.error(f"Request failed for {url}: {e}")
+            self._fetch_failed(url, e)
             return None
     
     def get_product_urls(self, max_urls: int = None) -> List[str]:
@@ -76,7 +80,7 @@ class Glo24Scraper(BaseScraper):
                 self.logger.error("Failed to fetch sitemap")
                 return product_urls
             
-            soup = BeautifulSoup(response.text, 'xml')
+            soup = self.parse_response(response, "xml")
             
             # Check if it's a sitemap index
             sitemap_locs = soup.find_all('sitemap')
@@ -93,7 +97,7 @@ class Glo24Scraper(BaseScraper):
                         
                         sub_response = self.make_request(sub_url)
                         if sub_response:
-                            sub_soup = BeautifulSoup(sub_response.text, 'xml')
+                            sub_soup = self.parse_response(sub_response, "xml")
                             urls = sub_soup.find_all('loc')
                             
                             for url_tag in urls:
@@ -153,7 +157,7 @@ class Glo24Scraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title
             product_name = self._extract_text(soup, [
@@ -289,10 +293,25 @@ class Glo24Scraper(BaseScraper):
         price = re.sub(r'[^\d,.]', '', price_str)
         return price.strip()
     
-    def run(self, max_products: int = None) -> int:
-        """Run the scraper with optional product limit."""
+    def run(
+        self,
+        max_products: int = None,
+        concurrent_workers: int = 10,
+        engine: str = None,
+        deadline: float = None,
+    ) -> int:
+        """
+        Run the scraper with optional product limit.
+
+        Takes BaseScraper.run's arguments; products are scraped one at a time,
+        so concurrent_workers and engine are ignored. Scraping stops at the
+        deadline (or SCRAPER_TIME_BUDGET_MINUTES).
+        """
         try:
             self.logger.info(f"Starting {SCRAPER_NAME} scraper...")
+            if deadline is None and os.getenv("SCRAPER_TIME_BUDGET_MINUTES"):
+                deadline = time.time() + float(os.getenv("SCRAPER_TIME_BUDGET_MINUTES")) * 60
+            self.deadline = deadline
             
             product_urls = self.get_product_urls(max_urls=max_products)
             
@@ -305,6 +324,9 @@ class Glo24Scraper(BaseScraper):
             success_count = 0
             
             for i, url in enumerate(product_urls, 1):
+                if self.out_of_time:
+                    self.logger.warning(f"Deadline reached, {len(product_urls) - i + 1} products not scraped")
+                    break
                 self.logger.info(f"[{i}/{len(product_urls)}] Processing: {url}")
                 
                 product_data = self.scrape_product(url)
@@ -0,0 +1,191 @@
+"""
+One worker pool shared by several scrapers (PIPELINE_SCHEDULER=global).
+
+The production pipeline used to run its scrapers in batches, each with its
+own SCRAPER_WORKERS threads, and waited for the slowest shop of a batch.
+With a GlobalScheduler all scrapers run at the same time and submit their
+product URLs to one pool sized for the machine. Each scraper gets a lane:
+
+- a lane runs at most `host_workers` tasks at once (politeness per shop;
+  the per-host rate limiter and circuit breaker still apply inside them),
+- a free worker takes the next task of the lane with the fewest running
+  tasks, so capacity left idle by shops that are done, throttled or still
+  discovering goes to the shops that have work.
+
+Usage:
+    scheduler = GlobalScheduler(workers=32, host_workers=8)
+    scraper.scheduler = scheduler       # before scraper.run()
+    ...
+    scheduler.shutdown()
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_HOST_WORKERS = 8
+
+
+def default_workers() -> int:
+    """Pool size for this machine: the work is network-bound, parsing runs on the GIL."""
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+class SchedulerLane:
+    """
+    One scraper's share of the GlobalScheduler, used like a ThreadPoolExecutor.
+
+    Args:
+        scheduler: Scheduler whose workers run the tasks
+        name: Label for stats (the scraper name)
+        limit: Maximum tasks of this lane running at once
+    """
+
+    def __init__(self, scheduler: "GlobalScheduler", name: str, limit: int):
+        self.scheduler = scheduler
+        self.name = name
+        self.limit = max(limit, 1)
+        self.pending: Deque[Tuple[Future, Callable[..., Any], tuple, dict]] = deque()
+        self.running = 0
+        self.completed = 0
+        self.peak_running = 0
+        self.closed = False
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        with self.scheduler.cond:
+            if self.closed:
+                raise RuntimeError(f"lane {self.name} is shut down")
+            self.pending.append((future, fn, args, kwargs))
+            self.scheduler.cond.notify_all()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Close the lane; with wait=True block until its tasks have finished."""
+        with self.scheduler.cond:
+            self.closed = True
+            if cancel_futures:
+                while self.pending:
+                    self.pending.popleft()[0].cancel()
+            if wait:
+                self.scheduler.cond.wait_for(lambda: not self.pending and not self.running)
+            self.scheduler._retire(self)
+
+    def __enter__(self) -> "SchedulerLane":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+
+class GlobalScheduler:
+    """
+    Worker threads shared by the lanes of several scrapers.
+
+    Args:
+        workers: Threads in the pool (PIPELINE_WORKERS; default_workers())
+        host_workers: Tasks one lane may run at once (PIPELINE_HOST_WORKERS)
+    """
+
+    def __init__(self, workers: Optional[int] = None, host_workers: Optional[int] = None):
+        self.workers = max(int(workers or os.getenv("PIPELINE_WORKERS") or default_workers()), 1)
+        self.host_workers = max(
+            int(host_workers or os.getenv("PIPELINE_HOST_WORKERS") or DEFAULT_HOST_WORKERS), 1
+        )
+        self.cond = threading.Condition()
+        self.lanes: Dict[str, SchedulerLane] = {}
+        # Every lane handed out, for summary().
+        self.history: List[SchedulerLane] = []
+        self._stopping = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"scheduler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def lane(self, name: str, limit: Optional[int] = None) -> SchedulerLane:
+        """
+        A new lane for one scraper run.
+
+        Args:
+            name: Scraper name (lanes with the same name get a numbered suffix)
+            limit: Tasks the lane may run at once (capped at host_workers)
+        """
+        limit = min(limit or self.host_workers, self.host_workers)
+        with self.cond:
+            key, n = name, 1
+            while key in self.lanes:
+                n += 1
+                key = f"{name}#{n}"
+            lane = SchedulerLane(self, key, limit)
+            self.lanes[key] = lane
+            self.history.append(lane)
+        return lane
+
+    def _next_task(self) -> Optional[Tuple[SchedulerLane, Future, Callable[..., Any], tuple, dict]]:
+        """Pop a task from the least busy lane that has one; caller holds the lock."""
+        best = None
+        for lane in self.lanes.values():
+            if lane.pending and lane.running < lane.limit and (best is None or lane.running < best.running):
+                best = lane
+        if best is None:
+            return None
+        future, fn, args, kwargs = best.pending.popleft()
+        return best, future, fn, args, kwargs
+
+    def _work(self) -> None:
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self._stopping or self._next_task_ready())
+                if self._stopping:
+                    return
+                lane, future, fn, args, kwargs = self._next_task()
+                if not future.set_running_or_notify_cancel():
+                    self.cond.notify_all()
+                    continue
+                lane.running += 1
+                lane.peak_running = max(lane.peak_running, lane.running)
+
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+            with self.cond:
+                lane.running -= 1
+                lane.completed += 1
+                self._retire(lane)
+                # Wakes idle workers (a lane slot is free) and waiting shutdowns.
+                self.cond.notify_all()
+
+    def _retire(self, lane: SchedulerLane) -> None:
+        """Drop a closed lane once its tasks are done; caller holds the lock."""
+        if lane.closed and not lane.pending and not lane.running and self.lanes.get(lane.name) is lane:
+            del self.lanes[lane.name]
+
+    def _next_task_ready(self) -> bool:
+        return any(lane.pending and lane.running < lane.limit for lane in self.lanes.values())
+
+    def summary(self) -> str:
+        lanes = ", ".join(
+            f"{lane.name} {lane.completed} (peak {lane.peak_running}/{lane.limit})" for lane in self.history
+        )
+        return f"Global scheduler: {self.workers} workers, tasks per lane: {lanes or 'none'}"
+
+    def shutdown(self) -> None:
+        """Stop the workers once they finish their current task."""
+        with self.cond:
+            self._stopping = True
+            self.cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "GlobalScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
@@ -11,9 +11,6 @@ import time
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Tuple
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-
 from config import CREDENTIALS_FILE, CSV_COLUMNS
 
 logger = logging.getLogger(__name__)
@@ -35,6 +32,11 @@ class GoogleSheetsHelper:
         Args:
             credentials_file: Path to credentials.json file
         """
+        # gspread and oauth2client cost ~0.3 s to import; every scraper module
+        # imports push_data, so they are only loaded once a helper is built.
+        import gspread
+
+        self.gspread = gspread
         self.credentials_file = credentials_file
         self.client = None
         self._last_write_ts = 0.0
@@ -87,7 +89,7 @@ class GoogleSheetsHelper:
                 result = operation()
                 self._last_write_ts = time.time()
                 return result
-            except gspread.exceptions.APIError as e:
+            except self.gspread.exceptions.APIError as e:
                 if not self._is_retryable_api_error(e) or attempt >= self._max_write_retries:
                     raise
                 backoff = min(60.0, (2 ** attempt) + random.uniform(0.2, 1.2))
@@ -135,6 +137,8 @@ class GoogleSheetsHelper:
 
     def _authenticate(self) -> None:
         """Authenticate with Google Sheets API using service account."""
+        from oauth2client.service_account import ServiceAccountCredentials
+
         try:
             scope = [
                 "https://spreadsheets.google.com/feeds",
@@ -146,7 +150,7 @@ class GoogleSheetsHelper:
                 scope,
             )
 
-            self.client = gspread.authorize(credentials)
+            self.client = self.gspread.authorize(credentials)
             logger.info("Successfully authenticated with Google Sheets API")
 
         except FileNotFoundError:
@@ -194,7 +198,7 @@ class GoogleSheetsHelper:
 
             try:
                 worksheet = spreadsheet.worksheet(worksheet_name)
-            except gspread.exceptions.WorksheetNotFound:
+            except self.gspread.exceptions.WorksheetNotFound:
                 worksheet = spreadsheet.add_worksheet(
                     title=worksheet_name,
                     rows=1000,
@@ -299,7 +303,7 @@ class GoogleSheetsHelper:
             logger.info(f"Successfully pushed {total_data_rows} rows to Google Sheets")
             return True
 
-        except gspread.exceptions.APIError as e:
+        except self.gspread.exceptions.APIError as e:
             logger.error(f"Google Sheets API error: {e}")
             print(f"Google Sheets API error: {e}")
             import traceback
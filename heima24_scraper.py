@@ -8,6 +8,8 @@ import re
 from typing import List, Dict, Optional, Any
 from base_scraper import BaseScraper
 from google_sheets_helper import push_data
+from json_ld import missing_fields as missing_json_ld_fields
+from sitemap_stream import SitemapCrawler
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -30,59 +32,59 @@ class Heima24Scraper(BaseScraper):
         
         self.logger.info(f"Initialized scraper for {self.base_url}")
     
+    SKIP_TERMS = [
+        "stellenangebot",
+        "ueber-uns",
+        "retourenabwicklung",
+        "widerruf",
+        "datenschutz",
+        "impressum",
+        "kontakt",
+        "versand",
+        "zahlungs",
+        "agb",
+        "climatechange",
+        "renewableenergy",
+        "neue-angebote",
+        "ust-regelung",
+    ]
+
+    def _is_product_url(self, url: str) -> bool:
+        # Filter for product pages (they have .html extension)
+        if not url.endswith('.html'):
+            return False
+        if url == self.base_url + '/':
+            return False
+        url_l = url.lower()
+        if any(term in url_l for term in self.SKIP_TERMS):
+            return False
+        if '/blog/' in url_l or '/ratgeber/' in url_l:
+            return False
+        if url_l.count('-') < 2 and '/shop/' not in url_l:
+            # Heuristic: product URLs on this site are usually descriptive slugs.
+            return False
+        return True
+    
     def get_product_urls(self) -> List[str]:
         """
         Get list of product URLs from sitemap.
         """
         product_urls = []
+        seen = set()
         
         try:
             self.logger.info("Fetching sitemap...")
             sitemap_url = "https://heima24.de/sitemap.xml"
-            response = self.make_request(sitemap_url)
-            
-            if not response:
-                self.logger.error("Failed to fetch sitemap")
-                return product_urls
-            
-            soup = self.parse_html(response.text)
-            locs = soup.find_all('loc')
+            crawler = SitemapCrawler(self, url_filter=self._is_product_url)
             
-            skip_terms = [
-                "stellenangebot",
-                "ueber-uns",
-                "retourenabwicklung",
-                "widerruf",
-                "datenschutz",
-                "impressum",
-                "kontakt",
-                "versand",
-                "zahlungs",
-                "agb",
-                "climatechange",
-                "renewableenergy",
-                "neue-angebote",
-                "ust-regelung",
-            ]
-
-            for loc in locs:
-                url = loc.text.strip()
-                # Filter for product pages (they have .html extension)
-                if not url.endswith('.html'):
-                    continue
-                if url == self.base_url + '/':
-                    continue
-                url_l = url.lower()
-                if any(term in url_l for term in skip_terms):
-                    continue
-                if '/blog/' in url_l or '/ratgeber/' in url_l:
-                    continue
-                if url_l.count('-') < 2 and '/shop/' not in url_l:
-                    # Heuristic: product URLs on this site are usually descriptive slugs.
-                    continue
-                if url not in product_urls:
+            for url, lastmod in crawler.iter_entries([sitemap_url]):
+                if url not in seen:
+                    seen.add(url)
                     product_urls.append(url)
+                    self.record_lastmod(url, lastmod)
             
+            if not product_urls:
+                self.logger.error("No product URLs found in sitemap")
             self.logger.info(f"Found {len(product_urls)} product URLs")
             
         except Exception as e:
@@ -90,60 +92,31 @@ class Heima24Scraper(BaseScraper):
         
         return product_urls
     
-    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
         """
-        Scrape individual product page.
+        Extract product data from a downloaded product page.
         """
-        response = self.make_request(url)
-        if not response:
-            return None
-        
         try:
-            soup = self.parse_html(response.text)
-            product_name = ''
-            manufacturer = ''
-            article_number = ''
-            ean = ''
-            price_gross = ''
-            product_image = ''
-            
-            # Try to extract from JSON-LD structured data first (most reliable)
-            json_ld = soup.find('script', {'type': 'application/ld+json'})
-            if json_ld:
-                try:
-                    import json
-                    import html
-                    data = json.loads(json_ld.string)
-                    
-                    # Some pages expose a list of schemas; keep only Product node.
-                    if isinstance(data, list):
-                        data = next(
-                            (item for item in data if isinstance(item, dict) and item.get('@type') == 'Product'),
-                            {}
-                        )
-
-                    # Check if it's a Product schema
-                    if isinstance(data, dict) and data.get('@type') == 'Product':
-                        product_name = html.unescape(data.get('name', ''))
-                        manufacturer = data.get('brand', {}).get('name', '') if isinstance(data.get('brand'), dict) else ''
-                        article_number = data.get('mpn', '') or data.get('sku', '')
-                        ean = data.get('gtin8', '') or data.get('gtin13', '') or data.get('gtin14', '')
-
-                        # Get price from offers
-                        offers = data.get('offers', {})
-                        price_gross_raw = str(offers.get('price', '')) if isinstance(offers, dict) else ''
-                        price_gross = price_gross_raw.replace('.', ',') if price_gross_raw else ''
+            # Structured data first: read straight from the response bytes.
+            fields = self.extract_json_ld(
+                response,
+                article_keys=('mpn', 'sku'),
+                ean_keys=('gtin8', 'gtin13', 'gtin14'),
+            )
+            product_name = fields['name']
+            manufacturer = fields['manufacturer']
+            article_number = fields['article_number']
+            ean = fields['ean']
+            price_gross = fields['price_gross'].replace('.', ',')
+            product_image = fields['image']
+            if product_name:
+                self.logger.info(f"Extracted from JSON-LD: {product_name}, EAN: {ean}")
 
-                        # Get image
-                        images = data.get('image', [])
-                        product_image = images[0] if isinstance(images, list) and images else ''
-
-                        self.logger.info(f"Extracted from JSON-LD: {product_name}, EAN: {ean}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse JSON-LD: {e}")
+            # Only build the DOM when JSON-LD left a field with a DOM fallback empty.
+            soup = self.parse_response(response) if missing_json_ld_fields(fields) else None
             
             # Fallback to HTML extraction if JSON-LD didn't work
-            if not product_name:
+            if not product_name and soup is not None:
                 product_name = self._extract_text(soup, [
                     'h1',
                     'div.product-name h1',
@@ -154,18 +127,20 @@ class Heima24Scraper(BaseScraper):
             name = product_name
             
             # Extract manufacturer/brand from HTML if not in JSON-LD
-            if not manufacturer:
+            if not manufacturer and soup is not None:
                 manufacturer = self._extract_text(soup, [
                     'span[itemprop="brand"]',
                     'div.manufacturer',
                     'a.brand-link'
                 ])
             
-            # Extract category from breadcrumbs or URL
-            category = self._extract_text(soup, [
-                'div.breadcrumb a:nth-last-child(2)',
-                'span[itemprop="category"]'
-            ])
+            # Extract category from JSON-LD, breadcrumbs or URL
+            category = fields['category']
+            if not category and soup is not None:
+                category = self._extract_text(soup, [
+                    'div.breadcrumb a:nth-last-child(2)',
+                    'span[itemprop="category"]'
+                ])
             
             # Infer category from URL if not found
             if not category and '/' in url:
@@ -174,7 +149,7 @@ class Heima24Scraper(BaseScraper):
                     category = parts[3].replace('-', ' ').title()
             
             # Extract article number from HTML if not in JSON-LD
-            if not article_number:
+            if not article_number and soup is not None:
                 # Look for "Artikel-Nr.:" in text
                 article_div = soup.find('div', class_='text-left')
                 if article_div:
@@ -197,7 +172,7 @@ class Heima24Scraper(BaseScraper):
                                 break
             
             # Extract price from HTML if not in JSON-LD
-            if not price_gross:
+            if not price_gross and soup is not None:
                 price_gross_raw = ""
                 
                 # Look for price in the "Bei uns:" section
@@ -233,7 +208,7 @@ class Heima24Scraper(BaseScraper):
                     price_net = ""
             
             # Extract EAN from HTML if not in JSON-LD
-            if not ean:
+            if not ean and soup is not None:
                 # Method 1: Look for "EAN:" in the text-left div (e.g., "Artikel-Nr.: XXX | EAN: YYY")
                 article_div = soup.find('div', class_='text-left')
                 if article_div:
@@ -263,7 +238,7 @@ class Heima24Scraper(BaseScraper):
                     ])
             
             # Extract image from HTML if not in JSON-LD
-            if not product_image:
+            if not product_image and soup is not None:
                 product_image = self._extract_image(soup, [
                     'img[itemprop="image"]',
                     'div.product-image img',
@@ -8,6 +8,7 @@ import re
 from typing import List, Dict, Optional, Any
 from base_scraper import BaseScraper
 from google_sheets_helper import push_data
+from sitemap_stream import SitemapCrawler
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -39,42 +40,22 @@ class Heizungsdiscount24Scraper(BaseScraper):
         try:
             self.logger.info("Fetching main sitemap...")
             sitemap_url = "https://www.heizungsdiscount24.de/sitemap.xml"
-            response = self.make_request(sitemap_url)
+            # Product pages end with .html
+            crawler = SitemapCrawler(self, url_filter=lambda url: url.endswith('.html'))
+            sitemap_locs = crawler.index_children(sitemap_url)
             
-            if not response:
+            if not sitemap_locs:
                 self.logger.error("Failed to fetch main sitemap")
                 return product_urls
             
-            soup = self.parse_html(response.text)
-            sitemap_locs = soup.find_all('loc')
-            
             # Filter for product sitemaps (sitemap_imgs*.xml)
-            product_sitemaps = [loc.text for loc in sitemap_locs if 'sitemap_imgs' in loc.text]
+            product_sitemaps = [child for child in sitemap_locs if 'sitemap_imgs' in child[0]]
             
             self.logger.info(f"Found {len(product_sitemaps)} product sitemaps")
             
-            # Process each product sitemap
-            for i, sitemap_url in enumerate(product_sitemaps, 1):
-                self.logger.info(f"Processing sitemap {i}/{len(product_sitemaps)}: {sitemap_url}")
-                
-                try:
-                    sitemap_response = self.make_request(sitemap_url)
-                    if not sitemap_response:
-                        continue
-                    
-                    sitemap_soup = self.parse_html(sitemap_response.text)
-                    urls = sitemap_soup.find_all('loc')
-                    
-                    for url_tag in urls:
-                        url = url_tag.text.strip()
-                        if url.endswith('.html'):  # Product pages end with .html
-                            product_urls.append(url)
-                    
-                    self.logger.info(f"Extracted {len(urls)} URLs from this sitemap")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing sitemap {sitemap_url}: {e}")
-                    continue
+            for url, lastmod in crawler.iter_entries(product_sitemaps):
+                product_urls.append(url)
+                self.record_lastmod(url, lastmod)
             
             self.logger.info(f"Total product URLs found: {len(product_urls)}")
             
@@ -92,7 +73,7 @@ class Heizungsdiscount24Scraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title
             product_name = self._extract_text(soup, [
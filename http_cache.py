@@ -0,0 +1,170 @@
+"""
+Persistent conditional-GET cache for scraper HTTP traffic.
+
+Bodies are stored under DATA_DIR/http_cache/<scraper_name>/ together with the
+validators (ETag / Last-Modified) the server sent. On the next run the stored
+validators are sent as If-None-Match / If-Modified-Since and a 304 answer is
+served from disk instead of re-downloading the page.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import DATA_DIR
+
+
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+
+# Headers worth keeping so a replayed response behaves like the original one.
+STORED_HEADERS = (
+    "Content-Type",
+    "Content-Encoding",
+    "ETag",
+    "Last-Modified",
+)
+
+
+class HttpCache:
+    """
+    On-disk cache keyed by URL, storing one body file and one metadata file
+    per entry. Safe to use from multiple worker threads.
+    """
+
+    def __init__(self, scraper_name: str, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or HTTP_CACHE_DIR) / scraper_name
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.bytes_saved = 0
+
+    def _entry_paths(self, url: str):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        folder = self.cache_dir / digest[:2]
+        return folder / f"{digest}.json", folder / f"{digest}.body"
+
+    def _load_meta(self, url: str) -> Optional[Dict[str, Any]]:
+        meta_path, body_path = self._entry_paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Return If-None-Match / If-Modified-Since headers for a cached URL.
+        """
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+
+        headers = {}
+        stored = meta.get("headers", {})
+        if stored.get("ETag"):
+            headers["If-None-Match"] = stored["ETag"]
+        if stored.get("Last-Modified"):
+            headers["If-Modified-Since"] = stored["Last-Modified"]
+        return headers
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """
+        Store a 200 response if it carries a validator we can revalidate with.
+        """
+        if response.status_code != 200:
+            return
+        if not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            return
+
+        meta_path, body_path = self._entry_paths(url)
+        meta = {
+            "url": url,
+            "final_url": response.url,
+            "encoding": response.encoding,
+            "headers": {
+                name: response.headers[name]
+                for name in STORED_HEADERS
+                if response.headers.get(name)
+            },
+        }
+        # The body is stored already decoded, so the encoding header no longer applies.
+        meta["headers"].pop("Content-Encoding", None)
+
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to temp files first so a killed job never leaves half an entry.
+            tmp_body = body_path.with_suffix(f".body.{threading.get_ident()}.tmp")
+            tmp_meta = meta_path.with_suffix(f".json.{threading.get_ident()}.tmp")
+            with open(tmp_body, "wb") as f:
+                f.write(response.content)
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_body, body_path)
+            os.replace(tmp_meta, meta_path)
+        except OSError:
+            return
+
+        with self._lock:
+            self.stores += 1
+
+    def response_from_cache(
+        self,
+        url: str,
+        not_modified: requests.Response,
+    ) -> Optional[requests.Response]:
+        """
+        Build a 200 response from disk for a 304 answer.
+        """
+        meta = self._load_meta(url)
+        if not meta:
+            return None
+
+        _, body_path = self._entry_paths(url)
+        try:
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        headers = CaseInsensitiveDict(meta.get("headers", {}))
+        # Refreshed validators from the 304 win over the stored ones.
+        for name in ("ETag", "Last-Modified"):
+            if not_modified.headers.get(name):
+                headers[name] = not_modified.headers[name]
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK (cached)"
+        response.headers = headers
+        response.url = meta.get("final_url") or url
+        response.encoding = meta.get("encoding")
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        return response
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def summary(self) -> str:
+        return (
+            f"HTTP cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.stores} stored, {self.bytes_saved / 1024 / 1024:.1f} MB saved"
+        )
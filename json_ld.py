@@ -0,0 +1,184 @@
+"""
+JSON-LD Product extraction straight from response bytes.
+
+Most shops embed a schema.org Product in <script type="application/ld+json">.
+Scanning the raw bytes for those blocks is far cheaper than building a DOM,
+so scrapers read JSON-LD first and only parse the HTML when required fields
+are still missing afterwards.
+"""
+import html
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+_LD_JSON_RE = re.compile(
+    rb"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+
+PRODUCT_FIELDS = ("name", "manufacturer", "article_number", "price_gross", "ean", "image", "category")
+
+# Fields the scrapers' DOM selectors fill in. The DOM is only skipped when
+# JSON-LD provides all of them; a shop without a selector for some field
+# passes its own list to missing_fields().
+DOM_FIELDS = PRODUCT_FIELDS
+
+ARTICLE_NUMBER_KEYS = ("sku", "mpn", "productID")
+EAN_KEYS = ("gtin13", "gtin14", "gtin12", "gtin8")
+
+
+def iter_json_ld(content: Union[bytes, str], encoding: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yield every parseable ld+json payload in the document.
+
+    Args:
+        content: Raw response body (bytes) or decoded HTML
+        encoding: Encoding of byte content (JSON is UTF-8 by default)
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+        encoding = "utf-8"
+    for match in _LD_JSON_RE.finditer(content):
+        raw = match.group(1).strip()
+        if not raw:
+            continue
+        try:
+            text = raw.decode(encoding or "utf-8", errors="replace")
+            yield json.loads(text, strict=False)
+        except (ValueError, LookupError):
+            continue
+
+
+def iter_items(payload: Any) -> Iterator[Dict[str, Any]]:
+    """Flatten a payload into its schema items (top-level dict, @graph, lists)."""
+    if isinstance(payload, list):
+        for item in payload:
+            yield from iter_items(item)
+    elif isinstance(payload, dict):
+        yield payload
+        graph = payload.get("@graph")
+        if isinstance(graph, list):
+            for item in graph:
+                if isinstance(item, dict):
+                    yield item
+
+
+def is_type(item: Dict[str, Any], type_name: str) -> bool:
+    type_value = item.get("@type", "")
+    values = type_value if isinstance(type_value, list) else [type_value]
+    return any(str(value).lower() == type_name.lower() for value in values)
+
+
+def find_product(content: Union[bytes, str], encoding: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the first schema.org Product item in the document, or None.
+    A BreadcrumbList found on the page is attached as "_breadcrumb".
+    """
+    product = None
+    breadcrumb = None
+    for payload in iter_json_ld(content, encoding):
+        for item in iter_items(payload):
+            if product is None and is_type(item, "Product"):
+                product = item
+            elif breadcrumb is None and is_type(item, "BreadcrumbList"):
+                breadcrumb = item
+    if product is not None and breadcrumb is not None:
+        product = dict(product, _breadcrumb=breadcrumb)
+    return product
+
+
+def _first(item: Dict[str, Any], keys: Iterable[str]) -> str:
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return str(value).strip()
+    return ""
+
+
+def _breadcrumb_category(breadcrumb: Optional[Dict[str, Any]]) -> str:
+    """Name of the second-to-last breadcrumb entry (the product's category)."""
+    if not isinstance(breadcrumb, dict):
+        return ""
+    elements = breadcrumb.get("itemListElement")
+    if not isinstance(elements, list) or len(elements) < 3:
+        return ""
+    elements = sorted(
+        (e for e in elements if isinstance(e, dict)),
+        key=lambda e: e.get("position") if isinstance(e.get("position"), int) else 0,
+    )
+    parent = elements[-2] if len(elements) >= 2 else {}
+    name = parent.get("name")
+    if not name and isinstance(parent.get("item"), dict):
+        name = parent["item"].get("name")
+    return str(name or "").strip()
+
+
+def product_fields(
+    item: Optional[Dict[str, Any]],
+    article_keys: Iterable[str] = ARTICLE_NUMBER_KEYS,
+    ean_keys: Iterable[str] = EAN_KEYS,
+) -> Dict[str, str]:
+    """
+    Map a Product item to the canonical fields (all strings, "" if missing).
+
+    Args:
+        item: Product item from find_product() (None gives all-empty fields)
+        article_keys: Keys tried in order for the article number
+        ean_keys: Keys tried in order for the EAN
+
+    Returns:
+        Dict with PRODUCT_FIELDS; price_gross is the raw offer price
+    """
+    fields = {field: "" for field in PRODUCT_FIELDS}
+    if not item:
+        return fields
+
+    name = item.get("name")
+    if isinstance(name, str):
+        fields["name"] = html.unescape(name).strip()
+
+    brand = item.get("brand")
+    if isinstance(brand, dict):
+        fields["manufacturer"] = str(brand.get("name", "")).strip()
+    elif isinstance(brand, str):
+        fields["manufacturer"] = brand.strip()
+
+    fields["article_number"] = _first(item, article_keys)
+    fields["ean"] = _first(item, ean_keys)
+
+    image = item.get("image")
+    if isinstance(image, list) and image:
+        image = image[0]
+    if isinstance(image, dict):
+        image = image.get("url") or image.get("contentUrl")
+    if isinstance(image, str):
+        fields["image"] = image.strip()
+
+    category = item.get("category")
+    if isinstance(category, str) and category.strip():
+        fields["category"] = category.strip()
+    else:
+        fields["category"] = _breadcrumb_category(item.get("_breadcrumb"))
+
+    offers = item.get("offers")
+    if isinstance(offers, list) and offers:
+        offers = offers[0]
+    if isinstance(offers, dict):
+        price = offers.get("price")
+        if price is None:
+            price = offers.get("lowPrice")
+        if price is not None:
+            fields["price_gross"] = str(price).strip()
+
+    return fields
+
+
+def extract_product(content: Union[bytes, str], encoding: Optional[str] = None, **kwargs) -> Dict[str, str]:
+    """Canonical Product fields straight from the raw page (see product_fields)."""
+    return product_fields(find_product(content, encoding), **kwargs)
+
+
+def missing_fields(fields: Dict[str, str], required: Iterable[str] = DOM_FIELDS) -> List[str]:
+    """Fields JSON-LD did not provide that the DOM has to fill (empty list: skip the DOM)."""
+    return [field for field in required if not fields.get(field)]
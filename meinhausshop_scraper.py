@@ -6,11 +6,12 @@ Platform: Shopware
 import sys
 import os
 import re
-import gzip
 from typing import List, Dict, Optional, Any
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit, urlunsplit
 from base_scraper import BaseScraper
 from google_sheets_helper import push_data
+from shopware_store_api import ShopwareStoreApi
+from sitemap_stream import SitemapCrawler
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -37,6 +38,12 @@ class MeinHausShopScraper(BaseScraper):
         if not raw_url:
             return ""
         url = raw_url.strip().split("?")[0].split("#")[0]
+        # The sitemap lists bare-host URLs; base_url (and the Store API
+        # URLs built from it) use www.
+        parts = urlsplit(url)
+        base = urlsplit(self.base_url)
+        if parts.netloc.removeprefix("www.") == base.netloc.removeprefix("www."):
+            url = urlunsplit((base.scheme, base.netloc, parts.path, "", ""))
         if url.endswith("/") and url != self.base_url + "/":
             url = url[:-1]
         return url
@@ -73,10 +80,14 @@ class MeinHausShopScraper(BaseScraper):
             return False
         return True
     
+    def bulk_source(self) -> ShopwareStoreApi:
+        """Products from the Shopware 6 Store API (SCRAPER_BULK_SOURCE=1)."""
+        return ShopwareStoreApi(self, self.base_url, normalize_url=self._normalize_url)
+
     def get_product_urls(self) -> List[str]:
         """
         Get list of product URLs from compressed sitemaps.
-        MeinHausShop uses gzipped sitemap files.
+        MeinHausShop uses gzipped sitemap files (streamed, see sitemap_stream.py).
         """
         product_urls = []
         seen_urls = set()
@@ -85,58 +96,29 @@ class MeinHausShopScraper(BaseScraper):
             # Get main sitemap index
             self.logger.info("Fetching main sitemap index...")
             sitemap_url = "https://meinhausshop.de/sitemap.xml"
-            response = self.make_request(sitemap_url)
+            crawler = SitemapCrawler(self, url_filter=self._is_product_url)
+            sitemap_locs = crawler.index_children(sitemap_url)
             
-            if not response:
+            if not sitemap_locs:
                 self.logger.error("Failed to fetch main sitemap")
                 return product_urls
             
-            soup = BeautifulSoup(response.text, "xml")
-            sitemap_locs = soup.find_all('loc')
+            self.logger.info(f"Found {len(sitemap_locs)} sub-sitemaps")
             selected_parts = self._get_selected_sitemap_parts(len(sitemap_locs))
             if selected_parts:
                 self.logger.info(
                     f"Sitemap part filter active: processing parts {sorted(selected_parts)} only"
                 )
-             
-            self.logger.info(f"Found {len(sitemap_locs)} sub-sitemaps")
-             
-            # Process each compressed sitemap
-            for i, loc in enumerate(sitemap_locs, 1):
-                if selected_parts and i not in selected_parts:
-                    continue
-                sitemap_gz_url = loc.text.strip()
-                self.logger.info(f"Processing sitemap {i}/{len(sitemap_locs)}: {sitemap_gz_url}")
-                
-                try:
-                    # Download and decompress
-                    gz_response = self.make_request(sitemap_gz_url)
-                    if not gz_response:
-                        continue
-                    
-                    # Decompress gzip content
-                    decompressed = gzip.decompress(gz_response.content).decode('utf-8')
-
-                    # Regex parsing is faster than full DOM build on very large sitemap files.
-                    urls = re.findall(r"<loc>([^<]+)</loc>", decompressed)
-                    added = 0
-                    for raw_url in urls:
-                        url = self._normalize_url(raw_url)
-                        if not url:
-                            continue
-                        if not self._is_product_url(url):
-                            continue
-                        if url in seen_urls:
-                            continue
-                        seen_urls.add(url)
-                        product_urls.append(url)
-                        added += 1
-
-                    self.logger.info(f"Extracted {added} unique product URLs from this sitemap")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing sitemap {sitemap_gz_url}: {e}")
-                    continue
+                sitemap_locs = [
+                    child for i, child in enumerate(sitemap_locs, 1) if i in selected_parts
+                ]
+            
+            for raw_url, lastmod in crawler.iter_entries(sitemap_locs):
+                url = self._normalize_url(raw_url)
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    product_urls.append(url)
+                    self.record_lastmod(url, lastmod)
             
             self.logger.info(f"Total product URLs found: {len(product_urls)}")
             
@@ -178,7 +160,7 @@ class MeinHausShopScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title
             product_name = self._extract_text(soup, [
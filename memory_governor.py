@@ -0,0 +1,266 @@
+"""
+Memory-aware admission control (PIPELINE_MEMORY_LIMIT_MB).
+
+The governor reads the process RSS with psutil and turns it into an
+admission level between MIN_LEVEL and 1:
+
+- below SOFT_FRACTION of the limit the level is 1 (full capacity),
+- between SOFT_FRACTION and HARD_FRACTION it falls linearly,
+- above HARD_FRACTION it stays at MIN_LEVEL and gc.collect() runs.
+
+Callers scale their capacity with scale(): BaseScraper.run() its in-flight
+futures and CSV buffer, run_production_powerbi the number of scrapers
+running at once (run_admitted()). Capacity grows back as soon as RSS drops.
+
+Stages (stage() / begin() / end()) record start, end and peak RSS; the
+timeline is written to data/memory_timeline.csv (PIPELINE_MEMORY_TIMELINE)
+for sizing the Render instances.
+
+Usage:
+    governor = get_memory_governor()
+    with governor.stage("sanundo: scraping"):
+        limit = governor.scale(max_in_flight)
+"""
+import csv
+import gc
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+from config import DATA_DIR
+
+SOFT_FRACTION = 0.7
+HARD_FRACTION = 0.9
+MIN_LEVEL = 0.1
+SAMPLE_INTERVAL = 0.25   # seconds between RSS reads
+GC_INTERVAL = 5.0        # seconds between forced collections above the hard mark
+
+TIMELINE_COLUMNS = ["stage", "start_s", "end_s", "rss_start_mb", "rss_peak_mb", "rss_end_mb", "min_level"]
+
+logger = logging.getLogger("memory_governor")
+
+
+def process_rss_mb() -> float:
+    """Resident set size of this process in MB (0 without psutil)."""
+    if psutil is None:
+        return 0.0
+    return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+
+
+class MemoryGovernor:
+    """
+    Admission level from the process RSS, plus a per-stage memory timeline.
+
+    Args:
+        limit_mb: Memory budget in MB; None disables admission control
+            (level() is always 1) but stages are still recorded
+        rss_reader: Returns the current RSS in MB (process_rss_mb)
+        sample_interval: Seconds between RSS reads
+    """
+
+    def __init__(
+        self,
+        limit_mb: Optional[float] = None,
+        rss_reader: Callable[[], float] = process_rss_mb,
+        sample_interval: float = SAMPLE_INTERVAL,
+    ):
+        self.limit_mb = limit_mb if limit_mb and limit_mb > 0 else None
+        self.rss_reader = rss_reader
+        self.sample_interval = sample_interval
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._sampled_at = 0.0
+        self._rss = 0.0
+        self._level = 1.0
+        self._last_gc = 0.0
+        self.throttled_samples = 0
+        # Open stages by name, and every stage that was closed, in order.
+        self._open: Dict[str, Dict[str, float]] = {}
+        self.timeline: List[Dict[str, object]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit_mb is not None
+
+    def sample(self, force: bool = False) -> float:
+        """Read RSS (at most every sample_interval seconds) and update level and stages."""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._sampled_at < self.sample_interval:
+                return self._rss
+            self._sampled_at = now
+        rss = float(self.rss_reader())
+        level = self._level_for(rss)
+        collect = False
+        with self._lock:
+            if level < 1.0 and self._level == 1.0:
+                logger.warning(f"RSS {rss:.0f} MB near the {self.limit_mb:.0f} MB limit: admission level {level:.2f}")
+            elif level == 1.0 and self._level < 1.0:
+                logger.info(f"RSS {rss:.0f} MB: back to full capacity")
+            self._rss, self._level = rss, level
+            if level < 1.0:
+                self.throttled_samples += 1
+            if level <= MIN_LEVEL and now - self._last_gc >= GC_INTERVAL:
+                self._last_gc = now
+                collect = True
+            for record in self._open.values():
+                record["rss_peak_mb"] = max(record["rss_peak_mb"], rss)
+                record["min_level"] = min(record["min_level"], level)
+        if collect:
+            gc.collect()
+        return rss
+
+    def _level_for(self, rss: float) -> float:
+        if not self.enabled:
+            return 1.0
+        soft, hard = self.limit_mb * SOFT_FRACTION, self.limit_mb * HARD_FRACTION
+        if rss <= soft:
+            return 1.0
+        if rss >= hard:
+            return MIN_LEVEL
+        return max(MIN_LEVEL, 1.0 - (1.0 - MIN_LEVEL) * (rss - soft) / (hard - soft))
+
+    def level(self) -> float:
+        """Current admission level (1 = full capacity)."""
+        self.sample()
+        return self._level
+
+    def scale(self, capacity: int, minimum: int = 1) -> int:
+        """
+        Capacity allowed at the current level.
+
+        Args:
+            capacity: Capacity with enough headroom (in-flight futures, buffer rows, scrapers)
+            minimum: Never go below this, so work keeps moving
+        """
+        level = self.level()
+        if level >= 1.0:
+            return capacity
+        return max(minimum, min(capacity, int(round(capacity * level))))
+
+    def begin(self, name: str) -> None:
+        """Open a stage of the timeline."""
+        rss = self.sample(force=True)
+        with self._lock:
+            self._open[name] = {
+                "start_s": time.time() - self.started,
+                "rss_start_mb": rss,
+                "rss_peak_mb": rss,
+                "min_level": self._level,
+            }
+
+    def end(self, name: str) -> None:
+        """Close a stage and add it to the timeline."""
+        rss = self.sample(force=True)
+        with self._lock:
+            record = self._open.pop(name, None)
+            if record is None:
+                return
+            self.timeline.append({
+                "stage": name,
+                "start_s": round(record["start_s"], 2),
+                "end_s": round(time.time() - self.started, 2),
+                "rss_start_mb": round(record["rss_start_mb"], 1),
+                "rss_peak_mb": round(max(record["rss_peak_mb"], rss), 1),
+                "rss_end_mb": round(rss, 1),
+                "min_level": round(record["min_level"], 2),
+            })
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def write_timeline(self, path: Optional[Path] = None) -> Path:
+        """Write the closed stages to CSV; returns the path."""
+        path = Path(path or os.getenv("PIPELINE_MEMORY_TIMELINE") or DATA_DIR / "memory_timeline.csv")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            rows = list(self.timeline)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=TIMELINE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def summary(self) -> str:
+        peak = max((row["rss_peak_mb"] for row in self.timeline), default=self._rss)
+        limit = f"{self.limit_mb:.0f} MB limit" if self.enabled else "no limit"
+        return (
+            f"Memory: peak {peak:.0f} MB ({limit}), {len(self.timeline)} stages, "
+            f"{self.throttled_samples} throttled samples"
+        )
+
+
+_governor: Optional[MemoryGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_memory_governor() -> MemoryGovernor:
+    """The process-wide governor; PIPELINE_MEMORY_LIMIT_MB sets its limit on first use."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            limit = os.getenv("PIPELINE_MEMORY_LIMIT_MB")
+            _governor = MemoryGovernor(float(limit) if limit else None)
+        return _governor
+
+
+def configure_memory_governor(limit_mb: Optional[float], **kwargs) -> MemoryGovernor:
+    """Replace the process-wide governor (pipelines with their own default limit, tests)."""
+    global _governor
+    with _governor_lock:
+        _governor = MemoryGovernor(limit_mb, **kwargs)
+        return _governor
+
+
+def run_admitted(
+    jobs: Dict[str, Callable[[], object]],
+    capacity: int,
+    governor: Optional[MemoryGovernor] = None,
+    poll: float = 1.0,
+) -> Iterator[Tuple[str, Future]]:
+    """
+    Run jobs on threads, at most governor.scale(capacity) at a time.
+
+    Jobs start in order while there is headroom; under memory pressure the
+    next one waits until running jobs finish or RSS drops. With a limit set,
+    at most one job starts per poll, so the RSS of the jobs already running
+    is seen before the next is admitted.
+
+    Args:
+        jobs: Callables by name
+        capacity: Jobs running at once with enough headroom
+        governor: Admission level source (the process-wide governor)
+        poll: Seconds between headroom checks while jobs are waiting
+
+    Yields:
+        (name, future) as each job finishes
+    """
+    governor = governor or get_memory_governor()
+    queue = deque(jobs.items())
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max(capacity, 1)) as executor:
+        while queue or running:
+            while queue and len(running) < governor.scale(capacity):
+                name, job = queue.popleft()
+                running[executor.submit(job)] = name
+                if governor.enabled:
+                    break
+            done, _ = wait(set(running), timeout=poll if queue else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), future
@@ -0,0 +1,323 @@
+"""
+Pluggable HTML parser backends for BaseScraper.parse_html / parse_response.
+
+SCRAPER_PARSER selects the backend:
+    html.parser  BeautifulSoup with Python's built-in parser (default)
+    lxml         BeautifulSoup with the lxml C parser
+    selectolax   selectolax (lexbor) DOM behind a BeautifulSoup-compatible adapter
+
+The adapter covers the part of the BeautifulSoup API the scrapers use
+(select/select_one, find/find_all, get/attrs, get_text/text/string,
+parent/find_parent), so scrape_product() code and the _extract_text /
+_extract_image helpers run unchanged on every backend.
+"""
+import logging
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_LXML = False
+
+
+HTML_PARSER = "html.parser"
+LXML = "lxml"
+SELECTOLAX = "selectolax"
+PARSER_BACKENDS = (HTML_PARSER, LXML, SELECTOLAX)
+
+# BeautifulSoup's get_text() skips the contents of these tags.
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+logger = logging.getLogger(__name__)
+
+
+def available_backends() -> List[str]:
+    backends = [HTML_PARSER]
+    if HAS_LXML:
+        backends.append(LXML)
+    if LexborHTMLParser is not None:
+        backends.append(SELECTOLAX)
+    return backends
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend from the argument or SCRAPER_PARSER, falling back
+    to the next best installed one.
+    """
+    name = (name or os.getenv("SCRAPER_PARSER") or HTML_PARSER).strip().lower()
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown SCRAPER_PARSER '{name}', using {HTML_PARSER}")
+        return HTML_PARSER
+    if name == SELECTOLAX and LexborHTMLParser is None:
+        logger.warning("selectolax is not installed; using lxml")
+        name = LXML
+    if name == LXML and not HAS_LXML:
+        logger.warning("lxml is not installed; using html.parser")
+        name = HTML_PARSER
+    return name
+
+
+def build_document(markup: Union[str, bytes], backend: str, from_encoding: Optional[str] = None):
+    """
+    Parse markup with the given backend.
+
+    Args:
+        markup: HTML as text or raw bytes
+        backend: One of PARSER_BACKENDS
+        from_encoding: Encoding of byte markup, if known
+
+    Returns:
+        BeautifulSoup object, or SelectolaxNode for the selectolax backend
+    """
+    if backend == SELECTOLAX:
+        if isinstance(markup, bytes):
+            markup = _decode(markup, from_encoding)
+        return SelectolaxNode(LexborHTMLParser(markup).root)
+    if isinstance(markup, bytes):
+        return BeautifulSoup(markup, backend, from_encoding=from_encoding)
+    return BeautifulSoup(markup, backend)
+
+
+def _decode(markup: bytes, encoding: Optional[str]) -> str:
+    if encoding:
+        try:
+            return markup.decode(encoding, errors="replace")
+        except LookupError:
+            pass
+    try:
+        return markup.decode("utf-8")
+    except UnicodeDecodeError:
+        return markup.decode("cp1252", errors="replace")
+
+
+Matcher = Union[None, bool, str, re.Pattern, Callable[[Any], bool], List[str]]
+
+
+def _matches(value: Any, matcher: Matcher) -> bool:
+    """BeautifulSoup-style attribute/string matching."""
+    if matcher is None:
+        return True
+    if matcher is True:
+        return value is not None
+    if matcher is False:
+        return value is None
+    if callable(matcher) and not isinstance(matcher, re.Pattern):
+        return bool(matcher(value))
+    if value is None:
+        return False
+    values = value if isinstance(value, list) else [value]
+    if isinstance(matcher, re.Pattern):
+        return any(matcher.search(v) for v in values) or (
+            isinstance(value, list) and bool(matcher.search(" ".join(value)))
+        )
+    if isinstance(matcher, (list, tuple, set)):
+        return any(v in matcher for v in values)
+    return matcher in values or (isinstance(value, list) and matcher == " ".join(value))
+
+
+class TextMatch(str):
+    """A text node returned by find(text=...) / find_all(string=...)."""
+
+    def __new__(cls, value: str, node):
+        obj = super().__new__(cls, value)
+        obj._node = node
+        return obj
+
+    @property
+    def parent(self) -> Optional["SelectolaxNode"]:
+        parent = self._node.parent
+        return SelectolaxNode(parent) if parent is not None and parent.is_element_node else None
+
+    def find_parent(self, name: Optional[str] = None, attrs: Optional[Dict[str, Any]] = None, **kwargs):
+        parent = self.parent
+        if parent is None:
+            return None
+        if parent._is(name, attrs, kwargs):
+            return parent
+        return parent.find_parent(name, attrs, **kwargs)
+
+
+class SelectolaxNode:
+    """BeautifulSoup-compatible view of a selectolax node."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    # Attributes -----------------------------------------------------------
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        attrs = {}
+        for key, value in self._node.attributes.items():
+            value = "" if value is None else value
+            attrs[key] = value.split() if key == "class" else value
+        return attrs
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key: str) -> bool:
+        return key in self._node.attributes
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def __contains__(self, key: str) -> bool:
+        return self.has_attr(key)
+
+    # Text -----------------------------------------------------------------
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        node = self._node
+        if node.tag in _NON_TEXT_TAGS or node.css_first(",".join(_NON_TEXT_TAGS)) is None:
+            return node.text(deep=True, separator=separator, strip=strip)
+
+        pieces = []
+        for child in node.traverse(include_text=True):
+            if not child.is_text_node:
+                continue
+            parent = child.parent
+            if parent is not None and parent.tag in _NON_TEXT_TAGS and parent.mem_id != node.mem_id:
+                continue
+            text = child.text(deep=False)
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            pieces.append(text)
+        return separator.join(pieces)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> Optional[str]:
+        children = list(self._node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if child.is_text_node:
+            return TextMatch(child.text(deep=False), child)
+        return SelectolaxNode(child).string
+
+    # Navigation -----------------------------------------------------------
+
+    @property
+    def parent(self) -> Optional["SelectolaxNode"]:
+        parent = self._node.parent
+        if parent is None or not parent.is_element_node:
+            return None
+        return SelectolaxNode(parent)
+
+    def find_parent(self, name: Optional[str] = None, attrs: Optional[Dict[str, Any]] = None, **kwargs):
+        parent = self.parent
+        while parent is not None:
+            if parent._is(name, attrs, kwargs):
+                return parent
+            parent = parent.parent
+        return None
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def _is(self, name, attrs: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> bool:
+        if name is not None and not _matches(self._node.tag, name):
+            return False
+        wanted = dict(attrs or {})
+        wanted.update(kwargs)
+        if "class_" in wanted:
+            wanted["class"] = wanted.pop("class_")
+        if not wanted:
+            return True
+        own = self.attrs
+        return all(_matches(own.get(key), matcher) for key, matcher in wanted.items())
+
+    def find_all(
+        self,
+        name: Matcher = None,
+        attrs: Optional[Dict[str, Any]] = None,
+        recursive: bool = True,
+        string: Matcher = None,
+        limit: Optional[int] = None,
+        text: Matcher = None,
+        **kwargs
+    ) -> List[Any]:
+        string = string if string is not None else text
+        results: List[Any] = []
+
+        if name is None and not attrs and not kwargs and string is not None:
+            # Text search: BeautifulSoup returns the matching strings themselves.
+            for child in self._node.traverse(include_text=True):
+                if not child.is_text_node:
+                    continue
+                value = child.text(deep=False)
+                if _matches(value, string):
+                    results.append(TextMatch(value, child))
+                    if limit and len(results) >= limit:
+                        break
+            return results
+
+        if isinstance(name, str):
+            candidates = self._node.css(name)
+        else:
+            candidates = [n for n in self._node.traverse() if n.is_element_node and n.mem_id != self._node.mem_id]
+        own_id = self._node.mem_id
+        for node in candidates:
+            if not recursive:
+                parent = node.parent
+                if parent is None or parent.mem_id != own_id:
+                    continue
+            element = SelectolaxNode(node)
+            if not element._is(name, attrs, kwargs):
+                continue
+            if string is not None and not _matches(element.string, string):
+                continue
+            results.append(element)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def find(self, name: Matcher = None, attrs: Optional[Dict[str, Any]] = None, **kwargs):
+        results = self.find_all(name, attrs, limit=1, **kwargs)
+        return results[0] if results else None
+
+    # Misc -----------------------------------------------------------------
+
+    def decompose(self) -> None:
+        self._node.decompose()
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SelectolaxNode) and other._node.mem_id == self._node.mem_id
+
+    def __hash__(self) -> int:
+        return hash(self._node.mem_id)
+
+    def __str__(self) -> str:
+        return self._node.html or ""
+
+    __repr__ = __str__
@@ -44,7 +44,7 @@ class PriwattScraper(BaseScraper):
         response = self.make_request(sitemap_url)
         
         if response:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             locs = soup.find_all('loc')
             
             for loc in locs:
@@ -85,7 +85,7 @@ class PriwattScraper(BaseScraper):
             response = self.make_request(category_url)
             
             if response:
-                soup = self.parse_html(response.text)
+                soup = self.parse_response(response)
                 
                 # Find all links
                 all_links = soup.find_all('a', href=True)
@@ -127,7 +127,7 @@ class PriwattScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name (try multiple selectors)
             product_name = self._extract_text(soup, [
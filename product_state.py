@@ -0,0 +1,222 @@
+"""
+Per-scraper product state for incremental runs (SCRAPER_INCREMENTAL=1).
+
+A SQLite file under DATA_DIR/state/ remembers, for every product URL, the
+sitemap lastmod seen when it was last scraped successfully and the product
+data extracted then. An incremental run only scrapes URLs whose lastmod is
+new or changed and carries the stored rows of the others into the CSV.
+Every SCRAPER_FULL_REFRESH_DAYS the whole catalogue is scraped again, for
+shops whose lastmod cannot be trusted.
+
+Listing-extraction runs (SCRAPER_LISTING_EXTRACT=1) use the same store: a
+category tile supplies the current price, the stored product page the rest,
+until the page is due again (SCRAPER_LISTING_REFRESH_DAYS).
+
+Runs with a deadline (SCRAPER_TIME_BUDGET_MINUTES) order their URLs with
+rank(): never-seen products, then products whose price changed within
+SCRAPER_VOLATILE_DAYS, then the rest, least recently scraped first.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import DATA_DIR
+
+
+# Half a day below the weekly cron period, so start-time jitter does not
+# push the full refresh of a weekly run to the week after.
+DEFAULT_FULL_REFRESH_DAYS = 6.5
+DEFAULT_LISTING_REFRESH_DAYS = 14.0
+DEFAULT_VOLATILE_DAYS = 14.0
+
+
+def product_state_path(scraper_name: str) -> Path:
+    return Path(DATA_DIR) / "state" / f"{scraper_name}.sqlite"
+
+
+def page_refresh_due(url: str, scraped_at: float, interval_days: float, now: Optional[float] = None) -> bool:
+    """
+    True when the product page of a listing-extracted URL should be fetched again.
+
+    Each URL comes due between half and the full interval after its last
+    extraction, at a point fixed by its hash. A catalogue scraped in one run
+    is therefore re-fetched spread over several runs, not all on one day.
+    """
+    digest = hashlib.sha1(url.encode("utf-8")).digest()
+    fraction = int.from_bytes(digest[:4], "big") / 2 ** 32
+    now = time.time() if now is None else now
+    return now - scraped_at >= interval_days * 86400 * (0.5 + 0.5 * fraction)
+
+
+def _gross_price(product_data: Dict[str, Any]) -> str:
+    """Gross price of stored product data, as scraped ("price_gross") or as a CSV row."""
+    return str(product_data.get("price_gross") or product_data.get("Preis_Brutto") or "")
+
+
+class ProductStateStore:
+    """
+    SQLite store of (url, lastmod, product data). Safe to share between threads.
+
+    Args:
+        scraper_name: Scraper the state belongs to
+        path: Database file (default: DATA_DIR/state/<scraper_name>.sqlite)
+    """
+
+    def __init__(self, scraper_name: str, path: Optional[Path] = None):
+        self.path = Path(path or product_state_path(scraper_name))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Shards of one scraper (SCRAPER_SHARD) may write to the store at once.
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                " url TEXT PRIMARY KEY,"
+                " lastmod TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " scraped_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            # Stores written before deadline runs existed have no price history.
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(products)")}
+            if "price_changed_at" not in columns:
+                self._conn.execute("ALTER TABLE products ADD COLUMN price_changed_at REAL")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Full refresh -----------------------------------------------------------
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def full_refresh_due(self, interval_days: float, now: Optional[float] = None) -> bool:
+        """True when no full run is on record or the last one is older than the interval."""
+        last = self._get_meta("last_full_refresh")
+        if last is None:
+            return True
+        now = time.time() if now is None else now
+        return now - float(last) >= interval_days * 86400
+
+    def mark_full_refresh(self, now: Optional[float] = None) -> None:
+        """Record a full run; pass its start time, which the next run's start is compared with."""
+        self._set_meta("last_full_refresh", str(time.time() if now is None else now))
+
+    # Products -------------------------------------------------------------
+
+    def save(self, url: str, lastmod: str, product_data: Dict[str, Any]) -> None:
+        """
+        Remember a successful extraction together with the lastmod it belongs to.
+
+        The time of the last gross price change is kept for rank().
+        """
+        data = json.dumps(product_data, ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data, price_changed_at FROM products WHERE url = ?", (url,)
+            ).fetchone()
+            price_changed_at = None
+            if row is not None:
+                price_changed_at = row[1]
+                old_price = _gross_price(json.loads(row[0]))
+                if old_price and old_price != _gross_price(product_data):
+                    price_changed_at = now
+            self._conn.execute(
+                "INSERT OR REPLACE INTO products (url, lastmod, data, scraped_at, price_changed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, lastmod or "", data, now, price_changed_at),
+            )
+
+    def split(
+        self, urls: Iterable[str], lastmods: Dict[str, str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Partition URLs into (to_scrape, unchanged).
+
+        A URL is unchanged when the sitemap gives a lastmod and it equals the
+        one stored with the last successful extraction.
+        """
+        to_scrape, unchanged = [], []
+        with self._lock:
+            for url in urls:
+                lastmod = lastmods.get(url, "")
+                if lastmod:
+                    row = self._conn.execute(
+                        "SELECT lastmod FROM products WHERE url = ?", (url,)
+                    ).fetchone()
+                    if row is not None and row[0] == lastmod:
+                        unchanged.append(url)
+                        continue
+                to_scrape.append(url)
+        return to_scrape, unchanged
+
+    def rank(
+        self, urls: Iterable[str], volatile_days: float, now: Optional[float] = None
+    ) -> Tuple[List[str], Dict[str, int]]:
+        """
+        Order URLs by the value of scraping them within a limited time.
+
+        Args:
+            urls: URLs of this run, in discovery order
+            volatile_days: A price change this recent makes a product volatile
+            now: Current time (default: time.time())
+
+        Returns:
+            (URLs: never seen, volatile, then the rest by oldest scrape;
+            counts per group)
+        """
+        now = time.time() if now is None else now
+        new, volatile, rest = [], [], []
+        with self._lock:
+            for url in urls:
+                row = self._conn.execute(
+                    "SELECT scraped_at, price_changed_at FROM products WHERE url = ?", (url,)
+                ).fetchone()
+                if row is None:
+                    new.append(url)
+                elif row[1] is not None and now - row[1] <= volatile_days * 86400:
+                    volatile.append(url)
+                else:
+                    rest.append((row[0], url))
+        rest.sort(key=lambda item: item[0])
+        counts = {"new": len(new), "volatile": len(volatile), "rest": len(rest)}
+        return new + volatile + [url for _, url in rest], counts
+
+    def stored(self, url: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(product data, scraped_at) of the last successful extraction, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, scraped_at FROM products WHERE url = ?", (url,)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row is not None else None
+
+    def iter_products(self, urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Stored product data for the given URLs (URLs without data are skipped)."""
+        for url in urls:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM products WHERE url = ?", (url,)
+                ).fetchone()
+            if row is not None:
+                yield json.loads(row[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
@@ -6,13 +6,13 @@ Strategy: Scrape from category pages using cloudscraper
 """
 import sys
 import re
-import time
 import os
-from typing import List, Dict, Optional, Any
-from bs4 import BeautifulSoup
+from typing import Iterator, List, Dict, Optional, Any
 import cloudscraper
 from base_scraper import BaseScraper
+from category_crawler import MAGENTO_TILES, CategoryCrawler, read_tiles
 from google_sheets_helper import push_data
+from magento_graphql import MagentoGraphQL
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -24,6 +24,9 @@ class Pumpe24Scraper(BaseScraper):
     Scraper for Pumpe24 using cloudscraper to bypass Cloudflare protection.
     """
     
+    # Cloudflare cookies are bound to the cloudscraper session.
+    async_fetch_supported = False
+    
     def __init__(self):
         super().__init__(SCRAPER_NAME)
         
@@ -88,7 +91,10 @@ class Pumpe24Scraper(BaseScraper):
         ]
         for warmup_url in warmup_urls:
             try:
-                response = self.scraper.get(
+                # Through _send_request so warm-ups respect the circuit breaker.
+                response = self._send_request(
+                    self.scraper,
+                    "GET",
                     warmup_url,
                     headers=self.request_headers,
                     timeout=20,
@@ -109,7 +115,9 @@ class Pumpe24Scraper(BaseScraper):
         attempts = kwargs.pop("attempts", 3)
         for attempt in range(1, attempts + 1):
             try:
-                response = self.scraper.get(
+                response = self._send_request(
+                    self.scraper,
+                    "GET",
                     url,
                     timeout=30,
                     headers=request_headers,
@@ -119,21 +127,27 @@ class Pumpe24Scraper(BaseScraper):
 
                 if response.status_code == 403:
                     self.logger.warning(f"403 for {url} (attempt {attempt}/{attempts})")
+                    if attempt == attempts or not self._backoff_before_retry(
+                        attempt - 1, response, base_delay=1.5
+                    ):
+                        self._fetch_failed(url)
+                        break
                     # Refresh cookies before next retry
                     self._warm_up_session()
-                    time.sleep(1.5 * attempt)
                     continue
 
                 response.raise_for_status()
                 return response
             except Exception as e:
-                if attempt == attempts:
+                if attempt == attempts or not self._backoff_before_retry(
+                    attempt - 1, getattr(e, "response", None), base_delay=1.0
+                ):
                     self.logger.error(f"Request failed for {url}: {e}")
-                else:
-                    self.logger.warning(
-                        f"Request retry for {url} after error (attempt {attempt}/{attempts}): {e}"
-                    )
-                    time.sleep(1.0 * attempt)
+                    self._fetch_failed(url, e)
+                    break
+                self.logger.warning(
+                    f"Request retry for {url} after error (attempt {attempt}/{attempts}): {e}"
+                )
         return None
 
     def _is_product_url(self, url: str) -> bool:
@@ -179,7 +193,7 @@ class Pumpe24Scraper(BaseScraper):
         if not sitemap_response:
             return []
 
-        soup = BeautifulSoup(sitemap_response.text, "xml")
+        soup = self.parse_response(sitemap_response, "xml")
         sitemap_locs = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
         if not sitemap_locs:
             return []
@@ -205,7 +219,7 @@ class Pumpe24Scraper(BaseScraper):
             if not sub_response:
                 continue
 
-            sub_soup = BeautifulSoup(sub_response.text, "xml")
+            sub_soup = self.parse_response(sub_response, "xml")
             for loc in sub_soup.find_all("loc"):
                 url = loc.get_text(strip=True)
                 if self._is_product_url(url) and url not in seen:
@@ -220,46 +234,41 @@ class Pumpe24Scraper(BaseScraper):
         """
         Get product URLs by scraping category pages and finding actual products.
         """
-        product_urls = []
-        seen = set()
+        return list(self.iter_product_urls(max_urls))
+
+    def iter_product_urls(self, max_urls: int = None) -> Iterator[str]:
+        """
+        Yield product URLs from all listing pages of the categories (?p=2, ...),
+        several pages at once; falls back to the sitemap when none are found.
+        """
+        found = 0
         
         try:
-            self.logger.info(f"Scraping {len(self.category_urls)} category pages...")
+            self.logger.info(f"Scraping {len(self.category_urls)} categories...")
             
-            for i, category_url in enumerate(self.category_urls, 1):
-                self.logger.info(f"[{i}/{len(self.category_urls)}] Scraping category: {category_url}")
-                
-                response = self.make_request(category_url)
-                if not response:
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find product links (Magento structure)
-                # Look for actual product item links (not subcategories)
-                product_links = soup.select('a.product-item-link')
-                
-                for link in product_links:
-                    href = link.get('href', '')
-                    if self._is_product_url(href) and href not in seen:
-                        seen.add(href)
-                        product_urls.append(href)
-                
-                self.logger.info(f"  Found {len(product_links)} links, {len(product_urls)} total products")
-                
-                if max_urls and len(product_urls) >= max_urls:
+            crawler = CategoryCrawler(
+                self,
+                product_links=self._listing_product_links,
+                tiles=self._listing_tiles,
+            )
+            for url in crawler.iter_products(self.category_urls):
+                if max_urls and found >= max_urls:
                     break
-                
-                time.sleep(2)
+                found += 1
+                yield url
             
-            if not product_urls:
+            if not found:
                 product_urls = self._get_product_urls_from_sitemap(max_urls=max_urls)
+                if max_urls:
+                    product_urls = product_urls[:max_urls]
                 if product_urls:
                     self.logger.info(f"Sitemap fallback found {len(product_urls)} products")
+                found = len(product_urls)
+                yield from product_urls
 
-            self.logger.info(f"Total product URLs found: {len(product_urls)}")
+            self.logger.info(f"Total product URLs found: {found}")
 
-            if not product_urls and not self.proxy:
+            if not found and not self.proxy:
                 self.logger.warning(
                     "No product URLs found and no proxy configured. "
                     "Pumpe24 may block Render datacenter IPs. "
@@ -268,8 +277,31 @@ class Pumpe24Scraper(BaseScraper):
             
         except Exception as e:
             self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
-        
-        return product_urls[:max_urls] if max_urls else product_urls
+
+    def _listing_product_links(self, soup, page_url: str) -> List[str]:
+        """
+        Product item links on a category page (Magento structure), not subcategories.
+        """
+        links = []
+        for link in soup.select('a.product-item-link'):
+            href = link.get('href', '')
+            if self._is_product_url(href):
+                links.append(href)
+        return links
+
+    def _listing_tiles(self, soup, page_url: str) -> List[Dict[str, str]]:
+        """Name, price and image from the category tiles (listing extraction)."""
+        return read_tiles(
+            soup,
+            page_url,
+            clean_price=self._clean_price,
+            normalize_url=lambda url: url if self._is_product_url(url) else "",
+            **MAGENTO_TILES,
+        )
+
+    def bulk_source(self) -> MagentoGraphQL:
+        """Products from the Magento GraphQL catalogue (SCRAPER_BULK_SOURCE=1)."""
+        return MagentoGraphQL(self, self.base_url)
     
     def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrape individual product page."""
@@ -278,7 +310,7 @@ class Pumpe24Scraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title (Magento structure)
             product_name = self._extract_text(soup, [
@@ -416,9 +448,20 @@ class Pumpe24Scraper(BaseScraper):
         price = re.sub(r'[^\d,.]', '', price_str)
         return price.strip()
     
-    def run(self, max_products: int = None, concurrent_workers: int = 10) -> int:
+    def run(
+        self,
+        max_products: int = None,
+        concurrent_workers: int = 10,
+        engine: str = None,
+        deadline: float = None,
+    ) -> int:
         """Run using the bounded-concurrency logic from BaseScraper."""
-        return super().run(max_products=max_products, concurrent_workers=concurrent_workers)
+        return super().run(
+            max_products=max_products,
+            concurrent_workers=concurrent_workers,
+            engine=engine,
+            deadline=deadline,
+        )
 
 
 def main():
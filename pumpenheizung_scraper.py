@@ -3,7 +3,6 @@ Pumpen-Heizung Scraper (HTTP only, no Selenium).
 Website: https://pumpen-heizung.de
 Strategy: crawl sitemap first, then fall back to homepage/category link discovery.
 """
-import json
 import re
 import sys
 from typing import Any, Dict, List, Optional
@@ -14,6 +13,8 @@ from bs4 import BeautifulSoup
 from base_scraper import BaseScraper
 from config import SCRAPER_CONFIGS, SHEET_IDS
 from google_sheets_helper import push_data
+from json_ld import missing_fields as missing_json_ld_fields
+from sitemap_stream import SitemapCrawler
 
 
 SCRAPER_NAME = "pumpenheizung"
@@ -116,41 +117,24 @@ class PumpenheizungScraper(BaseScraper):
     def _extract_urls_from_sitemap(self, max_urls: Optional[int] = None) -> List[str]:
         product_urls = []
         seen_products = set()
-        visited_sitemaps = set()
-        queue = [self.sitemap_url]
-        max_sitemaps = 120
-
-        while queue and len(visited_sitemaps) < max_sitemaps:
-            sitemap = queue.pop(0)
-            if sitemap in visited_sitemaps:
-                continue
-            visited_sitemaps.add(sitemap)
+        crawler = SitemapCrawler(
+            self,
+            is_sitemap=lambda loc: loc.lower().endswith(".xml") or "sitemap" in loc.lower(),
+            normalize_sitemap=self._normalize_url,
+            max_sitemaps=120,
+        )
 
-            response = self.make_request(sitemap)
-            if not response:
+        for loc, lastmod in crawler.iter_entries([self.sitemap_url]):
+            url = self._normalize_url(loc)
+            if not url:
                 continue
 
-            soup = BeautifulSoup(response.text, "xml")
-            locs = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
-
-            for loc in locs:
-                loc_lower = loc.lower()
-
-                if loc_lower.endswith(".xml") or "sitemap" in loc_lower:
-                    sitemap_candidate = self._normalize_url(loc)
-                    if sitemap_candidate and sitemap_candidate not in visited_sitemaps:
-                        queue.append(sitemap_candidate)
-                    continue
-
-                normalized = self._normalize_url(loc)
-                if not normalized:
-                    continue
-
-                if self._is_product_url(normalized) and normalized not in seen_products:
-                    seen_products.add(normalized)
-                    product_urls.append(normalized)
-                    if max_urls and len(product_urls) >= max_urls:
-                        return product_urls
+            if self._is_product_url(url) and url not in seen_products:
+                seen_products.add(url)
+                product_urls.append(url)
+                self.record_lastmod(url, lastmod)
+                if max_urls and len(product_urls) >= max_urls:
+                    break
 
         return product_urls
 
@@ -171,7 +155,7 @@ class PumpenheizungScraper(BaseScraper):
         if not response:
             return []
 
-        homepage = self.parse_html(response.text)
+        homepage = self.parse_response(response)
         all_links = self._extract_internal_links(homepage)
 
         product_urls = []
@@ -201,7 +185,7 @@ class PumpenheizungScraper(BaseScraper):
             if not page_response:
                 continue
 
-            page_soup = self.parse_html(page_response.text)
+            page_soup = self.parse_response(page_response)
             for link in self._extract_internal_links(page_soup):
                 if self._is_product_url(link) and link not in seen_products:
                     seen_products.add(link)
@@ -320,99 +304,10 @@ class PumpenheizungScraper(BaseScraper):
         except ValueError:
             return ""
 
-    def _extract_product_from_json_ld(self, soup: BeautifulSoup) -> Dict[str, str]:
-        result = {
-            "name": "",
-            "manufacturer": "",
-            "article_number": "",
-            "price_gross": "",
-            "ean": "",
-            "image": "",
-            "category": "",
-        }
-
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
-            raw = script.string or script.get_text(strip=True)
-            if not raw:
-                continue
-
-            try:
-                payload = json.loads(raw)
-            except Exception:
-                continue
-
-            candidates = []
-            if isinstance(payload, dict):
-                candidates.append(payload)
-                graph = payload.get("@graph")
-                if isinstance(graph, list):
-                    candidates.extend(item for item in graph if isinstance(item, dict))
-            elif isinstance(payload, list):
-                candidates.extend(item for item in payload if isinstance(item, dict))
-
-            for item in candidates:
-                type_value = item.get("@type", "")
-                if isinstance(type_value, list):
-                    is_product = any(str(t).lower() == "product" for t in type_value)
-                else:
-                    is_product = str(type_value).lower() == "product"
-
-                if not is_product:
-                    continue
-
-                name = item.get("name")
-                if isinstance(name, str):
-                    result["name"] = name.strip()
-
-                brand = item.get("brand")
-                if isinstance(brand, dict):
-                    result["manufacturer"] = str(brand.get("name", "")).strip()
-                elif isinstance(brand, str):
-                    result["manufacturer"] = brand.strip()
-
-                result["article_number"] = str(
-                    item.get("sku") or item.get("mpn") or item.get("productID") or ""
-                ).strip()
-
-                result["ean"] = str(
-                    item.get("gtin13")
-                    or item.get("gtin14")
-                    or item.get("gtin12")
-                    or item.get("gtin8")
-                    or ""
-                ).strip()
-
-                image = item.get("image")
-                if isinstance(image, list) and image:
-                    result["image"] = str(image[0]).strip()
-                elif isinstance(image, str):
-                    result["image"] = image.strip()
-
-                result["category"] = str(item.get("category", "")).strip()
-
-                offers = item.get("offers")
-                if isinstance(offers, list) and offers:
-                    offers = offers[0]
-                if isinstance(offers, dict):
-                    price = offers.get("price")
-                    if price is not None:
-                        result["price_gross"] = self._clean_price(str(price))
-
-                return result
-
-        return result
-
-    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
-        response = self.make_request(url)
-        if not response:
-            return None
-
-        try:
-            soup = self.parse_html(response.text)
-            json_ld = self._extract_product_from_json_ld(soup)
-
-            product_name = json_ld["name"] or self._extract_text(
+    def _fill_from_html(self, fields: Dict[str, str], soup: BeautifulSoup) -> None:
+        """Fill the fields JSON-LD left empty from the product page markup."""
+        if not fields["name"]:
+            fields["name"] = self._extract_text(
                 soup,
                 [
                     "h1[itemprop='name']",
@@ -421,10 +316,9 @@ class PumpenheizungScraper(BaseScraper):
                     "h1",
                 ],
             )
-            if not product_name:
-                return None
 
-            manufacturer = json_ld["manufacturer"] or self._extract_text(
+        if not fields["manufacturer"]:
+            fields["manufacturer"] = self._extract_text(
                 soup,
                 [
                     "[itemprop='brand'] [itemprop='name']",
@@ -434,7 +328,8 @@ class PumpenheizungScraper(BaseScraper):
                 ],
             )
 
-            category = json_ld["category"] or self._extract_text(
+        if not fields["category"]:
+            fields["category"] = self._extract_text(
                 soup,
                 [
                     "ul.breadcrumb li:nth-last-child(2) a",
@@ -443,7 +338,8 @@ class PumpenheizungScraper(BaseScraper):
                 ],
             )
 
-            article_number = json_ld["article_number"] or self._extract_text(
+        if not fields["article_number"]:
+            fields["article_number"] = self._extract_text(
                 soup,
                 [
                     "span[itemprop='sku']",
@@ -453,27 +349,25 @@ class PumpenheizungScraper(BaseScraper):
                 ],
             )
 
-            price_gross = json_ld["price_gross"]
-            if not price_gross:
-                price_raw = self._extract_text(
-                    soup,
-                    [
-                        "span[itemprop='price']",
-                        "meta[itemprop='price']",
-                        "span.price",
-                        "div.price",
-                    ],
-                )
-                if not price_raw:
-                    all_text = soup.get_text(" ", strip=True)
-                    match = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}(?:\s*EUR)?", all_text)
-                    if match:
-                        price_raw = match.group(0)
-                price_gross = self._clean_price(price_raw)
-
-            price_net = self._calc_net_price(price_gross)
-
-            ean = json_ld["ean"] or self._extract_text(
+        if not fields["price_gross"]:
+            price_raw = self._extract_text(
+                soup,
+                [
+                    "span[itemprop='price']",
+                    "meta[itemprop='price']",
+                    "span.price",
+                    "div.price",
+                ],
+            )
+            if not price_raw:
+                all_text = soup.get_text(" ", strip=True)
+                match = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}(?:\s*EUR)?", all_text)
+                if match:
+                    price_raw = match.group(0)
+            fields["price_gross"] = self._clean_price(price_raw)
+
+        if not fields["ean"]:
+            fields["ean"] = self._extract_text(
                 soup,
                 [
                     "span[itemprop='gtin13']",
@@ -483,7 +377,8 @@ class PumpenheizungScraper(BaseScraper):
                 ],
             )
 
-            product_image = json_ld["image"] or self._extract_image(
+        if not fields["image"]:
+            fields["image"] = self._extract_image(
                 soup,
                 [
                     "meta[property='og:image']",
@@ -493,16 +388,31 @@ class PumpenheizungScraper(BaseScraper):
                 ],
             )
 
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        try:
+            fields = self.extract_json_ld(response)
+            fields["price_gross"] = self._clean_price(fields["price_gross"])
+            # The DOM is only built when JSON-LD lacks a field the markup can fill.
+            if missing_json_ld_fields(fields):
+                self._fill_from_html(fields, self.parse_response(response))
+
+            product_name = fields["name"]
+            if not product_name:
+                return None
+
+            price_gross = fields["price_gross"]
+            price_net = self._calc_net_price(price_gross)
+
             return {
-                "manufacturer": manufacturer,
-                "category": category,
+                "manufacturer": fields["manufacturer"],
+                "category": fields["category"],
                 "name": product_name,
                 "title": product_name,
-                "article_number": article_number,
+                "article_number": fields["article_number"],
                 "price_net": price_net,
                 "price_gross": price_gross,
-                "ean": ean,
-                "product_image": product_image,
+                "ean": fields["ean"],
+                "product_image": fields["image"],
                 "product_url": self._normalize_url(url) or url,
             }
 
@@ -0,0 +1,172 @@
+"""
+Per-host adaptive rate limiting (token bucket + AIMD).
+
+One limiter exists per host and is shared by every worker thread (and every
+scraper) talking to that host. The request rate grows additively while the
+shop answers quickly and without errors, and is cut multiplicatively on
+429/503/timeouts, so each shop settles near the highest rate it tolerates.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_INITIAL_RATE = 5.0    # requests per second
+DEFAULT_MAX_RATE = 20.0       # ceiling when SCRAPER_CONFIGS has no delay_override
+DEFAULT_MIN_RATE = 0.2
+DEFAULT_RATE_STEP = 1.0       # additive increase, requests/sec per second of healthy traffic
+
+THROTTLE_FACTOR = 0.5         # 429 / 503 / timeout
+ERROR_FACTOR = 0.8            # other server errors and connection failures
+SLOW_FACTOR = 0.9             # latency well above the host's baseline
+LATENCY_TOLERANCE = 3.0       # "slow" = EWMA latency above baseline * tolerance
+DECREASE_COOLDOWN = 1.0       # seconds; in-flight failures of one burst count once
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate is adjusted with AIMD.
+
+    Args:
+        host: Host name this limiter protects (for log output)
+        initial_rate: Starting rate in requests per second
+        max_rate: Ceiling the rate never exceeds
+        min_rate: Floor the rate never drops below
+        step: Additive increase per second of healthy responses
+    """
+
+    def __init__(
+        self,
+        host: str,
+        initial_rate: float = DEFAULT_INITIAL_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        min_rate: float = DEFAULT_MIN_RATE,
+        step: float = DEFAULT_RATE_STEP,
+    ):
+        self.host = host
+        self.max_rate = max(max_rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = min(max(initial_rate, min_rate), self.max_rate)
+        self.step = step
+
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._latency_ewma: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.wait_time = 0.0
+
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before sending.
+        Non-blocking, so it can be used from threads and from asyncio alike.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            self.requests += 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative balance queues the caller behind everyone already waiting.
+            delay = -self._tokens / self.rate
+            self.wait_time += delay
+            return delay
+
+    def acquire(self) -> None:
+        """Block until the next request to this host may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * factor)
+        self._tokens = min(self._tokens, 0.0)
+
+    def record_success(self, latency: float) -> None:
+        """Additive increase, unless the host is getting noticeably slower."""
+        with self._lock:
+            if self._latency_ewma is None:
+                self._latency_ewma = latency
+            else:
+                self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+            if self._latency_baseline is None or self._latency_ewma < self._latency_baseline:
+                self._latency_baseline = self._latency_ewma
+
+            if self._latency_ewma > self._latency_baseline * LATENCY_TOLERANCE and self._latency_ewma > 0.5:
+                self._decrease(SLOW_FACTOR)
+                return
+
+            # Roughly +step req/s for every second spent at the current rate.
+            self.rate = min(self.max_rate, self.rate + self.step / max(self.rate, 1.0))
+
+    def record_throttle(self) -> None:
+        """Multiplicative decrease for 429 / 503 / timeouts."""
+        with self._lock:
+            self.throttled += 1
+            self._decrease(THROTTLE_FACTOR)
+
+    def record_error(self) -> None:
+        """Gentler decrease for other server errors and connection failures."""
+        with self._lock:
+            self.errors += 1
+            self._decrease(ERROR_FACTOR)
+
+    def summary(self) -> str:
+        return (
+            f"Rate limiter {self.host}: {self.rate:.1f} req/s "
+            f"(ceiling {self.max_rate:.1f}), {self.requests} requests, "
+            f"{self.throttled} throttled, {self.errors} errors, "
+            f"{self.wait_time:.1f}s waited"
+        )
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def get_host_limiter(url: str, delay_override: Optional[float] = None) -> AdaptiveRateLimiter:
+    """
+    Return the shared limiter for the URL's host, creating it on first use.
+
+    Args:
+        url: Any URL on the host
+        delay_override: Minimum seconds between requests for this site
+            (SCRAPER_CONFIGS[...]["delay_override"]); sets the rate ceiling
+    """
+    host = host_of(url)
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            max_rate = float(os.getenv("SCRAPER_RATE_MAX", DEFAULT_MAX_RATE))
+            if delay_override:
+                max_rate = min(max_rate, 1.0 / float(delay_override))
+            limiter = AdaptiveRateLimiter(
+                host,
+                initial_rate=float(os.getenv("SCRAPER_RATE_INITIAL", DEFAULT_INITIAL_RATE)),
+                max_rate=max_rate,
+                min_rate=float(os.getenv("SCRAPER_RATE_MIN", DEFAULT_MIN_RATE)),
+                step=float(os.getenv("SCRAPER_RATE_STEP", DEFAULT_RATE_STEP)),
+            )
+            _limiters[host] = limiter
+        return limiter
@@ -0,0 +1,127 @@
+"""
+Retry backoff and per-run retry budget.
+
+Backoff is exponential with jitter and honours Retry-After, so threads that
+failed together do not come back together. The budget caps retries at a
+fraction of all requests sent in the run: once a host is failing broadly,
+retries stop and the run finishes instead of multiplying the load.
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+DEFAULT_BUDGET_RATIO = 0.1      # retries may not exceed 10% of requests sent
+DEFAULT_BUDGET_MIN = 20         # small runs still get a few retries
+DEFAULT_BACKOFF_MAX = 60.0      # seconds, cap for the exponential part
+DEFAULT_RETRY_AFTER_MAX = 120.0 # seconds, cap for server-provided Retry-After
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float = DEFAULT_BACKOFF_MAX,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Seconds to wait before retry number ``attempt + 1``.
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+        base_delay: Delay for the first retry
+        max_delay: Cap for the exponential delay
+        retry_after: Server-provided Retry-After in seconds, if any
+
+    Returns:
+        Delay in seconds ("equal jitter": half fixed, half random)
+    """
+    ceiling = min(max_delay, base_delay * (2 ** attempt))
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+    if retry_after is not None:
+        # Never retry earlier than the server asked; a little jitter spreads the herd.
+        delay = max(delay, retry_after + random.uniform(0, base_delay))
+    return delay
+
+
+class RetryBudget:
+    """
+    Thread-safe retry allowance for one run.
+
+    Args:
+        ratio: Retries allowed per request sent
+        min_retries: Retries always allowed regardless of the ratio
+    """
+
+    def __init__(self, ratio: float = DEFAULT_BUDGET_RATIO, min_retries: int = DEFAULT_BUDGET_MIN):
+        self.ratio = max(ratio, 0.0)
+        self.min_retries = max(min_retries, 0)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self.backoff_time = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RetryBudget":
+        return cls(
+            ratio=float(os.getenv("SCRAPER_RETRY_BUDGET", DEFAULT_BUDGET_RATIO)),
+            min_retries=int(os.getenv("SCRAPER_RETRY_BUDGET_MIN", DEFAULT_BUDGET_MIN)),
+        )
+
+    @property
+    def allowance(self) -> int:
+        return max(self.min_retries, int(self.requests * self.ratio))
+
+    @property
+    def exhausted(self) -> bool:
+        return self.retries >= self.allowance
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False once it is used up."""
+        with self._lock:
+            if self.retries >= self.allowance:
+                self.denied += 1
+                return False
+            self.retries += 1
+            return True
+
+    def record_backoff(self, seconds: float) -> None:
+        with self._lock:
+            self.backoff_time += seconds
+
+    def summary(self) -> str:
+        text = (
+            f"Retries: {self.retries}/{self.allowance} allowed for {self.requests} requests, "
+            f"{self.backoff_time:.1f}s backing off"
+        )
+        if self.denied:
+            text += f", {self.denied} retries skipped (budget exhausted)"
+        return text
@@ -6,28 +6,17 @@ import multiprocessing
 import time
 from datetime import datetime
 
-# Import all scrapers
-from meinhausshop_scraper import MeinHausShopScraper
-from heima24_scraper import Heima24Scraper
-from sanundo_scraper import SanundoScraper
-from heizungsdiscount24_scraper import Heizungsdiscount24Scraper
-from wolfonlineshop_scraper import WolfonlineshopScraper
-from st_shop24_scraper import StShop24Scraper
-from selfio_scraper import SelfioScraper
-from pumpe24_scraper import Pumpe24Scraper
-from wasserpumpe_scraper import WasserpumpeScraper
-
 from google_sheets_helper import push_data
 from config import SHEET_IDS, CONCURRENT_WORKERS
+from scraper_registry import create_scraper
 
 
-def run_scraper(scraper_name, scraper_class, max_products=None):
+def run_scraper(scraper_name, max_products=None):
     """
     Run a single scraper and push to Google Sheets
     
     Args:
-        scraper_name: Name of the scraper
-        scraper_class: Scraper class to instantiate
+        scraper_name: Name of the scraper (imported in the worker process)
         max_products: Maximum products to scrape (None for all)
     """
     start_time = time.time()
@@ -38,7 +27,7 @@ def run_scraper(scraper_name, scraper_class, max_products=None):
         print(f"{'='*70}")
         
         # Initialize and run scraper
-        scraper = scraper_class()
+        scraper = create_scraper(scraper_name)
         
         if max_products:
             success_count = scraper.run(max_products=max_products, concurrent_workers=CONCURRENT_WORKERS)
@@ -97,18 +86,18 @@ def main():
     print("="*70)
     
     # Define all scrapers to run
-    # Format: (scraper_name, scraper_class, max_products)
+    # Format: (scraper_name, max_products)
     # Set max_products=None to scrape all products
     scrapers = [
-        ('meinhausshop', MeinHausShopScraper, None),
-        ('heima24', Heima24Scraper, None),
-        ('sanundo', SanundoScraper, None),
-        ('heizungsdiscount24', Heizungsdiscount24Scraper, None),
-        ('wolfonlineshop', WolfonlineshopScraper, None),
-        ('st_shop24', StShop24Scraper, None),
-        ('selfio', SelfioScraper, None),
-        ('pumpe24', Pumpe24Scraper, None),
-        ('wasserpumpe', WasserpumpeScraper, None),
+        ('meinhausshop', None),
+        ('heima24', None),
+        ('sanundo', None),
+        ('heizungsdiscount24', None),
+        ('wolfonlineshop', None),
+        ('st_shop24', None),
+        ('selfio', None),
+        ('pumpe24', None),
+        ('wasserpumpe', None),
     ]
     
     start_time = time.time()
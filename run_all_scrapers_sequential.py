@@ -5,16 +5,8 @@ Executes all 9 working scrapers one after another
 import time
 from datetime import datetime
 
-# Import all scrapers
-from meinhausshop_scraper import MeinHausShopScraper
-from heima24_scraper import Heima24Scraper
-from sanundo_scraper import SanundoScraper
-from heizungsdiscount24_scraper import Heizungsdiscount24Scraper
-from wolfonlineshop_scraper import WolfonlineshopScraper
-from st_shop24_scraper import StShop24Scraper
-from selfio_scraper import SelfioScraper
-from pumpe24_scraper import Pumpe24Scraper
-from wasserpumpe_scraper import WasserpumpeScraper
+# Scrapers are imported when first instantiated
+from scraper_registry import lazy_scraper
 
 from google_sheets_helper import push_data
 from config import SHEET_IDS, CONCURRENT_WORKERS
@@ -102,15 +94,15 @@ def main():
     # Format: (scraper_name, scraper_class, max_products)
     # Set max_products=None to scrape all products
     scrapers = [
-        ('meinhausshop', MeinHausShopScraper, None),
-        ('heima24', Heima24Scraper, None),
-        ('sanundo', SanundoScraper, None),
-        ('heizungsdiscount24', Heizungsdiscount24Scraper, None),
-        ('wolfonlineshop', WolfonlineshopScraper, None),
-        ('st_shop24', StShop24Scraper, None),
-        ('selfio', SelfioScraper, None),
-        ('pumpe24', Pumpe24Scraper, None),
-        ('wasserpumpe', WasserpumpeScraper, None),
+        ('meinhausshop', lazy_scraper("meinhausshop"), None),
+        ('heima24', lazy_scraper("heima24"), None),
+        ('sanundo', lazy_scraper("sanundo"), None),
+        ('heizungsdiscount24', lazy_scraper("heizungsdiscount24"), None),
+        ('wolfonlineshop', lazy_scraper("wolfonlineshop"), None),
+        ('st_shop24', lazy_scraper("st_shop24"), None),
+        ('selfio', lazy_scraper("selfio"), None),
+        ('pumpe24', lazy_scraper("pumpe24"), None),
+        ('wasserpumpe', lazy_scraper("wasserpumpe"), None),
     ]
     
     start_time = time.time()
@@ -1,29 +1,11 @@
 """
-Run heima24 scraper with 10,000 products limit
+Run heima24 scraper with 10,000 products limit.
+
+Same as: python scrape.py run heima24 --max 10000
 """
 import sys
-from heima24_scraper import Heima24Scraper
-
-
-def main():
-    """Run heima24 scraper with 10k limit."""
-    print("="*60)
-    print("Running heima24 scraper - 10,000 products")
-    print("="*60)
-    
-    scraper = Heima24Scraper()
-    
-    # Override max_products
-    scraper.max_products = 10000
-    
-    # Run scraper
-    success_count = scraper.run()
-    
-    print(f"\n{'='*60}")
-    print(f"Completed: {success_count} products scraped")
-    print(f"Output: {scraper.get_output_file()}")
-    print(f"{'='*60}")
 
+from scrape import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(["run", "heima24", "--max", "10000"]))
@@ -19,30 +19,21 @@ from google_sheets_helper import GoogleSheetsHelper
 from shopify_csv_export import ShopifyCSVExporter
 import csv
 
-# Import all scrapers
-from meinhausshop_scraper import MeinHausShopScraper
-from heima24_scraper import Heima24Scraper
-from sanundo_scraper import SanundoScraper
-from heizungsdiscount24_scraper import Heizungsdiscount24Scraper
-from wolfonlineshop_scraper import WolfonlineshopScraper
-from st_shop24_scraper import StShop24Scraper
-from selfio_scraper import SelfioScraper
-from pumpe24_scraper import Pumpe24Scraper
-from wasserpumpe_scraper import WasserpumpeScraper
-from glo24_scraper import Glo24Scraper
+# Scrapers are imported when first instantiated
+from scraper_registry import lazy_scraper
 
 # Map scraper names to classes
 SCRAPER_CLASSES = {
-    "meinhausshop": MeinHausShopScraper,
-    "heima24": Heima24Scraper,
-    "sanundo": SanundoScraper,
-    "heizungsdiscount24": Heizungsdiscount24Scraper,
-    "wolfonlineshop": WolfonlineshopScraper,
-    "st_shop24": StShop24Scraper,
-    "selfio": SelfioScraper,
-    "pumpe24": Pumpe24Scraper,
-    "wasserpumpe": WasserpumpeScraper,
-    "glo24": Glo24Scraper,
+    "meinhausshop": lazy_scraper("meinhausshop"),
+    "heima24": lazy_scraper("heima24"),
+    "sanundo": lazy_scraper("sanundo"),
+    "heizungsdiscount24": lazy_scraper("heizungsdiscount24"),
+    "wolfonlineshop": lazy_scraper("wolfonlineshop"),
+    "st_shop24": lazy_scraper("st_shop24"),
+    "selfio": lazy_scraper("selfio"),
+    "pumpe24": lazy_scraper("pumpe24"),
+    "wasserpumpe": lazy_scraper("wasserpumpe"),
+    "glo24": lazy_scraper("glo24"),
 }
 
 
@@ -3,6 +3,23 @@ Production Power BI data pipeline (memory-aware).
 
 Scrapes products from 10 websites, writes a combined CSV incrementally,
 then uploads to a Google Sheet worksheet for Power BI.
+
+Sharded jobs (SCRAPER_SHARD=i/N) only scrape their slice into a part file.
+A final job with SCRAPER_SHARD_MERGE=N merges the parts instead of scraping
+and builds the combined CSV and upload as usual.
+
+PIPELINE_MEMORY_LIMIT_MB drives admission control (memory_governor.py):
+near the limit fewer scrapers run at once and each keeps fewer pages in
+flight. A per-stage memory timeline is written to data/memory_timeline.csv.
+
+PIPELINE_TIME_BUDGET_MINUTES sets a wall-clock budget for the whole job
+(the cron timeout): scraping stops PIPELINE_UPLOAD_RESERVE_MINUTES before it
+so the Sheets upload still runs. Each scraper scrapes its most valuable URLs
+first and saves the ones it did not reach for the next run.
+
+PIPELINE_SCHEDULER=global starts every scraper at once and runs their
+product pages on one shared worker pool (global_scheduler.py) instead of
+batches of PIPELINE_BATCH_SIZE scrapers with SCRAPER_WORKERS threads each.
 """
 import csv
 import gc
@@ -11,22 +28,16 @@ import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
 from threading import Lock
 
 import psutil
 
 from config import CSV_COLUMNS, DATA_DIR
-from google_sheets_helper import push_data
-from heima24_scraper import Heima24Scraper
-from heizungsdiscount24_scraper import Heizungsdiscount24Scraper
-from meinhausshop_scraper import MeinHausShopScraper
-from pumpe24_scraper import Pumpe24Scraper
-from pumpenheizung_scraper import PumpenheizungScraper
-from sanundo_scraper import SanundoScraper
-from selfio_scraper import SelfioScraper
-from st_shop24_scraper import StShop24Scraper
-from wasserpumpe_scraper import WasserpumpeScraper
-from wolfonlineshop_scraper import WolfonlineshopScraper
+from global_scheduler import GlobalScheduler
+from memory_governor import configure_memory_governor, get_memory_governor, run_admitted
+from scraper_registry import lazy_scraper
+from sharding import merge_shard_parts
 
 gc.enable()
 
@@ -38,22 +49,28 @@ POWER_BI_SHEET_ID = os.getenv(
     "1MrbHBVwR8wIP35syBl5vV2oJ_LqO_HuxqSlu3WZ2KRg",
 )
 
+# Scrapers are imported when they are first instantiated (scraper_registry),
+# so a SCRAPER_FILTER=sanundo run only loads sanundo_scraper.
 SCRAPERS = [
-    ("sanundo", SanundoScraper),
-    ("heima24", Heima24Scraper),
-    ("st_shop24", StShop24Scraper),
-    ("selfio", SelfioScraper),
-    ("heizungsdiscount24", Heizungsdiscount24Scraper),
-    ("meinhausshop", MeinHausShopScraper),
-    ("wolfonlineshop", WolfonlineshopScraper),
-    ("pumpe24", Pumpe24Scraper),
-    ("pumpenheizung", PumpenheizungScraper),
-    ("wasserpumpe", WasserpumpeScraper),
+    (name, lazy_scraper(name))
+    for name in (
+        "sanundo",
+        "heima24",
+        "st_shop24",
+        "selfio",
+        "heizungsdiscount24",
+        "meinhausshop",
+        "wolfonlineshop",
+        "pumpe24",
+        "pumpenheizung",
+        "wasserpumpe",
+    )
 ]
 
 DEFAULT_BATCH_SIZE = 1
 DEFAULT_SCRAPER_WORKERS = 4
 DEFAULT_MEMORY_LIMIT_MB = 1700
+DEFAULT_UPLOAD_RESERVE_MINUTES = 15
 DEFAULT_SHEETS_BATCH_SIZE = 5000
 DEFAULT_WORKSHEET_NAME = "raw_all_products"
 
@@ -74,6 +91,22 @@ def log_memory(label=""):
     return mem
 
 
+def print_memory_timeline(memory):
+    """Print the per-stage memory timeline and save it (PIPELINE_MEMORY_TIMELINE)."""
+    path = memory.write_timeline()
+    print("\n" + "=" * 80)
+    print("MEMORY TIMELINE")
+    print("=" * 80)
+    for row in memory.timeline:
+        print(
+            f"{row['stage']:36s} | {row['start_s']:8.1f}s - {row['end_s']:8.1f}s | "
+            f"{row['rss_start_mb']:7.1f} -> peak {row['rss_peak_mb']:7.1f} -> {row['rss_end_mb']:7.1f} MB | "
+            f"level {row['min_level']:.2f}"
+        )
+    print(memory.summary())
+    print(f"Timeline saved to {path}")
+
+
 def get_int_env(name, default, minimum=1):
     value = os.getenv(name)
     if value is None:
@@ -85,6 +118,19 @@ def get_int_env(name, default, minimum=1):
         return default
 
 
+def get_scrape_deadline(start_time):
+    """
+    Unix time by which scraping must stop, or None without PIPELINE_TIME_BUDGET_MINUTES.
+
+    The Sheets upload gets PIPELINE_UPLOAD_RESERVE_MINUTES of the budget.
+    """
+    budget = get_int_env("PIPELINE_TIME_BUDGET_MINUTES", 0, minimum=0)
+    if not budget:
+        return None
+    reserve = get_int_env("PIPELINE_UPLOAD_RESERVE_MINUTES", DEFAULT_UPLOAD_RESERVE_MINUTES, minimum=0)
+    return start_time + max(budget - reserve, 1) * 60
+
+
 def get_target_scrapers():
     """
     Resolve the list of scrapers from SCRAPER_FILTER.
@@ -194,7 +240,13 @@ def run_single_scraper(
     columns_with_source,
     header_written_ref,
     scraper_workers,
+    scheduler=None,
+    deadline=None,
 ):
+    if deadline is not None and time.time() >= deadline:
+        thread_safe_print(f"\n[{idx}/{total}] skipping {name}: scrape deadline reached")
+        return {"scraper": name, "status": "skipped", "products": 0, "time": 0}
+
     thread_safe_print(f"\n[{idx}/{total}] starting {name}")
     thread_safe_print("-" * 80)
 
@@ -202,11 +254,33 @@ def run_single_scraper(
     mem_before = get_memory_usage_mb()
 
     try:
-        scraper = scraper_class()
-        scraper.run(max_products=None, concurrent_workers=scraper_workers)
+        merge_count = get_int_env("SCRAPER_SHARD_MERGE", 0, minimum=0)
+        if merge_count:
+            from base_scraper import env_flag
+
+            allow_missing = env_flag("SCRAPER_SHARD_ALLOW_MISSING")
+            rows, missing = merge_shard_parts(name, merge_count, allow_missing=allow_missing)
+            if missing and not allow_missing:
+                # The sheet is replaced on upload; a partial shop would drop rows.
+                thread_safe_print(f"[ERROR] {name}: shard parts {missing} missing or stale, not merging")
+                return {
+                    "scraper": name,
+                    "status": "failed",
+                    "products": 0,
+                    "time": time.time() - start_time,
+                    "error": f"shard parts {missing} missing or stale",
+                    "incomplete": True,
+                }
+            if missing:
+                thread_safe_print(f"[WARN] {name}: shard parts {missing} missing or stale, merging the rest")
+            thread_safe_print(f"{name}: merged {rows} rows from {merge_count} shards")
+        else:
+            scraper = scraper_class()
+            scraper.scheduler = scheduler
+            scraper.run(max_products=None, concurrent_workers=scraper_workers, deadline=deadline)
+            del scraper
         elapsed = time.time() - start_time
 
-        del scraper
         gc.collect()
         mem_after_scrape = get_memory_usage_mb()
 
@@ -215,13 +289,14 @@ def run_single_scraper(
             thread_safe_print(f"[ERROR] {name}: CSV output not found")
             return {"scraper": name, "status": "failed", "products": 0, "time": elapsed}
 
-        processed_count = process_and_write_products(
-            source_name=name,
-            csv_file=csv_file,
-            combined_csv_path=combined_csv_path,
-            columns_with_source=columns_with_source,
-            header_written_ref=header_written_ref,
-        )
+        with get_memory_governor().stage(f"{name}: csv merge"):
+            processed_count = process_and_write_products(
+                source_name=name,
+                csv_file=csv_file,
+                combined_csv_path=combined_csv_path,
+                columns_with_source=columns_with_source,
+                header_written_ref=header_written_ref,
+            )
         mem_after_process = get_memory_usage_mb()
 
         thread_safe_print(
@@ -250,8 +325,191 @@ def run_single_scraper(
         }
 
 
+def record_result(name, future, results, memory_limit_mb):
+    """
+    Add the result of a finished run_single_scraper() future to results.
+
+    Returns:
+        Number of products the scraper wrote to the combined CSV
+    """
+    try:
+        result = future.result()
+        results.append(result)
+
+        current_mem = get_memory_usage_mb()
+        if current_mem > memory_limit_mb:
+            thread_safe_print(
+                f"[WARN] memory {current_mem:.1f} MB above threshold, running GC"
+            )
+            gc.collect()
+            time.sleep(1)
+
+        log_memory(f"after {name}")
+        gc.collect()
+        return int(result.get("products", 0) or 0)
+    except Exception as e:
+        thread_safe_print(f"[ERROR] unexpected error for {name}: {e}")
+        results.append(
+            {
+                "scraper": name,
+                "status": "error",
+                "products": 0,
+                "time": 0,
+                "error": str(e),
+            }
+        )
+        return 0
+
+
+def run_batches(
+    target_scrapers,
+    batch_size,
+    scraper_workers,
+    combined_csv,
+    columns_with_source,
+    header_written_ref,
+    results,
+    memory_limit_mb,
+    deadline=None,
+):
+    """
+    Run the scrapers in batches of batch_size (fewer near the memory limit),
+    each with scraper_workers threads, until the scrape deadline.
+
+    Returns:
+        Number of products written to the combined CSV
+    """
+    memory = get_memory_governor()
+    total_products = 0
+    batch_start = 0
+    batch_num = 0
+    while batch_start < len(target_scrapers):
+        # Smaller batches while RSS is near PIPELINE_MEMORY_LIMIT_MB.
+        batch_end = min(batch_start + memory.scale(batch_size), len(target_scrapers))
+        batch_scrapers = target_scrapers[batch_start:batch_end]
+        batch_num += 1
+
+        thread_safe_print("\n" + "=" * 80)
+        thread_safe_print(
+            f"Batch {batch_num}: {[name for name, _ in batch_scrapers]}"
+        )
+        thread_safe_print("=" * 80)
+        log_memory(f"before batch {batch_num}")
+
+        with ThreadPoolExecutor(max_workers=len(batch_scrapers)) as executor:
+            future_to_name = {
+                executor.submit(
+                    run_single_scraper,
+                    name,
+                    scraper_class,
+                    batch_start + idx + 1,
+                    len(target_scrapers),
+                    combined_csv,
+                    columns_with_source,
+                    header_written_ref,
+                    scraper_workers,
+                    None,
+                    deadline,
+                ): name
+                for idx, (name, scraper_class) in enumerate(batch_scrapers)
+            }
+
+            for future in as_completed(future_to_name):
+                total_products += record_result(future_to_name[future], future, results, memory_limit_mb)
+
+        gc.collect()
+        time.sleep(2)
+        log_memory(f"after batch {batch_num}")
+        batch_start = batch_end
+    return total_products
+
+
+def run_global(
+    target_scrapers, combined_csv, columns_with_source, header_written_ref, results, memory_limit_mb, deadline=None
+):
+    """
+    Run every scraper at once on one shared worker pool (PIPELINE_SCHEDULER=global).
+
+    Discovery, bulk sources and CSV processing run on one thread per scraper;
+    product pages go through a lane of the GlobalScheduler, at most
+    PIPELINE_HOST_WORKERS at a time per shop, PIPELINE_WORKERS in total.
+    Near the memory limit, scrapers that have not started yet wait.
+
+    Returns:
+        Number of products written to the combined CSV
+    """
+    scheduler = GlobalScheduler()
+    thread_safe_print("\n" + "=" * 80)
+    thread_safe_print(
+        f"Global scheduler: {scheduler.workers} workers shared by {len(target_scrapers)} scrapers, "
+        f"at most {scheduler.host_workers} per shop"
+    )
+    thread_safe_print("=" * 80)
+    log_memory("before scraping")
+
+    jobs = {
+        name: partial(
+            run_single_scraper,
+            name,
+            scraper_class,
+            idx + 1,
+            len(target_scrapers),
+            combined_csv,
+            columns_with_source,
+            header_written_ref,
+            scheduler.host_workers,
+            scheduler,
+            deadline,
+        )
+        for idx, (name, scraper_class) in enumerate(target_scrapers)
+    }
+    total_products = 0
+    try:
+        for name, future in run_admitted(jobs, capacity=len(jobs)):
+            total_products += record_result(name, future, results, memory_limit_mb)
+    finally:
+        scheduler.shutdown()
+    thread_safe_print(scheduler.summary())
+    return total_products
+
+
+def run_shard(target_scrapers, deadline=None):
+    """Scrape this job's shard (SCRAPER_SHARD) of every target into its part file, until the deadline."""
+    shard = os.getenv("SCRAPER_SHARD").strip()
+    scraper_workers = get_int_env("SCRAPER_WORKERS", DEFAULT_SCRAPER_WORKERS, minimum=1)
+    print("=" * 80)
+    print(f"SHARD {shard}: {[name for name, _ in target_scrapers]}")
+    print("=" * 80)
+
+    failed = False
+    for name, scraper_class in target_scrapers:
+        start_time = time.time()
+        try:
+            scraper = scraper_class()
+            count = scraper.run(max_products=None, concurrent_workers=scraper_workers, deadline=deadline)
+            thread_safe_print(
+                f"[OK] {name} shard {shard}: {count} products in {time.time() - start_time:.1f}s "
+                f"-> {scraper.get_output_file()}"
+            )
+            failed = failed or count <= 0
+            del scraper
+        except Exception as e:
+            thread_safe_print(f"[ERROR] {name} shard {shard}: {e}")
+            failed = True
+        gc.collect()
+        log_memory(f"after {name}")
+
+    if failed:
+        sys.exit(1)
+
+
 def run_production_pipeline():
+    # The time budget counts from process start, like the cron timeout.
+    pipeline_start_time = time.time()
     target_scrapers = get_target_scrapers()
+    if (os.getenv("SCRAPER_SHARD") or "").strip():
+        run_shard(target_scrapers, get_scrape_deadline(pipeline_start_time))
+        return
 
     print("=" * 80)
     print("PRODUCTION POWER BI DATA PIPELINE")
@@ -270,6 +528,7 @@ def run_production_pipeline():
     memory_limit_mb = get_int_env(
         "PIPELINE_MEMORY_LIMIT_MB", DEFAULT_MEMORY_LIMIT_MB, minimum=256
     )
+    memory = configure_memory_governor(memory_limit_mb)
     sheets_batch_size = get_int_env(
         "SHEETS_BATCH_SIZE", DEFAULT_SHEETS_BATCH_SIZE, minimum=100
     )
@@ -278,9 +537,15 @@ def run_production_pipeline():
         or DEFAULT_WORKSHEET_NAME
     )
 
-    print(f"Batch size (parallel scrapers): {batch_size}")
-    print(f"Per-scraper workers: {scraper_workers}")
-    print(f"Memory GC threshold: {memory_limit_mb} MB")
+    scheduler_mode = (os.getenv("PIPELINE_SCHEDULER") or "batch").strip().lower()
+    if scheduler_mode not in ("batch", "global"):
+        raise ValueError(f"Unknown PIPELINE_SCHEDULER '{scheduler_mode}'. Allowed: batch, global")
+
+    print(f"Scheduler: {scheduler_mode}")
+    if scheduler_mode == "batch":
+        print(f"Batch size (parallel scrapers): {batch_size}")
+        print(f"Per-scraper workers: {scraper_workers}")
+    print(f"Memory limit (admission control, GC threshold): {memory_limit_mb} MB")
     print(f"Google Sheets worksheet: {worksheet_name}")
     print(f"Google Sheets batch size: {sheets_batch_size}")
     print()
@@ -298,69 +563,36 @@ def run_production_pipeline():
     header_written_ref = [False]
 
     total_start_time = time.time()
-    total_products = 0
     results = []
-
-    for batch_start in range(0, len(target_scrapers), batch_size):
-        batch_end = min(batch_start + batch_size, len(target_scrapers))
-        batch_scrapers = target_scrapers[batch_start:batch_end]
-        batch_num = (batch_start // batch_size) + 1
-
-        thread_safe_print("\n" + "=" * 80)
-        thread_safe_print(
-            f"Batch {batch_num}: {[name for name, _ in batch_scrapers]}"
+    deadline = get_scrape_deadline(pipeline_start_time)
+    if deadline is not None:
+        print(
+            f"Scrape deadline: {datetime.fromtimestamp(deadline).strftime('%H:%M:%S')} "
+            f"({(deadline - time.time()) / 60:.0f} min left for scraping)"
         )
-        thread_safe_print("=" * 80)
-        log_memory(f"before batch {batch_num}")
 
-        with ThreadPoolExecutor(max_workers=len(batch_scrapers)) as executor:
-            future_to_name = {
-                executor.submit(
-                    run_single_scraper,
-                    name,
-                    scraper_class,
-                    batch_start + idx + 1,
-                    len(target_scrapers),
-                    combined_csv,
-                    columns_with_source,
-                    header_written_ref,
-                    scraper_workers,
-                ): name
-                for idx, (name, scraper_class) in enumerate(batch_scrapers)
-            }
-
-            for future in as_completed(future_to_name):
-                name = future_to_name[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    total_products += int(result.get("products", 0) or 0)
-
-                    current_mem = get_memory_usage_mb()
-                    if current_mem > memory_limit_mb:
-                        thread_safe_print(
-                            f"[WARN] memory {current_mem:.1f} MB above threshold, running GC"
-                        )
-                        gc.collect()
-                        time.sleep(1)
-
-                    log_memory(f"after {name}")
-                    gc.collect()
-                except Exception as e:
-                    thread_safe_print(f"[ERROR] unexpected error for {name}: {e}")
-                    results.append(
-                        {
-                            "scraper": name,
-                            "status": "error",
-                            "products": 0,
-                            "time": 0,
-                            "error": str(e),
-                        }
-                    )
-
-        gc.collect()
-        time.sleep(2)
-        log_memory(f"after batch {batch_num}")
+    if scheduler_mode == "global":
+        total_products = run_global(
+            target_scrapers,
+            combined_csv,
+            columns_with_source,
+            header_written_ref,
+            results,
+            memory_limit_mb,
+            deadline,
+        )
+    else:
+        total_products = run_batches(
+            target_scrapers,
+            batch_size,
+            scraper_workers,
+            combined_csv,
+            columns_with_source,
+            header_written_ref,
+            results,
+            memory_limit_mb,
+            deadline,
+        )
 
     total_elapsed = time.time() - total_start_time
 
@@ -370,6 +602,15 @@ def run_production_pipeline():
             print("Combined CSV file was not created")
         if total_products <= 0:
             print("Total product count is 0")
+        print_memory_timeline(memory)
+        sys.exit(1)
+
+    incomplete = [result["scraper"] for result in results if result.get("incomplete")]
+    if incomplete:
+        # push_data() clears the worksheet first; keep last run's rows instead.
+        print(f"\n[ERROR] shard parts missing for {incomplete}, not uploading")
+        print("Rerun the missing shards or set SCRAPER_SHARD_ALLOW_MISSING=1")
+        print_memory_timeline(memory)
         sys.exit(1)
 
     with open(combined_csv, "r", encoding="utf-8") as f:
@@ -390,13 +631,16 @@ def run_production_pipeline():
     log_memory("before sheets upload")
 
     try:
-        ok = push_data(
-            sheet_id=POWER_BI_SHEET_ID,
-            csv_file=combined_csv,
-            worksheet_name=worksheet_name,
-            clear_existing=True,
-            batch_size=sheets_batch_size,
-        )
+        from google_sheets_helper import push_data
+
+        with memory.stage("sheets upload"):
+            ok = push_data(
+                sheet_id=POWER_BI_SHEET_ID,
+                csv_file=combined_csv,
+                worksheet_name=worksheet_name,
+                clear_existing=True,
+                batch_size=sheets_batch_size,
+            )
         if not ok:
             raise RuntimeError("Google Sheets upload reported failure")
         print(f"[OK] pushed {actual_rows:,} products to Google Sheets")
@@ -418,7 +662,7 @@ def run_production_pipeline():
 
     results.sort(key=lambda x: x["scraper"])
     for result in results:
-        status = "OK" if result["status"] == "success" else "ERROR"
+        status = {"success": "OK", "skipped": "SKIP"}.get(result["status"], "ERROR")
         print(
             f"{status:5s} {result['scraper']:20s} | "
             f"{result['products']:6,d} products | {result['time']:7.1f}s"
@@ -426,6 +670,8 @@ def run_production_pipeline():
         if "error" in result:
             print(f"      error: {result['error']}")
 
+    print_memory_timeline(memory)
+
     print("\n" + "=" * 80)
     print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Worksheet: {worksheet_name}")
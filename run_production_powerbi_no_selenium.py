@@ -29,15 +29,8 @@ def log_memory(label=""):
     print(f"[MEMORY] {label}: {mem_mb:.1f} MB")
     return mem_mb
 
-# Import working scrapers (NO SELENIUM)
-from meinhausshop_scraper import MeinHausShopScraper
-from heima24_scraper import Heima24Scraper
-from sanundo_scraper import SanundoScraper
-from heizungsdiscount24_scraper import Heizungsdiscount24Scraper
-from wolfonlineshop_scraper import WolfonlineshopScraper
-from st_shop24_scraper import StShop24Scraper
-from selfio_scraper import SelfioScraper
-from pumpe24_scraper import Pumpe24Scraper
+# Scrapers (NO SELENIUM) are imported when first instantiated
+from scraper_registry import lazy_scraper
 from google_sheets_helper import push_data
 from config import DATA_DIR, CSV_COLUMNS
 
@@ -47,14 +40,14 @@ POWER_BI_SHEET_ID = "1MrbHBVwR8wIP35syBl5vV2oJ_LqO_HuxqSlu3WZ2KRg"
 # 8 working scrapers - NO SELENIUM (for Render compatibility)
 # Ordered by memory usage: lightest first
 SCRAPERS = [
-    ("sanundo", SanundoScraper),              # Lightweight
-    ("heima24", Heima24Scraper),              # Lightweight
-    ("st_shop24", StShop24Scraper),           # Lightweight
-    ("selfio", SelfioScraper),                # Lightweight
-    ("heizungsdiscount24", Heizungsdiscount24Scraper),  # Medium
-    ("meinhausshop", MeinHausShopScraper),    # Medium
-    ("wolfonlineshop", WolfonlineshopScraper),# Medium
-    ("pumpe24", Pumpe24Scraper),              # Medium
+    ("sanundo", lazy_scraper("sanundo")),                     # Lightweight
+    ("heima24", lazy_scraper("heima24")),                     # Lightweight
+    ("st_shop24", lazy_scraper("st_shop24")),                 # Lightweight
+    ("selfio", lazy_scraper("selfio")),                       # Lightweight
+    ("heizungsdiscount24", lazy_scraper("heizungsdiscount24")),  # Medium
+    ("meinhausshop", lazy_scraper("meinhausshop")),           # Medium
+    ("wolfonlineshop", lazy_scraper("wolfonlineshop")),       # Medium
+    ("pumpe24", lazy_scraper("pumpe24")),                     # Medium
 ]
 
 def run_production_pipeline():
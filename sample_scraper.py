@@ -40,7 +40,7 @@ class SampleScraper(BaseScraper):
         response = self.make_request(sitemap_url)
         
         if response:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             # Extract URLs from sitemap
             locs = soup.find_all('loc')
             for loc in locs:
@@ -75,7 +75,7 @@ class SampleScraper(BaseScraper):
             response = self.make_request(url)
             
             if response:
-                soup = self.parse_html(response.text)
+                soup = self.parse_response(response)
                 # Common selectors for product links
                 links = soup.select('a[href*="/product/"]')
                 
@@ -99,7 +99,7 @@ class SampleScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name (try multiple selectors)
             product_name = self._extract_text(soup, [
@@ -5,10 +5,11 @@ Platform: Shopware
 """
 import sys
 import re
-import gzip
 from typing import List, Dict, Optional, Any
 from base_scraper import BaseScraper
 from google_sheets_helper import push_data
+from shopware_store_api import ShopwareStoreApi
+from sitemap_stream import SitemapCrawler
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -31,10 +32,14 @@ class SanundoScraper(BaseScraper):
         
         self.logger.info(f"Initialized scraper for {self.base_url}")
     
+    def bulk_source(self) -> ShopwareStoreApi:
+        """Products from the Shopware 6 Store API (SCRAPER_BULK_SOURCE=1)."""
+        return ShopwareStoreApi(self, self.base_url)
+
     def get_product_urls(self) -> List[str]:
         """
         Get list of product URLs from compressed sitemaps.
-        Sanundo uses gzipped sitemap files.
+        Sanundo uses gzipped sitemap files (streamed, see sitemap_stream.py).
         """
         product_urls = []
         
@@ -42,46 +47,19 @@ class SanundoScraper(BaseScraper):
             # Get main sitemap index
             self.logger.info("Fetching main sitemap index...")
             sitemap_url = "https://sanundo.de/sitemap.xml"
-            response = self.make_request(sitemap_url)
+            # Filter out category pages (product pages have more path depth)
+            crawler = SitemapCrawler(self, url_filter=lambda url: url.count('/') >= 3)
+            sitemap_locs = crawler.index_children(sitemap_url)
             
-            if not response:
+            if not sitemap_locs:
                 self.logger.error("Failed to fetch main sitemap")
                 return product_urls
             
-            soup = self.parse_html(response.text)
-            sitemap_locs = soup.find_all('loc')
-            
             self.logger.info(f"Found {len(sitemap_locs)} sub-sitemaps")
             
-            # Process each compressed sitemap
-            for i, loc in enumerate(sitemap_locs, 1):
-                sitemap_gz_url = loc.text.strip()
-                self.logger.info(f"Processing sitemap {i}/{len(sitemap_locs)}: {sitemap_gz_url}")
-                
-                try:
-                    # Download and decompress
-                    gz_response = self.make_request(sitemap_gz_url)
-                    if not gz_response:
-                        continue
-                    
-                    # Decompress gzip content
-                    decompressed = gzip.decompress(gz_response.content).decode('utf-8')
-                    
-                    # Parse decompressed XML
-                    sitemap_soup = self.parse_html(decompressed)
-                    urls = sitemap_soup.find_all('loc')
-                    
-                    for url_tag in urls:
-                        url = url_tag.text.strip()
-                        # Filter out category pages (they usually have fewer path segments)
-                        if url.count('/') >= 3:  # Product pages have more depth
-                            product_urls.append(url)
-                    
-                    self.logger.info(f"Extracted {len(urls)} URLs from this sitemap")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing sitemap {sitemap_gz_url}: {e}")
-                    continue
+            for url, lastmod in crawler.iter_entries(sitemap_locs):
+                product_urls.append(url)
+                self.record_lastmod(url, lastmod)
             
             self.logger.info(f"Total product URLs found: {len(product_urls)}")
             
@@ -101,7 +79,7 @@ class SanundoScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title
             product_name = self._extract_text(soup, [
@@ -0,0 +1,449 @@
+"""
+Resident scheduler for the Power BI scrapers (replaces one cron service per shop).
+
+render.yaml used to start ten cron services a week. Each one reinstalled the
+requirements, imported every scraper, authenticated to Google, redid the
+Cloudflare warm-up and rediscovered the sitemaps. The daemon is one
+long-lived process:
+
+- every shop has a cron schedule in UTC (SHOP_SCHEDULES; DAEMON_SCHEDULES
+  overrides it, SCRAPER_FILTER selects shops),
+- scraper instances are kept between runs with their HTTP sessions,
+  Cloudflare cookies and rate limiters; one GoogleSheetsHelper is
+  authenticated once for all uploads,
+- DAEMON_PREWARM_MINUTES before a run the shop's product URLs are
+  discovered into the discovery cache (SCRAPER_DISCOVERY_CACHE), so the run
+  starts scraping straight away,
+- at most DAEMON_MAX_JOBS shops run at once,
+- GET /status returns the run status as JSON; POST /run/<shop> starts a
+  run now (with "Authorization: Bearer $DAEMON_TOKEN" when it is set).
+
+Usage:
+    python scheduler_daemon.py              # serves on $PORT (default 8080)
+    curl -X POST localhost:8080/run/sanundo
+"""
+import gc
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from config import CSV_COLUMNS, DATA_DIR
+from memory_governor import configure_memory_governor, get_memory_governor
+from run_production_powerbi import (
+    DEFAULT_MEMORY_LIMIT_MB,
+    POWER_BI_SHEET_ID,
+    get_int_env,
+    get_target_scrapers,
+    process_and_write_products,
+)
+
+DEFAULT_PORT = 8080
+DEFAULT_MAX_JOBS = 1
+DEFAULT_PREWARM_MINUTES = 60
+TICK_SECONDS = 5.0
+
+# Shop -> (cron schedule in UTC, scraper workers, Sheets batch size), as the
+# cron services of render.yaml had them.
+SHOP_SCHEDULES = {
+    "sanundo": ("0 2 * * 0", 6, 1200),
+    "heima24": ("20 2 * * 0", 6, 1200),
+    "st_shop24": ("40 2 * * 0", 6, 1200),
+    "selfio": ("0 3 * * 0", 6, 1200),
+    "heizungsdiscount24": ("20 3 * * 0", 5, 1200),
+    "meinhausshop": ("40 3 * * 0", 5, 1200),
+    "wolfonlineshop": ("0 4 * * 0", 5, 1200),
+    "pumpe24": ("20 4 * * 0", 5, 1200),
+    "pumpenheizung": ("0 5 * * 0", 1, 800),
+    "wasserpumpe": ("0 7 * * 0", 1, 800),
+}
+
+logger = logging.getLogger("scheduler_daemon")
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day-of-month month day-of-week).
+
+    Fields take "*", numbers, ranges ("1-5"), lists ("0,30") and steps
+    ("*/15"); day-of-week 0 and 7 are Sunday. As in cron, a run is due when
+    either day field matches if both are restricted.
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron schedule needs 5 fields: '{expression}'")
+        self.expression = expression
+        fields = [self._parse(part, *bounds) for part, bounds in zip(parts, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for item in field.split(","):
+            step = 1
+            if "/" in item:
+                item, step_text = item.split("/", 1)
+                step = int(step_text)
+            if item == "*":
+                start, end = low, high
+            elif "-" in item:
+                start, end = (int(value) for value in item.split("-", 1))
+            else:
+                start = end = int(item)
+            if start < low or end > high or step < 1:
+                raise ValueError(f"Cron field '{field}' outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after moment."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron schedule never matches: '{self.expression}'")
+
+
+class SheetsUploader:
+    """
+    Pushes a shop's CSV to its worksheet with one GoogleSheetsHelper,
+    authenticated on first use and kept for later uploads.
+    """
+
+    def __init__(self, sheet_id: str = POWER_BI_SHEET_ID):
+        self.sheet_id = sheet_id
+        self.helper = None
+
+    def __call__(self, csv_file, worksheet: str, batch_size: int) -> bool:
+        from google_sheets_helper import GoogleSheetsHelper
+
+        if self.helper is None:
+            self.helper = GoogleSheetsHelper()
+        try:
+            return self.helper.push_csv_to_sheet(
+                sheet_id=self.sheet_id,
+                csv_file=csv_file,
+                worksheet_name=worksheet,
+                clear_existing=True,
+                batch_size=batch_size,
+            )
+        except Exception:
+            # Authenticate again on the next upload.
+            self.helper = None
+            raise
+
+
+class ShopJob:
+    """
+    One shop of the daemon: its schedule, its kept scraper and its last run.
+
+    Args:
+        name: Shop name (also the worksheet name)
+        scraper_class: Scraper to instantiate on the first run
+        schedule: Cron expression in UTC
+        workers: concurrent_workers for run()
+        sheets_batch_size: Rows per Sheets API update
+    """
+
+    def __init__(
+        self,
+        name: str,
+        scraper_class: Callable[[], Any],
+        schedule: str,
+        workers: int = 4,
+        sheets_batch_size: int = 1200,
+    ):
+        self.name = name
+        self.scraper_class = scraper_class
+        self.schedule = CronSchedule(schedule)
+        self.workers = workers
+        self.sheets_batch_size = sheets_batch_size
+        # Held while the kept scraper is in use (run or prewarm).
+        self.lock = threading.Lock()
+        self.scraper = None
+        self.state = "idle"
+        self.next_run: Optional[datetime] = None
+        self.prewarmed_for: Optional[datetime] = None
+        self.runs = 0
+        self.last: Dict[str, Any] = {}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "schedule": self.schedule.expression,
+            "state": self.state,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "prewarmed": self.prewarmed_for is not None and self.prewarmed_for == self.next_run,
+            "scraper_warm": self.scraper is not None,
+            "runs": self.runs,
+            "last_run": dict(self.last),
+        }
+
+
+class SchedulerDaemon:
+    """
+    Runs ShopJobs on their schedules in one resident process.
+
+    Args:
+        jobs: Shops to schedule
+        uploader: Called with (csv_file, worksheet, batch_size) after a run;
+            SheetsUploader() by default
+        max_jobs: Shops running at once (DAEMON_MAX_JOBS)
+        prewarm_minutes: Discovery this long before a scheduled run
+            (DAEMON_PREWARM_MINUTES; 0 switches it off)
+    """
+
+    def __init__(
+        self,
+        jobs: List[ShopJob],
+        uploader: Optional[Callable[..., bool]] = None,
+        max_jobs: Optional[int] = None,
+        prewarm_minutes: Optional[float] = None,
+    ):
+        self.jobs = {job.name: job for job in jobs}
+        self.uploader = uploader or SheetsUploader()
+        self.max_jobs = max(int(max_jobs or os.getenv("DAEMON_MAX_JOBS") or DEFAULT_MAX_JOBS), 1)
+        if prewarm_minutes is None:
+            prewarm_minutes = float(os.getenv("DAEMON_PREWARM_MINUTES", DEFAULT_PREWARM_MINUTES))
+        self.prewarm = timedelta(minutes=prewarm_minutes)
+        self.started_at = utc_now()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._runs = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="shop")
+        # Discovery is light next to scraping; one thread, outside the run slots.
+        self._prewarms = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        for job in self.jobs.values():
+            job.next_run = job.schedule.next_after(self.started_at)
+
+    # Scheduling -------------------------------------------------------------
+
+    def trigger(self, name: str, reason: str = "manual") -> bool:
+        """
+        Queue a run of one shop now.
+
+        Returns:
+            False when the shop is already queued or running
+        """
+        job = self.jobs[name]
+        with self._lock:
+            if job.state in ("queued", "running"):
+                return False
+            job.state = "queued"
+        logger.info(f"{name}: run queued ({reason})")
+        self._runs.submit(self._run, job, reason)
+        return True
+
+    def tick(self, now: Optional[datetime] = None) -> None:
+        """Start due runs and prewarms; called every TICK_SECONDS."""
+        now = now or utc_now()
+        for job in self.jobs.values():
+            if job.next_run <= now:
+                scheduled = job.next_run
+                job.next_run = job.schedule.next_after(now)
+                if not self.trigger(job.name, reason=f"scheduled {scheduled.isoformat()}"):
+                    logger.warning(f"{job.name}: still busy, skipping the run scheduled for {scheduled.isoformat()}")
+            elif (
+                self.prewarm
+                and job.next_run - self.prewarm <= now
+                and job.prewarmed_for != job.next_run
+                and job.state == "idle"
+            ):
+                job.prewarmed_for = job.next_run
+                self._prewarms.submit(self._prewarm, job)
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {e}", exc_info=True)
+            self._stop.wait(TICK_SECONDS)
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._prewarms.shutdown(wait=wait)
+        self._runs.shutdown(wait=wait)
+
+    # Jobs -------------------------------------------------------------------
+
+    def _scraper(self, job: ShopJob):
+        """The shop's kept scraper; created (Cloudflare warm-up included) on first use."""
+        if job.scraper is None:
+            job.scraper = job.scraper_class()
+        return job.scraper
+
+    def _prewarm(self, job: ShopJob) -> None:
+        with job.lock:
+            start = time.time()
+            try:
+                count = self._scraper(job).warm_up()
+                logger.info(f"{job.name}: {count} product URLs discovered ahead of the run in {time.time() - start:.1f}s")
+            except Exception as e:
+                logger.warning(f"{job.name}: prewarm failed, the run discovers itself: {e}")
+
+    def _run(self, job: ShopJob, reason: str) -> None:
+        with job.lock:
+            job.state = "running"
+            start = time.time()
+            job.last = {"reason": reason, "started": utc_now().isoformat(), "status": "running"}
+            try:
+                scraper = job.scraper
+                if scraper is None:
+                    scraper = self._scraper(job)
+                else:
+                    scraper.reset_for_next_run()
+                scraper.run(max_products=None, concurrent_workers=job.workers)
+
+                upload_csv = DATA_DIR / f"power_bi_{job.name}.csv"
+                if upload_csv.exists():
+                    upload_csv.unlink()
+                columns = CSV_COLUMNS + ["Quelle"] if "Quelle" not in CSV_COLUMNS else CSV_COLUMNS
+                products = process_and_write_products(
+                    job.name, scraper.get_output_file(), upload_csv, columns, [False]
+                )
+                job.last["products"] = products
+                if products <= 0:
+                    raise RuntimeError("no products scraped")
+                with get_memory_governor().stage(f"{job.name}: sheets upload"):
+                    if not self.uploader(upload_csv, job.name, job.sheets_batch_size):
+                        raise RuntimeError("Google Sheets upload reported failure")
+                job.last["status"] = "success"
+                logger.info(f"{job.name}: {products} products pushed in {time.time() - start:.1f}s")
+            except Exception as e:
+                job.last.update(status="error", error=str(e))
+                logger.error(f"{job.name}: run failed: {e}", exc_info=True)
+            finally:
+                job.last.update(finished=utc_now().isoformat(), seconds=round(time.time() - start, 1))
+                job.runs += 1
+                job.state = "idle"
+                gc.collect()
+
+    # Status -----------------------------------------------------------------
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "started": self.started_at.isoformat(),
+            "max_jobs": self.max_jobs,
+            "memory": get_memory_governor().summary(),
+            "shops": {name: job.status() for name, job in self.jobs.items()},
+        }
+
+    def serve(self, port: int = DEFAULT_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """Start the status/trigger HTTP server on a background thread and return it."""
+        server = ThreadingHTTPServer((host, port), DaemonRequestHandler)
+        server.scheduler = self
+        threading.Thread(target=server.serve_forever, name="daemon-http", daemon=True).start()
+        return server
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """GET /health, GET /status, POST /run/<shop>."""
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"ok": True})
+        elif self.path == "/status":
+            self._send_json(200, self.server.scheduler.status())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        daemon = self.server.scheduler
+        token = os.getenv("DAEMON_TOKEN")
+        if token and self.headers.get("Authorization") != f"Bearer {token}":
+            self._send_json(401, {"error": "unauthorized"})
+            return
+        if not self.path.startswith("/run/"):
+            self._send_json(404, {"error": "not found"})
+            return
+        name = self.path[len("/run/"):]
+        if name not in daemon.jobs:
+            self._send_json(404, {"error": f"unknown shop '{name}'", "shops": sorted(daemon.jobs)})
+        elif daemon.trigger(name):
+            self._send_json(202, {"queued": name})
+        else:
+            self._send_json(409, {"error": f"{name} is already queued or running"})
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+
+def build_jobs() -> List[ShopJob]:
+    """
+    One ShopJob per shop of SCRAPER_FILTER (all by default).
+
+    DAEMON_SCHEDULES overrides schedules, e.g. "sanundo=0 2 * * *;heima24=30 2 * * *".
+    """
+    overrides = {}
+    for item in (os.getenv("DAEMON_SCHEDULES") or "").split(";"):
+        if "=" in item:
+            name, expression = item.split("=", 1)
+            overrides[name.strip()] = expression.strip()
+
+    jobs = []
+    for name, scraper_class in get_target_scrapers():
+        schedule, workers, sheets_batch_size = SHOP_SCHEDULES.get(name, ("0 2 * * 0", 4, 1200))
+        jobs.append(ShopJob(name, scraper_class, overrides.get(name, schedule), workers, sheets_batch_size))
+    return jobs
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    # Prewarmed discoveries are read back by the scheduled run.
+    os.environ.setdefault("SCRAPER_DISCOVERY_CACHE", "1")
+    configure_memory_governor(get_int_env("PIPELINE_MEMORY_LIMIT_MB", DEFAULT_MEMORY_LIMIT_MB, minimum=256))
+
+    daemon = SchedulerDaemon(build_jobs())
+    port = int(os.getenv("PORT") or DEFAULT_PORT)
+    daemon.serve(port)
+    for name, job in daemon.jobs.items():
+        logger.info(f"{name}: '{job.schedule.expression}' UTC, next run {job.next_run.isoformat()}")
+    logger.info(f"Scheduler daemon listening on port {port}")
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping")
+        daemon.stop(wait=False)
+
+
+if __name__ == "__main__":
+    main()
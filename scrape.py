@@ -0,0 +1,91 @@
+"""
+Command line entry point for single-shop runs.
+
+Only the selected shop's scraper module is imported (scraper_registry), and
+the Google Sheets client only with --push, so a one-shop run starts in a
+fraction of the time the all-shop runners need.
+
+Usage:
+    python scrape.py list
+    python scrape.py run heima24 --max 50 --push
+    python scrape.py run sanundo --workers 8 --budget 30
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from scraper_registry import create_scraper, scraper_names
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scrape", description="Run one shop scraper.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the registered shops")
+
+    run = commands.add_parser("run", help="scrape one shop")
+    run.add_argument("shop", choices=scraper_names(), metavar="shop", help="shop name (see 'list')")
+    run.add_argument("--max", type=int, default=None, dest="max_products", help="stop after N products")
+    run.add_argument("--workers", type=int, default=None, help="concurrent workers (default: the scraper's)")
+    run.add_argument(
+        "--budget", type=float, default=None, metavar="MINUTES",
+        help="stop scraping after this many minutes (URLs left are kept for the next run)",
+    )
+    run.add_argument("--push", action="store_true", help="push the CSV to the shop's Google Sheet")
+    return parser
+
+
+def push(shop: str, csv_file) -> bool:
+    """
+    Push a shop's CSV to its sheet from config.SHEET_IDS.
+
+    Returns:
+        True if the upload succeeded
+    """
+    from config import SHEET_IDS
+    from google_sheets_helper import push_data
+
+    sheet_id = SHEET_IDS.get(shop)
+    if not sheet_id or sheet_id == "TBD":
+        print(f"[WARN] No Google Sheet ID configured for {shop}")
+        return False
+    print(f"Pushing {csv_file} to Google Sheets...")
+    if not push_data(sheet_id, csv_file):
+        print("[ERROR] Failed to push to Google Sheets")
+        return False
+    print(f"[OK] https://docs.google.com/spreadsheets/d/{sheet_id}")
+    return True
+
+
+def run(args: argparse.Namespace) -> int:
+    start_time = time.time()
+    scraper = create_scraper(args.shop)
+    run_kwargs = {"max_products": args.max_products}
+    if args.workers:
+        run_kwargs["concurrent_workers"] = args.workers
+    if args.budget:
+        run_kwargs["deadline"] = start_time + args.budget * 60
+    count = scraper.run(**run_kwargs)
+
+    print("=" * 70)
+    print(f"{args.shop}: {count} products in {time.time() - start_time:.1f}s -> {scraper.get_output_file()}")
+    print("=" * 70)
+    if count <= 0:
+        return 1
+    if args.push and not push(args.shop, scraper.get_output_file()):
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "list":
+        for name in scraper_names():
+            print(name)
+        return 0
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Registry of scrapers by shop name, imported on demand.
+
+Every scraper module pulls in base_scraper, requests and BeautifulSoup, and
+some of them cloudscraper; importing all of them up front costs most of an
+entry point's start-up even when SCRAPER_FILTER selects a single shop.
+The registry only knows "module:Class" paths and imports a scraper's
+module the first time it is needed.
+
+Usage:
+    from scraper_registry import create_scraper, lazy_scraper
+
+    scraper = create_scraper("heima24")            # imports heima24_scraper only
+    SCRAPERS = [("sanundo", lazy_scraper("sanundo"))]
+    scraper = SCRAPERS[0][1]()                     # imports sanundo_scraper here
+"""
+import importlib
+from typing import Any, Dict, List, Type
+
+# Shop name (as in config.SHEET_IDS) -> "module:Class".
+SCRAPER_PATHS: Dict[str, str] = {
+    "sanundo": "sanundo_scraper:SanundoScraper",
+    "heima24": "heima24_scraper:Heima24Scraper",
+    "st_shop24": "st_shop24_scraper:StShop24Scraper",
+    "selfio": "selfio_scraper:SelfioScraper",
+    "heizungsdiscount24": "heizungsdiscount24_scraper:Heizungsdiscount24Scraper",
+    "meinhausshop": "meinhausshop_scraper:MeinHausShopScraper",
+    "wolfonlineshop": "wolfonlineshop_scraper:WolfonlineshopScraper",
+    "pumpe24": "pumpe24_scraper:Pumpe24Scraper",
+    "pumpenheizung": "pumpenheizung_scraper:PumpenheizungScraper",
+    "wasserpumpe": "wasserpumpe_scraper:WasserpumpeScraper",
+    "glo24": "glo24_scraper:Glo24Scraper",
+    "wolf_online_shop": "wolf_online_shop_scraper:WolfOnlineShopScraper",
+    # Old solar scrapers (kept for reference)
+    "akusolar": "akusolar_scraper:AkusolarScraper",
+    "actec": "actec_scraper:ActecScraper",
+    "alpha": "alpha_scraper:AlphaScraper",
+    "erneuerbar": "erneuerbar_scraper:ErneuerbarScraper",
+    "czech": "czech_scraper:CzechScraper",
+    "zendure": "zendure_scraper:ZendureScraper",
+    "priwatt": "priwatt_scraper:PriwattScraper",
+}
+
+
+def scraper_names() -> List[str]:
+    """Registered shop names, in registry order."""
+    return list(SCRAPER_PATHS)
+
+
+def load_scraper_class(name: str) -> Type:
+    """
+    Import a shop's scraper module and return its class.
+
+    Args:
+        name: Shop name (key of SCRAPER_PATHS)
+
+    Returns:
+        The scraper class
+
+    Raises:
+        ValueError: If the shop is not registered
+    """
+    try:
+        path = SCRAPER_PATHS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown scraper '{name}'. Allowed: {', '.join(sorted(SCRAPER_PATHS))}"
+        ) from None
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_scraper(name: str, *args: Any, **kwargs: Any) -> Any:
+    """Import a shop's scraper and instantiate it."""
+    return load_scraper_class(name)(*args, **kwargs)
+
+
+class LazyScraper:
+    """
+    Stands in for a scraper class until it is called.
+
+    Calling it imports the module and instantiates the scraper, so lists of
+    (name, scraper_class) pairs keep working unchanged. It only holds the
+    shop name, so it pickles into worker processes.
+    """
+
+    def __init__(self, name: str):
+        if name not in SCRAPER_PATHS:
+            raise ValueError(
+                f"Unknown scraper '{name}'. Allowed: {', '.join(sorted(SCRAPER_PATHS))}"
+            )
+        self.name = name
+
+    def load(self) -> Type:
+        return load_scraper_class(self.name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyScraper({SCRAPER_PATHS[self.name]!r})"
+
+
+def lazy_scraper(name: str) -> LazyScraper:
+    """A LazyScraper for a registered shop name."""
+    return LazyScraper(name)
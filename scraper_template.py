@@ -62,7 +62,7 @@ class TemplateScraper(BaseScraper):
         # sitemap_url = self.config.get("sitemap_url")
         # response = self.make_request(sitemap_url)
         # if response:
-        #     soup = self.parse_html(response.text)
+        #     soup = self.parse_response(response)
         #     urls = soup.find_all('loc')
         #     product_urls = [url.text for url in urls if '/product/' in url.text]
         
@@ -70,7 +70,7 @@ class TemplateScraper(BaseScraper):
         # category_url = f"{self.base_url}/products"
         # response = self.make_request(category_url)
         # if response:
-        #     soup = self.parse_html(response.text)
+        #     soup = self.parse_response(response)
         #     links = soup.select('a.product-link')
         #     product_urls = [self.base_url + link['href'] for link in links]
         
@@ -96,7 +96,7 @@ class TemplateScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # TODO: Customize these selectors for your website
             # Use browser DevTools to find the right CSS selectors
@@ -5,10 +5,12 @@ Platform: Shopware 6
 """
 import sys
 import re
-import gzip
 from typing import List, Dict, Optional, Any
 from base_scraper import BaseScraper
+from category_crawler import SHOPWARE_TILES, CategoryCrawler, read_tiles
 from google_sheets_helper import push_data
+from shopware_store_api import ShopwareStoreApi
+from sitemap_stream import SitemapCrawler
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -35,7 +37,9 @@ class SelfioScraper(BaseScraper):
     def get_product_urls(self, max_sitemaps: int = 5) -> List[str]:
         """
         Get list of product URLs from compressed sitemaps.
-        Selfio uses gzipped sitemap files.
+        Selfio uses gzipped sitemap files (streamed, see sitemap_stream.py).
+        Listing extraction also reads the tiles of the category pages listed
+        in the sitemaps.
         
         Args:
             max_sitemaps: Maximum number of sitemap files to process (default: 5)
@@ -45,57 +49,66 @@ class SelfioScraper(BaseScraper):
         try:
             # Get main sitemap index
             self.logger.info("Fetching main sitemap index...")
-            response = self.make_request(self.sitemap_url)
+            crawler = SitemapCrawler(
+                self,
+                url_filter=lambda url: self._is_product_url(url) or (
+                    self.listing_extract and self._is_category_url(url)
+                ),
+            )
+            sitemap_locs = crawler.index_children(self.sitemap_url)
             
-            if not response:
+            if not sitemap_locs:
                 self.logger.error("Failed to fetch main sitemap")
                 return product_urls
             
-            soup = self.parse_html(response.text)
-            sitemap_locs = soup.find_all('loc')
-            
             # Limit to first N sitemaps
             sitemap_locs = sitemap_locs[:max_sitemaps]
             
             self.logger.info(f"Processing first {len(sitemap_locs)} sub-sitemaps")
             
-            # Process each compressed sitemap
-            for i, loc in enumerate(sitemap_locs, 1):
-                sitemap_gz_url = loc.text.strip()
-                self.logger.info(f"Processing sitemap {i}/{len(sitemap_locs)}: {sitemap_gz_url}")
-                
-                try:
-                    # Download and decompress
-                    gz_response = self.make_request(sitemap_gz_url)
-                    if not gz_response:
-                        continue
-                    
-                    # Decompress gzip content
-                    decompressed = gzip.decompress(gz_response.content).decode('utf-8')
-                    
-                    # Parse decompressed XML
-                    sitemap_soup = self.parse_html(decompressed)
-                    urls = sitemap_soup.find_all('loc')
-                    
-                    for url_tag in urls:
-                        url = url_tag.text.strip()
-                        # Filter for product pages - they contain /produkte/ in the path
-                        if '/produkte/' in url and not url.endswith('/'):
-                            product_urls.append(url)
-                    
-                    self.logger.info(f"  Extracted {len(urls)} URLs (total: {len(product_urls)})")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing sitemap {sitemap_gz_url}: {e}")
+            category_urls = []
+            for url, lastmod in crawler.iter_entries(sitemap_locs):
+                if not self._is_product_url(url):
+                    category_urls.append(url)
                     continue
+                product_urls.append(url)
+                self.record_lastmod(url, lastmod)
             
             self.logger.info(f"Total product URLs found: {len(product_urls)}")
+
+            if category_urls:
+                self.logger.info(f"Reading tiles of {len(category_urls)} categories...")
+                tile_crawler = CategoryCrawler(self, tiles=self._listing_tiles)
+                for _ in tile_crawler.iter_products(category_urls):
+                    pass
             
         except Exception as e:
             self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
         
         return product_urls
     
+    def bulk_source(self) -> ShopwareStoreApi:
+        """Products from the Shopware 6 Store API (SCRAPER_BULK_SOURCE=1)."""
+        return ShopwareStoreApi(self, self.base_url)
+
+    def _is_product_url(self, url: str) -> bool:
+        """Product pages contain /produkte/ in the path."""
+        return '/produkte/' in url and not url.endswith('/')
+
+    def _is_category_url(self, url: str) -> bool:
+        """Shopware 6 category pages end with a slash."""
+        return url.endswith('/') and '/produkte/' not in url and url.rstrip('/') != self.base_url
+
+    def _listing_tiles(self, soup, page_url: str) -> List[Dict[str, str]]:
+        """Name, price and image from the category tiles (listing extraction)."""
+        return read_tiles(
+            soup,
+            page_url,
+            clean_price=self._clean_price,
+            normalize_url=lambda url: url if self._is_product_url(url) else "",
+            **SHOPWARE_TILES,
+        )
+
     def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrape individual product page."""
         response = self.make_request(url)
@@ -103,7 +116,7 @@ class SelfioScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title (Shopware structure)
             product_name = self._extract_text(soup, [
@@ -0,0 +1,236 @@
+"""
+Deterministic URL sharding across cron jobs or machines (SCRAPER_SHARD=i/N).
+
+Each shard keeps the product URLs whose hash falls into its slice and writes
+them to its own part file under DATA_DIR/shards/. merge_shard_parts() joins
+the parts into the usual per-shop CSV; run_production_powerbi.py does that
+with SCRAPER_SHARD_MERGE=N before building the combined Power BI CSV. Parts
+older than SCRAPER_SHARD_MAX_AGE hours are left over from an earlier run and
+count as missing; with a part missing the CSV is not replaced unless
+SCRAPER_SHARD_ALLOW_MISSING=1.
+
+URL discovery is cached under DATA_DIR/discovery/ (SCRAPER_DISCOVERY_TTL
+hours), lastmods and category tile fields included, so only the first shard
+crawls the sitemap. Shards that start while
+it is still crawling wait for its result instead of crawling themselves.
+
+Usage:
+    python sharding.py merge <scraper> <shards> [--allow-missing]
+"""
+import csv
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import CSV_COLUMNS, DATA_DIR
+
+
+DEFAULT_DISCOVERY_TTL_HOURS = 12.0
+DEFAULT_SHARD_MAX_AGE_HOURS = 12.0  # older parts belong to an earlier run
+DISCOVERY_LOCK_TIMEOUT = 3600.0     # seconds before a crawl lock counts as stale
+DISCOVERY_POLL_INTERVAL = 2.0
+
+
+def parse_shard(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Parse SCRAPER_SHARD ("2/4" = second of four shards).
+
+    Returns:
+        (index, count) with 1 <= index <= count, or None when unset
+
+    Raises:
+        ValueError: malformed value
+    """
+    if value is None or not value.strip():
+        return None
+    try:
+        index, count = (int(part) for part in value.strip().split("/"))
+    except ValueError:
+        raise ValueError(f"SCRAPER_SHARD must look like 2/4, got {value!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"SCRAPER_SHARD {value!r} is out of range")
+    return index, count
+
+
+def shard_of(url: str, count: int) -> int:
+    """Shard (1..count) a URL belongs to; stable across processes and machines."""
+    digest = hashlib.sha1(url.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(urls: List[str], index: int, count: int) -> List[str]:
+    return [url for url in urls if shard_of(url, count) == index]
+
+
+def shard_part_path(scraper_name: str, index: int, count: int) -> Path:
+    return Path(DATA_DIR) / "shards" / f"{scraper_name}.part-{index}-of-{count}.csv"
+
+
+def merge_shard_parts(
+    scraper_name: str,
+    count: int,
+    output_file: Optional[Path] = None,
+    max_age_hours: Optional[float] = None,
+    allow_missing: bool = False,
+) -> Tuple[int, List[int]]:
+    """
+    Concatenate the part files of all shards into one CSV.
+
+    A part older than max_age_hours was written by an earlier run (its shard
+    job failed this time) and counts as missing. When a part is missing the
+    output file is left as it is, unless allow_missing is set.
+
+    Args:
+        scraper_name: Scraper whose parts are merged
+        count: Number of shards (N of SCRAPER_SHARD)
+        output_file: Target CSV (default: DATA_DIR/<scraper_name>.csv)
+        max_age_hours: Maximum part age (default: SCRAPER_SHARD_MAX_AGE)
+        allow_missing: Merge the parts that are there even if some are missing
+
+    Returns:
+        (rows written, indexes of missing or stale parts); rows is 0 when
+        the output was not written
+    """
+    if max_age_hours is None:
+        max_age_hours = float(os.getenv("SCRAPER_SHARD_MAX_AGE", DEFAULT_SHARD_MAX_AGE_HOURS))
+    output_file = Path(output_file or Path(DATA_DIR) / f"{scraper_name}.csv")
+    oldest = time.time() - max_age_hours * 3600
+    parts = []
+    missing = []
+    for index in range(1, count + 1):
+        part = shard_part_path(scraper_name, index, count)
+        if part.exists() and part.stat().st_mtime >= oldest:
+            parts.append(part)
+        else:
+            missing.append(index)
+    if missing and not allow_missing:
+        return 0, missing
+
+    tmp_file = output_file.with_suffix(".merge.tmp")
+    rows = 0
+    with open(tmp_file, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for part in parts:
+            with open(part, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    writer.writerow(row)
+                    rows += 1
+    os.replace(tmp_file, output_file)
+    return rows, missing
+
+
+# Discovery cache --------------------------------------------------------------
+
+def discovery_cache_path(scraper_name: str) -> Path:
+    return Path(DATA_DIR) / "discovery" / f"{scraper_name}.json.gz"
+
+
+def _load_discovery(path: Path, ttl_hours: float) -> Optional[List[tuple]]:
+    if not path.exists() or time.time() - path.stat().st_mtime > ttl_hours * 3600:
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [tuple(entry) for entry in json.load(f)["urls"]]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_discovery(path: Path, entries: List[tuple]) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump({"created_at": time.time(), "urls": entries}, f)
+    os.replace(tmp_path, path)
+
+
+def _try_lock(lock_path: Path) -> bool:
+    try:
+        fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            stale = time.time() - lock_path.stat().st_mtime > DISCOVERY_LOCK_TIMEOUT
+        except FileNotFoundError:
+            return False
+        if stale:
+            lock_path.unlink(missing_ok=True)
+        return False
+    os.write(fd, str(os.getpid()).encode())
+    os.close(fd)
+    return True
+
+
+def cached_discovery(
+    scraper_name: str,
+    discover: Callable[[], List[tuple]],
+    ttl_hours: Optional[float] = None,
+    logger=None,
+) -> List[tuple]:
+    """
+    Return the cached (url, lastmod[, extra]) list of a scraper, discovering it once.
+
+    Entries are stored as discover() returns them; BaseScraper appends the
+    category tile fields of listing extraction as a third element.
+
+    One process holds a lock file while it runs discover(); others wait for
+    its result. An empty discovery is not cached.
+
+    Args:
+        scraper_name: Scraper the URLs belong to
+        discover: Crawls the shop and returns (url, lastmod) pairs
+        ttl_hours: Maximum cache age (default: SCRAPER_DISCOVERY_TTL)
+        logger: Optional logger for progress messages
+    """
+    if ttl_hours is None:
+        ttl_hours = float(os.getenv("SCRAPER_DISCOVERY_TTL", DEFAULT_DISCOVERY_TTL_HOURS))
+    path = discovery_cache_path(scraper_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_name(f"{path.name}.lock")
+
+    waited = False
+    while True:
+        entries = _load_discovery(path, ttl_hours)
+        if entries is not None:
+            if logger:
+                logger.info(f"Using {len(entries)} cached product URLs from {path}")
+            return entries
+        if _try_lock(lock_path):
+            break
+        if logger and not waited:
+            logger.info("Another shard is discovering product URLs; waiting for its result")
+            waited = True
+        time.sleep(DISCOVERY_POLL_INTERVAL)
+
+    try:
+        entries = discover()
+        if entries:
+            _save_discovery(path, entries)
+        return entries
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    allow_missing = "--allow-missing" in args
+    args = [arg for arg in args if arg != "--allow-missing"]
+    if len(args) != 3 or args[0] != "merge":
+        print(__doc__.strip().rsplit("Usage:", 1)[1].strip())
+        return 2
+    scraper_name, count = args[1], int(args[2])
+    rows, missing = merge_shard_parts(scraper_name, count, allow_missing=allow_missing)
+    if missing and not allow_missing:
+        print(f"Missing or stale parts: {missing}; {Path(DATA_DIR) / f'{scraper_name}.csv'} not replaced")
+        return 1
+    if missing:
+        print(f"Missing or stale parts: {missing}")
+    print(f"Merged {rows} rows into {Path(DATA_DIR) / f'{scraper_name}.csv'}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
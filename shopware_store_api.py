@@ -0,0 +1,149 @@
+"""
+Shopware 6 Store API as a bulk product source (SCRAPER_BULK_SOURCE=1).
+
+POST /store-api/product returns a page of products with prices, EAN,
+manufacturer, cover image and SEO URL. The request needs the sales channel's
+public access key (sw-access-key). It is taken from the scraper's
+SCRAPER_CONFIGS entry ("store_api_key"), the <SCRAPER>_STORE_API_KEY
+environment variable, or the storefront HTML, where many themes embed it.
+
+Usage:
+    def bulk_source(self):
+        return ShopwareStoreApi(self, self.base_url, normalize_url=self._normalize_url)
+"""
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from bulk_source import BulkSource, BulkSourceUnavailable, format_price
+from config import SCRAPER_CONFIGS
+
+# Sales channel access keys: "SW" + "SC" (sales channel) + 24 base32 characters.
+ACCESS_KEY_PATTERN = re.compile(r"\bSWSC[A-Z0-9]{20,30}\b")
+
+# Entity data the listing needs besides the product's own fields.
+PRODUCT_ASSOCIATIONS = {
+    "manufacturer": {},
+    "cover": {"associations": {"media": {}}},
+    "seoUrls": {},
+}
+
+
+def _translated(entity: Optional[Dict[str, Any]], field: str = "name") -> str:
+    if not entity:
+        return ""
+    value = (entity.get("translated") or {}).get(field) or entity.get(field)
+    return str(value).strip() if value else ""
+
+
+class ShopwareStoreApi(BulkSource):
+    """
+    Product records from a Shopware 6 storefront's Store API.
+
+    Args:
+        scraper: BaseScraper whose make_request() sends the requests
+        base_url: Storefront URL (product URLs are built from it)
+        access_key: sw-access-key; looked up as described above when None
+        page_size: Products per request (SCRAPER_BULK_PAGE_SIZE)
+        normalize_url: Applied to each product URL so it matches the URLs
+            the scraper discovers itself
+    """
+
+    name = "Shopware Store API"
+
+    def __init__(
+        self,
+        scraper,
+        base_url: str,
+        access_key: Optional[str] = None,
+        page_size: Optional[int] = None,
+        normalize_url: Optional[Callable[[str], str]] = None,
+    ):
+        super().__init__(scraper, page_size=page_size)
+        self.base_url = base_url.rstrip("/")
+        self.access_key = access_key
+        self.normalize_url = normalize_url
+
+    def find_access_key(self) -> Optional[str]:
+        """Access key from the config, the environment or the storefront HTML."""
+        name = self.scraper.scraper_name
+        key = SCRAPER_CONFIGS.get(name, {}).get("store_api_key") or os.getenv(
+            f"{name.upper()}_STORE_API_KEY"
+        )
+        if key:
+            return key
+        response = self.scraper.make_request(self.base_url + "/")
+        self.requests += 1
+        if response is None:
+            return None
+        match = ACCESS_KEY_PATTERN.search(response.text)
+        return match.group(0) if match else None
+
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        access_key = self.access_key or self.find_access_key()
+        if not access_key:
+            raise BulkSourceUnavailable(f"{self.name}: no sales channel access key found")
+        self.access_key = access_key
+
+        page = 1
+        while True:
+            payload = self._request_json(
+                f"{self.base_url}/store-api/product",
+                method="POST",
+                headers={"sw-access-key": access_key},
+                json={
+                    "page": page,
+                    "limit": self.page_size,
+                    "total-count-mode": 1,
+                    "associations": PRODUCT_ASSOCIATIONS,
+                },
+            )
+            elements = payload.get("elements") if isinstance(payload, dict) else None
+            if elements is None:
+                raise BulkSourceUnavailable(f"{self.name}: unexpected response on page {page}")
+
+            for element in elements:
+                record = self.map_product(element)
+                if record["product_url"]:
+                    self.products += 1
+                    yield record
+
+            total = payload.get("total")
+            if len(elements) < self.page_size or (total is not None and page * self.page_size >= total):
+                return
+            page += 1
+
+    def map_product(self, element: Dict[str, Any]) -> Dict[str, Any]:
+        """Map one Store API product entity to the keys extract_product() returns."""
+        name = _translated(element)
+        price = element.get("calculatedPrice") or {}
+        gross = price.get("unitPrice")
+        net = None
+        if gross is not None:
+            taxes = sum(tax.get("tax") or 0 for tax in price.get("calculatedTaxes") or [])
+            net = gross - taxes if taxes else gross / 1.19
+
+        seo_urls = element.get("seoUrls") or []
+        canonical = next((seo for seo in seo_urls if seo.get("isCanonical")), seo_urls[0] if seo_urls else None)
+        if canonical and canonical.get("seoPathInfo"):
+            product_url = f"{self.base_url}/{canonical['seoPathInfo'].lstrip('/')}"
+        elif element.get("id"):
+            product_url = f"{self.base_url}/detail/{element['id']}"
+        else:
+            product_url = ""
+        if product_url and self.normalize_url:
+            product_url = self.normalize_url(product_url)
+
+        media = (element.get("cover") or {}).get("media") or {}
+        return {
+            "manufacturer": _translated(element.get("manufacturer")),
+            "category": _translated(element.get("seoCategory")),
+            "name": name,
+            "title": name,
+            "article_number": element.get("productNumber") or element.get("manufacturerNumber") or "",
+            "price_net": format_price(net),
+            "price_gross": format_price(gross),
+            "ean": element.get("ean") or "",
+            "product_image": media.get("url") or "",
+            "product_url": product_url,
+        }
@@ -0,0 +1,388 @@
+"""
+Streaming sitemap reader shared by the scrapers.
+
+Sitemaps and sitemap indexes are downloaded with stream=True through the
+scraper's own make_request() (so cassette, rate limiter and circuit breaker
+apply), gunzipped chunk by chunk with zlib and parsed incrementally with
+xml.etree's XMLPullParser. Entries are yielded as they are parsed and the
+element tree is cleared behind them, so peak memory does not grow with the
+size of a sitemap.
+
+SitemapCrawler downloads sub-sitemaps in parallel, merges them in a fixed
+order and skips sub-sitemaps whose lastmod has not changed since the last run.
+
+Usage:
+    crawler = SitemapCrawler(scraper, url_filter=scraper._is_product_url)
+    for loc, lastmod in crawler.iter_entries([scraper.sitemap_url]):
+        ...
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from base_scraper import env_flag
+from config import DATA_DIR
+
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_SITEMAP_WORKERS = 4
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Entry kinds yielded by parse_sitemap_stream().
+SITEMAP = "sitemap"
+URL = "url"
+
+# Depth of <url>/<sitemap> and of their <loc>/<lastmod> children below the
+# document root. Deeper elements such as <image:loc> are ignored.
+_ENTRY_DEPTH = 2
+_FIELD_DEPTH = 3
+
+
+class SitemapFetchError(Exception):
+    """A sitemap could not be downloaded."""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _decompressed(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Pass chunks through, gunzipping on the fly when the stream is gzip."""
+    decompressor = None
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            if chunk.startswith(GZIP_MAGIC):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is None:
+            yield chunk
+            continue
+        # Cap the output per step: sitemaps compress ~30x, so one network
+        # chunk would otherwise expand to megabytes of XML at once.
+        data = decompressor.decompress(chunk, CHUNK_SIZE)
+        while data:
+            yield data
+            if decompressor.eof or not decompressor.unconsumed_tail:
+                break
+            data = decompressor.decompress(decompressor.unconsumed_tail, CHUNK_SIZE)
+        if decompressor.eof:
+            return
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def parse_sitemap_stream(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Incrementally parse a (possibly gzipped) sitemap or sitemap index.
+
+    Args:
+        chunks: Raw response body in pieces (e.g. response.iter_content())
+
+    Yields:
+        (kind, loc, lastmod) with kind SITEMAP for <sitemap> entries of an
+        index and URL for <url> entries of a urlset; lastmod is "" if absent
+
+    Raises:
+        xml.etree.ElementTree.ParseError: the body is not well-formed XML
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+    loc = lastmod = ""
+    leading = True
+
+    for data in _decompressed(chunks):
+        if leading:
+            # Some shops emit whitespace or a BOM before the XML declaration.
+            data = data.lstrip(b"\xef\xbb\xbf \t\r\n")
+            if not data:
+                continue
+            leading = False
+        parser.feed(data)
+        for event, elem in parser.read_events():
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+
+            name = _local_name(elem.tag)
+            if depth == _FIELD_DEPTH:
+                if name == "loc":
+                    loc = (elem.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = (elem.text or "").strip()
+            elif depth == _ENTRY_DEPTH:
+                if loc and name in (SITEMAP, URL):
+                    yield name, loc, lastmod
+                loc = lastmod = ""
+                # Drop finished entries so the tree never holds the whole sitemap.
+                root.clear()
+            depth -= 1
+
+    parser.close()
+
+
+def sitemap_state_dir(scraper_name: str) -> Path:
+    return Path(DATA_DIR) / "sitemap_state" / scraper_name
+
+
+class SitemapCrawler:
+    """
+    Breadth-first walk over sitemap indexes and urlsets.
+
+    Up to `workers` sitemaps are downloaded at once (SCRAPER_SITEMAP_WORKERS);
+    results are merged in queue order, so the output matches a serial walk.
+    Each download is spooled entry by entry to a gzip JSON-lines file that
+    is read back when the walk reaches it, so memory does not grow with the
+    size of a urlset either. The files of sub-sitemaps are kept under
+    DATA_DIR/sitemap_state/<scraper>/ and reused on the next run when the parent still lists the same lastmod
+    (SCRAPER_SITEMAP_STATE=0 disables this).
+
+    Args:
+        scraper: BaseScraper whose make_request() downloads the sitemaps
+        url_filter: Keeps only page URLs it returns True for (None keeps all)
+        is_sitemap: Marks <url> entries that are themselves sitemaps (some
+            shops list sub-sitemaps in a plain urlset)
+        normalize_sitemap: Cleans up child sitemap URLs; "" skips the child
+        max_sitemaps: Upper bound on sitemap documents fetched per walk
+        request_kwargs: Extra arguments for make_request()
+        workers: Sitemaps downloaded in parallel
+        reuse_state: Reuse unchanged sub-sitemaps from the previous run
+    """
+
+    def __init__(
+        self,
+        scraper,
+        url_filter: Optional[Callable[[str], bool]] = None,
+        is_sitemap: Optional[Callable[[str], bool]] = None,
+        normalize_sitemap: Optional[Callable[[str], str]] = None,
+        max_sitemaps: Optional[int] = None,
+        request_kwargs: Optional[dict] = None,
+        workers: Optional[int] = None,
+        reuse_state: Optional[bool] = None,
+    ):
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.url_filter = url_filter
+        self.is_sitemap = is_sitemap
+        self.normalize_sitemap = normalize_sitemap
+        self.max_sitemaps = max_sitemaps
+        self.request_kwargs = dict(request_kwargs or {})
+        self.workers = max(
+            int(workers or os.getenv("SCRAPER_SITEMAP_WORKERS", DEFAULT_SITEMAP_WORKERS)), 1
+        )
+        self.reuse_state = env_flag("SCRAPER_SITEMAP_STATE", True) if reuse_state is None else reuse_state
+        self.state_dir = sitemap_state_dir(scraper.scraper_name)
+        self.fetched = 0
+        self.reused = 0
+
+    def _stream(self, url: str) -> Iterator[Tuple[str, str, str]]:
+        """Stream one document; raises on download and parse errors."""
+        response = self.scraper.make_request(url, stream=True, **self.request_kwargs)
+        if not response:
+            raise SitemapFetchError(f"Failed to fetch sitemap {url}")
+        try:
+            yield from parse_sitemap_stream(response.iter_content(CHUNK_SIZE))
+        finally:
+            response.close()
+
+    def _log_error(self, url: str, error: Exception) -> None:
+        if isinstance(error, SitemapFetchError):
+            self.logger.warning(str(error))
+        elif isinstance(error, (ParseError, zlib.error)):
+            self.logger.warning(f"Sitemap {url} is not a valid (gzipped) XML sitemap: {error}")
+        else:
+            self.logger.error(f"Error reading sitemap {url}: {error}")
+
+    def iter_document(self, url: str) -> Iterator[Tuple[str, str, str]]:
+        """
+        Stream one sitemap document. Download and parse errors are logged and
+        end the document early; entries parsed before the error are kept.
+
+        Yields:
+            (kind, loc, lastmod) as parse_sitemap_stream()
+        """
+        try:
+            yield from self._stream(url)
+        except Exception as e:
+            self._log_error(url, e)
+
+    def index_children(self, url: str) -> List[Tuple[str, str]]:
+        """(loc, lastmod) of the sub-sitemaps listed in a sitemap index, in document order."""
+        return [(loc, lastmod) for kind, loc, lastmod in self.iter_document(url) if kind == SITEMAP]
+
+    def _child_url(self, loc: str) -> str:
+        return self.normalize_sitemap(loc) if self.normalize_sitemap else loc
+
+    # Spool files and previous-run state -----------------------------------
+
+    def _state_path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.state_dir / f"{digest}.jsonl.gz"
+
+    def _state_matches(self, path: Path, url: str, lastmod: str) -> bool:
+        """True if path holds the complete entries of url at this lastmod."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except (OSError, EOFError, ValueError):
+            return False
+        return header.get("url") == url and header.get("lastmod") == lastmod
+
+    def _spool_document(self, url: str, lastmod: str) -> Tuple[Path, bool]:
+        """
+        Download one document into a gzip JSON-lines spool file, one entry per
+        line after a {"url", "lastmod"} header, so no document is ever held in
+        memory. Complete downloads with a lastmod become the saved state.
+
+        Returns:
+            (path, temporary) as _read_document()
+        """
+        spool_dir = None
+        if self.reuse_state and lastmod:
+            # Same directory as the state file, so it can be renamed into place.
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            spool_dir = self.state_dir
+        fd, name = tempfile.mkstemp(prefix="sitemap-", suffix=".jsonl.gz.tmp", dir=spool_dir)
+        os.close(fd)
+        path = Path(name)
+        complete = False
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"url": url, "lastmod": lastmod}) + "\n")
+            try:
+                for entry in self._stream(url):
+                    f.write(json.dumps(entry) + "\n")
+                complete = True
+            except Exception as e:
+                self._log_error(url, e)
+        if complete and spool_dir is not None:
+            state_path = self._state_path(url)
+            try:
+                os.replace(path, state_path)
+                return state_path, False
+            except OSError as e:
+                self.logger.debug(f"Could not save sitemap state for {url}: {e}")
+        return path, True
+
+    def _read_document(self, url: str, lastmod: str) -> Tuple[Path, bool]:
+        """
+        Entries of one document as a spool file: the previous run's state when
+        the parent lists the same non-empty lastmod, otherwise a fresh download
+        (kept as state for the next run when complete and dated).
+
+        Returns:
+            (path, temporary); temporary files are deleted once read, and
+            a failed download leaves a temporary file with the entries
+            parsed before the error
+        """
+        if self.reuse_state and lastmod:
+            path = self._state_path(url)
+            if self._state_matches(path, url, lastmod):
+                self.reused += 1
+                return path, False
+
+        self.fetched += 1
+        return self._spool_document(url, lastmod)
+
+    def _iter_spool(self, url: str, path: Path, temporary: bool) -> Iterator[Tuple[str, str, str]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                f.readline()
+                for line in f:
+                    yield tuple(json.loads(line))
+        except (OSError, EOFError, ValueError) as e:
+            self.logger.warning(f"Could not read stored entries of sitemap {url}: {e}")
+        finally:
+            if temporary:
+                _remove(path)
+
+    # Walk -------------------------------------------------------------------
+
+    def iter_entries(self, sitemap_urls: Iterable[Union[str, Tuple[str, str]]]) -> Iterator[Tuple[str, str]]:
+        """
+        Walk the given sitemaps and every sitemap they reference.
+
+        Args:
+            sitemap_urls: Sitemap URLs, or (url, lastmod) pairs as returned
+                by index_children()
+
+        Yields:
+            (loc, lastmod) for page URLs accepted by url_filter, in the order
+            of a serial breadth-first walk; each loc is yielded once
+        """
+        queue = deque(
+            (item, "") if isinstance(item, str) else tuple(item) for item in sitemap_urls
+        )
+        visited = set()
+        seen = set()
+        pending = deque()
+        self.fetched = self.reused = 0
+
+        def submit_more(pool) -> None:
+            while queue and len(pending) < self.workers:
+                if self.max_sitemaps is not None and len(visited) >= self.max_sitemaps:
+                    return
+                url, lastmod = queue.popleft()
+                if url in visited:
+                    continue
+                visited.add(url)
+                pending.append((url, pool.submit(self._read_document, url, lastmod)))
+
+        def discard(future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                path, temporary = future.result()
+                if temporary:
+                    _remove(path)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                submit_more(pool)
+                while pending:
+                    url, future = pending.popleft()
+                    kept = 0
+                    for kind, loc, lastmod in self._iter_spool(url, *future.result()):
+                        if kind == SITEMAP or (self.is_sitemap and self.is_sitemap(loc)):
+                            child = self._child_url(loc)
+                            if child and child not in visited:
+                                queue.append((child, lastmod))
+                            continue
+                        if loc in seen or (self.url_filter is not None and not self.url_filter(loc)):
+                            continue
+                        seen.add(loc)
+                        kept += 1
+                        yield loc, lastmod
+                    self.logger.info(f"Sitemap {url}: {kept} URLs")
+                    submit_more(pool)
+            finally:
+                # The caller may stop early (max_urls); drop downloads not yet
+                # started and the spool files of the others once they finish.
+                for _, future in pending:
+                    future.cancel()
+                    future.add_done_callback(discard)
+
+        if queue and self.max_sitemaps is not None and len(visited) >= self.max_sitemaps:
+            self.logger.info(f"Sitemap limit of {self.max_sitemaps} documents reached")
+        self.logger.info(
+            f"Sitemaps: {self.fetched} downloaded, {self.reused} unchanged since last run"
+        )
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
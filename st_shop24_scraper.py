@@ -5,9 +5,12 @@ Platform: Magento
 """
 import sys
 import re
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
+from urllib.parse import urljoin
 from base_scraper import BaseScraper
+from category_crawler import MAGENTO_TILES, CategoryCrawler, read_tiles
 from google_sheets_helper import push_data
+from magento_graphql import MagentoGraphQL
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -31,16 +34,24 @@ class StShop24Scraper(BaseScraper):
         
         self.logger.info(f"Initialized scraper for {self.base_url}")
     
-    def get_product_urls(self, max_categories: int = 50) -> List[str]:
+    def get_product_urls(self, max_categories: Optional[int] = None) -> List[str]:
         """
         Get list of product URLs by scraping category pages.
         Magento sites don't have products in sitemap, only categories.
         
         Args:
-            max_categories: Maximum number of categories to scrape (default: 50)
+            max_categories: Maximum number of categories to scrape (default: all)
         """
-        product_urls = []
+        return list(self.iter_product_urls(max_categories))
+
+    def iter_product_urls(self, max_categories: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield product URLs as category listing pages are parsed.
+        All pages of each category are followed (?p=2, ...), several at once.
         
+        Args:
+            max_categories: Maximum number of categories to scrape (default: all)
+        """
         try:
             # Get category URLs from sitemap
             self.logger.info("Fetching category URLs from sitemap...")
@@ -48,9 +59,9 @@ class StShop24Scraper(BaseScraper):
             
             if not response:
                 self.logger.error("Failed to fetch sitemap")
-                return product_urls
+                return
             
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             locs = soup.find_all('loc')
             
             # Filter for category pages (not too deep, has .html)
@@ -61,52 +72,57 @@ class StShop24Scraper(BaseScraper):
                 if url.endswith('.html') and 3 <= url.count('/') <= 5:
                     category_urls.append(url)
             
-            # Limit to first N categories
-            category_urls = category_urls[:max_categories]
+            if max_categories:
+                category_urls = category_urls[:max_categories]
             
-            self.logger.info(f"Scraping first {len(category_urls)} categories")
+            self.logger.info(f"Scraping {len(category_urls)} categories")
             
-            # Scrape products from each category
-            for i, category_url in enumerate(category_urls, 1):
-                self.logger.info(f"Scraping category {i}/{len(category_urls)}: {category_url}")
-                
-                try:
-                    cat_response = self.make_request(category_url)
-                    if not cat_response:
-                        continue
-                    
-                    cat_soup = self.parse_html(cat_response.text)
-                    
-                    # Find product items (Magento uses .product-item class)
-                    product_items = cat_soup.select('.product-item')
-                    
-                    for item in product_items:
-                        link = item.select_one('a')
-                        if link and link.get('href'):
-                            product_url = link.get('href')
-                            
-                            # Make absolute URL
-                            if product_url.startswith('/'):
-                                product_url = self.base_url + product_url
-                            elif not product_url.startswith('http'):
-                                product_url = self.base_url + '/' + product_url
-                            
-                            # Avoid duplicates
-                            if product_url not in product_urls:
-                                product_urls.append(product_url)
-                    
-                    self.logger.info(f"  Found {len(product_items)} products (total: {len(product_urls)})")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing category {category_url}: {e}")
-                    continue
-            
-            self.logger.info(f"Total product URLs found: {len(product_urls)}")
+            crawler = CategoryCrawler(
+                self,
+                product_links=self._listing_product_links,
+                tiles=self._listing_tiles,
+            )
+            yield from crawler.iter_products(category_urls)
             
         except Exception as e:
             self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
-        
-        return product_urls
+
+    def _listing_product_links(self, soup, page_url: str) -> List[str]:
+        """Product URLs on a category listing page (Magento uses .product-item class)."""
+        links = []
+        for item in soup.select('.product-item'):
+            link = item.select_one('a')
+            if link and link.get('href'):
+                links.append(urljoin(page_url, link.get('href')))
+        return links
+
+    def _listing_tiles(self, soup, page_url: str) -> List[Dict[str, str]]:
+        """Name, price and image from the category tiles (listing extraction)."""
+        records = read_tiles(soup, page_url, clean_price=self._clean_price, **MAGENTO_TILES)
+        for record in records:
+            record['article_number'] = self._article_from_name(record.get('name', ''))
+        return records
+
+    def bulk_source(self) -> MagentoGraphQL:
+        """Products from the Magento GraphQL catalogue (SCRAPER_BULK_SOURCE=1)."""
+        return MagentoGraphQL(self, self.base_url)
+
+    def _article_from_name(self, product_name: str) -> str:
+        """
+        For st-shop24, the article number is typically at the end of the product title.
+        Example: "Grundfos Kit Gleitringdichtung für CRT2/4 - AUUV - 96513599"
+        """
+        if not product_name:
+            return ""
+        # Try 8-digit number (most common)
+        match = re.search(r'\b(\d{8})\b', product_name)
+        if match:
+            return match.group(1)
+        # Try alphanumeric code at the end (e.g., "ABC-123", "XYZ123")
+        match = re.search(r'[-\s]([A-Z0-9]{3,}[-]?[A-Z0-9]+)$', product_name)
+        if match:
+            return match.group(1)
+        return ""
     
     def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
         """Scrape individual product page."""
@@ -115,7 +131,7 @@ class StShop24Scraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title (Magento structure)
             product_name = self._extract_text(soup, [
@@ -143,25 +159,8 @@ class StShop24Scraper(BaseScraper):
                 if brand_meta:
                     manufacturer = brand_meta.get('content', '')
             
-            # Extract article number/SKU
-            # For st-shop24, the article number is typically at the end of the product title
-            # Example: "Grundfos Kit Gleitringdichtung für CRT2/4 - AUUV - 96513599"
-            article_number = ""
-            
-            if product_name:
-                # Try to extract article number from product name (usually at the end)
-                # Look for patterns like: 8-digit numbers, alphanumeric codes
-                import re
-                
-                # Try 8-digit number (most common)
-                match = re.search(r'\b(\d{8})\b', product_name)
-                if match:
-                    article_number = match.group(1)
-                else:
-                    # Try alphanumeric code at the end (e.g., "ABC-123", "XYZ123")
-                    match = re.search(r'[-\s]([A-Z0-9]{3,}[-]?[A-Z0-9]+)$', product_name)
-                    if match:
-                        article_number = match.group(1)
+            # Extract article number/SKU (usually at the end of the product name)
+            article_number = self._article_from_name(product_name)
             
             # If not found in title, try standard SKU selectors
             if not article_number:
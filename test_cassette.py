@@ -0,0 +1,106 @@
+"""
+Offline test for the record/replay cassette (SCRAPER_CASSETTE).
+Records one run against a local stub server, shuts the server down and
+replays the same run from the cassette with injected latency.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import cassette
+from base_scraper import BaseScraper
+from tests.stub_server import StubServer
+from tests.support import timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+PAGES = {
+    f"/produkt-{i}": f"<html><body><h1>Wärmepumpe {i}</h1><span class='price'>{i},99 €</span></body></html>"
+    for i in range(1, 9)
+}
+
+
+class CassetteStubScraper(BaseScraper):
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        super().__init__("test_cassette")
+
+    def get_product_urls(self) -> List[str]:
+        return [self.base_url + path for path in PAGES]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        soup = self.parse_response(response)
+        return {
+            "name": soup.select_one("h1").text,
+            "price_gross": soup.select_one(".price").text,
+            "product_url": url,
+        }
+
+
+def run_with_cassette(monkeypatch, base_url: str, path: str, mode: str, latency_ms: str = "0"):
+    monkeypatch.setenv("SCRAPER_CASSETTE", path)
+    monkeypatch.setenv("SCRAPER_CASSETTE_MODE", mode)
+    monkeypatch.setenv("SCRAPER_CASSETTE_LATENCY_MS", latency_ms)
+    scraper = CassetteStubScraper(base_url)
+    rows = []
+    scraper.save_products = rows.extend
+    count, elapsed = timed_run(scraper, concurrent_workers=4)
+    return scraper, count, sorted(rows, key=lambda r: r["product_url"]), elapsed
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    # Scrapers share Cassette objects by path; start from an empty registry.
+    monkeypatch.setattr(cassette, "_cassettes", {})
+    path = str(tmp_path / "{scraper}.jsonl.gz")
+    with StubServer(PAGES) as server:
+        base_url = server.base_url
+        recorder, count, recorded_rows, _ = run_with_cassette(monkeypatch, base_url, path, "record")
+    recorder.cassette.close()
+    assert count == len(PAGES)
+    assert recorder.cassette.recorded == len(PAGES)
+    assert (tmp_path / "test_cassette.jsonl.gz").exists()
+
+    # Server is gone: every response must come from the cassette.
+    player, count, replayed_rows, elapsed = run_with_cassette(monkeypatch, base_url, path, "replay", "50")
+    assert count == len(PAGES)
+    assert replayed_rows == recorded_rows
+    assert player.cassette.replayed == len(PAGES)
+    assert player.cassette.misses == 0
+    # 8 pages, 50 ms each, 4 workers -> at least two latency rounds.
+    assert elapsed >= 0.1
+
+
+def test_posts_to_one_url_replay_by_body(tmp_path, monkeypatch):
+    def echo_page(handler):
+        page = json.loads(handler.request_body)["page"]
+        handler.send_payload(200, f"Seite {page}".encode("utf-8"), "text/plain")
+
+    monkeypatch.setattr(cassette, "_cassettes", {})
+    monkeypatch.setenv("SCRAPER_CASSETTE", str(tmp_path / "{scraper}.jsonl.gz"))
+    monkeypatch.setenv("SCRAPER_CASSETTE_MODE", "record")
+    with StubServer({"/store-api/product": echo_page}) as server:
+        url = server.url("/store-api/product")
+        recorder = CassetteStubScraper(server.base_url)
+        for page in (1, 2, 3):
+            assert recorder.make_request(url, method="POST", json={"page": page}).text == f"Seite {page}"
+    recorder.cassette.close()
+
+    monkeypatch.setenv("SCRAPER_CASSETTE_MODE", "replay")
+    player = CassetteStubScraper(server.base_url)
+    for page in (3, 1, 2):
+        response = player.make_request(url, method="POST", json={"page": page})
+        assert response.text == f"Seite {page}"
+        assert response.request.method == "POST"
+    assert player.cassette.replayed == 3
+    assert player.cassette.misses == 0
+
+
+if __name__ == "__main__":
+    with tmp_run_dirs() as (monkeypatch, tmp_path):
+        test_record_then_replay_offline(tmp_path, monkeypatch)
+    print("✓ Cassette replayed the recorded run without network access")
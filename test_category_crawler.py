@@ -0,0 +1,156 @@
+"""
+Paginated category crawling (category_crawler.py), serial and with workers.
+
+The stub shop has categories whose listing pages paginate via rel="next",
+?p= or ?page= links, link to sub-categories, and repeat products once a
+category runs out of pages.
+
+Usage:
+    python test_category_crawler.py [categories] [pages] [per_page] [latency]
+"""
+import sys
+import time
+from typing import Dict, List
+
+import pytest
+
+from category_crawler import CategoryCrawler, absolute_links, next_page_url
+from parser_backends import HTML_PARSER, build_document
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, report
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+def listing_page(products: List[int], links: List[str] = (), head: str = "") -> str:
+    items = "".join(f"<li class='product-item'><a href='/produkt-{i}'>Produkt {i}</a></li>" for i in products)
+    anchors = "".join(f"<a href='{href}'>{href}</a>" for href in links)
+    return f"<html><head>{head}</head><body><ul>{items}</ul><nav>{anchors}</nav></body></html>"
+
+
+def build_shop() -> Dict[str, str]:
+    return {
+        # rel="next" pagination plus a sub-category and another category's page 2
+        "/kategorie-a": listing_page(
+            range(0, 10), ["/kategorie-d", "/kategorie-b?page=2"], "<link rel='next' href='/kategorie-a?p=2'>"
+        ),
+        "/kategorie-a?p=2": listing_page(range(10, 20), [], "<link rel='next' href='/kategorie-a?p=3'>"),
+        "/kategorie-a?p=3": listing_page(range(20, 25)),
+        # ?page= links only
+        "/kategorie-b": listing_page(range(25, 35), ["/kategorie-b?page=2", "/kategorie-b?page=3"]),
+        "/kategorie-b?page=2": listing_page(range(35, 45), ["/kategorie-b", "/kategorie-b?page=3"]),
+        "/kategorie-b?page=3": listing_page(range(45, 50), ["/kategorie-b", "/kategorie-b?page=2"]),
+        # page 2 repeats page 1 (shops that clamp out-of-range pages): stop there
+        "/kategorie-c": listing_page(range(50, 60), ["/kategorie-c?p=2"]),
+        "/kategorie-c?p=2": listing_page(range(50, 60), ["/kategorie-c?p=3"]),
+        "/kategorie-c?p=3": listing_page(range(60, 70)),
+        # reached through /kategorie-a only; overlaps with it
+        "/kategorie-d": listing_page(range(5, 15)),
+    }
+
+
+def build_benchmark_shop(categories: int, pages: int, per_page: int) -> Dict[str, str]:
+    routes = {}
+    product = 0
+    for category in range(categories):
+        for page in range(1, pages + 1):
+            path = f"/kategorie-{category}" + (f"?p={page}" if page > 1 else "")
+            links = [f"/kategorie-{category}?p={page + 1}"] if page < pages else []
+            routes[path] = listing_page(range(product, product + per_page), links)
+            product += per_page
+    return routes
+
+
+def product_links(soup, page_url: str) -> List[str]:
+    return absolute_links(soup, page_url, lambda url: "/produkt-" in url)
+
+
+def crawl(server, categories: List[str], workers: int, follow: bool = True, max_pages: int = 200):
+    """Returns (product URLs, seconds, crawler); server.peak_in_flight covers this crawl only."""
+    server.reset_peak()
+    scraper = StubExtractScraper([])
+    crawler = CategoryCrawler(
+        scraper,
+        product_links=product_links,
+        follow_category=(lambda url: "/kategorie-" in url) if follow else None,
+        workers=workers,
+        max_pages=max_pages,
+    )
+    start = time.time()
+    urls = list(crawler.iter_products(server.url(path) for path in categories))
+    return urls, time.time() - start, crawler
+
+
+def test_next_page_url():
+    url = "https://shop.test/pumpen.html"
+    soup = build_document("<a href='?p=3'>3</a><a href='?p=2'>2</a>", HTML_PARSER)
+    assert next_page_url(soup, url, 1) == "https://shop.test/pumpen.html?p=2"
+    assert next_page_url(soup, url, 3) is None
+    soup = build_document("<link rel='next' href='/pumpen.html?page=9'><a href='?p=2'>2</a>", HTML_PARSER)
+    assert next_page_url(soup, url, 1) == "https://shop.test/pumpen.html?page=9"
+
+
+def test_crawl_follows_pagination_and_subcategories():
+    with StubServer(build_shop()) as server:
+        urls, _, crawler = crawl(server, ["/kategorie-a", "/kategorie-b", "/kategorie-c"], workers=4)
+        requested = {path for _, path in server.request_log}
+
+    assert len(urls) == len(set(urls)) == 60
+    assert {url.rsplit("-", 1)[1] for url in urls} == {str(i) for i in range(60)}
+    assert crawler.categories == 4
+    # /kategorie-c stopped at the page that added nothing new.
+    assert "/kategorie-c?p=2" in requested and "/kategorie-c?p=3" not in requested
+    # Every listing page was fetched once.
+    assert len(server.request_log) == len(requested) == 9
+
+
+def test_workers_crawl_categories_in_parallel(monkeypatch):
+    # Without the per-host rate limiter only the workers decide how many pages overlap.
+    monkeypatch.setenv("SCRAPER_ADAPTIVE_RATE", "0")
+    with StubServer(build_benchmark_shop(6, 3, 5), latency=0.2) as server:
+        categories = [f"/kategorie-{i}" for i in range(6)]
+        serial_urls, _, _ = crawl(server, categories, workers=1, follow=False)
+        serial_peak = server.peak_in_flight
+        parallel_urls, _, _ = crawl(server, categories, workers=4, follow=False)
+        parallel_peak = server.peak_in_flight
+
+    assert sorted(serial_urls) == sorted(parallel_urls) and len(parallel_urls) == 90
+    assert serial_peak == 1
+    assert 1 < parallel_peak <= 4
+
+
+def test_early_stop_cancels_pending_pages():
+    with StubServer(build_benchmark_shop(8, 4, 5), latency=0.1) as server:
+        scraper = StubExtractScraper([])
+        crawler = CategoryCrawler(scraper, product_links=product_links, workers=2)
+        stream = crawler.iter_products(server.url(f"/kategorie-{i}") for i in range(8))
+        first = [next(stream) for _ in range(7)]
+        stream.close()
+        requested = len(server.request_log)
+
+    assert len(set(first)) == 7
+    assert requested <= 4
+
+
+if __name__ == "__main__":
+    categories = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    per_page = int(sys.argv[3]) if len(sys.argv) > 3 else 24
+    latency = float(sys.argv[4]) if len(sys.argv) > 4 else 0.3
+    test_next_page_url()
+    test_crawl_follows_pagination_and_subcategories()
+
+    with StubServer(build_benchmark_shop(categories, pages, per_page), latency=latency) as server:
+        paths = [f"/kategorie-{i}" for i in range(categories)]
+        first_urls, first_time, _ = crawl(server, paths, workers=1, follow=False, max_pages=1)
+        serial_urls, serial_time, _ = crawl(server, paths, workers=1, follow=False)
+        parallel_urls, parallel_time, crawler = crawl(server, paths, workers=4, follow=False)
+        parallel_peak = server.peak_in_flight
+
+    with report(f"CATEGORY CRAWL ({categories} categories x {pages} pages x {per_page} products, {latency}s latency)"):
+        print(f"first page only, serial : {len(first_urls):6d} URLs {first_time:6.2f} s")
+        print(f"all pages, serial       : {len(serial_urls):6d} URLs {serial_time:6.2f} s")
+        print(
+            f"all pages, {crawler.workers} workers    : {len(parallel_urls):6d} URLs {parallel_time:6.2f} s"
+            f" ({parallel_peak} pages in flight)"
+        )
@@ -0,0 +1,96 @@
+"""
+Offline test for the per-host circuit breaker.
+A stub shop that answers everything with 403 must end the run early and
+leave the unvisited URLs on disk for the next run.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from base_scraper import BaseScraper
+from circuit_breaker import CircuitBreaker, CircuitOpenError, load_unvisited_urls
+from tests.stub_server import StubServer
+from tests.support import timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+def test_breaker_states():
+    breaker = CircuitBreaker("example.test", threshold=3, cooldown=0.2, deadline=60)
+    for _ in range(2):
+        breaker.record_status(403)
+    assert breaker.admit() == 0.0  # still closed
+
+    breaker.record_status(429)
+    assert breaker.state == "open"
+    assert breaker.admit() > 0
+
+    time.sleep(0.25)
+    assert breaker.admit() == 0.0  # the half-open probe
+    assert breaker.state == "half-open"
+    assert breaker.admit() > 0  # everyone else waits for the probe
+
+    breaker.record_status(200)
+    assert breaker.state == "closed"
+    assert breaker.admit() == 0.0
+
+
+def test_breaker_trips_after_deadline():
+    breaker = CircuitBreaker("example.test", threshold=1, cooldown=0.05, deadline=0.2)
+    breaker.record_status(403)
+    time.sleep(0.25)
+    try:
+        breaker.admit()
+    except CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("breaker should have tripped")
+    assert breaker.tripped
+
+
+class BlockedScraper(BaseScraper):
+    def __init__(self, server: StubServer, pages: int):
+        self.server = server
+        self.pages = pages
+        super().__init__("test_circuit_breaker")
+
+    def get_product_urls(self) -> List[str]:
+        return [self.server.url(f"/produkt-{i}") for i in range(self.pages)]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        return {"name": url.rsplit("/", 1)[-1], "product_url": url}
+
+
+def test_blocked_run_ends_early_and_saves_unvisited(monkeypatch):
+    def blocked(request):
+        request.send_payload(403, b"Attention Required! | Cloudflare", "text/html")
+
+    monkeypatch.setenv("SCRAPER_BREAKER_THRESHOLD", "3")
+    monkeypatch.setenv("SCRAPER_BREAKER_COOLDOWN", "0.1")
+    monkeypatch.setenv("SCRAPER_BREAKER_DEADLINE", "0.5")
+    pages = 200
+    routes = {f"/produkt-{i}": blocked for i in range(pages)}
+    with StubServer(routes) as server:
+        scraper = BlockedScraper(server, pages)
+        count, elapsed = timed_run(scraper, concurrent_workers=4)
+        assert count == 0
+
+    assert scraper.circuit_tripped
+    assert elapsed < 10
+    assert len(server.request_log) < pages / 4
+
+    unvisited = load_unvisited_urls("test_circuit_breaker")
+    assert len(unvisited) > pages / 2
+    assert set(unvisited) <= set(scraper.get_product_urls())
+
+
+if __name__ == "__main__":
+    test_breaker_states()
+    test_breaker_trips_after_deadline()
+    with tmp_run_dirs() as (monkeypatch, _):
+        test_blocked_run_ends_early_and_saves_unvisited(monkeypatch)
+    print("✓ Circuit breaker ends blocked runs early and keeps unvisited URLs")
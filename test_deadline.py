@@ -0,0 +1,139 @@
+"""
+Deadline-aware runs: run(deadline=...), SCRAPER_TIME_BUDGET_MINUTES and
+PIPELINE_TIME_BUDGET_MINUTES.
+
+The benchmark gives a catalogue with a few new and price-volatile products a
+time budget too short for all of it, once in discovery order and once ranked
+by value, and counts how many of the valuable products each run reached.
+
+Usage:
+    python test_deadline.py [products] [budget_seconds]
+"""
+import inspect
+import sys
+import time
+from typing import List, Set, Tuple
+
+import pytest
+
+from base_scraper import BaseScraper
+from circuit_breaker import clear_unvisited_urls, load_unvisited_urls
+from product_state import ProductStateStore
+from scraper_registry import load_scraper_class, scraper_names
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class DeadlineScraper(StubExtractScraper):
+    def __init__(self, urls: List[str]):
+        self.urls = urls
+        BaseScraper.__init__(self, "test_deadline")
+        self.scrape_min_delay = self.scrape_max_delay = 0
+
+
+class UnrankedScraper(DeadlineScraper):
+    """Scrapes in discovery order, like a run without ranking."""
+
+    def _rank_by_value(self, product_urls: List[str]) -> List[str]:
+        return product_urls
+
+
+def seed(urls: List[str], volatile: List[str]) -> None:
+    """Store every URL as scraped before; the volatile ones with a price change."""
+    store = ProductStateStore("test_deadline")
+    try:
+        for url in urls:
+            store.save(url, "", {"price_gross": "10,00", "product_url": url})
+        for url in volatile:
+            store.save(url, "", {"price_gross": "12,50", "product_url": url})
+    finally:
+        store.close()
+
+
+def scrape(urls: List[str], budget: float = None, scraper_class=DeadlineScraper) -> Tuple[Set[str], float]:
+    """Returns (product URLs in the CSV, seconds)."""
+    scraper = scraper_class(urls)
+    _, elapsed = timed_run(scraper, concurrent_workers=4, deadline=time.time() + budget if budget else None)
+    return {row["Produkt_URL"] for row in read_rows(scraper.output_file)}, elapsed
+
+
+def test_rank_puts_new_and_volatile_products_first():
+    store = ProductStateStore("test_deadline")
+    try:
+        for url, price in (("old", "1"), ("older", "1"), ("volatile", "1"), ("volatile", "2")):
+            store.save(url, "", {"price_gross": price})
+        with store._lock, store._conn:
+            store._conn.execute("UPDATE products SET scraped_at = 0 WHERE url = 'older'")
+        ranked, counts = store.rank(["old", "older", "new", "volatile"], volatile_days=14)
+        assert ranked == ["new", "volatile", "older", "old"]
+        assert counts == {"new": 1, "volatile": 1, "rest": 2}
+        # A price change outside the window no longer counts.
+        _, counts = store.rank(["old", "volatile"], volatile_days=14, now=time.time() + 15 * 86400)
+        assert counts == {"new": 0, "volatile": 0, "rest": 2}
+    finally:
+        store.close()
+
+
+def test_run_overrides_take_the_deadline():
+    """The pipeline passes deadline= to every scraper; run() overrides must accept it."""
+    expected = list(inspect.signature(BaseScraper.run).parameters)
+    for name in scraper_names():
+        assert list(inspect.signature(load_scraper_class(name).run).parameters) == expected, name
+
+
+def test_deadline_stops_the_run_and_carries_the_rest():
+    clear_unvisited_urls("test_deadline")
+    with StubServer(build_pages(50, specs=0), latency=0.05) as server:
+        urls = [server.url(f"/produkt-{i}") for i in range(50)]
+        new, volatile = urls[40:45], urls[45:]
+        seed(urls[:40] + volatile, volatile)
+
+        scraped, elapsed = scrape(urls, budget=3)
+        unvisited = load_unvisited_urls("test_deadline")
+        assert elapsed < 5
+        assert set(new + volatile) <= scraped
+        assert unvisited and len(scraped) + len(unvisited) == 50
+        assert not scraped & set(unvisited)
+
+        # The next run starts with the URLs the first one did not reach.
+        rescraped, _ = scrape(urls)
+        assert set(unvisited) <= rescraped and len(rescraped) == 50
+        assert not load_unvisited_urls("test_deadline")
+
+
+def reached(scraper_class, count: int, budget: float) -> Tuple[int, int, int, int, float]:
+    """Returns (rows, new reached, volatile reached, unvisited, seconds) for one budgeted run."""
+    clear_unvisited_urls("test_deadline")
+    with StubServer(build_pages(count, specs=0), latency=0.05) as server:
+        urls = [server.url(f"/produkt-{i}") for i in range(count)]
+        # Every tenth product is new, another tenth had a price change.
+        new = {url for i, url in enumerate(urls) if i % 10 == 9}
+        volatile = [url for i, url in enumerate(urls) if i % 10 == 4]
+        seed([url for url in urls if url not in new], volatile)
+        scraped, elapsed = scrape(urls, budget, scraper_class)
+        unvisited = len(load_unvisited_urls("test_deadline"))
+    clear_unvisited_urls("test_deadline")
+    return len(scraped), len(scraped & new), len(scraped & set(volatile)), unvisited, elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    for test in (test_rank_puts_new_and_volatile_products_first, test_deadline_stops_the_run_and_carries_the_rest):
+        with tmp_run_dirs():
+            test()
+
+    rows = []
+    for label, scraper_class in (("discovery order", UnrankedScraper), ("ranked by value", DeadlineScraper)):
+        # Each run starts from its own freshly seeded state.
+        with tmp_run_dirs():
+            rows.append((label, reached(scraper_class, count, budget)))
+
+    with report(f"DEADLINE RUNS ({count} products, {count // 10} new, {count // 10} volatile, {budget:.0f} s budget)"):
+        for label, (scraped, new, volatile, unvisited, elapsed) in rows:
+            print(
+                f"{label:16s}: {scraped:4d} rows, new {new:3d}/{count // 10}, volatile {volatile:3d}/{count // 10}, "
+                f"{unvisited:4d} carried over, {elapsed:5.2f} s"
+            )
@@ -0,0 +1,86 @@
+"""
+Side-by-side throughput comparison of the thread and async engines.
+Both engines scrape the same pages from a local stub server that adds a
+fixed latency per request, so the numbers only reflect engine overhead.
+
+Usage:
+    python test_engine_throughput.py [pages] [latency_seconds]
+"""
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from base_scraper import BaseScraper
+from tests.stub_server import StubServer
+from tests.support import build_pages, report, timed_run
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class StubShopScraper(BaseScraper):
+    """Minimal scraper with the usual make_request + parse_html shape."""
+
+    def __init__(self, server: StubServer):
+        self.server = server
+        super().__init__("test_engine_throughput")
+        self.scrape_min_delay = self.scrape_max_delay = 0
+
+    def get_product_urls(self) -> List[str]:
+        return [self.server.url(path) for path in self.server.httpd.routes]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        soup = self.parse_response(response)
+        return {
+            "name": soup.select_one("h1").text,
+            "price_gross": soup.select_one("meta[itemprop='price']")["content"],
+            "product_url": url,
+        }
+
+
+def run_engine(server: StubServer, engine: str, workers: int) -> Tuple[int, float, int]:
+    """Returns (products, seconds, most requests in flight at the server)."""
+    server.reset_peak()
+    count, elapsed = timed_run(StubShopScraper(server), concurrent_workers=workers, engine=engine)
+    return count, elapsed, server.peak_in_flight
+
+
+def compare_engines(pages: int, latency: float) -> Dict[str, Tuple[float, int]]:
+    """Returns {engine: (seconds, most requests in flight)} for the thread and async engines."""
+    results = {}
+    with StubServer(build_pages(pages, specs=0), latency=latency) as server:
+        for engine in ("thread", "async"):
+            count, elapsed, peak = run_engine(server, engine, workers=6)
+            assert count == pages
+            results[engine] = (elapsed, peak)
+    return results
+
+
+def test_async_engine_keeps_more_requests_in_flight(monkeypatch):
+    # Without the per-host rate limiter only the engine decides how many requests overlap.
+    monkeypatch.setenv("SCRAPER_ADAPTIVE_RATE", "0")
+    results = compare_engines(pages=120, latency=0.1)
+    assert results["thread"][1] <= 6
+    assert results["async"][1] > 6
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+    results = compare_engines(pages, latency)
+    (thread_time, thread_peak), (async_time, async_peak) = results["thread"], results["async"]
+
+    with report(f"ENGINE THROUGHPUT ({pages} pages, {latency * 1000:.0f} ms latency)"):
+        print(
+            f"thread engine (6 workers): {thread_time:7.2f}s  {pages / thread_time:8.1f} products/sec"
+            f"  {thread_peak:4d} in flight"
+        )
+        print(
+            f"async engine            : {async_time:7.2f}s  {pages / async_time:8.1f} products/sec"
+            f"  {async_peak:4d} in flight"
+        )
+        print(f"Speedup: {thread_time / async_time:.1f}x")
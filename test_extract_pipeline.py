@@ -0,0 +1,130 @@
+"""
+Fetching on threads, extracting in worker processes (SCRAPER_PARSE_PROCESSES).
+
+Pages come from a local stub server; extraction parses each page with
+html.parser, so the process pool has real CPU work to spread out.
+
+Usage:
+    python test_extract_pipeline.py [pages] [processes]
+"""
+import os
+import pickle
+import sys
+from typing import List
+
+import pytest
+
+import config
+from base_scraper import BaseScraper, _extract_in_worker
+from tests.stub_server import StubServer
+from tests.support import (
+    FIXTURES,
+    StubExtractScraper,
+    build_pages,
+    load_scrapers,
+    read_rows,
+    report,
+    timed_run,
+)
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class LoggingExtractScraper(StubExtractScraper):
+    """Logs every extraction with the id of the process that ran it."""
+
+    def extract_product(self, url: str, response):
+        self.logger.info(f"Extracted {url} in process {os.getpid()}")
+        return super().extract_product(url, response)
+
+
+def run_scraper(monkeypatch, urls: List[str], processes: int, workers: int = 4):
+    """Returns (success_count, seconds, sorted CSV rows)."""
+    monkeypatch.setenv("SCRAPER_PARSE_PROCESSES", str(processes))
+    scraper = StubExtractScraper(urls)
+    count, elapsed = timed_run(scraper, concurrent_workers=workers)
+    return count, elapsed, sorted(tuple(row.items()) for row in read_rows(scraper.output_file))
+
+
+@pytest.mark.usefixtures("fixture_cassette")
+def test_scraper_pickles_without_sessions():
+    for scraper in load_scrapers():
+        if not scraper.extract_supported:
+            continue
+        clone = pickle.loads(pickle.dumps(scraper))
+        assert clone.session is None
+        assert clone.cassette is None
+        assert clone.logger is scraper.logger
+        for url in FIXTURES:
+            response = scraper.fetch_product(url)
+            assert clone.extract_product(url, response) == scraper.extract_product(url, response)
+
+
+@pytest.mark.usefixtures("fixture_cassette")
+def test_scrapers_extract_in_spawned_workers():
+    # Spawned workers only get what __getstate__() pickles.
+    for scraper in load_scrapers():
+        if not scraper.extract_supported:
+            continue
+        scraper.parse_processes = 1
+        with scraper.create_extract_pool() as pool:
+            for url in FIXTURES:
+                response = scraper.fetch_product(url)
+                expected = scraper.extract_product(url, response)
+                assert pool.submit(_extract_in_worker, url, response).result() == expected
+
+
+def test_extract_workers_log_to_the_run_logs_dir(tmp_data_dirs, monkeypatch):
+    _, logs_dir = tmp_data_dirs
+    repo_logs = config.BASE_DIR / "logs"
+
+    def snapshot():
+        return {path.name: path.stat().st_size for path in repo_logs.glob("*.log*")}
+
+    before = snapshot()
+    monkeypatch.setenv("SCRAPER_PARSE_PROCESSES", "2")
+    with StubServer(build_pages(8, specs=0)) as server:
+        scraper = LoggingExtractScraper([server.url(path) for path in server.httpd.routes])
+        assert scraper.run(concurrent_workers=2) == 8
+
+    assert snapshot() == before
+    log = (logs_dir / f"{scraper.scraper_name}.log").read_text(encoding="utf-8")
+    assert f"in process {os.getpid()}" not in log and log.count("Extracted ") == 8
+
+
+def test_pipeline_matches_thread_engine(monkeypatch):
+    with StubServer(build_pages(40)) as server:
+        urls = [server.url(path) for path in server.httpd.routes]
+        thread_count, _, thread_rows = run_scraper(monkeypatch, urls, processes=0)
+        pipeline_count, _, pipeline_rows = run_scraper(monkeypatch, urls, processes=2)
+
+    assert thread_count == pipeline_count == 40
+    assert pipeline_rows == thread_rows
+
+
+def test_unmigrated_scraper_keeps_thread_engine(monkeypatch):
+    class WholeScraper(StubExtractScraper):
+        extract_product = BaseScraper.extract_product
+
+        def scrape_product(self, url):
+            return {"name": url, "product_url": url}
+
+    monkeypatch.setenv("SCRAPER_PARSE_PROCESSES", "2")
+    scraper = WholeScraper(["https://shop.test/a", "https://shop.test/b"])
+    assert not scraper.extract_supported
+    assert scraper.create_extract_pool() is None
+    assert scraper.run(concurrent_workers=2) == 2
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+
+    with StubServer(build_pages(pages)) as server, pytest.MonkeyPatch.context() as monkeypatch:
+        urls = [server.url(path) for path in server.httpd.routes]
+        _, thread_time, _ = run_scraper(monkeypatch, urls, processes=0, workers=8)
+        _, pipeline_time, _ = run_scraper(monkeypatch, urls, processes=processes, workers=8)
+
+    with report(f"FETCH/EXTRACT PIPELINE ({pages} pages, {os.cpu_count()} CPUs)"):
+        print(f"thread engine (8 threads fetch + parse) : {thread_time:6.2f} s")
+        print(f"pipeline (8 fetch threads, {processes} processes): {pipeline_time:6.2f} s")
@@ -0,0 +1,180 @@
+"""
+Resuming a killed run from the URL frontier (SCRAPER_FRONTIER, frontier.py).
+
+A run is "killed" by raising KeyboardInterrupt from extract_product(); the
+next run must resume from the frontier and append to the partial CSV.
+
+Usage:
+    python test_frontier.py [pages]
+"""
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+
+import pytest
+
+from frontier import DONE, FAILED, IN_FLIGHT, PENDING, UrlFrontier
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class KillableScraper(StubExtractScraper):
+    """Dies at the kill-th extraction and raises for URLs listed in `flaky` once."""
+
+    def __init__(self, urls: List[str], kill: Optional[int] = None, flaky=()):
+        self.kill = kill
+        self.flaky = set(flaky)
+        self.extracted = 0
+        self.discovered = False
+        super().__init__(urls)
+
+    def get_product_urls(self) -> List[str]:
+        self.discovered = True
+        return super().get_product_urls()
+
+    def extract_product(self, url, response):
+        self.extracted += 1
+        if self.kill is not None and self.extracted >= self.kill:
+            raise KeyboardInterrupt
+        if url in self.flaky:
+            self.flaky.discard(url)
+            raise ConnectionResetError("connection reset")
+        return super().extract_product(url, response)
+
+
+def enable_frontier(monkeypatch, **env_vars: str) -> None:
+    """Turn the frontier on (with a small CSV buffer) for the scrapers created next."""
+    for name, value in {"SCRAPER_FRONTIER": "1", "SCRAPER_CSV_BUFFER_SIZE": "5", **env_vars}.items():
+        monkeypatch.setenv(name, value)
+
+
+def csv_urls(scraper) -> List[str]:
+    return [row["Produkt_URL"] for row in read_rows(scraper.output_file)]
+
+
+def run_until_killed(urls: List[str], kill: int, workers: int = 4) -> KillableScraper:
+    scraper = KillableScraper(urls, kill=kill)
+    try:
+        scraper.run(concurrent_workers=workers)
+    except KeyboardInterrupt:
+        pass
+    return scraper
+
+
+def test_frontier_states_and_backoff(tmp_path):
+    store = UrlFrontier("shop", backoff=60, path=str(tmp_path / "shop.sqlite"))
+    assert store.start(["a", "b", "c", "b"]) == 3
+    claims = store.iter_claims(batch_size=2)
+    assert [next(claims), next(claims)] == ["a", "b"]
+    assert store.counts() == {IN_FLIGHT: 2, PENDING: 1}
+
+    store.complete([("a", None), ("b", "HTTPError: 500")])
+    assert list(claims) == ["c"]
+    # b waits for its backoff; c was left in flight by a "crash".
+    assert 59 < store.seconds_until_retry() <= 60
+    assert store.recover() == 1
+    assert store.resumable() and not store.finish()
+
+    store.complete([("c", None)])
+    store.max_attempts = 1
+    assert store.seconds_until_retry() is None
+    assert store.counts() == {DONE: 2, FAILED: 1}
+    assert store.finish() and not store.resumable()
+    store.close()
+
+
+def test_killed_run_resumes_and_appends(monkeypatch):
+    enable_frontier(monkeypatch)
+    with StubServer(build_pages(40)) as server:
+        urls = [server.url(path) for path in server.httpd.routes]
+        killed = run_until_killed(urls, kill=25)
+        partial = csv_urls(killed)
+        assert 0 < len(partial) < 40
+
+        resumed = KillableScraper(urls)
+        assert csv_urls(resumed) == partial
+        count = resumed.run(concurrent_workers=4)
+
+        assert not resumed.discovered
+        assert count == 40 - len(partial)
+        assert Counter(csv_urls(resumed)) == Counter(urls)
+
+        # The frontier is finished: the next run crawls from scratch.
+        fresh = KillableScraper(urls)
+        assert csv_urls(fresh) == []
+        assert fresh.run(concurrent_workers=4) == 40 and fresh.discovered
+
+
+def test_failed_urls_are_retried_after_backoff(monkeypatch):
+    routes = build_pages(10)
+    page = routes["/produkt-9"]
+    served = []
+
+    def down_once(handler):
+        served.append(handler.path)
+        handler.send_payload(503 if len(served) == 1 else 200, page.encode("utf-8"))
+
+    routes["/produkt-9"] = down_once
+    enable_frontier(monkeypatch, SCRAPER_FRONTIER_BACKOFF="0.2")
+    with StubServer(routes) as server:
+        urls = [server.url(path) for path in server.httpd.routes]
+        scraper = KillableScraper(urls, flaky=urls[3:5])
+        scraper.max_retries = 1
+        assert scraper.run(concurrent_workers=2) == 10
+        assert len(served) == 2
+        assert sorted(csv_urls(scraper)) == sorted(urls)
+
+        store = UrlFrontier.from_env(scraper.scraper_name)
+        assert store.counts() == {DONE: 10}
+        store.close()
+
+
+def test_pages_without_data_are_not_retried(monkeypatch):
+    routes = build_pages(6, specs=0)
+    routes["/produkt-4"] = "<html><body><h1>Kategorie</h1></body></html>"
+    del routes["/produkt-5"]
+    enable_frontier(monkeypatch)
+    with StubServer(routes) as server:
+        urls = [server.url(f"/produkt-{i}") for i in range(6)]
+        scraper = KillableScraper(urls)
+        scraper.extract_product = lambda url, response: (
+            None if "Kategorie" in response.text else StubExtractScraper.extract_product(scraper, url, response)
+        )
+        assert scraper.run(concurrent_workers=2) == 4
+        assert len(server.request_log) == 6
+
+        store = UrlFrontier.from_env(scraper.scraper_name)
+        assert store.counts() == {DONE: 6}
+        store.close()
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tmp_run_dirs() as (_, tmp_path):
+        test_frontier_states_and_backoff(tmp_path)
+    for test in (
+        test_killed_run_resumes_and_appends,
+        test_failed_urls_are_retried_after_backoff,
+        test_pages_without_data_are_not_retried,
+    ):
+        with tmp_run_dirs() as (monkeypatch, _):
+            test(monkeypatch)
+
+    with StubServer(build_pages(pages), latency=0.02) as server:
+        urls = [server.url(path) for path in server.httpd.routes]
+        kill = int(pages * 0.8)
+        timings: Dict[str, float] = {}
+        for mode in ("restart", "resume"):
+            with tmp_run_dirs() as (monkeypatch, _):
+                enable_frontier(monkeypatch, SCRAPER_FRONTIER="1" if mode == "resume" else "0")
+                run_until_killed(urls, kill=kill, workers=8)
+                scraper = KillableScraper(urls)
+                _, timings[mode] = timed_run(scraper, concurrent_workers=8)
+                rows = len(csv_urls(scraper))
+            timings[f"{mode} rows"] = rows
+
+    with report(f"RESUME AFTER A RUN KILLED AT 80% ({pages} pages, 20 ms latency)"):
+        print(f"restart from zero : {timings['restart']:6.2f} s ({timings['restart rows']} rows)")
+        print(f"resume (frontier) : {timings['resume']:6.2f} s ({timings['resume rows']} rows)")
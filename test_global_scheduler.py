@@ -0,0 +1,185 @@
+"""
+One worker pool shared by every shop (global_scheduler.py).
+
+The benchmark runs ten stub shops with different sizes and latencies, once
+like run_production_pipeline's batches (one shop at a time, SCRAPER_WORKERS
+threads each) and once with all shops on one GlobalScheduler.
+
+Usage:
+    python test_global_scheduler.py [latency_step]
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pytest
+
+from base_scraper import BaseScraper
+from global_scheduler import GlobalScheduler
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class ShopScraper(StubExtractScraper):
+    """StubExtractScraper with its own name, so every shop writes its own CSV."""
+
+    def __init__(self, name: str, urls: List[str]):
+        self.urls = urls
+        BaseScraper.__init__(self, name)
+        self.scrape_min_delay = self.scrape_max_delay = 0
+
+
+class Probe:
+    """Counts how many tasks run at once, overall and per lane."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+        self.peak_total = 0
+
+    def task(self, lane: str, seconds: float) -> str:
+        with self.lock:
+            self.running[lane] = self.running.get(lane, 0) + 1
+            self.peak[lane] = max(self.peak.get(lane, 0), self.running[lane])
+            self.peak_total = max(self.peak_total, sum(self.running.values()))
+        time.sleep(seconds)
+        with self.lock:
+            self.running[lane] -= 1
+        return lane
+
+
+def run_shops(
+    shops: List[Tuple[str, StubServer, int]], scheduler: Optional[GlobalScheduler] = None, workers: int = 4
+) -> Tuple[float, int]:
+    """
+    Run one scraper per shop, one after the other or all at once on the scheduler.
+
+    Returns:
+        (seconds, CSV rows written, seconds of the slowest shop)
+    """
+    scrapers = []
+    for name, server, count in shops:
+        scraper = ShopScraper(name, [server.url(f"/produkt-{i}") for i in range(count)])
+        scraper.scheduler = scheduler
+        scrapers.append(scraper)
+
+    def run(scraper) -> float:
+        return timed_run(scraper, concurrent_workers=workers if scheduler is None else scheduler.host_workers)[1]
+
+    start = time.time()
+    if scheduler is None:
+        shop_times = [run(scraper) for scraper in scrapers]
+    else:
+        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            shop_times = list(executor.map(run, scrapers))
+    elapsed = time.time() - start
+
+    rows = sum(len(read_rows(scraper.output_file)) for scraper in scrapers)
+    return elapsed, rows, max(shop_times)
+
+
+def test_lanes_respect_their_limit_and_the_pool_size():
+    probe = Probe()
+    with GlobalScheduler(workers=4, host_workers=3) as scheduler:
+        with scheduler.lane("a") as a, scheduler.lane("b") as b:
+            futures = [lane.submit(probe.task, lane.name, 0.02) for lane in (a, b) for _ in range(15)]
+        results = [future.result() for future in futures]
+
+    assert results == ["a"] * 15 + ["b"] * 15
+    assert probe.peak["a"] <= 3 and probe.peak["b"] <= 3
+    assert probe.peak_total == 4
+    assert not scheduler.lanes
+
+
+def test_idle_capacity_goes_to_the_lane_with_work():
+    probe = Probe()
+    with GlobalScheduler(workers=4, host_workers=4) as scheduler:
+        short, long = scheduler.lane("short"), scheduler.lane("long")
+        with scheduler.cond:  # queue both lanes before any worker starts
+            futures = [short.submit(probe.task, "short", 0.05) for _ in range(4)]
+            futures += [long.submit(probe.task, "long", 0.05) for _ in range(40)]
+        short.shutdown()
+        with probe.lock:
+            # Both lanes shared the pool; the long lane now has all of it.
+            assert probe.peak["short"] == 2
+        long.shutdown()
+
+    assert all(future.done() for future in futures)
+    assert long.peak_running == 4 and long.completed == 40
+
+
+def test_errors_reach_the_caller_and_cancel_pending_tasks():
+    def fail():
+        raise ValueError("boom")
+
+    with GlobalScheduler(workers=1) as scheduler:
+        with scheduler.lane("x") as lane:
+            failed = lane.submit(fail)
+        try:
+            failed.result()
+        except ValueError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("exception was swallowed")
+
+        blocker = threading.Event()
+        lane = scheduler.lane("y")
+        lane.submit(blocker.wait, 5)
+        queued = [lane.submit(time.sleep, 0) for _ in range(3)]
+        time.sleep(0.05)
+        blocker.set()
+        lane.shutdown(cancel_futures=True)
+
+    assert all(future.cancelled() for future in queued)
+
+
+def test_scrapers_share_one_pool():
+    servers = [
+        StubServer(build_pages(count, specs=0), latency=latency).start() for count, latency in ((40, 0.05), (8, 0.01))
+    ]
+    try:
+        shops = [(f"test_global_scheduler_{i}", server, len(server.httpd.routes)) for i, server in enumerate(servers)]
+        with GlobalScheduler(workers=6, host_workers=4) as scheduler:
+            _, rows, _ = run_shops(shops, scheduler)
+    finally:
+        for server in servers:
+            server.stop()
+
+    assert rows == 48
+    assert {lane.name: lane.completed for lane in scheduler.history} == {
+        "test_global_scheduler_0": 40,
+        "test_global_scheduler_1": 8,
+    }
+    assert all(lane.peak_running <= 4 for lane in scheduler.history)
+
+
+if __name__ == "__main__":
+    step = float(sys.argv[1]) if len(sys.argv) > 1 else 0.02
+    test_lanes_respect_their_limit_and_the_pool_size()
+    test_idle_capacity_goes_to_the_lane_with_work()
+    test_scrapers_share_one_pool()
+
+    def ten_shops(scheduler: Optional[GlobalScheduler] = None):
+        # Sizes 20..200 products, latencies 10*step..step. New servers (new
+        # hosts) per run, so each run starts with cold rate limiters.
+        servers = [StubServer(build_pages(20 * (i + 1), specs=0), latency=step * (10 - i)).start() for i in range(10)]
+        try:
+            shops = [(f"test_global_scheduler_{i}", server, 20 * (i + 1)) for i, server in enumerate(servers)]
+            return run_shops(shops, scheduler, workers=4)
+        finally:
+            for server in servers:
+                server.stop()
+
+    batch_time, batch_rows, longest = ten_shops()
+    with GlobalScheduler(workers=32, host_workers=8) as scheduler:
+        global_time, global_rows, _ = ten_shops(scheduler)
+
+    with report(f"TEN SHOPS, 1,100 PRODUCTS ({step}s to {step * 10:.2f}s latency)"):
+        print(f"batches of 1 shop, 4 workers each     : {batch_rows:5d} rows {batch_time:6.2f} s")
+        print(f"global scheduler, 32 workers, 8/shop  : {global_rows:5d} rows {global_time:6.2f} s")
+        print(f"slowest shop of the batch run         :            {longest:6.2f} s")
@@ -0,0 +1,71 @@
+"""
+Offline test for the conditional-GET HTTP cache (SCRAPER_HTTP_CACHE=1).
+Runs two scrapes against a local stub server and checks that the second
+one is answered with 304s and served from disk.
+"""
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from base_scraper import BaseScraper
+from http_cache import HttpCache
+from tests.stub_server import StubServer
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+PAGES = {
+    f"/produkt-{i}": f"<html><body><h1>Produkt {i}</h1><span class='price'>{i},99</span></body></html>"
+    for i in range(1, 6)
+}
+
+
+class CachedStubScraper(BaseScraper):
+    def __init__(self, server: StubServer, cache_dir: str):
+        self.server = server
+        super().__init__("test_http_cache")
+        assert self.http_cache is not None, "SCRAPER_HTTP_CACHE=1 not set"
+        self.http_cache = HttpCache(self.scraper_name, cache_dir=cache_dir)
+
+    def get_product_urls(self) -> List[str]:
+        return [self.server.url(path) for path in PAGES]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        soup = self.parse_response(response)
+        return {"name": soup.select_one("h1").text, "product_url": url}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_HTTP_CACHE", "1")
+    return tmp_path / "http_cache"
+
+
+def test_second_run_served_from_cache(cache_dir):
+    with StubServer(PAGES, etags=True) as server:
+        first = CachedStubScraper(server, cache_dir)
+        assert first.run(concurrent_workers=2) == len(PAGES)
+        assert first.http_cache.misses == len(PAGES)
+        assert first.http_cache.stores == len(PAGES)
+
+        second = CachedStubScraper(server, cache_dir)
+        assert second.run(concurrent_workers=2) == len(PAGES)
+        assert second.http_cache.hits == len(PAGES)
+        assert second.http_cache.misses == 0
+        assert second.http_cache.bytes_saved == sum(len(p) for p in PAGES.values())
+
+
+if __name__ == "__main__":
+    os.environ["SCRAPER_HTTP_CACHE"] = "1"
+    cache_dir = tempfile.mkdtemp()
+    try:
+        test_second_run_served_from_cache(cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    print("✓ HTTP cache served the second run from disk")
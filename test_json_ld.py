@@ -0,0 +1,179 @@
+"""
+The JSON-LD fast path (json_ld.py) against the DOM selectors.
+
+Covers @graph/list payloads and breadcrumb categories, checks that scrapers
+skip the DOM only when JSON-LD has every field their DOM fallbacks cover,
+and that those fallbacks still fill what JSON-LD lacks.
+
+Usage:
+    python test_json_ld.py [rounds]
+"""
+import sys
+import tempfile
+import time
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import json_ld
+from base_scraper import BaseScraper
+from parser_backends import HTML_PARSER, build_document
+from tests.support import FIXTURES, load_scrapers, report, use_fixture_cassette
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+GRAPH_PAGE = b"""<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "WebSite", "name": "Shop"}</script>
+<script type='application/ld+json'>
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "Shop GmbH"},
+  {"@type": ["Product", "IndividualProduct"], "name": "Umw\xc3\xa4lzpumpe &amp; Zubeh\xc3\xb6r",
+   "brand": {"@type": "Brand", "name": "Grundfos"}, "mpn": "99221216", "gtin13": "5712603000000",
+   "image": [{"@type": "ImageObject", "url": "https://shop.test/p.jpg"}],
+   "offers": [{"@type": "AggregateOffer", "lowPrice": "249.00", "priceCurrency": "EUR"}]},
+  {"@type": "BreadcrumbList", "itemListElement": [
+    {"@type": "ListItem", "position": 3, "name": "Alpha2"},
+    {"@type": "ListItem", "position": 1, "name": "Start"},
+    {"@type": "ListItem", "position": 2, "name": "Heizungspumpen"}]}
+]}
+</script></head><body><h1>ignored</h1></body></html>"""
+
+LIST_PAGE = b"""<script type="application/ld+json">[
+  {"@type": "BreadcrumbList", "itemListElement": []},
+  {"@type": "Product", "name": "Ventil", "sku": "V-1", "category": "Armaturen",
+   "offers": {"@type": "Offer", "price": 12.5}}
+]</script>"""
+
+
+def test_graph_and_breadcrumb():
+    fields = json_ld.extract_product(GRAPH_PAGE, "utf-8")
+    assert fields["name"] == "Umwälzpumpe & Zubehör"
+    assert fields["manufacturer"] == "Grundfos"
+    assert fields["article_number"] == "99221216"
+    assert fields["ean"] == "5712603000000"
+    assert fields["image"] == "https://shop.test/p.jpg"
+    assert fields["price_gross"] == "249.00"
+    assert fields["category"] == "Heizungspumpen"
+    assert not json_ld.missing_fields(fields)
+
+
+def test_list_payload_and_missing_fields():
+    fields = json_ld.extract_product(LIST_PAGE.decode())
+    assert fields["name"] == "Ventil"
+    assert fields["category"] == "Armaturen"
+    assert fields["price_gross"] == "12.5"
+    assert json_ld.missing_fields(json_ld.extract_product(b"<html></html>")) == list(json_ld.DOM_FIELDS)
+    assert json_ld.missing_fields({"name": "x", "price_gross": ""}, ("name", "price_gross")) == ["price_gross"]
+
+
+HEIMA24_URL = "https://www.heima24.de/grundfos-alpha2-25-60-180.html"
+
+# JSON-LD without gtin; the EAN is only in the page text.
+HEIMA24_NO_GTIN = b"""<html><head><script type="application/ld+json">
+{"@type": "Product", "name": "Grundfos Alpha2 25-60", "brand": {"@type": "Brand", "name": "Grundfos"},
+ "mpn": "99411170", "image": "https://www.heima24.de/alpha2.jpg", "category": "Heizungspumpen",
+ "offers": {"@type": "Offer", "price": "289.90"}}
+</script></head><body>
+<div class="text-left">Artikel-Nr.: 99411170 | EAN: 5712603001234</div>
+</body></html>"""
+
+HEIMA24_COMPLETE = HEIMA24_NO_GTIN.replace(b'"mpn"', b'"gtin13": "5712603001234", "mpn"')
+
+
+def page_response(url: str, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+    response.url = url
+    response._content = body
+    return response
+
+
+def count_dom_builds(run):
+    """Returns (run(), scraper names that built a DOM meanwhile)."""
+    built = []
+    original = BaseScraper.parse_response
+
+    def counting_parse(self, response, parser=None):
+        built.append(self.scraper_name)
+        return original(self, response, parser)
+
+    BaseScraper.parse_response = counting_parse
+    try:
+        return run(), built
+    finally:
+        BaseScraper.parse_response = original
+
+
+def test_dom_fills_fields_json_ld_lacks():
+    from heima24_scraper import Heima24Scraper
+
+    scraper = Heima24Scraper()
+    product, built = count_dom_builds(
+        lambda: scraper.extract_product(HEIMA24_URL, page_response(HEIMA24_URL, HEIMA24_NO_GTIN))
+    )
+    assert product["ean"] == "5712603001234" and product["manufacturer"] == "Grundfos"
+    assert built == ["heima24"]
+
+    product, built = count_dom_builds(
+        lambda: scraper.extract_product(HEIMA24_URL, page_response(HEIMA24_URL, HEIMA24_COMPLETE))
+    )
+    assert product["ean"] == "5712603001234" and product["article_number"] == "99411170"
+    assert built == []
+
+
+@pytest.mark.usefixtures("fixture_cassette")
+def test_fixture_pages():
+    """The saved pages have no gtin in JSON-LD: every JSON-LD scraper builds the DOM for it."""
+    def run():
+        scrapers = [
+            s for s in load_scrapers()
+            if s.scraper_name in ("wasserpumpe", "pumpenheizung", "heima24", "wolf_online_shop")
+        ]
+        for scraper in scrapers:
+            for url in FIXTURES:
+                product = scraper.scrape_product(url)
+                assert product and product["name"] and product["price_gross"], (scraper.scraper_name, url)
+        return len(scrapers)
+
+    count, built = count_dom_builds(run)
+    assert len(built) == count * len(FIXTURES)
+
+
+def benchmark(rounds: int = 5):
+    """Returns (fixture, size, json_ld_time, dom_time) per saved product page (dom_time: DOM build alone)."""
+    results = []
+    for fixture in FIXTURES.values():
+        with open(fixture, "rb") as f:
+            body = f.read()
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            json_ld.extract_product(body, "utf-8")
+        ld_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            build_document(body, HTML_PARSER, "utf-8")
+        dom_time = (time.perf_counter() - start) / rounds
+
+        results.append((fixture, len(body), ld_time, dom_time))
+    return results
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    test_graph_and_breadcrumb()
+    test_list_payload_and_missing_fields()
+    test_dom_fills_fields_json_ld_lacks()
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as monkeypatch:
+        use_fixture_cassette(monkeypatch, tmp)
+        test_fixture_pages()
+
+    with report(f"JSON-LD FAST PATH ({rounds} rounds per page)"):
+        for fixture, size, ld_time, dom_time in benchmark(rounds):
+            print(f"{fixture} ({size / 1024:.0f} KB)")
+            print(f"  JSON-LD from bytes : {ld_time * 1000:7.2f} ms")
+            print(f"  html.parser DOM    : {dom_time * 1000:7.1f} ms  ({dom_time / ld_time:.0f}x)")
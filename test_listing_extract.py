@@ -0,0 +1,163 @@
+"""
+Products taken from category tiles instead of their pages (SCRAPER_LISTING_EXTRACT).
+
+ListingScraper discovers its products through a paginated Magento-style
+category whose tiles show name, price and image; manufacturer and EAN are
+only on the product pages.
+
+Usage:
+    python test_listing_extract.py [products] [latency]
+"""
+import sys
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from category_crawler import MAGENTO_TILES, CategoryCrawler, read_tiles
+from product_state import page_refresh_due
+from sharding import discovery_cache_path
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, read_rows, report, timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+PER_PAGE = 24
+
+
+class ListingScraper(StubExtractScraper):
+    def __init__(self, category_url: str):
+        self.category_url = category_url
+        super().__init__([])
+
+    def get_product_urls(self) -> List[str]:
+        crawler = CategoryCrawler(
+            self, tiles=lambda soup, url: read_tiles(soup, url, clean_price=self._clean_price, **MAGENTO_TILES)
+        )
+        return list(crawler.iter_products([self.category_url]))
+
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        product_data = super().extract_product(url, response)
+        soup = self.parse_response(response)
+        product_data.update(
+            manufacturer=soup.select_one("span.brand").text,
+            ean=soup.select_one("span.ean").text,
+            price_net="(from page)",
+        )
+        return product_data
+
+    @staticmethod
+    def _clean_price(text: str) -> str:
+        return text.replace("€", "").strip()
+
+
+def tile(i: int, price: str) -> str:
+    price_html = f"<span data-price-type='finalPrice'><span class='price'>{price} €</span></span>" if price else ""
+    return (
+        f"<li class='product-item'><a class='product-item-link' href='/produkt-{i}'>Testprodukt {i}</a>"
+        f"{price_html}<img class='product-image-photo' src='/bilder/{i}.jpg'></li>"
+    )
+
+
+def build_shop(count: int, prices: Dict[int, str]) -> Dict[str, str]:
+    routes = {}
+    pages = (count + PER_PAGE - 1) // PER_PAGE
+    for page in range(1, pages + 1):
+        items = "".join(tile(i, prices[i]) for i in range((page - 1) * PER_PAGE, min(page * PER_PAGE, count)))
+        link = f"<a href='/kategorie?p={page + 1}'>{page + 1}</a>" if page < pages else ""
+        routes["/kategorie" + (f"?p={page}" if page > 1 else "")] = (
+            f"<html><body><ul>{items}</ul>{link}</body></html>"
+        )
+    for i in range(count):
+        routes[f"/produkt-{i}"] = (
+            f"<html><body><h1>Testprodukt {i}</h1><meta itemprop='price' content='{prices[i] or '1,00'}'>"
+            f"<span class='brand'>Grundfos</span><span class='ean'>{4000000000000 + i}</span></body></html>"
+        )
+    return routes
+
+
+def listing_run(monkeypatch, server, listing: bool = True):
+    """Returns (count, seconds, product pages fetched, CSV rows by product path)."""
+    monkeypatch.setenv("SCRAPER_LISTING_EXTRACT", "1" if listing else "0")
+    scraper = ListingScraper(server.url("/kategorie"))
+    server.request_log.clear()
+    count, elapsed = timed_run(scraper, concurrent_workers=4)
+    fetched = sum(1 for _, path in server.request_log if path.startswith("/produkt-"))
+    rows = {row["Produkt_URL"].rsplit("/", 1)[1]: row for row in read_rows(scraper.output_file)}
+    return count, elapsed, fetched, rows
+
+
+def test_refresh_is_spread_over_the_interval():
+    urls = [f"https://shop.test/produkt-{i}" for i in range(1000)]
+    day = 86400
+    assert not any(page_refresh_due(url, 0, 14, now=6 * day) for url in urls)
+    assert all(page_refresh_due(url, 0, 14, now=14 * day) for url in urls)
+    due = sum(page_refresh_due(url, 0, 14, now=10.5 * day) for url in urls)
+    assert 350 < due < 650
+
+
+def test_tiles_replace_product_pages_once_stored(monkeypatch):
+    prices = {i: f"{i},99" for i in range(30)}
+    with StubServer(build_shop(30, prices)) as server:
+        count, _, fetched, rows = listing_run(monkeypatch, server)
+        assert count == 30 and fetched == 30
+        assert rows["produkt-3"]["EAN"] == "4000000000003"
+
+        # New prices on three tiles; one tile stops showing a price.
+        for i in (3, 4, 5):
+            prices[i] = f"{i}9,00"
+        prices[7] = ""
+        server.httpd.routes.update(build_shop(30, prices))
+        count, _, fetched, rows = listing_run(monkeypatch, server)
+
+    assert count == 30 and fetched == 1
+    assert rows["produkt-3"]["Preis_Brutto"] == "39,00"
+    assert rows["produkt-3"]["Preis_Netto"] == "32,77"
+    assert rows["produkt-3"]["Hersteller"] == "Grundfos"
+    assert rows["produkt-3"]["EAN"] == "4000000000003"
+    assert rows["produkt-3"]["Produktbild"].endswith("/bilder/3.jpg")
+    assert rows["produkt-7"]["Preis_Netto"] == "(from page)"
+    assert rows["produkt-8"]["Preis_Brutto"] == "8,99"
+
+
+def test_tiles_kept_in_the_discovery_cache(monkeypatch):
+    # The scheduler daemon's flow: prewarm, reset the kept scraper, run from the cache.
+    monkeypatch.setenv("SCRAPER_DISCOVERY_CACHE", "1")
+    prices = {i: f"{i},99" for i in range(30)}
+    with StubServer(build_shop(30, prices)) as server:
+        assert listing_run(monkeypatch, server)[2] == 30
+        discovery_cache_path("test_extract_pipeline").unlink()
+
+        monkeypatch.setenv("SCRAPER_LISTING_EXTRACT", "1")
+        scraper = ListingScraper(server.url("/kategorie"))
+        assert scraper.warm_up() == 30
+        scraper.reset_for_next_run()
+        server.request_log.clear()
+        assert scraper.run(concurrent_workers=4) == 30
+    assert server.request_log == []
+
+
+def test_off_by_default(monkeypatch):
+    prices = {i: f"{i},99" for i in range(10)}
+    with StubServer(build_shop(10, prices)) as server:
+        listing_run(monkeypatch, server, listing=False)
+        assert listing_run(monkeypatch, server, listing=False)[2] == 10
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 480
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    test_refresh_is_spread_over_the_interval()
+    with tmp_run_dirs() as (monkeypatch, _):
+        test_tiles_replace_product_pages_once_stored(monkeypatch)
+
+    prices = {i: f"{i},99" for i in range(count)}
+    with tmp_run_dirs() as (monkeypatch, _), StubServer(build_shop(count, prices), latency=latency) as server:
+        _, page_time, page_fetches, _ = listing_run(monkeypatch, server, listing=False)
+        page_requests = len(server.request_log)
+        listing_run(monkeypatch, server)
+        _, listing_time, listing_fetches, _ = listing_run(monkeypatch, server)
+        listing_requests = len(server.request_log)
+
+    with report(f"LISTING EXTRACTION ({count} products, {PER_PAGE} per category page, {latency}s latency)"):
+        print(f"product pages      : {page_requests:5d} requests ({page_fetches:5d} product pages) {page_time:6.2f} s")
+        print(f"category tiles     : {listing_requests:5d} requests ({listing_fetches:5d} product pages) {listing_time:6.2f} s")
@@ -0,0 +1,168 @@
+"""
+Magento GraphQL as a bulk product source (SCRAPER_BULK_SOURCE).
+
+The stand-in endpoint (tests.stub_server.magento_graphql_route) pages through
+product items built from fixtures/magento_graphql_products.json; the same
+products are also served as HTML pages for the fallback.
+
+Usage:
+    python test_magento_graphql.py [products] [latency]
+"""
+import copy
+import sys
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from magento_graphql import PRODUCTS_QUERY, MagentoGraphQL
+from tests.stub_server import StubServer, load_fixture, magento_graphql_route
+from tests.support import (
+    StubExtractScraper,
+    build_pages,
+    read_rows,
+    report,
+    timed_run,
+    tmp_run_dirs,
+)
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class GraphQLScraper(StubExtractScraper):
+    def __init__(self, server, count: int, page_size: int = 100):
+        self.base_url = server.base_url
+        self.page_size = page_size
+        super().__init__([server.url(f"/produkt-{i}") for i in range(count)])
+
+    def bulk_source(self) -> MagentoGraphQL:
+        return MagentoGraphQL(self, self.base_url, page_size=self.page_size)
+
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        # The product pages have the fields GraphQL lacks.
+        product = super().extract_product(url, response)
+        number = url.rsplit("-", 1)[1]
+        product.update(manufacturer="Grundfos", ean=f"40{int(number):011d}")
+        return product
+
+
+def build_items(count: int) -> List[Dict[str, Any]]:
+    """GraphQL items whose URLs match the HTML pages of build_pages()."""
+    template = load_fixture("magento_graphql_products.json")[0]
+    items = []
+    for i in range(count):
+        item = copy.deepcopy(template)
+        item["sku"] = f"P24-{i}"
+        item["name"] = f"Testprodukt {i}"
+        item["url_key"] = f"produkt-{i}"
+        item["url_suffix"] = ""
+        item["price_range"]["minimum_price"]["final_price"]["value"] = 100.0 + i
+        items.append(item)
+    return items
+
+
+def start_shop(count: int, latency: float = 0.0, **route_kwargs) -> StubServer:
+    routes = dict(build_pages(count))
+    routes["/graphql"] = magento_graphql_route(build_items(count), **route_kwargs)
+    return StubServer(routes, latency=latency).start()
+
+
+def bulk_run(monkeypatch, server, count: int, bulk: bool = True, page_size: int = 100):
+    """Returns (count, seconds, requests by kind, CSV rows by URL)."""
+    monkeypatch.setenv("SCRAPER_BULK_SOURCE", "1" if bulk else "0")
+    scraper = GraphQLScraper(server, count, page_size=page_size)
+    server.request_log.clear()
+    written, elapsed = timed_run(scraper, concurrent_workers=4)
+    kinds = {"api": 0, "pages": 0}
+    for _, path in server.request_log:
+        kinds["api" if path.startswith("/graphql") else "pages"] += 1
+    rows = {row["Produkt_URL"]: row for row in read_rows(scraper.output_file)}
+    return written, elapsed, kinds, rows
+
+
+def test_map_fixture_items():
+    api = MagentoGraphQL(StubExtractScraper([]), "https://www.pumpe24.de/")
+    first, second, third = (api.map_product(item) for item in load_fixture("magento_graphql_products.json"))
+    assert first == {
+        "manufacturer": "",
+        "category": "Druckerhöhungsanlagen",
+        "name": "Grundfos SCALA2 3-45 A Druckerhöhungsanlage",
+        "title": "Grundfos SCALA2 3-45 A Druckerhöhungsanlage",
+        "article_number": "P24-98562804",
+        "price_net": "578,99",
+        "price_gross": "689,00",
+        "ean": "",
+        "product_image": "https://www.pumpe24.de/media/catalog/product/cache/3f1c0e/g/r/grundfos-scala2.jpg",
+        "product_url": "https://www.pumpe24.de/grundfos-scala2-3-45-a-druckerhoehungsanlage.html",
+    }
+    assert second["product_url"] == "https://www.pumpe24.de/wilo-stratos-maxo-30-0-5-12.html"
+    assert second["price_gross"] == "2.149,90" and second["product_image"] == ""
+    assert third["product_url"] == "https://www.pumpe24.de/ksb-ixo-pro-4.html"
+    assert third["price_gross"] == third["price_net"] == ""
+
+
+def test_bulk_run_pages_through_graphql(monkeypatch):
+    server = start_shop(250)
+    try:
+        # Nothing stored yet: EAN and manufacturer need the product pages.
+        count, _, kinds, rows = bulk_run(monkeypatch, server, 250)
+        assert count == 250 and kinds == {"api": 3, "pages": 250}
+        assert rows[server.url("/produkt-7")]["EAN"] == "4000000000007"
+
+        count, _, kinds, rows = bulk_run(monkeypatch, server, 250)
+        method, path = server.request_log[0]
+    finally:
+        server.stop()
+    assert count == 250 and len(rows) == 250
+    assert kinds == {"api": 3, "pages": 0}
+    # Cacheable GET with the query in the URL.
+    assert method == "GET" and parse_qs(urlsplit(path).query)["query"] == [PRODUCTS_QUERY]
+    # Price and article number from GraphQL, EAN and manufacturer from the stored page.
+    row = rows[server.url("/produkt-7")]
+    assert row["Preis_Brutto"] == "107,00" and row["Artikelnummer"] == "P24-7"
+    assert row["EAN"] == "4000000000007" and row["Hersteller"] == "Grundfos"
+
+
+def test_falls_back_to_html(monkeypatch):
+    # Cloudflare challenge on /graphql.
+    server = start_shop(20, blocked=True)
+    try:
+        count, _, kinds, rows = bulk_run(monkeypatch, server, 20)
+    finally:
+        server.stop()
+    assert count == 20 and kinds == {"api": 1, "pages": 20}
+    assert rows[server.url("/produkt-3")]["Name"] == "Testprodukt 3"
+
+    # Schema without one of the queried fields.
+    server = start_shop(20, error='Cannot query field "url_suffix" on type "ProductInterface".')
+    try:
+        count, _, kinds, _ = bulk_run(monkeypatch, server, 20)
+    finally:
+        server.stop()
+    assert count == 20 and kinds == {"api": 1, "pages": 20}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    test_map_fixture_items()
+    for test in (test_bulk_run_pages_through_graphql, test_falls_back_to_html):
+        with tmp_run_dirs() as (monkeypatch, _):
+            test(monkeypatch)
+
+    server = start_shop(count, latency=latency)
+    try:
+        with tmp_run_dirs() as (monkeypatch, _):
+            _, html_time, html_kinds, _ = bulk_run(monkeypatch, server, count, bulk=False)
+            _, cold_time, cold_kinds, _ = bulk_run(monkeypatch, server, count, page_size=200)
+            _, bulk_time, bulk_kinds, _ = bulk_run(monkeypatch, server, count, page_size=200)
+    finally:
+        server.stop()
+
+    with report(f"MAGENTO GRAPHQL BULK SOURCE ({count} products, {latency}s latency)"):
+        print(f"HTML product pages               : {html_kinds['pages']:5d} requests {html_time:6.2f} s")
+        print(
+            f"GraphQL, nothing stored (1st run): {cold_kinds['api'] + cold_kinds['pages']:5d} requests "
+            f"{cold_time:6.2f} s"
+        )
+        print(f"GraphQL + stored EAN/manufacturer: {bulk_kinds['api']:5d} requests {bulk_time:6.2f} s")
@@ -0,0 +1,210 @@
+"""
+Memory admission control for scrapers and pages (memory_governor.py).
+
+The checks feed the governor a fake RSS; the benchmark runs memory-hungry
+jobs through run_admitted(), with and without a PIPELINE_MEMORY_LIMIT_MB,
+and compares the peak RSS.
+
+Usage:
+    python test_memory_governor.py [jobs] [job_mb]
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from memory_governor import MemoryGovernor, configure_memory_governor, process_rss_mb, run_admitted
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class FakeRss:
+    def __init__(self, mb: float):
+        self.mb = mb
+
+    def __call__(self) -> float:
+        return self.mb
+
+
+class Concurrency:
+    """Peak number of threads inside a block."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    @contextmanager
+    def track(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.current -= 1
+
+
+class CountingScraper(StubExtractScraper):
+    """Counts concurrent page fetches and CSV appends."""
+
+    def __init__(self, urls: List[str]):
+        self.fetches = Concurrency()
+        self.appends = 0
+        super().__init__(urls)
+
+    def fetch_product(self, url: str):
+        with self.fetches.track():
+            return super().fetch_product(url)
+
+    def save_products(self, products: List[Dict[str, Any]]) -> None:
+        if products:
+            self.appends += 1
+        super().save_products(products)
+
+
+@contextmanager
+def governed(limit_mb: Optional[float], rss_reader=process_rss_mb):
+    """Install a process-wide governor for the block, then an unlimited one."""
+    try:
+        yield configure_memory_governor(limit_mb, rss_reader=rss_reader)
+    finally:
+        configure_memory_governor(None)
+
+
+def scrape(server, count: int, workers: int = 4) -> CountingScraper:
+    scraper = CountingScraper([server.url(f"/produkt-{i}") for i in range(count)])
+    scraper.run(concurrent_workers=workers)
+    return scraper
+
+
+def test_level_shrinks_and_grows_with_rss():
+    rss = FakeRss(500)
+    governor = MemoryGovernor(1000, rss_reader=rss)
+    levels = []
+    for mb in (500, 700, 800, 950, 2000, 600):
+        rss.mb = mb
+        governor.sample(force=True)
+        levels.append(governor.scale(40))
+    assert levels == [40, 40, 22, 4, 4, 40]
+    rss.mb = 950
+    governor.sample(force=True)
+    assert governor.scale(3) == 1
+    assert MemoryGovernor(None, rss_reader=FakeRss(10 ** 6)).scale(40) == 40
+
+
+def test_run_keeps_fewer_pages_in_flight_under_pressure():
+    with StubServer(build_pages(40), latency=0.05) as server:
+        with governed(1000, FakeRss(100)):
+            relaxed = scrape(server, 40)
+        with governed(1000, FakeRss(950)) as governor:
+            pressed = scrape(server, 40)
+
+    assert relaxed.fetches.peak == 4 and relaxed.appends == 1
+    # At level 0.1: 4 workers -> 1 page in flight; CSV buffer 250 -> 25 rows.
+    assert pressed.fetches.peak == 1 and pressed.appends == 2
+    assert len(read_rows(pressed.output_file)) == 40
+    assert [row["stage"] for row in governor.timeline] == [
+        "test_extract_pipeline: discovery",
+        "test_extract_pipeline: scraping",
+    ]
+    assert governor.timeline[1]["min_level"] == 0.1
+
+
+def test_scrapers_wait_for_headroom():
+    rss = FakeRss(950)
+    governor = MemoryGovernor(1000, rss_reader=rss, sample_interval=0)
+    running = Concurrency()
+
+    def job():
+        with running.track():
+            time.sleep(0.5)
+
+    finished = []
+    for name, future in run_admitted({f"shop-{i}": job for i in range(6)}, 6, governor, poll=0.05):
+        future.result()
+        finished.append(name)
+        rss.mb = 100  # headroom again: the rest start one poll apart and overlap
+    assert finished[0] == "shop-0" and len(finished) == 6
+    assert running.peak == 5
+
+
+def test_timeline_csv(tmp_path):
+    governor = MemoryGovernor(None, rss_reader=FakeRss(321))
+    with governor.stage("sanundo: csv merge"):
+        pass
+    path = governor.write_timeline(tmp_path / "timeline.csv")
+    rows = read_rows(path)
+    assert rows[0]["stage"] == "sanundo: csv merge" and rows[0]["rss_peak_mb"] == "321.0"
+
+
+def measure(jobs: int, job_mb: int, headroom_mb: Optional[float]) -> str:
+    """
+    Run `jobs` scraper-sized jobs through run_admitted() like the global
+    pipeline; each holds up to job_mb MB for about a second (large buffers
+    go back to the OS when freed, unlike parsed pages).
+
+    Returns:
+        "peak_mb most_jobs_at_once seconds"
+    """
+    running = Concurrency()
+
+    def job():
+        with running.track():
+            held = []
+            for _ in range(4):
+                held.append(bytearray(b"\x01") * (job_mb * 1024 * 1024 // 4))
+                time.sleep(0.25)
+
+    baseline = process_rss_mb()
+    with governed(baseline + headroom_mb if headroom_mb else None) as governor:
+        start = time.time()
+        done = threading.Event()
+
+        def watch():
+            # Keep sampling between admission checks, so the stage sees the peak.
+            while not done.wait(0.05):
+                governor.sample()
+
+        with governor.stage("all jobs"):
+            sampler = threading.Thread(target=watch)
+            sampler.start()
+            for _, future in run_admitted({f"shop-{i}": job for i in range(jobs)}, jobs, poll=0.2):
+                future.result()
+            done.set()
+            sampler.join()
+        elapsed = time.time() - start
+    return f"{governor.timeline[-1]['rss_peak_mb'] - baseline:.1f} {running.peak} {elapsed:.2f}"
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        print(measure(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]) or None))
+        sys.exit(0)
+
+    import subprocess
+
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    job_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    test_level_shrinks_and_grows_with_rss()
+    test_run_keeps_fewer_pages_in_flight_under_pressure()
+    test_scrapers_wait_for_headroom()
+
+    # One process per mode: freed memory is not returned to the OS reliably.
+    rows = []
+    for label, headroom in (("no limit", 0), ("+150 MB", 150)):
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", str(jobs), str(job_mb), str(headroom)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        rows.append((label, *map(float, output[-3:])))
+
+    with report(f"MEMORY ADMISSION ({jobs} jobs of up to {job_mb} MB through run_admitted)"):
+        for label, peak, at_once, elapsed in rows:
+            print(f"limit {label:9s}: peak +{peak:6.1f} MB over baseline, {at_once:.0f} jobs at once, {elapsed:5.2f} s")
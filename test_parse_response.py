@@ -0,0 +1,122 @@
+"""
+Bytes-first parsing in BaseScraper.parse_response.
+Uses the saved wolf_product_page.html / wasserpumpe_product_page.html pages,
+served without a charset header so response.text has to run detection.
+
+Usage:
+    python test_parse_response.py [rounds]
+"""
+import sys
+import time
+from typing import Optional
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from base_scraper import BaseScraper
+from tests.support import report
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+FIXTURES = ["wolf_product_page.html", "wasserpumpe_product_page.html"]
+
+
+class ParseOnlyScraper(BaseScraper):
+    def __init__(self):
+        super().__init__("test_parse_response")
+
+    def get_product_urls(self):
+        return []
+
+    def scrape_product(self, url):
+        return None
+
+
+def make_response(body: bytes, content_type: str = "text/html", url: str = "https://shop.test/p") -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    response.url = url
+    response.encoding = None
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+def test_encoding_sources():
+    scraper = ParseOnlyScraper()
+    title = "Wärmepumpe Größe"
+
+    header = make_response(f"<h1>{title}</h1>".encode("cp1252"), "text/html; charset=windows-1252")
+    assert scraper.parse_response(header).h1.text == title
+
+    meta = make_response(f"<meta charset='iso-8859-1'><h1>{title}</h1>".encode("latin-1"))
+    assert scraper.parse_response(meta).h1.text == title
+    assert meta.encoding == "iso-8859-1"
+
+    # No declaration at all: the host's encoding from the previous page is reused.
+    bare = make_response(f"<h1>{title}</h1>".encode("latin-1"))
+    assert scraper.parse_response(bare).h1.text == title
+
+
+def test_fixture_parity():
+    scraper = ParseOnlyScraper()
+    for path in FIXTURES:
+        with open(path, "rb") as f:
+            body = f.read()
+        from_text = scraper.parse_html(make_response(body).text)
+        from_bytes = scraper.parse_response(make_response(body))
+        assert from_text.title.text == from_bytes.title.text
+        assert from_text.get_text() == from_bytes.get_text()
+
+
+def benchmark(rounds: int = 5, scraper: Optional[ParseOnlyScraper] = None):
+    """
+    Returns:
+        (path, size, detect_time, sniff_time, text_time, bytes_time) per fixture;
+        detect/sniff time the encoding step alone, text/bytes the full parse
+    """
+    scraper = scraper or ParseOnlyScraper()
+    results = []
+    for path in FIXTURES:
+        with open(path, "rb") as f:
+            body = f.read()
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            make_response(body).text
+        detect_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scraper._response_encoding(make_response(body))
+        sniff_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scraper.parse_html(make_response(body).text)
+        text_time = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            scraper.parse_response(make_response(body))
+        bytes_time = (time.perf_counter() - start) / rounds
+
+        results.append((path, len(body), detect_time, sniff_time, text_time, bytes_time))
+    return results
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    test_encoding_sources()
+    test_fixture_parity()
+
+    with report(f"PARSE BENCHMARK ({rounds} rounds per page, no charset header)"):
+        for path, size, detect_time, sniff_time, text_time, bytes_time in benchmark(rounds):
+            print(f"{path} ({size / 1024:.0f} KB)")
+            print(f"  encoding via response.text : {detect_time * 1000:7.2f} ms")
+            print(f"  encoding via header/meta   : {sniff_time * 1000:7.2f} ms")
+            print(f"  parse_html(response.text)  : {text_time * 1000:7.1f} ms")
+            print(f"  parse_response(response)   : {bytes_time * 1000:7.1f} ms  ({text_time / bytes_time:.2f}x)")
@@ -0,0 +1,112 @@
+"""
+Parser backend parity check and per-page timing (SCRAPER_PARSER).
+
+Every production scraper runs scrape_product() on the saved product pages
+under each installed backend; the extracted fields must be identical to the
+html.parser result. Pages are served from a replay cassette, so no network
+access is needed.
+
+Usage:
+    python test_parser_backends.py [rounds]
+"""
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from parser_backends import HTML_PARSER, available_backends
+from tests.support import FIXTURES, load_scrapers, report, use_fixture_cassette
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+def extract_all(scrapers, backend: str) -> Dict[Tuple[str, str], dict]:
+    results = {}
+    for scraper in scrapers:
+        scraper.parser_backend = backend
+        for url in FIXTURES:
+            product = scraper.scrape_product(url)
+            if product:
+                product = {k: v for k, v in product.items() if k not in ("scraped_at", "timestamp")}
+            results[(scraper.scraper_name, url)] = product
+    return results
+
+
+def diff_backends() -> Dict[str, List[str]]:
+    """Returns backend -> list of mismatch descriptions (empty when identical)."""
+    scrapers = load_scrapers()
+    reference = extract_all(scrapers, HTML_PARSER)
+    mismatches = {}
+    for backend in available_backends():
+        if backend == HTML_PARSER:
+            continue
+        problems = []
+        for key, product in extract_all(scrapers, backend).items():
+            expected = reference[key]
+            if product == expected:
+                continue
+            if not product or not expected:
+                problems.append(f"{key[0]} {key[1]}: {expected!r} != {product!r}")
+                continue
+            for field in sorted(set(expected) | set(product)):
+                if expected.get(field) != product.get(field):
+                    problems.append(
+                        f"{key[0]} {key[1]} [{field}]: "
+                        f"{expected.get(field)!r} != {product.get(field)!r}"
+                    )
+        mismatches[backend] = problems
+    return mismatches
+
+
+@pytest.mark.usefixtures("fixture_cassette")
+def test_backends_extract_identical_fields():
+    for backend, problems in diff_backends().items():
+        assert not problems, f"{backend} differs from html.parser:\n" + "\n".join(problems)
+
+
+def time_backends(rounds: int = 5) -> Dict[str, Dict[str, float]]:
+    """Average seconds per page for parse only and for a full scrape_product()."""
+    scrapers = load_scrapers()
+    wolf = next(s for s in scrapers if s.scraper_name == "wolf_online_shop")
+    timings = {}
+    for backend in available_backends():
+        wolf.parser_backend = backend
+        row = {}
+        for url, fixture in FIXTURES.items():
+            with open(fixture, "rb") as f:
+                body = f.read()
+            start = time.perf_counter()
+            for _ in range(rounds):
+                response = requests.Response()
+                response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+                response.url = url
+                response._content = body
+                wolf.parse_response(response)
+            row[fixture] = (time.perf_counter() - start) / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract_all(scrapers, backend)
+        row["all scrapers x pages"] = (time.perf_counter() - start) / rounds
+        timings[backend] = row
+    return timings
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as monkeypatch:
+        use_fixture_cassette(monkeypatch, tmp)
+        for backend, problems in diff_backends().items():
+            status = "identical" if not problems else f"{len(problems)} differences"
+            print(f"{backend}: {status}")
+            for problem in problems:
+                print(f"  {problem}")
+
+        with report(f"PARSER BACKENDS ({rounds} rounds)"):
+            for backend, row in time_backends(rounds).items():
+                cells = "  ".join(f"{name}: {seconds * 1000:7.1f} ms" for name, seconds in row.items())
+                print(f"{backend:<12} {cells}")
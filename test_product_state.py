@@ -0,0 +1,110 @@
+"""
+Incremental runs that skip unchanged products (SCRAPER_INCREMENTAL, product_state.py).
+
+Usage:
+    python test_product_state.py [pages] [changed]
+"""
+import sys
+import time
+from typing import Dict, List
+
+import pytest
+
+from product_state import DEFAULT_FULL_REFRESH_DAYS, ProductStateStore
+from tests.stub_server import StubServer
+from tests.support import (
+    StubExtractScraper,
+    build_pages,
+    read_rows,
+    report,
+    timed_run,
+    tmp_run_dirs,
+)
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class LastmodScraper(StubExtractScraper):
+    """StubExtractScraper whose URLs come with sitemap lastmods."""
+
+    def __init__(self, lastmods: Dict[str, str]):
+        self.lastmods = lastmods
+        super().__init__(list(lastmods))
+
+    def get_product_urls(self) -> List[str]:
+        for url, lastmod in self.lastmods.items():
+            self.record_lastmod(url, lastmod)
+        return list(self.lastmods)
+
+
+def incremental_run(monkeypatch, lastmods: Dict[str, str], workers: int = 4, **env_vars: str):
+    """Returns (count, seconds, CSV product URLs)."""
+    for name, value in {"SCRAPER_INCREMENTAL": "1", **env_vars}.items():
+        monkeypatch.setenv(name, value)
+    scraper = LastmodScraper(lastmods)
+    count, elapsed = timed_run(scraper, concurrent_workers=workers)
+    return count, elapsed, sorted(row["Produkt_URL"] for row in read_rows(scraper.output_file))
+
+
+def test_store_split_and_full_refresh(tmp_path):
+    store = ProductStateStore("shop", path=str(tmp_path / "shop.sqlite"))
+    store.save("https://shop.test/a", "2024-05-01", {"name": "A"})
+    store.save("https://shop.test/b", "2024-05-01", {"name": "B"})
+    lastmods = {"https://shop.test/a": "2024-05-01", "https://shop.test/b": "2024-06-01"}
+    urls = ["https://shop.test/a", "https://shop.test/b", "https://shop.test/c"]
+    assert store.split(urls, lastmods) == (urls[1:], urls[:1])
+    assert list(store.iter_products(urls[:1])) == [{"name": "A"}]
+
+    assert store.full_refresh_due(7)
+    store.mark_full_refresh(now=1000.0)
+    assert not store.full_refresh_due(7, now=1000.0 + 6 * 86400)
+    assert store.full_refresh_due(7, now=1000.0 + 7 * 86400)
+    # A weekly cron run that starts a few minutes early is still due.
+    assert store.full_refresh_due(DEFAULT_FULL_REFRESH_DAYS, now=1000.0 + 7 * 86400 - 600)
+    store.close()
+
+
+def test_incremental_run_scrapes_only_changed_urls(monkeypatch):
+    with StubServer(build_pages(20)) as server:
+        lastmods = {server.url(path): "2024-05-01" for path in server.httpd.routes}
+        assert incremental_run(monkeypatch, lastmods)[0] == 20
+
+        changed = sorted(lastmods)[:3]
+        for url in changed:
+            lastmods[url] = "2024-06-01"
+        del server.request_log[:]
+        count, _, urls = incremental_run(monkeypatch, lastmods)
+
+        assert count == 20
+        assert urls == sorted(lastmods)
+        assert sorted(path for _, path in server.request_log) == sorted(
+            url[len(server.url("")):] for url in changed
+        )
+
+        # A full refresh scrapes everything again and is dated to its start.
+        del server.request_log[:]
+        started = time.time()
+        assert incremental_run(monkeypatch, lastmods, SCRAPER_FULL_REFRESH_DAYS="0")[0] == 20
+        assert len(server.request_log) == 20
+        store = ProductStateStore("test_extract_pipeline")
+        assert started <= float(store._get_meta("last_full_refresh")) <= started + 1
+        store.close()
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else pages // 20
+    with tmp_run_dirs() as (monkeypatch, tmp_path):
+        test_store_split_and_full_refresh(tmp_path)
+        test_incremental_run_scrapes_only_changed_urls(monkeypatch)
+
+    with tmp_run_dirs() as (monkeypatch, _), StubServer(build_pages(pages), latency=0.05) as server:
+        lastmods = {server.url(path): "2024-05-01" for path in server.httpd.routes}
+        _, full_time, _ = incremental_run(monkeypatch, lastmods, workers=8)
+        for url in sorted(lastmods)[:changed]:
+            lastmods[url] = "2024-06-01"
+        count, incremental_time, _ = incremental_run(monkeypatch, lastmods, workers=8)
+
+    with report(f"INCREMENTAL RUN ({pages} products, {changed} changed, 50 ms latency)"):
+        print(f"full run        : {full_time:6.2f} s")
+        print(f"incremental run : {incremental_time:6.2f} s ({count} rows in CSV)")
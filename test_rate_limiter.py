@@ -0,0 +1,86 @@
+"""
+Offline test for the per-host adaptive rate limiter.
+Checks the AIMD behaviour directly and against a stub server that starts
+answering 429 part-way through a run.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from base_scraper import BaseScraper
+from rate_limiter import AdaptiveRateLimiter
+from tests.stub_server import StubServer
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+def test_aimd_adjustments():
+    limiter = AdaptiveRateLimiter("example.test", initial_rate=4, max_rate=6, min_rate=0.5)
+
+    for _ in range(200):
+        limiter.record_success(0.05)
+    assert limiter.rate == 6  # capped at the ceiling
+
+    limiter.record_throttle()
+    assert limiter.rate == 3
+    limiter.record_throttle()  # inside the cooldown, same burst
+    assert limiter.rate == 3
+    assert limiter.throttled == 2
+
+
+def test_reserve_spaces_requests():
+    limiter = AdaptiveRateLimiter("example.test", initial_rate=10, max_rate=10)
+    delays = [limiter.reserve() for _ in range(20)]
+    # The first burst goes out immediately, the rest are spaced at 1/rate.
+    assert delays[0] == 0.0
+    assert delays[-1] > delays[-2] > 0
+    assert abs((delays[-1] - delays[-2]) - 0.1) < 0.01
+
+
+class ThrottledScraper(BaseScraper):
+    def __init__(self, server: StubServer):
+        self.server = server
+        super().__init__("test_rate_limiter")
+        self.max_retries = 1
+
+    def get_product_urls(self) -> List[str]:
+        return [self.server.url(f"/produkt-{i}") for i in range(16)]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        return {"name": url.rsplit("/", 1)[-1], "product_url": url}
+
+
+def test_429_slows_the_host_down():
+    served = {"count": 0}
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            served["count"] += 1
+            throttled = served["count"] > 10
+        if throttled:
+            request.send_payload(429, b"slow down", "text/plain")
+        else:
+            request.send_payload(200, b"<html><h1>ok</h1></html>")
+
+    routes = {f"/produkt-{i}": handler for i in range(16)}
+    with StubServer(routes) as server:
+        scraper = ThrottledScraper(server)
+        limiter = scraper._get_rate_limiter(server.base_url)
+        limiter.min_rate = 2.0  # keep the throttled tail of the test short
+        start_rate = limiter.rate
+        scraper.run(concurrent_workers=4)
+
+    assert limiter.throttled > 0
+    assert limiter.rate < start_rate
+
+
+if __name__ == "__main__":
+    test_aimd_adjustments()
+    test_reserve_spaces_requests()
+    test_429_slows_the_host_down()
+    print("✓ Adaptive rate limiter backs off on 429 and ramps up on healthy responses")
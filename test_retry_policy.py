@@ -0,0 +1,108 @@
+"""
+Offline test for Retry-After-aware backoff and the per-run retry budget.
+"""
+import threading
+import time
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from base_scraper import BaseScraper
+from retry_policy import RetryBudget, backoff_delay, parse_retry_after
+from tests.stub_server import StubServer
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+    http_date = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+    assert 25 <= http_date <= 30
+
+
+def test_backoff_grows_and_honours_retry_after():
+    for attempt in range(5):
+        ceiling = min(8.0, 1.0 * 2 ** attempt)
+        delay = backoff_delay(attempt, 1.0, max_delay=8.0)
+        assert ceiling / 2 <= delay <= ceiling
+    assert backoff_delay(0, 1.0, retry_after=10) >= 10
+
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio=0.1, min_retries=2)
+    for _ in range(50):
+        budget.record_request()
+    assert budget.allowance == 5
+    assert sum(budget.try_spend() for _ in range(10)) == 5
+    assert budget.exhausted and budget.denied == 5
+
+
+class FlakyScraper(BaseScraper):
+    def __init__(self, server: StubServer, pages: int):
+        self.server = server
+        self.pages = pages
+        super().__init__("test_retry_policy")
+        self.retry_delay = 0.05
+
+    def get_product_urls(self) -> List[str]:
+        return [self.server.url(f"/produkt-{i}") for i in range(self.pages)]
+
+    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
+        response = self.make_request(url)
+        if not response:
+            return None
+        return {"name": url.rsplit("/", 1)[-1], "product_url": url}
+
+
+def test_retry_after_is_respected():
+    seen = {}
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            first = request.path not in seen
+            seen.setdefault(request.path, time.monotonic())
+        if first:
+            request.send_payload(429, b"slow down", "text/plain", {"Retry-After": "1"})
+        else:
+            request.send_payload(200, b"<html><h1>ok</h1></html>")
+
+    with StubServer({"/produkt-0": handler}) as server:
+        scraper = FlakyScraper(server, pages=1)
+        scraper.adaptive_rate = False
+        started = time.monotonic()
+        assert scraper.run(concurrent_workers=1) == 1
+
+    assert time.monotonic() - started >= 1.0
+    assert scraper.retry_budget.retries == 1
+    assert scraper.retry_budget.backoff_time >= 1.0
+
+
+def test_exhausted_budget_stops_retrying(monkeypatch):
+    def always_down(request):
+        request.send_payload(500, b"down", "text/plain")
+
+    routes = {f"/produkt-{i}": always_down for i in range(20)}
+    with StubServer(routes) as server:
+        scraper = FlakyScraper(server, pages=20)
+        scraper.adaptive_rate = False
+        scraper.max_retries = 3
+        monkeypatch.setenv("SCRAPER_RETRY_BUDGET_MIN", "2")
+        assert scraper.run(concurrent_workers=2) == 0
+
+    # Without a budget this would be 20 * 3 = 60 requests.
+    assert len(server.request_log) < 30
+    assert scraper.retry_budget.denied > 0
+
+
+if __name__ == "__main__":
+    test_parse_retry_after()
+    test_backoff_grows_and_honours_retry_after()
+    test_budget_caps_retries()
+    test_retry_after_is_respected()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        test_exhausted_budget_stops_retrying(monkeypatch)
+    print("✓ Backoff honours Retry-After and the retry budget stops retry storms")
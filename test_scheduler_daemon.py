@@ -0,0 +1,196 @@
+"""
+The resident scheduler daemon (scheduler_daemon.py) against a cron job.
+
+The benchmark compares one shop run as a cron job did it (new process,
+imports, scraper init with its warm-up, discovery, scraping) with a run of
+the daemon, whose scraper is kept and whose discovery was prewarmed.
+
+Usage:
+    python test_scheduler_daemon.py [products] [latency]
+"""
+import json
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import pytest
+
+from base_scraper import BaseScraper
+from scheduler_daemon import CronSchedule, SchedulerDaemon, ShopJob
+from sharding import discovery_cache_path
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+SITEMAPS = 4
+
+
+class WarmScraper(StubExtractScraper):
+    """Warms up its session in __init__ (like the Cloudflare scrapers) and discovers from sitemaps."""
+
+    inits = 0
+    discoveries = 0
+
+    def __init__(self, server: StubServer):
+        self.server = server
+        BaseScraper.__init__(self, "test_scheduler_daemon")
+        self.scrape_min_delay = self.scrape_max_delay = 0
+        WarmScraper.inits += 1
+        for path in ("/", "/warmup-1", "/warmup-2"):
+            self.session.get(server.url(path), timeout=10)
+
+    def get_product_urls(self) -> List[str]:
+        WarmScraper.discoveries += 1
+        urls = []
+        for i in range(SITEMAPS):
+            urls += self.session.get(self.server.url(f"/sitemap-{i}.txt"), timeout=10).text.split()
+        return urls
+
+
+def shop_routes(count: int) -> Dict[str, str]:
+    routes = build_pages(count, specs=0)
+    routes.update({path: "<html>ok</html>" for path in ("/", "/warmup-1", "/warmup-2")})
+    return routes
+
+
+def add_sitemaps(server: StubServer, count: int) -> None:
+    for i in range(SITEMAPS):
+        server.httpd.routes[f"/sitemap-{i}.txt"] = "\n".join(
+            server.url(f"/produkt-{n}") for n in range(i, count, SITEMAPS)
+        )
+
+
+class Uploads:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, csv_file, worksheet: str, batch_size: int) -> bool:
+        rows = read_rows(csv_file)
+        self.calls.append((worksheet, batch_size, len(rows), {row["Quelle"] for row in rows}))
+        return True
+
+
+def wait_for(condition, timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def discovery_cache(monkeypatch):
+    monkeypatch.setenv("SCRAPER_DISCOVERY_CACHE", "1")
+
+
+def request(url: str, method: str = "GET", token: str = None):
+    req = urllib.request.Request(url, method=method)
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_cron_schedule():
+    saturday = datetime(2026, 10, 17, 12, 7, tzinfo=timezone.utc)
+    assert CronSchedule("0 2 * * 0").next_after(saturday) == datetime(2026, 10, 18, 2, 0, tzinfo=timezone.utc)
+    assert CronSchedule("*/15 * * * *").next_after(saturday) == saturday.replace(minute=15)
+    assert CronSchedule("30 6 * * 1-5").next_after(saturday) == datetime(2026, 10, 19, 6, 30, tzinfo=timezone.utc)
+    # Both day fields restricted: either one matches (the 1st, or a Sunday).
+    assert CronSchedule("0 0 1 * 7").next_after(saturday) == datetime(2026, 10, 18, 0, 0, tzinfo=timezone.utc)
+    for bad in ("0 2 * *", "60 2 * * 0", "0 2 * * 8"):
+        with pytest.raises(ValueError):
+            CronSchedule(bad)
+
+
+def test_daemon_keeps_the_scraper_warm(discovery_cache, monkeypatch):
+    monkeypatch.setenv("DAEMON_TOKEN", "secret")
+    WarmScraper.inits = WarmScraper.discoveries = 0
+    uploads = Uploads()
+    with StubServer(shop_routes(30)) as server:
+        add_sitemaps(server, 30)
+        job = ShopJob("test_scheduler_daemon", lambda: WarmScraper(server), "0 2 * * 0", workers=4)
+        daemon = SchedulerDaemon([job], uploader=uploads, prewarm_minutes=60)
+        http = daemon.serve(port=0, host="127.0.0.1")
+        base = f"http://127.0.0.1:{http.server_address[1]}"
+        try:
+            # An hour before the run the URLs are discovered; at the scheduled time it runs.
+            daemon.tick(job.next_run - timedelta(minutes=30))
+            wait_for(lambda: WarmScraper.discoveries == 1)
+            daemon.tick(job.next_run)
+            wait_for(lambda: job.runs == 1)
+            assert job.last["status"] == "success" and job.last["reason"].startswith("scheduled")
+
+            assert request(f"{base}/run/test_scheduler_daemon", "POST")[0] == 401
+            assert request(f"{base}/run/nope", "POST", token="secret")[0] == 404
+            assert request(f"{base}/run/test_scheduler_daemon", "POST", token="secret") == (
+                202, {"queued": "test_scheduler_daemon"}
+            )
+            wait_for(lambda: job.runs == 2)
+            status, payload = request(f"{base}/status")
+        finally:
+            http.shutdown()
+            daemon.stop()
+
+    # One init (warm-up) and one discovery for three uses; a fresh CSV per run.
+    assert WarmScraper.inits == 1 and WarmScraper.discoveries == 1
+    assert uploads.calls == [("test_scheduler_daemon", 1200, 30, {"test_scheduler_daemon"})] * 2
+    shop = payload["shops"]["test_scheduler_daemon"]
+    assert status == 200 and shop["runs"] == 2 and shop["scraper_warm"]
+    assert shop["last_run"]["status"] == "success" and shop["last_run"]["products"] == 30
+    assert shop["next_run"] == job.next_run.isoformat()
+
+
+def cold_run(count: int, latency: float) -> Tuple[float, float]:
+    """A cron job: (seconds for process start and imports, seconds for init, discovery and scraping)."""
+    start = time.time()
+    subprocess.run([sys.executable, "-c", "import run_production_powerbi"], check=True)
+    imports = time.time() - start
+    with StubServer(shop_routes(count), latency=latency) as server:
+        add_sitemaps(server, count)
+        return imports, timed_run(WarmScraper(server), concurrent_workers=4)[1]
+
+
+def warm_run(count: int, latency: float) -> float:
+    """The same shop on the daemon, second run: kept scraper, prewarmed discovery."""
+    with StubServer(shop_routes(count), latency=latency) as server:
+        add_sitemaps(server, count)
+        job = ShopJob("test_scheduler_daemon", lambda: WarmScraper(server), "0 2 * * 0", workers=4)
+        daemon = SchedulerDaemon([job], uploader=Uploads(), prewarm_minutes=60)
+        try:
+            daemon.trigger(job.name)
+            wait_for(lambda: job.runs == 1, timeout=600)
+            discovery_cache_path("test_scheduler_daemon").unlink(missing_ok=True)
+            daemon.tick(job.next_run - timedelta(minutes=30))
+            daemon._prewarms.submit(lambda: None).result()  # one prewarm thread: this waits for it
+            start = time.time()
+            daemon.tick(job.next_run)
+            wait_for(lambda: job.runs == 2, timeout=600)
+            return time.time() - start
+        finally:
+            daemon.stop()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    test_cron_schedule()
+
+    with tmp_run_dirs() as (monkeypatch, _):
+        monkeypatch.setenv("SCRAPER_DISCOVERY_CACHE", "1")
+        imports, cold = cold_run(count, latency)
+        discovery_cache_path("test_scheduler_daemon").unlink(missing_ok=True)
+        warm = warm_run(count, latency)
+
+    with report(f"ONE SHOP RUN ({count} products, {latency}s latency, 3 warm-up and {SITEMAPS} sitemap requests)"):
+        print(f"cron job: process start + imports       : {imports:6.2f} s")
+        print(f"cron job: init, discovery, scraping     : {cold:6.2f} s")
+        print(f"daemon: kept scraper, prewarmed discovery: {warm:6.2f} s (incl. CSV, upload stubbed)")
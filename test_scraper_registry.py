@@ -0,0 +1,115 @@
+"""
+Lazy scraper imports through scraper_registry.py and the single-shop CLI
+(scrape.py).
+
+The benchmark starts fresh interpreters and times the imports of a one-shop
+run: eagerly (every scraper module and the Google Sheets client, as the
+runners did) and through the registry.
+
+Usage:
+    python test_scraper_registry.py [repeats]
+"""
+import json
+import subprocess
+import sys
+import time
+from typing import List
+
+import pytest
+
+import scrape
+import scraper_registry
+from base_scraper import BaseScraper
+from scraper_registry import SCRAPER_PATHS, LazyScraper, load_scraper_class
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+HEAVY_MODULES = ("gspread", "oauth2client", "cloudscraper")
+
+EAGER = (
+    "import gspread, oauth2client.service_account\n"
+    + "".join(f"import {path.split(':')[0]}\n" for path in list(SCRAPER_PATHS.values())[:10])
+    + "import run_production_powerbi\n"
+)
+LAZY = (
+    "import os\n"
+    "os.environ['SCRAPER_FILTER'] = 'sanundo'\n"
+    "import run_production_powerbi\n"
+    "[(name, scraper_class)] = run_production_powerbi.get_target_scrapers()\n"
+    "scraper_class.load()\n"
+)
+CLI = "import scrape\nfrom scraper_registry import load_scraper_class\nload_scraper_class('sanundo')\n"
+
+
+class CliScraper(StubExtractScraper):
+    urls: List[str] = []
+
+    def __init__(self):
+        self.urls = CliScraper.urls
+        BaseScraper.__init__(self, "test_scraper_registry")
+        self.scrape_min_delay = self.scrape_max_delay = 0
+
+
+def loaded_modules(code: str) -> List[str]:
+    """Run code in a fresh interpreter and return the modules it left imported."""
+    result = subprocess.run(
+        [sys.executable, "-c", code + "import sys, json\nprint(json.dumps(sorted(sys.modules)))"],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_registry_paths_resolve():
+    for name, path in SCRAPER_PATHS.items():
+        scraper_class = load_scraper_class(name)
+        assert issubclass(scraper_class, BaseScraper), path
+        assert LazyScraper(name).load() is scraper_class
+    with pytest.raises(ValueError, match="Unknown scraper 'nope'"):
+        LazyScraper("nope")
+
+
+def test_one_shop_run_imports_one_scraper():
+    modules = loaded_modules(LAZY)
+    scrapers = [m for m in modules if m.endswith("_scraper") and m != "base_scraper"]
+    assert scrapers == ["sanundo_scraper"]
+    assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+
+
+def test_cli_run(monkeypatch):
+    monkeypatch.setitem(SCRAPER_PATHS, "test_scraper_registry", "test_scraper_registry:CliScraper")
+    pushed = []
+    monkeypatch.setattr(scrape, "push", lambda shop, csv_file: pushed.append((shop, csv_file)) or True)
+    with StubServer(build_pages(12, specs=0)) as server:
+        CliScraper.urls = [server.url(f"/produkt-{i}") for i in range(12)]
+        assert scrape.main(["run", "test_scraper_registry", "--max", "5", "--workers", "2", "--push"]) == 0
+    [(shop, csv_file)] = pushed
+    assert shop == "test_scraper_registry" and len(read_rows(csv_file)) == 5
+    assert "test_scraper_registry" in scraper_registry.scraper_names()
+
+
+def startup(code: str, repeats: int) -> float:
+    """Best wall time of `repeats` fresh interpreters running code."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.time()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.time() - start)
+    return best
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    test_one_shop_run_imports_one_scraper()
+
+    baseline = startup("pass", repeats)
+    rows = [
+        ("eager: all scrapers + Sheets client", startup(EAGER, repeats), loaded_modules(EAGER)),
+        ("registry: SCRAPER_FILTER=sanundo", startup(LAZY, repeats), loaded_modules(LAZY)),
+        ("scrape.py run sanundo (imports)", startup(CLI, repeats), loaded_modules(CLI)),
+    ]
+
+    with report(f"ONE-SHOP STARTUP (best of {repeats}, bare interpreter {baseline:.2f} s)"):
+        for label, seconds, modules in rows:
+            print(f"{label:36s}: {seconds:5.2f} s, {len(modules):4d} modules")
@@ -0,0 +1,130 @@
+"""
+URL sharding across jobs (SCRAPER_SHARD, sharding.py) and how even it is.
+
+Usage:
+    python test_sharding.py [urls] [shards]
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List
+
+import pytest
+
+import sharding
+from sharding import cached_discovery, merge_shard_parts, parse_shard, shard_of, shard_part_path
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class CountingScraper(StubExtractScraper):
+    discoveries = 0
+
+    def get_product_urls(self) -> List[str]:
+        CountingScraper.discoveries += 1
+        for url in self.urls:
+            self.record_lastmod(url, "2024-05-01")
+        return super().get_product_urls()
+
+
+def read_urls(path) -> List[str]:
+    return [row["Produkt_URL"] for row in read_rows(path)]
+
+
+def test_parse_shard():
+    assert parse_shard(None) is None and parse_shard(" ") is None
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "1-4", "a/b", "1/0"):
+        try:
+            parse_shard(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} accepted")
+
+
+def test_shards_are_disjoint_and_balanced():
+    urls = [f"https://shop.test/produkt/{i}" for i in range(20000)]
+    counts = Counter(shard_of(url, 4) for url in urls)
+    assert sorted(counts) == [1, 2, 3, 4]
+    assert max(counts.values()) < 1.1 * min(counts.values())
+    assert all(shard_of(url, 4) == shard_of(url, 4) for url in urls[:100])
+
+
+def test_sharded_runs_share_discovery_and_merge(tmp_path, monkeypatch):
+    CountingScraper.discoveries = 0
+    with StubServer(build_pages(30)) as server:
+        urls = [server.url(path) for path in server.httpd.routes]
+        parts = []
+        for index in (1, 2, 3):
+            monkeypatch.setenv("SCRAPER_SHARD", f"{index}/3")
+            scraper = CountingScraper(urls)
+            assert scraper.output_file == shard_part_path(scraper.scraper_name, index, 3)
+            scraper.run(concurrent_workers=4)
+            assert scraper.url_lastmods[scraper.urls[0]] == "2024-05-01"
+            parts.append(read_urls(scraper.output_file))
+
+        assert CountingScraper.discoveries == 1
+        assert sum(len(part) for part in parts) == 30
+        assert sorted(url for part in parts for url in part) == sorted(urls)
+
+        output = str(tmp_path / "merged.csv")
+        assert merge_shard_parts(scraper.scraper_name, 3, output) == (30, [])
+        assert sorted(read_urls(output)) == sorted(urls)
+        assert merge_shard_parts(scraper.scraper_name, 4, output) == (0, [1, 2, 3, 4])
+
+        # A part left over from an earlier run counts as missing, and the
+        # merged CSV is kept unless missing parts are allowed.
+        stale = time.time() - 13 * 3600
+        os.utime(shard_part_path(scraper.scraper_name, 2, 3), (stale, stale))
+        assert merge_shard_parts(scraper.scraper_name, 3, output) == (0, [2])
+        assert sorted(read_urls(output)) == sorted(urls)
+        rows, missing = merge_shard_parts(scraper.scraper_name, 3, output, allow_missing=True)
+        assert missing == [2] and rows == 30 - len(parts[1]) == len(read_urls(output))
+
+
+def test_concurrent_discovery_crawls_once(monkeypatch):
+    calls = []
+
+    def discover():
+        calls.append(1)
+        time.sleep(0.5)
+        return [("https://shop.test/a", "2024-05-01")]
+
+    monkeypatch.setattr(sharding, "DISCOVERY_POLL_INTERVAL", 0.05)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached_discovery("shop", discover)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [[("https://shop.test/a", "2024-05-01")]] * 4
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 169000
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    test_parse_shard()
+    test_shards_are_disjoint_and_balanced()
+    with tmp_run_dirs() as (monkeypatch, tmp_path):
+        test_sharded_runs_share_discovery_and_merge(tmp_path, monkeypatch)
+    with tmp_run_dirs() as (monkeypatch, _):
+        test_concurrent_discovery_crawls_once(monkeypatch)
+
+    urls = [f"https://www.meinhausshop.de/produkt-{i}-heizung" for i in range(count)]
+    start = time.perf_counter()
+    counts = Counter(shard_of(url, shards) for url in urls)
+    elapsed = time.perf_counter() - start
+
+    with report(f"SHARD BALANCE ({count} URLs, {shards} shards, {elapsed * 1000:.0f} ms to assign)"):
+        for index in range(1, shards + 1):
+            print(f"shard {index}/{shards}: {counts[index]:8d} URLs ({counts[index] / count:6.2%})")
+        print(f"largest / smallest: {max(counts.values()) / min(counts.values()):.3f}")
@@ -0,0 +1,233 @@
+"""
+Memory use of the streaming sitemap reader (sitemap_stream.py).
+
+Usage:
+    python test_sitemap_stream.py [urls]
+"""
+import gzip
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+import sitemap_stream
+from base_scraper import BaseScraper
+from sitemap_stream import SITEMAP, URL, SitemapCrawler, parse_sitemap_stream
+from tests.stub_server import StubServer
+from tests.support import report
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+IMAGE_NS = 'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"'
+
+
+def urlset(urls: List[str], lastmod: str = "2024-05-01") -> bytes:
+    entries = "".join(
+        f"<url><loc>{url}</loc><lastmod>{lastmod}</lastmod>"
+        f"<image:image><image:loc>{url}.jpg</image:loc></image:image></url>"
+        for url in urls
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset {NS} {IMAGE_NS}>{entries}</urlset>'.encode()
+
+
+def sitemap_index(locs: List[str], lastmods: Optional[Dict[str, str]] = None) -> bytes:
+    lastmods = lastmods or {}
+    entries = "".join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{lastmods.get(loc, '2024-06-01')}</lastmod></sitemap>"
+        for loc in locs
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{entries}</sitemapindex>'.encode()
+
+
+def chunked(data: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class SitemapOnlyScraper(BaseScraper):
+    def __init__(self):
+        super().__init__("test_sitemap_stream")
+
+    def get_product_urls(self):
+        return []
+
+    def scrape_product(self, url):
+        return None
+
+
+def test_parse_gzip_in_small_chunks():
+    body = b"\xef\xbb\xbf\n  " + urlset(["https://shop.test/a", "https://shop.test/b"])
+    entries = list(parse_sitemap_stream(chunked(gzip.compress(body), 7)))
+    assert entries == [
+        (URL, "https://shop.test/a", "2024-05-01"),
+        (URL, "https://shop.test/b", "2024-05-01"),
+    ]
+
+    index = list(parse_sitemap_stream([sitemap_index(["https://shop.test/s1.xml.gz"])]))
+    assert index == [(SITEMAP, "https://shop.test/s1.xml.gz", "2024-06-01")]
+
+
+def test_crawler_walks_index_and_nested_sitemaps():
+    routes: Dict[str, bytes] = {}
+    with StubServer(routes, content_type="application/xml") as server:
+        routes["/sitemap.xml"] = sitemap_index([server.url("/s1.xml.gz"), server.url("/s2.xml")])
+        routes["/s1.xml.gz"] = gzip.compress(urlset([server.url(f"/p/{i}") for i in range(3)]))
+        # A plain urlset that lists another sitemap among its pages.
+        routes["/s2.xml"] = urlset([server.url("/kategorie"), server.url("/s3.xml"), server.url("/p/9")])
+        routes["/s3.xml"] = urlset([server.url("/p/10")])
+
+        crawler = SitemapCrawler(
+            SitemapOnlyScraper(),
+            url_filter=lambda url: "/p/" in url,
+            is_sitemap=lambda loc: loc.endswith(".xml"),
+            reuse_state=False,
+        )
+        locs = [loc for loc, _ in crawler.iter_entries([server.url("/sitemap.xml")])]
+        children = crawler.index_children(server.url("/sitemap.xml"))
+
+    assert locs == [server.url(p) for p in ("/p/0", "/p/1", "/p/2", "/p/9", "/p/10")]
+    assert children == [(server.url("/s1.xml.gz"), "2024-06-01"), (server.url("/s2.xml"), "2024-06-01")]
+
+
+def shop_routes(server: StubServer, routes: Dict[str, bytes], parts: int, lastmods=None) -> None:
+    children = [server.url(f"/sitemap-{n}.xml.gz") for n in range(parts)]
+    routes["/sitemap.xml"] = sitemap_index(children, lastmods)
+    for n in range(parts):
+        # Neighbouring parts overlap by one URL to exercise deduplication.
+        urls = [server.url(f"/p/{n * 10 + i}") for i in range(11)]
+        routes[f"/sitemap-{n}.xml.gz"] = gzip.compress(urlset(urls))
+
+
+def test_parallel_walk_is_ordered_and_deduplicated():
+    routes: Dict[str, bytes] = {}
+    with StubServer(routes, latency=0.05, content_type="application/xml") as server:
+        shop_routes(server, routes, parts=8)
+        scraper = SitemapOnlyScraper()
+        walks = {}
+        for workers in (1, 4):
+            crawler = SitemapCrawler(scraper, workers=workers, reuse_state=False)
+            start = time.perf_counter()
+            walks[workers] = [loc for loc, _ in crawler.iter_entries([server.url("/sitemap.xml")])]
+            walks[f"{workers} time"] = time.perf_counter() - start
+
+    assert walks[4] == walks[1] == [server.url(f"/p/{i}") for i in range(81)]
+    assert walks["4 time"] < walks["1 time"]
+
+
+def test_unchanged_sub_sitemaps_are_reused():
+    state_dir = tempfile.mkdtemp()
+    original_dir = sitemap_stream.DATA_DIR
+    sitemap_stream.DATA_DIR = state_dir
+    routes: Dict[str, bytes] = {}
+    try:
+        with StubServer(routes, content_type="application/xml") as server:
+            shop_routes(server, routes, parts=4)
+            scraper = SitemapOnlyScraper()
+            root = server.url("/sitemap.xml")
+
+            first = list(SitemapCrawler(scraper).iter_entries([root]))
+            del server.request_log[:]
+            crawler = SitemapCrawler(scraper)
+            second = list(crawler.iter_entries([root]))
+            assert second == first
+            assert server.request_log == [("GET", "/sitemap.xml")]
+            assert (crawler.fetched, crawler.reused) == (1, 4)
+
+            changed = server.url("/sitemap-2.xml.gz")
+            shop_routes(server, routes, parts=4, lastmods={changed: "2024-07-01"})
+            del server.request_log[:]
+            list(SitemapCrawler(scraper).iter_entries([root]))
+            assert server.request_log == [("GET", "/sitemap.xml"), ("GET", "/sitemap-2.xml.gz")]
+    finally:
+        sitemap_stream.DATA_DIR = original_dir
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+
+def test_broken_sitemap_keeps_parsed_entries():
+    body = f"<urlset {NS}><url><loc>https://shop.test/a</loc></url><url><loc>https://shop.test/b</oops>".encode()
+    with StubServer({"/sitemap.xml": body}, content_type="application/xml") as server:
+        crawler = SitemapCrawler(SitemapOnlyScraper(), reuse_state=False)
+        locs = [loc for loc, _ in crawler.iter_entries([server.url("/sitemap.xml")])]
+    assert locs == ["https://shop.test/a"]
+
+
+def measure(count: int):
+    """Returns (gzip size, xml size, streamed peak, whole-file peak, stream s, whole s)."""
+    xml = urlset([f"https://shop.test/produkt/{i}-waermepumpe-test" for i in range(count)])
+    compressed = gzip.compress(xml)
+
+    start = time.perf_counter()
+    streamed = sum(1 for _ in parse_sitemap_stream(chunked(compressed, 64 * 1024)))
+    stream_time = time.perf_counter() - start
+
+    # Previous approach: decompress everything into one string, then findall.
+    start = time.perf_counter()
+    whole = len(re.findall(r"<loc>([^<]+)</loc>", gzip.decompress(compressed).decode("utf-8")))
+    whole_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in parse_sitemap_stream(chunked(compressed, 64 * 1024)):
+        pass
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    re.findall(r"<loc>([^<]+)</loc>", gzip.decompress(compressed).decode("utf-8"))
+    _, whole_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert streamed == whole == count
+    return len(compressed), len(xml), stream_peak, whole_peak, stream_time, whole_time
+
+
+def test_streaming_memory_is_bounded():
+    _, xml_size, stream_peak, _, _, _ = measure(50000)
+    assert stream_peak < xml_size / 4
+
+
+def walk_peak(count: int) -> int:
+    """Peak traced memory of a crawler walk over an index with one urlset of count URLs."""
+    routes: Dict[str, bytes] = {}
+    with StubServer(routes, content_type="application/xml") as server:
+        routes["/sitemap.xml"] = sitemap_index([server.url("/produkte.xml.gz")])
+        routes["/produkte.xml.gz"] = gzip.compress(
+            urlset([f"https://shop.test/produkt/{i}-waermepumpe-test" for i in range(count)])
+        )
+        # Reject every page so the crawler's seen-set stays empty; what is
+        # left is the memory the walk itself needs per document.
+        crawler = SitemapCrawler(SitemapOnlyScraper(), url_filter=lambda url: False)
+        tracemalloc.start()
+        try:
+            assert list(crawler.iter_entries([server.url("/sitemap.xml")])) == []
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    assert (crawler.fetched, crawler.reused) == (2, 0)
+    # The urlset was spooled straight into the saved state, no temp file left.
+    assert crawler._state_path(server.url("/produkte.xml.gz")).exists()
+    assert not list(crawler.state_dir.glob("*.tmp"))
+    return peak
+
+
+def test_crawler_memory_does_not_grow_with_urlset_size():
+    small, large = walk_peak(2000), walk_peak(40000)
+    assert large < small * 2
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    test_parse_gzip_in_small_chunks()
+    test_crawler_walks_index_and_nested_sitemaps()
+    test_broken_sitemap_keeps_parsed_entries()
+    test_parallel_walk_is_ordered_and_deduplicated()
+    test_unchanged_sub_sitemaps_are_reused()
+
+    gz_size, xml_size, stream_peak, whole_peak, stream_time, whole_time = measure(count)
+    with report(f"SITEMAP STREAMING ({count} URLs, {gz_size / 1e6:.1f} MB gzip, {xml_size / 1e6:.1f} MB XML)"):
+        print(f"streamed (zlib + XMLPullParser): peak {stream_peak / 1e6:6.1f} MB  {stream_time:5.2f} s")
+        print(f"gzip.decompress + re.findall   : peak {whole_peak / 1e6:6.1f} MB  {whole_time:5.2f} s")
@@ -1,6 +1,10 @@
 """
 Quick test to verify speed improvements with concurrent scraping.
 Tests with 100 products to see the performance difference.
+
+To benchmark without the live shop, record once and replay afterwards:
+    SCRAPER_CASSETTE=data/cassettes/{scraper}.jsonl.gz SCRAPER_CASSETTE_MODE=record python test_speed_improvement.py
+    SCRAPER_CASSETTE=data/cassettes/{scraper}.jsonl.gz SCRAPER_CASSETTE_MODE=replay SCRAPER_CASSETTE_LATENCY_MS=150 python test_speed_improvement.py
 """
 import time
 from wolfonlineshop_scraper import WolfonlineshopScraper
@@ -0,0 +1,156 @@
+"""
+The Shopware 6 Store API as a bulk product source (SCRAPER_BULK_SOURCE).
+
+The stand-in endpoint (tests.stub_server.store_api_route) pages through product
+entities built from fixtures/shopware_store_api_products.json; the same
+products are also served as HTML pages for the fallback.
+
+Usage:
+    python test_store_api.py [products] [latency]
+"""
+import copy
+import sys
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from meinhausshop_scraper import MeinHausShopScraper
+from shopware_store_api import ShopwareStoreApi
+from tests.stub_server import StubServer, load_fixture, store_api_route
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run, tmp_run_dirs
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+ACCESS_KEY = "SWSCVGHSMEJQZ3LJTWXRDNVZQW"
+
+
+class StoreApiScraper(StubExtractScraper):
+    def __init__(self, server, access_key: Optional[str] = None, page_size: int = 100):
+        self.base_url = server.base_url
+        self.access_key = access_key
+        self.page_size = page_size
+        super().__init__([server.url(f"/produkt-{i}") for i in range(len(server.products))])
+
+    def bulk_source(self) -> ShopwareStoreApi:
+        return ShopwareStoreApi(self, self.base_url, access_key=self.access_key, page_size=self.page_size)
+
+
+def build_products(count: int) -> List[Dict[str, Any]]:
+    """Store API entities whose SEO URLs match the HTML pages of build_pages()."""
+    template = load_fixture("shopware_store_api_products.json")[0]
+    products = []
+    for i in range(count):
+        product = copy.deepcopy(template)
+        product["id"] = f"{i:032x}"
+        product["productNumber"] = f"SIO-{i}"
+        product["translated"]["name"] = f"Testprodukt {i}"
+        product["calculatedPrice"]["unitPrice"] = 100.0 + i
+        product["calculatedPrice"]["calculatedTaxes"][0]["tax"] = round((100.0 + i) * 19 / 119, 2)
+        product["seoUrls"] = [{"seoPathInfo": f"produkt-{i}", "isCanonical": True}]
+        products.append(product)
+    return products
+
+
+def start_shop(count: int, latency: float = 0.0, **route_kwargs) -> StubServer:
+    routes = dict(build_pages(count))
+    routes["/"] = f"<html><script>window.accessKey = '{ACCESS_KEY}';</script></html>"
+    routes["/store-api/product"] = store_api_route(build_products(count), ACCESS_KEY, **route_kwargs)
+    server = StubServer(routes, latency=latency).start()
+    server.products = range(count)
+    return server
+
+
+def bulk_run(monkeypatch, server, bulk: bool = True, **scraper_kwargs):
+    """Returns (count, seconds, requests by kind, CSV rows by URL)."""
+    monkeypatch.setenv("SCRAPER_BULK_SOURCE", "1" if bulk else "0")
+    scraper = StoreApiScraper(server, **scraper_kwargs)
+    server.request_log.clear()
+    count, elapsed = timed_run(scraper, concurrent_workers=4)
+    kinds = {"api": 0, "pages": 0}
+    for _, path in server.request_log:
+        kinds["api" if path.startswith("/store-api/") else "pages"] += path != "/"
+    rows = {row["Produkt_URL"]: row for row in read_rows(scraper.output_file)}
+    return count, elapsed, kinds, rows
+
+
+def test_map_fixture_products():
+    api = ShopwareStoreApi(StubExtractScraper([]), "https://www.selfio.de/")
+    first, second, third = (api.map_product(p) for p in load_fixture("shopware_store_api_products.json"))
+    assert first == {
+        "manufacturer": "Grundfos",
+        "category": "Heizungspumpen",
+        "name": "Grundfos ALPHA2 25-60 180 Heizungspumpe",
+        "title": "Grundfos ALPHA2 25-60 180 Heizungspumpe",
+        "article_number": "SIO-100482",
+        "price_net": "243,61",
+        "price_gross": "289,90",
+        "ean": "5712606561234",
+        "product_image": "https://www.selfio.de/media/4e/7a/91/1689243111/grundfos-alpha2.jpg",
+        "product_url": "https://www.selfio.de/produkte/grundfos-alpha2-25-60-180-heizungspumpe",
+    }
+    assert second["price_gross"] == "1.249,00" and second["product_image"] == ""
+    assert third["manufacturer"] == "" and third["price_net"] == "2.352,10"
+    assert third["product_url"] == "https://www.selfio.de/detail/0188b7c2ea5c7d0c9b1e2a3f4d5c6b73"
+
+
+def test_product_urls_match_discovered_urls():
+    # meinhausshop's sitemap lists bare-host URLs; SEO paths end in a slash.
+    scraper = MeinHausShopScraper()
+    element = copy.deepcopy(load_fixture("shopware_store_api_products.json")[0])
+    element["seoUrls"] = [{"isCanonical": True, "seoPathInfo": "grundfos-alpha2-25-60/"}]
+    product_url = scraper.bulk_source().map_product(element)["product_url"]
+    assert product_url == scraper._normalize_url("https://meinhausshop.de/grundfos-alpha2-25-60/")
+    assert product_url == "https://www.meinhausshop.de/grundfos-alpha2-25-60"
+
+
+def test_bulk_run_pages_through_the_store_api(monkeypatch):
+    server = start_shop(250)
+    try:
+        count, _, kinds, rows = bulk_run(monkeypatch, server)
+    finally:
+        server.stop()
+    assert count == 250 and len(rows) == 250
+    assert kinds == {"api": 3, "pages": 0}
+    row = rows[server.url("/produkt-7")]
+    assert row["Preis_Brutto"] == "107,00" and row["Hersteller"] == "Grundfos"
+
+
+def test_falls_back_to_html(monkeypatch):
+    server = start_shop(30)
+    try:
+        # Wrong access key: the endpoint answers 401.
+        count, _, kinds, rows = bulk_run(monkeypatch, server, access_key="SWSCWRONGKEY0000000000000000")
+        assert count == 30 and kinds["pages"] == 30
+        assert rows[server.url("/produkt-3")]["Name"] == "Testprodukt 3"
+    finally:
+        server.stop()
+
+    # Endpoint disappears after the first page: only the rest is scraped.
+    server = start_shop(30, fail_from_page=2)
+    try:
+        count, _, kinds, rows = bulk_run(monkeypatch, server, page_size=10)
+    finally:
+        server.stop()
+    assert count == 30 and len(rows) == 30
+    assert kinds == {"api": 2, "pages": 20}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    test_map_fixture_products()
+    for test in (test_bulk_run_pages_through_the_store_api, test_falls_back_to_html):
+        with tmp_run_dirs() as (monkeypatch, _):
+            test(monkeypatch)
+
+    server = start_shop(count, latency=latency)
+    try:
+        with tmp_run_dirs() as (monkeypatch, _):
+            _, html_time, html_kinds, _ = bulk_run(monkeypatch, server, bulk=False)
+            _, bulk_time, bulk_kinds, _ = bulk_run(monkeypatch, server, page_size=250)
+    finally:
+        server.stop()
+
+    with report(f"STORE API BULK SOURCE ({count} products, {latency}s latency)"):
+        print(f"HTML product pages     : {html_kinds['pages']:5d} requests {html_time:6.2f} s")
+        print(f"Store API, 250 per page: {bulk_kinds['api']:5d} requests {bulk_time:6.2f} s")
@@ -0,0 +1,104 @@
+"""
+Scraping product URLs while discovery is still running (SCRAPER_STREAM_DISCOVERY).
+
+SlowDiscoveryScraper yields its product URLs category by category with a
+delay per category page, like st_shop24 or wolf_online_shop.
+
+Usage:
+    python test_url_stream.py [categories] [per_category] [category_delay]
+"""
+import sys
+import time
+from typing import Iterator, List
+
+import pytest
+
+from tests.stub_server import StubServer
+from tests.support import StubExtractScraper, build_pages, read_rows, report, timed_run, tmp_run_dirs
+from url_stream import UrlStream
+
+pytestmark = pytest.mark.usefixtures("tmp_data_dirs")
+
+
+class SlowDiscoveryScraper(StubExtractScraper):
+    """Notes how many pages the server had been asked for when discovery ended."""
+
+    def __init__(self, server: StubServer, per_category: int, category_delay: float):
+        self.server = server
+        self.per_category = per_category
+        self.category_delay = category_delay
+        self.requests_during_discovery = None
+        super().__init__(sorted(server.url(path) for path in server.httpd.routes))
+
+    def iter_product_urls(self) -> Iterator[str]:
+        for start in range(0, len(self.urls), self.per_category):
+            time.sleep(self.category_delay)
+            # Listing pages repeat products that are shown in several categories.
+            yield from self.urls[max(start - 1, 0):start + self.per_category]
+        self.requests_during_discovery = len(self.server.request_log)
+
+    def get_product_urls(self) -> List[str]:
+        return list(self.iter_product_urls())
+
+
+def run_scraper(monkeypatch, scraper_args, stream: bool, engine: str = "thread", max_products=None):
+    """Returns (count, seconds, CSV product URLs, pages requested before discovery ended)."""
+    monkeypatch.setenv("SCRAPER_STREAM_DISCOVERY", "1" if stream else "0")
+    scraper = SlowDiscoveryScraper(*scraper_args)
+    scraper.server.request_log.clear()
+    count, elapsed = timed_run(scraper, concurrent_workers=4, engine=engine, max_products=max_products)
+    rows = [row["Produkt_URL"] for row in read_rows(scraper.output_file)]
+    return count, elapsed, rows, scraper.requests_during_discovery
+
+
+def test_stream_deduplicates_and_limits():
+    stream = UrlStream(iter(["b", "c", "a", "d", "e"]), first=["a", "b"], limit=4)
+    assert list(stream) == ["a", "b", "c", "d"]
+    assert stream.duplicates == 2
+
+    def broken():
+        yield "x"
+        raise RuntimeError("sitemap gone")
+
+    stream = UrlStream(broken())
+    assert stream.next_batch(10) == ["x"]
+    assert stream.next_batch(10) == []
+
+
+def test_streaming_overlaps_discovery_with_scraping(monkeypatch):
+    with StubServer(build_pages(24), latency=0.05) as server:
+        urls = sorted(server.url(path) for path in server.httpd.routes)
+        args = (server, 4, 0.2)
+        list_count, _, list_rows, list_overlap = run_scraper(monkeypatch, args, stream=False)
+        stream_count, _, stream_rows, stream_overlap = run_scraper(monkeypatch, args, stream=True)
+        limited = run_scraper(monkeypatch, args, stream=True, max_products=10)
+        async_count, _, async_rows, async_overlap = run_scraper(
+            monkeypatch, args, stream=True, engine="async"
+        )
+
+    assert list_count == stream_count == async_count == 24
+    assert sorted(stream_rows) == sorted(list_rows) == sorted(async_rows) == urls
+    # Product pages were requested while the categories were still being read.
+    assert list_overlap == 0
+    assert stream_overlap > 0 and async_overlap > 0
+    assert limited[0] == 10 and sorted(limited[2]) == urls[:10]
+
+
+if __name__ == "__main__":
+    categories = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    per_category = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    category_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    test_stream_deduplicates_and_limits()
+
+    pages = build_pages(categories * per_category)
+    with tmp_run_dirs() as (monkeypatch, _), StubServer(pages, latency=0.05) as server:
+        args = (server, per_category, category_delay)
+        _, list_time, _, _ = run_scraper(monkeypatch, args, stream=False)
+        _, stream_time, _, overlap = run_scraper(monkeypatch, args, stream=True)
+
+    with report(
+        f"STREAMING DISCOVERY ({categories} categories x {per_category} products, "
+        f"{category_delay}s per category)"
+    ):
+        print(f"discover everything, then scrape : {list_time:6.2f} s")
+        print(f"scrape while discovering         : {stream_time:6.2f} s ({overlap} pages before discovery ended)")
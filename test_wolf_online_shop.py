@@ -18,7 +18,7 @@ def test_single_product():
     response = scraper.make_request(test_url)
     
     if response:
-        soup = scraper.parse_html(response.text)
+        soup = scraper.parse_response(response)
         
         # Find first product link
         links = soup.find_all('a', href=True)
@@ -0,0 +1 @@
+"""Support code for the offline test_*.py checks at the repo root."""
@@ -0,0 +1,245 @@
+"""
+Local stand-in HTTP server for the offline tests and benchmarks.
+
+Serves canned pages from memory on 127.0.0.1 so scrapers can be exercised
+without touching the live shops.
+
+Usage:
+    with StubServer({"/product-1": "<html>...</html>"}, latency=0.05) as server:
+        url = server.url("/product-1")
+
+store_api_route() and magento_graphql_route() stand in for the shops' JSON
+catalogue endpoints, serving product entities from fixtures/ (load_fixture()).
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+Route = Union[str, bytes, Callable[["StubRequestHandler"], None]]
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Request handler that looks up the path in the server's route table."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep test output readable.
+        pass
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_payload(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str = "text/html; charset=utf-8",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.request_log.append((self.command, self.path))
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self._respond()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _respond(self) -> None:
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        self.request_body = self._body()
+        route = server.routes.get(self.path)
+        if route is None:
+            route = server.routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self.send_payload(404, b"not found", "text/plain")
+            return
+
+        if callable(route):
+            route(self)
+            return
+
+        body = route.encode("utf-8") if isinstance(route, str) else route
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if server.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        headers = {"ETag": etag} if server.etags else {}
+        self.send_payload(200, body, server.content_type, headers)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_HEAD = _handle
+
+
+class StubServer:
+    """
+    Threaded HTTP server bound to a free local port.
+
+    Args:
+        routes: Mapping of path -> body (str/bytes) or handler callable
+        latency: Seconds to sleep before answering each request
+        etags: Send ETag headers and answer If-None-Match with 304
+        content_type: Content-Type for static routes
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, Route],
+        latency: float = 0.0,
+        etags: bool = False,
+        content_type: str = "text/html; charset=utf-8",
+    ):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = routes
+        self.httpd.latency = latency
+        self.httpd.etags = etags
+        self.httpd.content_type = content_type
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_log = []
+        self.httpd.in_flight = 0
+        self.httpd.peak_in_flight = 0
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_log(self):
+        return self.httpd.request_log
+
+    @property
+    def peak_in_flight(self) -> int:
+        """Most requests the server was handling at once since the last reset_peak()."""
+        return self.httpd.peak_in_flight
+
+    def reset_peak(self) -> None:
+        with self.httpd.lock:
+            self.httpd.peak_in_flight = self.httpd.in_flight
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def load_fixture(name: str) -> Any:
+    """Decoded JSON fixture from fixtures/."""
+    with open(FIXTURES_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def send_json(handler: StubRequestHandler, status: int, payload: Any) -> None:
+    handler.send_payload(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+
+def store_api_route(
+    products: List[Dict[str, Any]], access_key: str, fail_from_page: Optional[int] = None
+) -> Callable[[StubRequestHandler], None]:
+    """
+    Stand-in for Shopware 6 POST /store-api/product.
+
+    Args:
+        products: Product entities to page through (see load_fixture())
+        access_key: sw-access-key the route accepts; others get 401
+        fail_from_page: Answer 404 from this page on (endpoint going away mid-run)
+    """
+
+    def handle(handler: StubRequestHandler) -> None:
+        if handler.headers.get("sw-access-key") != access_key:
+            send_json(handler, 401, {"errors": [{"status": "401", "code": "FRAMEWORK__API_INVALID_ACCESS_KEY"}]})
+            return
+        criteria = json.loads(handler.request_body or b"{}")
+        page = int(criteria.get("page", 1))
+        limit = int(criteria.get("limit", 10))
+        if fail_from_page is not None and page >= fail_from_page:
+            send_json(handler, 404, {"errors": [{"status": "404"}]})
+            return
+        send_json(handler, 200, {
+            "apiAlias": "dal_entity_search_result",
+            "total": len(products),
+            "page": page,
+            "limit": limit,
+            "elements": products[(page - 1) * limit:page * limit],
+            "aggregations": [],
+        })
+
+    return handle
+
+
+def magento_graphql_route(
+    products: List[Dict[str, Any]], blocked: bool = False, error: Optional[str] = None
+) -> Callable[[StubRequestHandler], None]:
+    """
+    Stand-in for Magento 2 GET /graphql with the products query.
+
+    Args:
+        products: Product items to page through (see load_fixture())
+        blocked: Answer with a Cloudflare challenge page (403)
+        error: Answer every query with this GraphQL error (HTTP 200, as Magento does)
+    """
+
+    def handle(handler: StubRequestHandler) -> None:
+        if blocked:
+            handler.send_payload(403, b"<html><title>Just a moment...</title></html>")
+            return
+        if error:
+            send_json(handler, 200, {"errors": [{"message": error, "extensions": {"category": "graphql"}}]})
+            return
+        params = parse_qs(urlsplit(handler.path).query)
+        variables = json.loads(params.get("variables", ["{}"])[0])
+        page = int(variables.get("currentPage", 1))
+        size = int(variables.get("pageSize", 20))
+        total_pages = max((len(products) + size - 1) // size, 1)
+        send_json(handler, 200, {"data": {"products": {
+            "total_count": len(products),
+            "page_info": {"current_page": page, "total_pages": total_pages},
+            "items": products[(page - 1) * size:page * size],
+        }}})
+
+    return handle
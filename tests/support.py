@@ -0,0 +1,229 @@
+"""
+Scaffolding shared by the offline tests and their benchmarks.
+
+build_pages() and StubExtractScraper make up stub shops for StubServer,
+load_scrapers() and write_fixture_cassette() run the production scrapers on
+the saved product pages, timed_run() and read_rows() time a run and read its
+CSV, and report() frames the benchmark tables. redirect_data_dirs() and
+use_fixture_cassette() back the tmp_data_dirs and fixture_cassette fixtures
+in conftest.py; the __main__ benchmarks, which run outside pytest, use
+tmp_run_dirs() and use_fixture_cassette() directly.
+"""
+import csv
+import logging
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import cassette
+import config
+from base_scraper import BaseScraper
+from scraper_registry import create_scraper
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Run directories --------------------------------------------------------------
+
+def _project_modules():
+    """Loaded modules that live in the repo root."""
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and Path(path).resolve().parent == BASE_DIR:
+            yield module
+
+
+def redirect_data_dirs(monkeypatch, root: Path) -> Tuple[Path, Path]:
+    """
+    Point DATA_DIR, LOGS_DIR and HTTP_CACHE_DIR below root.
+
+    Modules import the paths with `from config import DATA_DIR`, so every
+    loaded project module holding a copy is patched, not only config.
+
+    Args:
+        monkeypatch: pytest's monkeypatch fixture or pytest.MonkeyPatch.context()
+        root: Directory to create data/ and logs/ in
+
+    Returns:
+        (data_dir, logs_dir)
+    """
+    data_dir = Path(root) / "data"
+    logs_dir = Path(root) / "logs"
+    data_dir.mkdir(exist_ok=True)
+    logs_dir.mkdir(exist_ok=True)
+    for module in [config, *_project_modules()]:
+        if hasattr(module, "DATA_DIR"):
+            monkeypatch.setattr(module, "DATA_DIR", data_dir)
+        if hasattr(module, "LOGS_DIR"):
+            monkeypatch.setattr(module, "LOGS_DIR", logs_dir)
+        if hasattr(module, "HTTP_CACHE_DIR"):
+            monkeypatch.setattr(module, "HTTP_CACHE_DIR", data_dir / "http_cache")
+    return data_dir, logs_dir
+
+
+def close_log_handlers(root: Path) -> None:
+    """
+    Close the scraper log handlers writing below root.
+
+    Scraper loggers keep their handlers, so the next scraper of the same name
+    would otherwise keep logging into a directory that is about to go away.
+    """
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        handlers = getattr(logger, "handlers", [])
+        if any(Path(getattr(h, "baseFilename", "/")).is_relative_to(root) for h in handlers):
+            for handler in list(handlers):
+                logger.removeHandler(handler)
+                handler.close()
+
+
+@contextmanager
+def tmp_run_dirs() -> Iterator[Tuple[pytest.MonkeyPatch, Path]]:
+    """
+    The tmp_data_dirs fixture for the __main__ benchmarks, which run outside
+    pytest: DATA_DIR and LOGS_DIR point into a temporary directory for the block.
+
+    Yields:
+        (monkeypatch, temporary directory); monkeypatch.setenv() and the
+        redirect are undone when the block ends
+    """
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as monkeypatch:
+        root = Path(tmp)
+        redirect_data_dirs(monkeypatch, root)
+        try:
+            yield monkeypatch, root
+        finally:
+            close_log_handlers(root)
+
+
+# Stub shops -------------------------------------------------------------------
+
+def build_pages(count: int, specs: int = 300) -> Dict[str, str]:
+    """
+    Product pages /produkt-0 .. /produkt-<count - 1> for StubExtractScraper.
+
+    Args:
+        count: Number of pages
+        specs: <li class="spec"> rows per page, which give extract_product()
+            real parsing work; 0 where only the waiting on hosts matters
+    """
+    filler = "".join(f"<li class='spec'><span>Eigenschaft {n}</span><b>{n}</b></li>" for n in range(specs))
+    return {
+        f"/produkt-{i}": (
+            f"<html><head><meta charset='utf-8'></head><body>"
+            f"<h1 class='product-detail-name'>Testprodukt {i}</h1>"
+            f"<meta itemprop='price' content='{i},99'><ul>{filler}</ul>"
+            f"</body></html>"
+        )
+        for i in range(count)
+    }
+
+
+class StubExtractScraper(BaseScraper):
+    """Scraper split into fetch_product() / extract_product()."""
+
+    def __init__(self, urls: List[str]):
+        self.urls = urls
+        super().__init__("test_extract_pipeline")
+        self.scrape_min_delay = self.scrape_max_delay = 0
+
+    def get_product_urls(self) -> List[str]:
+        return list(self.urls)
+
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        soup = self.parse_response(response)
+        return {
+            "name": soup.select_one("h1").text,
+            "price_gross": soup.select_one("meta[itemprop='price']")["content"],
+            "category": str(len(soup.select("li.spec"))),
+            "product_url": url,
+        }
+
+
+def timed_run(scraper: BaseScraper, **run_kwargs: Any) -> Tuple[int, float]:
+    """scraper.run(**run_kwargs) -> (products written, seconds)."""
+    start = time.time()
+    count = scraper.run(**run_kwargs)
+    return count, time.time() - start
+
+
+def read_rows(path) -> List[Dict[str, str]]:
+    """Rows of a scraper CSV."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@contextmanager
+def report(title: str) -> Iterator[None]:
+    """Frame what the block prints as a benchmark table under title."""
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+    yield
+    print("=" * 70)
+
+
+# Saved product pages ----------------------------------------------------------
+
+# Product URL -> saved page at the repo root.
+FIXTURES = {
+    "https://www.wolf-online-shop.de/Buderus-Schamottstein-hinten-L136mm-8738121554::526582.html":
+        "wolf_product_page.html",
+    "https://www.wasserpumpe.de/dab-nova-up-300-m-ae-flachsauger-tauchpumpe":
+        "wasserpumpe_product_page.html",
+}
+
+# The production scrapers (scraper_registry names) run on the saved pages.
+FIXTURE_SCRAPERS = (
+    "sanundo",
+    "heima24",
+    "st_shop24",
+    "selfio",
+    "heizungsdiscount24",
+    "meinhausshop",
+    "wolfonlineshop",
+    "pumpe24",
+    "pumpenheizung",
+    "wasserpumpe",
+    "wolf_online_shop",
+)
+
+
+def write_fixture_cassette(path: str) -> None:
+    recorder = cassette.Cassette(path, cassette.RECORD)
+    for url, fixture in FIXTURES.items():
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        response.url = url
+        with open(BASE_DIR / fixture, "rb") as f:
+            response._content = f.read()
+        recorder.record("GET", url, response, 0.0)
+    recorder.close()
+
+
+def load_scrapers() -> List[BaseScraper]:
+    """One instance of every FIXTURE_SCRAPERS scraper."""
+    return [create_scraper(name) for name in FIXTURE_SCRAPERS]
+
+
+def use_fixture_cassette(monkeypatch, directory: Path) -> None:
+    """
+    Replay the saved product pages (FIXTURES) through SCRAPER_CASSETTE.
+
+    Args:
+        monkeypatch: pytest's monkeypatch fixture or pytest.MonkeyPatch.context()
+        directory: Where to write the cassette
+    """
+    path = Path(directory) / "fixtures.jsonl.gz"
+    write_fixture_cassette(str(path))
+    # Scrapers share Cassette objects by path; start from an empty registry.
+    monkeypatch.setattr(cassette, "_cassettes", {})
+    monkeypatch.setenv("SCRAPER_CASSETTE", str(path))
+    monkeypatch.setenv("SCRAPER_CASSETTE_MODE", "replay")
@@ -0,0 +1,125 @@
+"""
+Streaming URL discovery for run() (SCRAPER_STREAM_DISCOVERY, on by default).
+
+UrlStream runs a scraper's iter_product_urls() generator on a background
+thread and hands the URLs to the execution engines as they are discovered,
+so product pages are scraped while categories and sitemaps are still being
+crawled. URLs are deduplicated on the fly and max_products is applied to the
+deduplicated stream; a bounded queue keeps discovery from running far ahead
+of scraping.
+"""
+import queue
+import threading
+from typing import Iterable, Iterator, List, Optional
+
+DEFAULT_QUEUE_SIZE = 10000
+
+_END = object()
+
+
+class UrlStream:
+    """
+    Iterator over discovered URLs, fed by a background thread.
+
+    Args:
+        source: URL generator (e.g. scraper.iter_product_urls())
+        first: URLs yielded before the source (e.g. carried unvisited URLs)
+        limit: Stop after this many unique URLs (None for all)
+        logger: Logger for discovery errors and the summary
+        maxsize: URLs buffered ahead of the consumer
+    """
+
+    def __init__(
+        self,
+        source: Iterable[str],
+        first: Iterable[str] = (),
+        limit: Optional[int] = None,
+        logger=None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.logger = logger
+        self.limit = limit
+        self.count = 0
+        self.duplicates = 0
+        self.finished = False
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(maxsize, 1))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._produce, args=(first, source), name="url-discovery", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, first: Iterable[str], source: Iterable[str]) -> None:
+        seen = set()
+        try:
+            for urls in (first, source):
+                for url in urls:
+                    if self._stop.is_set():
+                        return
+                    if not url or url in seen:
+                        self.duplicates += 1
+                        continue
+                    seen.add(url)
+                    if not self._put(url):
+                        return
+                    self.count += 1
+                    if self.limit and self.count >= self.limit:
+                        if self.logger:
+                            self.logger.info(f"Limited to first {self.limit} products")
+                        return
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
+        finally:
+            if self.logger and not self._stop.is_set():
+                self.logger.info(
+                    f"Discovery finished: {self.count} product URLs "
+                    f"({self.duplicates} duplicates skipped)"
+                )
+            self._put(_END)
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        if self.finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self.finished = True
+            raise StopIteration
+        return item
+
+    def next_batch(self, size: int) -> List[str]:
+        """
+        Block until at least one URL is available, then return up to `size`
+        URLs without waiting further. An empty list means the stream ended.
+        """
+        try:
+            batch = [next(self)]
+        except StopIteration:
+            return []
+        while len(batch) < size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                self.finished = True
+                break
+            batch.append(item)
+        return batch
+
+    def close(self) -> None:
+        """Stop discovery early (e.g. when the run fails)."""
+        self._stop.set()
+        self._thread.join(timeout=5)
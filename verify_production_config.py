@@ -13,6 +13,9 @@ def verify_production():
     print("1. Checking imports...")
     try:
         from run_production_powerbi import SCRAPERS, POWER_BI_SHEET_ID
+        # SCRAPERS is lazy; load every scraper module to check its imports.
+        for _, scraper_class in SCRAPERS:
+            scraper_class.load()
         print(f"   ✓ All imports successful")
         print(f"   ✓ {len(SCRAPERS)} scrapers loaded")
     except Exception as e:
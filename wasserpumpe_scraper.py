@@ -4,20 +4,22 @@ Website: https://wasserpumpe.de
 Strategy: sitemap-first discovery with category fallback, then parse product pages
 with JSON-LD + HTML selectors.
 """
-import json
 import os
 import re
 import sys
-import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
 import cloudscraper
 
 from base_scraper import BaseScraper
+from category_crawler import SHOPWARE_TILES, CategoryCrawler, read_tiles
 from config import SCRAPER_CONFIGS, SHEET_IDS
 from google_sheets_helper import push_data
+from json_ld import missing_fields as missing_json_ld_fields
+from magento_graphql import MagentoGraphQL
+from sitemap_stream import SitemapCrawler
 
 
 SCRAPER_NAME = "wasserpumpe"
@@ -28,6 +30,9 @@ class WasserpumpeScraper(BaseScraper):
     Scraper for Wasserpumpe.de using cloudscraper and plain HTTP parsing.
     """
 
+    # Cloudflare cookies are bound to the cloudscraper session.
+    async_fetch_supported = False
+
     SKIP_PATH_PARTS = [
         "/rechtliches",
         "/datenschutz",
@@ -104,7 +109,10 @@ class WasserpumpeScraper(BaseScraper):
         ]
         for warmup_url in warmup_urls:
             try:
-                response = self.scraper.get(
+                # Through _send_request so warm-ups respect the circuit breaker.
+                response = self._send_request(
+                    self.scraper,
+                    "GET",
                     warmup_url,
                     headers=self.request_headers,
                     timeout=20,
@@ -125,7 +133,9 @@ class WasserpumpeScraper(BaseScraper):
 
         for attempt in range(1, attempts + 1):
             try:
-                response = self.scraper.get(
+                response = self._send_request(
+                    self.scraper,
+                    "GET",
                     url,
                     headers=headers,
                     timeout=timeout,
@@ -134,20 +144,26 @@ class WasserpumpeScraper(BaseScraper):
                 )
                 if response.status_code == 403:
                     self.logger.warning(f"403 for {url} (attempt {attempt}/{attempts})")
+                    if attempt == attempts or not self._backoff_before_retry(
+                        attempt - 1, response, base_delay=1.5
+                    ):
+                        self._fetch_failed(url)
+                        break
                     self._warm_up_session()
-                    time.sleep(1.5 * attempt)
                     continue
 
                 response.raise_for_status()
                 return response
             except Exception as exc:
-                if attempt == attempts:
+                if attempt == attempts or not self._backoff_before_retry(
+                    attempt - 1, getattr(exc, "response", None), base_delay=1.0
+                ):
                     self.logger.error(f"Request failed for {url}: {exc}")
-                else:
-                    self.logger.warning(
-                        f"Retrying {url} after error (attempt {attempt}/{attempts}): {exc}"
-                    )
-                    time.sleep(1.0 * attempt)
+                    self._fetch_failed(url, exc)
+                    break
+                self.logger.warning(
+                    f"Retrying {url} after error (attempt {attempt}/{attempts}): {exc}"
+                )
 
         return None
 
@@ -219,117 +235,101 @@ class WasserpumpeScraper(BaseScraper):
                 product_urls.append(url)
         return product_urls
 
-    def _extract_urls_from_sitemap(self, max_urls: Optional[int] = None) -> List[str]:
-        product_urls = []
+    def _iter_urls_from_sitemap(self, max_urls: Optional[int] = None) -> Iterator[str]:
         seen_products = set()
-        visited_sitemaps = set()
-        queue = [self.sitemap_url]
-        max_sitemaps = 120
-
-        while queue and len(visited_sitemaps) < max_sitemaps:
-            sitemap = queue.pop(0)
-            if sitemap in visited_sitemaps:
-                continue
-            visited_sitemaps.add(sitemap)
+        crawler = SitemapCrawler(
+            self,
+            is_sitemap=lambda loc: loc.lower().endswith(".xml") or "sitemap" in loc.lower(),
+            normalize_sitemap=self._normalize_url,
+            max_sitemaps=120,
+            request_kwargs={"attempts": 2, "timeout": 30},
+        )
 
-            response = self.make_request(sitemap, attempts=2, timeout=30)
-            if not response:
+        for loc, lastmod in crawler.iter_entries([self.sitemap_url]):
+            url = self._normalize_url(loc)
+            if not url:
                 continue
 
-            soup = BeautifulSoup(response.text, "xml")
-            locs = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
-
-            for loc in locs:
-                loc_lower = loc.lower()
-
-                if loc_lower.endswith(".xml") or "sitemap" in loc_lower:
-                    next_sitemap = self._normalize_url(loc)
-                    if next_sitemap and next_sitemap not in visited_sitemaps:
-                        queue.append(next_sitemap)
-                    continue
-
-                url = self._normalize_url(loc)
-                if not url:
-                    continue
-
-                if self._is_product_url(url) and url not in seen_products:
-                    seen_products.add(url)
-                    product_urls.append(url)
-                    if max_urls and len(product_urls) >= max_urls:
-                        return product_urls
-
-        return product_urls
+            if self._is_product_url(url) and url not in seen_products:
+                seen_products.add(url)
+                self.record_lastmod(url, lastmod)
+                yield url
+                if max_urls and len(seen_products) >= max_urls:
+                    return
 
-    def _extract_urls_from_categories(self, max_urls: Optional[int] = None) -> List[str]:
+    def _listing_product_links(self, soup: BeautifulSoup, page_url: str) -> List[str]:
         product_urls = []
-        seen = set()
-
-        for idx, category_url in enumerate(self.category_urls, 1):
-            self.logger.info(
-                f"[{idx}/{len(self.category_urls)}] Scraping category: {category_url}"
-            )
-            response = self.make_request(category_url, attempts=3, timeout=35)
-            if not response:
-                continue
-
-            soup = self.parse_html(response.text)
-
-            for anchor in soup.select("a[href]"):
-                href = anchor.get("href", "")
-                url = self._normalize_url(href)
-                if url and self._is_product_url(url) and url not in seen:
-                    seen.add(url)
-                    product_urls.append(url)
-
-            # Extra fallback: parse URLs from embedded scripts/text.
-            if len(product_urls) < 10:
-                script_urls = self._extract_urls_from_text(response.text)
-                for url in script_urls:
-                    if url not in seen:
-                        seen.add(url)
-                        product_urls.append(url)
-
-            self.logger.info(
-                f"  Category yielded {len(product_urls)} product URLs total"
-            )
+        for anchor in soup.select("a[href]"):
+            url = self._normalize_url(anchor.get("href", ""))
+            if url and self._is_product_url(url):
+                product_urls.append(url)
 
-            if max_urls and len(product_urls) >= max_urls:
-                return product_urls[:max_urls]
+        # Extra fallback: parse URLs from embedded scripts/text.
+        if len(product_urls) < 10:
+            product_urls.extend(self._extract_urls_from_text(str(soup)))
+        return product_urls
 
-            time.sleep(1.2)
+    def _listing_tiles(self, soup: BeautifulSoup, page_url: str) -> List[Dict[str, str]]:
+        """Name, price and image from the category tiles (listing extraction)."""
+        return read_tiles(
+            soup,
+            page_url,
+            clean_price=self._clean_price,
+            normalize_url=lambda url: self._normalize_url(url) if self._is_product_url(url) else "",
+            **SHOPWARE_TILES,
+        )
 
-        return product_urls
+    def bulk_source(self) -> MagentoGraphQL:
+        """Products from the Magento GraphQL catalogue (SCRAPER_BULK_SOURCE=1)."""
+        return MagentoGraphQL(self, self.base_url, normalize_url=self._normalize_url)
 
-    def get_product_urls(self, max_urls: int = None) -> List[str]:
-        all_urls = []
+    def _iter_urls_from_categories(self, max_urls: Optional[int] = None) -> Iterator[str]:
+        crawler = CategoryCrawler(
+            self,
+            product_links=self._listing_product_links,
+            tiles=self._listing_tiles,
+            request_kwargs={"attempts": 3, "timeout": 35},
+        )
+        for found, url in enumerate(crawler.iter_products(self.category_urls), 1):
+            yield url
+            if max_urls and found >= max_urls:
+                return
+
+    def iter_product_urls(self, max_urls: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield product URLs from the sitemaps as they are read, then from the
+        category pages if the sitemaps yielded too few or listing extraction
+        is on.
+        """
         seen = set()
 
         self.logger.info("Fetching product URLs from sitemap...")
-        sitemap_urls = self._extract_urls_from_sitemap(max_urls=max_urls)
-        self.logger.info(f"Sitemap found {len(sitemap_urls)} candidate product URLs")
-
-        for url in sitemap_urls:
-            if url not in seen:
-                seen.add(url)
-                all_urls.append(url)
-
-        # Category fallback if sitemap is blocked/incomplete.
-        if len(all_urls) < 40:
-            self.logger.info(
-                f"Low URL count ({len(all_urls)}). Trying category-based discovery..."
-            )
-            category_urls = self._extract_urls_from_categories(max_urls=max_urls)
-            for url in category_urls:
+        for url in self._iter_urls_from_sitemap(max_urls=max_urls):
+            seen.add(url)
+            yield url
+        self.logger.info(f"Sitemap found {len(seen)} candidate product URLs")
+
+        # Category fallback if sitemap is blocked/incomplete; listing extraction
+        # always reads the category tiles.
+        low_count = len(seen) < 40
+        if (low_count or self.listing_extract) and not (max_urls and len(seen) >= max_urls):
+            if low_count:
+                self.logger.info(
+                    f"Low URL count ({len(seen)}). Trying category-based discovery..."
+                )
+            else:
+                self.logger.info("Reading category tiles for listing extraction...")
+            for url in self._iter_urls_from_categories(max_urls=max_urls):
                 if url not in seen:
                     seen.add(url)
-                    all_urls.append(url)
-                    if max_urls and len(all_urls) >= max_urls:
+                    yield url
+                    if max_urls and len(seen) >= max_urls:
                         break
 
-        self.logger.info(f"Total product URLs found: {len(all_urls)}")
-        if max_urls:
-            return all_urls[:max_urls]
-        return all_urls
+        self.logger.info(f"Total product URLs found: {len(seen)}")
+
+    def get_product_urls(self, max_urls: int = None) -> List[str]:
+        return list(self.iter_product_urls(max_urls=max_urls))
 
     def _extract_text(self, soup: BeautifulSoup, selectors: List[str], default: str = "") -> str:
         for selector in selectors:
@@ -417,99 +417,10 @@ class WasserpumpeScraper(BaseScraper):
         except ValueError:
             return ""
 
-    def _extract_product_from_json_ld(self, soup: BeautifulSoup) -> Dict[str, str]:
-        result = {
-            "name": "",
-            "manufacturer": "",
-            "article_number": "",
-            "price_gross": "",
-            "ean": "",
-            "image": "",
-            "category": "",
-        }
-
-        scripts = soup.find_all("script", {"type": "application/ld+json"})
-        for script in scripts:
-            raw = script.string or script.get_text(strip=True)
-            if not raw:
-                continue
-
-            try:
-                payload = json.loads(raw)
-            except Exception:
-                continue
-
-            candidates = []
-            if isinstance(payload, dict):
-                candidates.append(payload)
-                graph = payload.get("@graph")
-                if isinstance(graph, list):
-                    candidates.extend(item for item in graph if isinstance(item, dict))
-            elif isinstance(payload, list):
-                candidates.extend(item for item in payload if isinstance(item, dict))
-
-            for item in candidates:
-                type_value = item.get("@type", "")
-                if isinstance(type_value, list):
-                    is_product = any(str(t).lower() == "product" for t in type_value)
-                else:
-                    is_product = str(type_value).lower() == "product"
-
-                if not is_product:
-                    continue
-
-                name = item.get("name")
-                if isinstance(name, str):
-                    result["name"] = name.strip()
-
-                brand = item.get("brand")
-                if isinstance(brand, dict):
-                    result["manufacturer"] = str(brand.get("name", "")).strip()
-                elif isinstance(brand, str):
-                    result["manufacturer"] = brand.strip()
-
-                result["article_number"] = str(
-                    item.get("sku") or item.get("mpn") or item.get("productID") or ""
-                ).strip()
-
-                result["ean"] = str(
-                    item.get("gtin13")
-                    or item.get("gtin14")
-                    or item.get("gtin12")
-                    or item.get("gtin8")
-                    or ""
-                ).strip()
-
-                image = item.get("image")
-                if isinstance(image, list) and image:
-                    result["image"] = str(image[0]).strip()
-                elif isinstance(image, str):
-                    result["image"] = image.strip()
-
-                result["category"] = str(item.get("category", "")).strip()
-
-                offers = item.get("offers")
-                if isinstance(offers, list) and offers:
-                    offers = offers[0]
-                if isinstance(offers, dict):
-                    price = offers.get("price")
-                    if price is not None:
-                        result["price_gross"] = self._clean_price(str(price))
-
-                return result
-
-        return result
-
-    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
-        response = self.make_request(url, attempts=3, timeout=35)
-        if not response:
-            return None
-
-        try:
-            soup = self.parse_html(response.text)
-            json_ld = self._extract_product_from_json_ld(soup)
-
-            product_name = json_ld["name"] or self._extract_text(
+    def _fill_from_html(self, fields: Dict[str, str], soup: BeautifulSoup, response) -> None:
+        """Fill the fields JSON-LD left empty from the product page markup."""
+        if not fields["name"]:
+            fields["name"] = self._extract_text(
                 soup,
                 [
                     "h1.page-title span",
@@ -518,10 +429,9 @@ class WasserpumpeScraper(BaseScraper):
                     "h1",
                 ],
             )
-            if not product_name:
-                return None
 
-            manufacturer = json_ld["manufacturer"] or self._extract_text(
+        if not fields["manufacturer"]:
+            fields["manufacturer"] = self._extract_text(
                 soup,
                 [
                     "a.product-manufacturer",
@@ -532,7 +442,8 @@ class WasserpumpeScraper(BaseScraper):
                 ],
             )
 
-            category = json_ld["category"] or self._extract_text(
+        if not fields["category"]:
+            fields["category"] = self._extract_text(
                 soup,
                 [
                     "ul.breadcrumbs li:nth-last-child(2) a",
@@ -541,7 +452,8 @@ class WasserpumpeScraper(BaseScraper):
                 ],
             )
 
-            article_number = json_ld["article_number"] or self._extract_text(
+        if not fields["article_number"]:
+            fields["article_number"] = self._extract_text(
                 soup,
                 [
                     "div.product-info-stock-sku div.value",
@@ -552,26 +464,24 @@ class WasserpumpeScraper(BaseScraper):
                 ],
             )
 
-            price_gross = json_ld["price_gross"]
-            if not price_gross:
-                price_raw = self._extract_text(
-                    soup,
-                    [
-                        "span.price",
-                        "span[itemprop='price']",
-                        "div.product-info-price span.price",
-                        "meta[itemprop='price']",
-                    ],
-                )
-                if not price_raw:
-                    match = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}(?:\s*EUR)?", response.text)
-                    if match:
-                        price_raw = match.group(0)
-                price_gross = self._clean_price(price_raw)
-
-            price_net = self._calc_net_price(price_gross)
-
-            ean = json_ld["ean"] or self._extract_text(
+        if not fields["price_gross"]:
+            price_raw = self._extract_text(
+                soup,
+                [
+                    "span.price",
+                    "span[itemprop='price']",
+                    "div.product-info-price span.price",
+                    "meta[itemprop='price']",
+                ],
+            )
+            if not price_raw:
+                match = re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}(?:\s*EUR)?", response.text)
+                if match:
+                    price_raw = match.group(0)
+            fields["price_gross"] = self._clean_price(price_raw)
+
+        if not fields["ean"]:
+            fields["ean"] = self._extract_text(
                 soup,
                 [
                     "span[itemprop='gtin13']",
@@ -582,7 +492,8 @@ class WasserpumpeScraper(BaseScraper):
                 ],
             )
 
-            product_image = json_ld["image"] or self._extract_image(
+        if not fields["image"]:
+            fields["image"] = self._extract_image(
                 soup,
                 [
                     "meta[property='og:image']",
@@ -592,16 +503,34 @@ class WasserpumpeScraper(BaseScraper):
                 ],
             )
 
+    def fetch_product(self, url: str):
+        return self.make_request(url, attempts=3, timeout=35)
+
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        try:
+            fields = self.extract_json_ld(response)
+            fields["price_gross"] = self._clean_price(fields["price_gross"])
+            # The DOM is only built when JSON-LD lacks a field the markup can fill.
+            if missing_json_ld_fields(fields):
+                self._fill_from_html(fields, self.parse_response(response), response)
+
+            product_name = fields["name"]
+            if not product_name:
+                return None
+
+            price_gross = fields["price_gross"]
+            price_net = self._calc_net_price(price_gross)
+
             return {
-                "manufacturer": manufacturer,
-                "category": category,
+                "manufacturer": fields["manufacturer"],
+                "category": fields["category"],
                 "name": product_name,
                 "title": product_name,
-                "article_number": article_number,
+                "article_number": fields["article_number"],
                 "price_net": price_net,
                 "price_gross": price_gross,
-                "ean": ean,
-                "product_image": product_image,
+                "ean": fields["ean"],
+                "product_image": fields["image"],
                 "product_url": url,
             }
 
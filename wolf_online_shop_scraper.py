@@ -5,12 +5,13 @@ Platform: Custom (Heating/HVAC parts shop) - Cloudflare protected
 """
 import sys
 import re
-import time
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
 from bs4 import BeautifulSoup
 import cloudscraper
 from base_scraper import BaseScraper
+from category_crawler import CategoryCrawler, absolute_links
 from google_sheets_helper import push_data
+from json_ld import missing_fields as missing_json_ld_fields
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -24,6 +25,9 @@ class WolfOnlineShopScraper(BaseScraper):
               price_net, price_gross, ean, product_image, product_url
     """
     
+    # Cloudflare cookies are bound to the cloudscraper session.
+    async_fetch_supported = False
+    
     def __init__(self):
         super().__init__(SCRAPER_NAME)
         
@@ -44,11 +48,12 @@ class WolfOnlineShopScraper(BaseScraper):
     def make_request(self, url: str, **kwargs):
         """Override to use cloudscraper instead of requests."""
         try:
-            response = self.scraper.get(url, timeout=30, **kwargs)
+            response = self._send_request(self.scraper, "GET", url, timeout=30, **kwargs)
             response.raise_for_status()
             return response
         except Exception as e:
             self.logger.error(f"Request failed for {url}: {e}")
+            self._fetch_failed(url, e)
             return None
     
     def get_product_urls(self, max_urls: int = None) -> List[str]:
@@ -56,7 +61,22 @@ class WolfOnlineShopScraper(BaseScraper):
         Get product URLs by crawling categories.
         The site has category pages with products that need to be discovered.
         """
-        product_urls = []
+        return list(self.iter_product_urls(max_urls))
+
+    def _absolute_url(self, href: str) -> str:
+        if href.startswith('/'):
+            return self.base_url + href
+        if not href.startswith('http'):
+            return self.base_url + '/' + href
+        return href
+
+    def iter_product_urls(self, max_urls: int = None) -> Iterator[str]:
+        """
+        Yield product URLs from the homepage, then from all category pages.
+        Categories linked from category pages and their ?page= pagination
+        are followed as well, several pages at once.
+        """
+        seen = set()
         category_urls = set()
         
         try:
@@ -65,88 +85,54 @@ class WolfOnlineShopScraper(BaseScraper):
             
             if not response:
                 self.logger.error("Failed to fetch homepage")
-                return product_urls
+                return
             
-            soup = self.parse_html(response.text)
-            links = soup.find_all('a', href=True)
+            soup = self.parse_response(response)
+            homepage_products = []
             
             # First pass: collect all category URLs (with :::)
-            for link in links:
+            for link in soup.find_all('a', href=True):
                 href = link.get('href')
                 if not href:
                     continue
+                url = self._absolute_url(href)
                 
-                # Make absolute URL
-                if href.startswith('/'):
-                    url = self.base_url + href
-                elif not href.startswith('http'):
-                    url = self.base_url + '/' + href
-                else:
-                    url = href
-                
-                # Category pages have ::: pattern
-                if ':::' in url and '.html' in url:
+                if self._is_category_url(url):
                     category_urls.add(url)
                 # Product pages have :: pattern
-                elif self._is_product_url(url):
-                    if url not in product_urls:
-                        product_urls.append(url)
+                elif self._is_product_url(url) and url not in seen:
+                    seen.add(url)
+                    homepage_products.append(url)
             
-            self.logger.info(f"Found {len(product_urls)} products on homepage")
+            self.logger.info(f"Found {len(homepage_products)} products on homepage")
             self.logger.info(f"Found {len(category_urls)} category pages to explore")
+            yield from homepage_products[:max_urls] if max_urls else homepage_products
             
-            # Now crawl each category page to find products
-            for i, cat_url in enumerate(sorted(category_urls), 1):
-                if max_urls and len(product_urls) >= max_urls:
+            # Now crawl the category pages to find products
+            crawler = CategoryCrawler(
+                self,
+                product_links=self._listing_product_links,
+                follow_category=self._is_category_url,
+            )
+            for url in crawler.iter_products(sorted(category_urls)):
+                if max_urls and len(seen) >= max_urls:
                     break
-                
-                self.logger.info(f"[{i}/{len(category_urls)}] Crawling category: {cat_url}")
-                
-                try:
-                    cat_response = self.make_request(cat_url)
-                    if not cat_response:
-                        continue
-                    
-                    cat_soup = self.parse_html(cat_response.text)
-                    cat_links = cat_soup.find_all('a', href=True)
-                    
-                    products_in_category = 0
-                    for link in cat_links:
-                        href = link.get('href')
-                        if not href:
-                            continue
-                        
-                        # Make absolute URL
-                        if href.startswith('/'):
-                            url = self.base_url + href
-                        elif not href.startswith('http'):
-                            url = self.base_url + '/' + href
-                        else:
-                            url = href
-                        
-                        # Check if it's a product page
-                        if self._is_product_url(url) and url not in product_urls:
-                            product_urls.append(url)
-                            products_in_category += 1
-                            
-                            if max_urls and len(product_urls) >= max_urls:
-                                break
-                    
-                    self.logger.info(f"  Found {products_in_category} products (total: {len(product_urls)})")
-                    
-                    # Small delay between category requests
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error crawling category {cat_url}: {e}")
-                    continue
+                if url not in seen:
+                    seen.add(url)
+                    yield url
             
-            self.logger.info(f"Total product URLs found: {len(product_urls)}")
+            self.logger.info(f"Total product URLs found: {len(seen)}")
             
         except Exception as e:
             self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
-        
-        return product_urls[:max_urls] if max_urls else product_urls
+
+    def _listing_product_links(self, soup, page_url: str) -> List[str]:
+        """Product URLs linked from a category page."""
+        return absolute_links(soup, page_url, self._is_product_url)
+
+    def _is_category_url(self, url: str) -> bool:
+        """Category pages have pattern: /Category:::ID.html (triple colon)."""
+        return ':::' in url and '.html' in url
     
     def _is_product_url(self, url: str) -> bool:
         """Determine if URL is a product page."""
@@ -178,58 +164,29 @@ class WolfOnlineShopScraper(BaseScraper):
         
         return False
     
-    def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
-        """Scrape individual product page."""
-        response = self.make_request(url)
-        if not response:
-            return None
-        
+    def extract_product(self, url: str, response) -> Optional[Dict[str, Any]]:
+        """Extract product data from a downloaded product page."""
         try:
-            soup = self.parse_html(response.text)
-            
-            # Try to extract from JSON-LD structured data first (most reliable)
-            json_ld = soup.find('script', {'type': 'application/ld+json'})
-            if json_ld:
-                try:
-                    import json
-                    data = json.loads(json_ld.string)
-                    
-                    # Check if it's a Product schema
-                    if isinstance(data, dict) and data.get('@type') == 'Product':
-                        import html
-                        product_name = html.unescape(data.get('name', ''))
-                        manufacturer = data.get('brand', {}).get('name', '') if isinstance(data.get('brand'), dict) else ''
-                        article_number = data.get('mpn', '') or data.get('sku', '')
-                        ean = data.get('gtin8', '') or data.get('gtin13', '')
-                        
-                        # Get price from offers
-                        offers = data.get('offers', {})
-                        price_gross_raw = str(offers.get('price', '')) if isinstance(offers, dict) else ''
-                        price_gross = price_gross_raw.replace('.', ',') if price_gross_raw else ''
-                        
-                        # Get image
-                        images = data.get('image', [])
-                        product_image = images[0] if isinstance(images, list) and images else ''
-                        
-                        self.logger.info(f"Extracted from JSON-LD: {product_name}, {manufacturer}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse JSON-LD: {e}")
-                    manufacturer = ''
-                    article_number = ''
-                    ean = ''
-                    price_gross = ''
-                    product_image = ''
-                    product_name = ''
-            else:
-                manufacturer = ''
-                article_number = ''
-                ean = ''
-                price_gross = ''
-                product_image = ''
-                product_name = ''
+            # Structured data first: read straight from the response bytes.
+            fields = self.extract_json_ld(
+                response,
+                article_keys=('mpn', 'sku'),
+                ean_keys=('gtin8', 'gtin13'),
+            )
+            product_name = fields['name']
+            manufacturer = fields['manufacturer']
+            article_number = fields['article_number']
+            ean = fields['ean']
+            price_gross = fields['price_gross'].replace('.', ',')
+            product_image = fields['image']
+            if product_name:
+                self.logger.info(f"Extracted from JSON-LD: {product_name}, {manufacturer}")
+
+            # Only build the DOM when JSON-LD left a field with a DOM fallback empty.
+            soup = self.parse_response(response) if missing_json_ld_fields(fields) else None
             
             # Fallback to HTML extraction if JSON-LD didn't work
-            if not product_name:
+            if not product_name and soup is not None:
                 product_name = self._extract_text(soup, [
                     'h1.product-name',
                     'h1.product-title',
@@ -243,7 +200,7 @@ class WolfOnlineShopScraper(BaseScraper):
                 return None
             
             # Extract manufacturer from HTML if not in JSON-LD
-            if not manufacturer:
+            if not manufacturer and soup is not None:
                 # Look for "Hersteller:" label
                 manufacturer_elem = soup.find('strong', string=lambda x: x and 'Hersteller' in x)
                 if manufacturer_elem and manufacturer_elem.parent:
@@ -263,15 +220,17 @@ class WolfOnlineShopScraper(BaseScraper):
                     ])
             
             # Extract category
-            category = self._extract_text(soup, [
-                'nav.breadcrumb li:nth-last-child(2) a',
-                'ul.breadcrumbs li:nth-last-child(2) a',
-                'div.breadcrumbs a:last-of-type',
-                'span[itemprop="category"]'
-            ])
+            category = fields['category']
+            if not category and soup is not None:
+                category = self._extract_text(soup, [
+                    'nav.breadcrumb li:nth-last-child(2) a',
+                    'ul.breadcrumbs li:nth-last-child(2) a',
+                    'div.breadcrumbs a:last-of-type',
+                    'span[itemprop="category"]'
+                ])
             
             # Extract article number from HTML if not in JSON-LD
-            if not article_number:
+            if not article_number and soup is not None:
                 # Look for "HAN:" label
                 han_elem = soup.find('strong', string=lambda x: x and 'HAN:' in x)
                 if han_elem and han_elem.parent:
@@ -291,7 +250,7 @@ class WolfOnlineShopScraper(BaseScraper):
                     ])
             
             # Extract price from HTML if not in JSON-LD
-            if not price_gross:
+            if not price_gross and soup is not None:
                 price_gross_raw = self._extract_text(soup, [
                     'span.value_price',
                     'span.price',
@@ -312,7 +271,7 @@ class WolfOnlineShopScraper(BaseScraper):
                     pass
             
             # Extract EAN from HTML if not in JSON-LD
-            if not ean:
+            if not ean and soup is not None:
                 ean = self._extract_text(soup, [
                     'span.ean',
                     'span[itemprop="gtin13"]',
@@ -321,7 +280,7 @@ class WolfOnlineShopScraper(BaseScraper):
                 ])
             
             # Extract product image from HTML if not in JSON-LD
-            if not product_image:
+            if not product_image and soup is not None:
                 product_image = self._extract_image(soup, [
                     'img.product-image',
                     'img[itemprop="image"]',
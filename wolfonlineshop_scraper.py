@@ -5,9 +5,12 @@ Platform: Shopware 6
 """
 import sys
 import re
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
+from urllib.parse import urljoin
 from base_scraper import BaseScraper
+from category_crawler import SHOPWARE_TILES, CategoryCrawler, read_tiles
 from google_sheets_helper import push_data
+from shopware_store_api import ShopwareStoreApi
 from config import SHEET_IDS, SCRAPER_CONFIGS
 
 
@@ -41,54 +44,46 @@ class WolfonlineshopScraper(BaseScraper):
         
         self.logger.info(f"Initialized scraper for {self.base_url}")
     
+    def bulk_source(self) -> ShopwareStoreApi:
+        """Products from the Shopware 6 Store API (SCRAPER_BULK_SOURCE=1)."""
+        return ShopwareStoreApi(self, self.base_url)
+
     def get_product_urls(self) -> List[str]:
         """
         Get list of product URLs by scraping category pages.
         Heat-Store doesn't have product URLs in sitemap, so we scrape categories.
         """
-        product_urls = []
-        
+        return list(self.iter_product_urls())
+
+    def iter_product_urls(self) -> Iterator[str]:
+        """
+        Yield product URLs from all listing pages of the categories (?p=2, ...),
+        several pages at once.
+        """
         try:
-            self.logger.info(f"Scraping {len(self.category_urls)} category pages...")
-            
-            for i, category_url in enumerate(self.category_urls, 1):
-                self.logger.info(f"Processing category {i}/{len(self.category_urls)}: {category_url}")
-                
-                try:
-                    response = self.make_request(category_url)
-                    if not response:
-                        continue
-                    
-                    soup = self.parse_html(response.text)
-                    
-                    # Find product links (they have 'product' in class name)
-                    product_links = soup.find_all('a', class_=lambda x: x and 'product' in str(x).lower())
-                    
-                    for link in product_links:
-                        href = link.get('href')
-                        if href and href.endswith('.html'):
-                            # Make absolute URL
-                            if href.startswith('/'):
-                                href = self.base_url + href
-                            elif not href.startswith('http'):
-                                href = self.base_url + '/' + href
-                            
-                            # Avoid duplicates
-                            if href not in product_urls:
-                                product_urls.append(href)
-                    
-                    self.logger.info(f"Found {len(product_links)} products in this category")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing category {category_url}: {e}")
-                    continue
-            
-            self.logger.info(f"Total product URLs found: {len(product_urls)}")
+            self.logger.info(f"Scraping {len(self.category_urls)} categories...")
+            crawler = CategoryCrawler(
+                self,
+                product_links=self._listing_product_links,
+                tiles=self._listing_tiles,
+            )
+            yield from crawler.iter_products(self.category_urls)
             
         except Exception as e:
             self.logger.error(f"Error getting product URLs: {e}", exc_info=True)
-        
-        return product_urls
+
+    def _listing_product_links(self, soup, page_url: str) -> List[str]:
+        """Product links on a category page (they have 'product' in class name)."""
+        links = []
+        for link in soup.find_all('a', class_=lambda x: x and 'product' in str(x).lower()):
+            href = link.get('href')
+            if href and href.endswith('.html'):
+                links.append(urljoin(page_url, href))
+        return links
+
+    def _listing_tiles(self, soup, page_url: str) -> List[Dict[str, str]]:
+        """Name, price and image from the category tiles (listing extraction)."""
+        return read_tiles(soup, page_url, clean_price=self._clean_price, **SHOPWARE_TILES)
     
     def scrape_product(self, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -99,7 +94,7 @@ class WolfonlineshopScraper(BaseScraper):
             return None
         
         try:
-            soup = self.parse_html(response.text)
+            soup = self.parse_response(response)
             
             # Extract product name/title
             product_name = self._extract_text(soup, [